@@ -1,4 +1,5 @@
 import logging, os
+from datetime import datetime
 from celery import shared_task, Task
 from breathecode.admissions.models import Cohort
 from breathecode.admissions.utils.cohort_log import CohortDayLog
@@ -84,3 +85,23 @@ def get_attendancy_log(self, cohort_id: int):
     cohort.save()
 
     logger.info('History log saved')
+
+
+@shared_task(bind=True, max_retries=5)
+def add_student_activities(self, activities: list[dict]):
+    from breathecode.services.google_cloud import Datastore, MAX_ENTITIES_PER_COMMIT
+
+    logger.info(f'Executing add_student_activities with {len(activities)} activities')
+    datastore = Datastore()
+
+    for i in range(0, len(activities), MAX_ENTITIES_PER_COMMIT):
+        chunk = [{
+            **x, 'created_at': datetime.fromisoformat(x['created_at'])
+        } for x in activities[i:i + MAX_ENTITIES_PER_COMMIT]]
+
+        try:
+            datastore.update_many('student_activity', chunk)
+
+        except Exception as e:
+            # the chunks that were saved must not be duplicated
+            raise self.retry(exc=e, args=(activities[i:], ), countdown=60 * 5)
@@ -0,0 +1,73 @@
+"""
+Test /answer
+"""
+from datetime import timedelta
+from unittest.mock import MagicMock, call, patch
+
+from django.utils import timezone
+
+from breathecode.activity.tasks import add_student_activities
+from breathecode.services.google_cloud import Datastore
+
+from ..mixins import MediaTestCase
+
+UTC_NOW = timezone.now()
+
+
+def get_activity(index, data={}):
+    return {
+        'academy_id': 1,
+        'cohort': 'miami-downtown-pt-xx',
+        'created_at': (UTC_NOW + timedelta(seconds=index)).isoformat(),
+        'data': '{"day": 1}',
+        'email': f'konan{index}@naruto.io',
+        'slug': 'classroom_attendance',
+        'user_agent': 'bc/test',
+        'user_id': index,
+        **data,
+    }
+
+
+def get_entity(activity):
+    return {**activity, 'created_at': timezone.datetime.fromisoformat(activity['created_at'])}
+
+
+class MediaTestSuite(MediaTestCase):
+    """
+    🔽🔽🔽 One commit per chunk
+    """
+
+    @patch.object(Datastore, '__init__', new=lambda x: None)
+    @patch.object(Datastore, 'update_many', MagicMock())
+    @patch('breathecode.services.google_cloud.MAX_ENTITIES_PER_COMMIT', 2)
+    def test_chunks(self):
+        activities = [get_activity(n) for n in range(5)]
+        add_student_activities.delay(activities)
+
+        self.assertEqual(Datastore.update_many.call_args_list, [
+            call('student_activity', [get_entity(x) for x in activities[0:2]]),
+            call('student_activity', [get_entity(x) for x in activities[2:4]]),
+            call('student_activity', [get_entity(x) for x in activities[4:5]]),
+        ])
+
+    """
+    🔽🔽🔽 Retry from the failed chunk
+    """
+
+    @patch.object(Datastore, '__init__', new=lambda x: None)
+    @patch.object(Datastore, 'update_many', MagicMock(side_effect=[None, Exception('error')]))
+    @patch('breathecode.services.google_cloud.MAX_ENTITIES_PER_COMMIT', 2)
+    @patch('breathecode.activity.tasks.add_student_activities.retry',
+           MagicMock(side_effect=Exception('retry')))
+    def test_retry_from_the_failed_chunk(self):
+        activities = [get_activity(n) for n in range(5)]
+
+        with self.assertRaisesMessage(Exception, 'retry'):
+            add_student_activities(activities)
+
+        self.assertEqual(Datastore.update_many.call_args_list, [
+            call('student_activity', [get_entity(x) for x in activities[0:2]]),
+            call('student_activity', [get_entity(x) for x in activities[2:4]]),
+        ])
+        self.assertEqual(len(add_student_activities.retry.call_args_list), 1)
+        self.assertEqual(add_student_activities.retry.call_args[1]['args'], (activities[2:], ))
@@ -13,6 +13,7 @@ from breathecode.services.google_cloud import Datastore
 from ..mixins import MediaTestCase
 import random
 
+UTC_NOW = timezone.now()
 TOTAL = 15
 
 DATASTORE_SEED = [{
@@ -440,3 +441,125 @@ class MediaTestSuite(MediaTestCase):
         json = response.json()
         self.assertEqual(json, {'detail': 'user-not-exists', 'status_code': 400})
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    """
+    🔽🔽🔽 Post
+    """
+
+    @patch('breathecode.activity.tasks.add_student_activities.delay', MagicMock())
+    def test_post__student_not_found(self):
+        from breathecode.activity.tasks import add_student_activities
+
+        self.headers(academy=1)
+        cohort_users = [{'role': 'TEACHER', 'user_id': 1}]
+        model = self.bc.database.create(user=2,
+                                        cohort=1,
+                                        cohort_user=cohort_users,
+                                        profile_academy=1,
+                                        capability='classroom_activity',
+                                        role=1)
+        self.client.force_authenticate(model.user[0])
+
+        url = reverse_lazy('activity:academy_cohort_id', kwargs={'cohort_id': 1})
+        data = [{
+            'user_id': 2,
+            'slug': 'classroom_attendance',
+            'user_agent': 'bc/test',
+            'cohort': model.cohort.slug,
+            'data': '{"day": 1}',
+        }]
+        response = self.client.post(url, data, format='json')
+
+        json = response.json()
+        expected = {'detail': 'not-found-in-cohort', 'status_code': 400}
+
+        self.assertEqual(json, expected)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(add_student_activities.delay.call_args_list, [])
+
+    @patch('breathecode.activity.tasks.add_student_activities.delay', MagicMock())
+    def test_post__bad_user_id(self):
+        from breathecode.activity.tasks import add_student_activities
+
+        self.headers(academy=1)
+        cohort_users = [{'role': 'TEACHER', 'user_id': 1}]
+        model = self.bc.database.create(user=1,
+                                        cohort=1,
+                                        cohort_user=cohort_users,
+                                        profile_academy=1,
+                                        capability='classroom_activity',
+                                        role=1)
+        self.client.force_authenticate(model.user)
+
+        url = reverse_lazy('activity:academy_cohort_id', kwargs={'cohort_id': 1})
+        data = [{
+            'user_id': 'two',
+            'slug': 'classroom_attendance',
+            'user_agent': 'bc/test',
+            'cohort': model.cohort.slug,
+            'data': '{"day": 1}',
+        }]
+        response = self.client.post(url, data, format='json')
+
+        json = response.json()
+        expected = {'detail': 'bad-user-id', 'status_code': 400}
+
+        self.assertEqual(json, expected)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(add_student_activities.delay.call_args_list, [])
+
+    @patch('breathecode.activity.tasks.add_student_activities.delay', MagicMock())
+    @patch('breathecode.activity.views.generate_created_at', MagicMock(return_value=UTC_NOW))
+    def test_post__many_students__enqueued_in_one_task(self):
+        from breathecode.activity.tasks import add_student_activities
+
+        self.headers(academy=1)
+        cohort_users = [{
+            'role': 'TEACHER',
+            'user_id': 1
+        }] + [{
+            'role': 'STUDENT',
+            'user_id': n
+        } for n in range(2, 5)]
+        model = self.bc.database.create(user=4,
+                                        cohort=1,
+                                        cohort_user=cohort_users,
+                                        profile_academy=1,
+                                        capability='classroom_activity',
+                                        role=1)
+        self.client.force_authenticate(model.user[0])
+
+        url = reverse_lazy('activity:academy_cohort_id', kwargs={'cohort_id': 1})
+
+        # the ids could be sent as strings
+        data = [{
+            'user_id': str(n) if n == 3 else n,
+            'slug': 'classroom_attendance',
+            'user_agent': 'bc/test',
+            'cohort': model.cohort.slug,
+            'data': '{"day": 1}',
+        } for n in range(2, 5)]
+
+        # the queries do not grow with the number of activities
+        with self.assertNumQueries(4):
+            response = self.client.post(url, data, format='json')
+
+        json = response.json()
+        activities = [{
+            'slug': 'classroom_attendance',
+            'user_agent': 'bc/test',
+            'cohort': model.cohort.slug,
+            'data': '{"day": 1}',
+            'created_at': self.datetime_to_iso(UTC_NOW),
+            'user_id': n,
+            'email': model.user[n - 1].email,
+            'academy_id': 1,
+        } for n in range(2, 5)]
+
+        self.assertEqual(json, activities)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(add_student_activities.delay.call_args_list, [
+            call([{
+                **x, 'created_at': UTC_NOW.isoformat()
+            } for x in activities]),
+        ])
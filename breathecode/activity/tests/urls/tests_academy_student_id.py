@@ -0,0 +1,89 @@
+"""
+Test /v1/activity/academy/student/<student_id>
+"""
+from datetime import timedelta
+from unittest.mock import MagicMock, call, patch
+
+from django.urls.base import reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+
+from breathecode.services.google_cloud import Datastore
+
+from ..mixins import MediaTestCase
+
+UTC_NOW = timezone.now()
+
+
+def get_activity(day):
+    return {
+        'academy_id': 1,
+        'cohort': None,
+        'created_at': (UTC_NOW + timedelta(days=day)).isoformat().replace('+00:00', 'Z'),
+        'data': None,
+        'day': day,
+        'email': 'konan@naruto.io',
+        'slug': 'breathecode_login',
+        'user_agent': 'bc/test',
+        'user_id': 1,
+    }
+
+
+class MediaTestSuite(MediaTestCase):
+    """
+    🔽🔽🔽 With cursor
+    """
+
+    @patch.object(Datastore, '__init__', new=lambda x: None)
+    @patch.object(Datastore, 'fetch_page',
+                  MagicMock(return_value=([get_activity(1), get_activity(2)], 'abc')))
+    @patch.object(Datastore, 'count', MagicMock(return_value=15))
+    def test_student_id__with_cursor__first_page(self):
+        self.headers(academy=1)
+        self.generate_models(authenticate=True,
+                             profile_academy=True,
+                             capability='read_activity',
+                             role='potato',
+                             cohort_user=True)
+
+        url = reverse_lazy('activity:academy_student_id', kwargs={'student_id': 1}) + '?limit=2&cursor='
+        response = self.client.get(url)
+
+        json = response.json()
+        expected = {
+            'next': 'http://testserver/v1/activity/academy/student/1?cursor=abc&limit=2',
+            'results': [get_activity(2), get_activity(1)],
+        }
+
+        self.assertEqual(json, expected)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Link'],
+                         '<http://testserver/v1/activity/academy/student/1?cursor=abc&limit=2>; rel="next"')
+
+        self.assertEqual(Datastore.fetch_page.call_args_list,
+                         [call(2, None, kind='student_activity', user_id=1)])
+        self.assertEqual(Datastore.count.call_args_list, [])
+
+    @patch.object(Datastore, '__init__', new=lambda x: None)
+    @patch.object(Datastore, 'fetch_page', MagicMock(return_value=([get_activity(1)], None)))
+    def test_student_id__with_cursor__last_page(self):
+        self.headers(academy=1)
+        self.generate_models(authenticate=True,
+                             profile_academy=True,
+                             capability='read_activity',
+                             role='potato',
+                             cohort_user=True)
+
+        url = reverse_lazy('activity:academy_student_id', kwargs={'student_id': 1})
+        url += '?cursor=abc&envelope=false'
+        response = self.client.get(url)
+
+        json = response.json()
+        expected = [get_activity(1)]
+
+        self.assertEqual(json, expected)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Link', response)
+
+        self.assertEqual(Datastore.fetch_page.call_args_list,
+                         [call(100, 'abc', kind='student_activity', user_id=1)])
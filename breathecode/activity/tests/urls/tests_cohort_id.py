@@ -362,3 +362,67 @@ class MediaTestSuite(MediaTestCase):
         self.assertEqual(mock.fetch.call_args_list,
                          [call([FilterNode('cohort', '=', model.cohort.slug)], limit=5, offset=10)])
         self.assertEqual(mock.count.call_args_list, [call([FilterNode('cohort', '=', model.cohort.slug)])])
+
+    """
+    🔽🔽🔽 With cursor
+    """
+
+    @patch.object(NDB, '__init__', new=ndb_init_mock)
+    @patch.object(NDB, 'fetch_page', MagicMock(return_value=([DATASTORE_PRIVATE_SEED], 'abc')))
+    @patch.object(NDB, 'count', new=ndb_count_mock(15))
+    def test_cohort_id__with_cursor__first_page(self):
+        from breathecode.utils import NDB as mock
+        ndb_init_mock.call_args_list = []
+        mock.count.call_args_list = []
+
+        self.headers(academy=1)
+        model = self.generate_models(authenticate=True,
+                                     profile_academy=True,
+                                     capability='read_activity',
+                                     role='potato',
+                                     cohort=True)
+
+        url = reverse_lazy('activity:cohort_id', kwargs={'cohort_id': 1}) + '?limit=5&cursor='
+        response = self.client.get(url)
+
+        json = response.json()
+        expected = {
+            'next': 'http://testserver/v1/activity/cohort/1?cursor=abc&limit=5',
+            'results': [DATASTORE_PRIVATE_SEED],
+        }
+
+        self.assertEqual(json, expected)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Link'],
+                         '<http://testserver/v1/activity/cohort/1?cursor=abc&limit=5>; rel="next"')
+
+        self.assertEqual(ndb_init_mock.call_args_list, [call(Activity)])
+        self.assertEqual(mock.fetch_page.call_args_list,
+                         [call([FilterNode('cohort', '=', model.cohort.slug)], 5, None)])
+        self.assertEqual(mock.count.call_args_list, [])
+
+    @patch.object(NDB, '__init__', new=ndb_init_mock)
+    @patch.object(NDB, 'fetch_page', MagicMock(return_value=([DATASTORE_PRIVATE_SEED], None)))
+    def test_cohort_id__with_cursor__last_page(self):
+        from breathecode.utils import NDB as mock
+        ndb_init_mock.call_args_list = []
+
+        self.headers(academy=1)
+        model = self.generate_models(authenticate=True,
+                                     profile_academy=True,
+                                     capability='read_activity',
+                                     role='potato',
+                                     cohort=True)
+
+        url = reverse_lazy('activity:cohort_id', kwargs={'cohort_id': 1}) + '?cursor=abc&envelope=false'
+        response = self.client.get(url)
+
+        json = response.json()
+        expected = [DATASTORE_PRIVATE_SEED]
+
+        self.assertEqual(json, expected)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Link', response)
+
+        self.assertEqual(mock.fetch_page.call_args_list,
+                         [call([FilterNode('cohort', '=', model.cohort.slug)], 100, 'abc')])
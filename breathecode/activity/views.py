@@ -1,10 +1,13 @@
+from typing import Optional
 from django.contrib.auth.models import User
 from django.db.models import Q
 from google.cloud.ndb.query import OR
 from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
+from breathecode.activity import tasks
 from breathecode.activity.models import Activity
 from breathecode.admissions.models import Cohort, CohortUser
 from breathecode.utils import (HeaderLimitOffsetPagination, ValidationException, capable_of, getLogger)
@@ -39,13 +42,31 @@ ACTIVITIES = {
     'career_note': 'Notes related to the student career',
 }
 
+CURSOR_PAGE_SIZE = 100
+
 ACTIVITY_PUBLIC_SLUGS = [
     'breathecode_login',
     'online_platform_registration',
 ]
 
 
-class ActivityViewMixin(APIView):
+class CursorResponseMixin:
+
+    def get_cursor_response(self, data: list[dict], cursor: Optional[str]) -> Response:
+        next_url = None
+        headers = {}
+
+        if cursor:
+            next_url = replace_query_param(self.request.build_absolute_uri(), 'cursor', cursor)
+            headers['Link'] = f'<{next_url}>; rel="next"'
+
+        if str(self.request.GET.get('envelope')).lower() in ['false', '0']:
+            return Response(data, status=status.HTTP_200_OK, headers=headers)
+
+        return Response({'next': next_url, 'results': data}, status=status.HTTP_200_OK, headers=headers)
+
+
+class ActivityViewMixin(CursorResponseMixin, APIView):
     queryargs = []
 
     def filter_by_slugs(self):
@@ -191,6 +212,13 @@ class ActivityCohortView(ActivityViewMixin, HeaderLimitOffsetPagination):
         offset = self.get_offset_from_query()
 
         client = NDB(Activity)
+
+        # the offsets are billed per skipped entity, the cursors are not
+        if 'cursor' in request.GET:
+            data, cursor = client.fetch_page(self.queryargs, limit or CURSOR_PAGE_SIZE,
+                                             request.GET.get('cursor') or None)
+            return self.get_cursor_response(data, cursor)
+
         data = client.fetch(self.queryargs, limit=limit, offset=offset)
         page = self.paginate_queryset(data, request)
 
@@ -290,19 +318,21 @@ class ActivityClassroomView(APIView, HeaderLimitOffsetPagination):
         if isinstance(data, list) == False:
             data = [data]
 
+        student_ids = get_student_ids(data)
+        cohort_users = CohortUser.objects.filter(role='STUDENT',
+                                                 user__id__in=[x for x in student_ids if x is not None],
+                                                 cohort__id=cu.cohort_id).select_related('user')
+        students = {x.user.id: x.user for x in cohort_users}
+        cohorts = get_cohort_keys(academy_id, data)
+
         new_activities = []
-        for activity in data:
-            student_id = activity['user_id']
-            del activity['user_id']
-            cohort_user = CohortUser.objects.filter(role='STUDENT',
-                                                    user__id=student_id,
-                                                    cohort__id=cu.cohort.id).first()
-            if cohort_user is None:
+        for student_id, activity in zip(student_ids, data):
+            if student_id not in students:
                 raise ValidationException('Student not found in this cohort', slug='not-found-in-cohort')
 
-            new_activities.append(add_student_activity(cohort_user.user, activity, academy_id))
+            new_activities.append(get_student_activity(students[student_id], activity, academy_id, cohorts))
 
-        return Response(new_activities, status=status.HTTP_201_CREATED)
+        return enqueue_student_activities(new_activities)
 
     @capable_of('classroom_activity')
     def get(self, request, cohort_id=None, academy_id=None):
@@ -376,9 +406,41 @@ class ActivityClassroomView(APIView, HeaderLimitOffsetPagination):
             return Response(page, status=status.HTTP_200_OK)
 
 
-def add_student_activity(user, data, academy_id):
-    from breathecode.services import Datastore
+def get_student_ids(activities: list[dict]) -> list[Optional[int]]:
+    """
+    Get the user_id of each activity as an integer, the clients could send it as a string.
+    """
+
+    student_ids = []
+    for activity in activities:
+        student_id = activity.pop('user_id', None)
+
+        try:
+            student_ids.append(int(student_id) if student_id is not None else None)
+        except (TypeError, ValueError):
+            raise ValidationException('user_id is not a interger', slug='bad-user-id')
+
+    return student_ids
+
+
+def get_cohort_keys(academy_id, activities: list[dict]) -> set[str]:
+    """
+    Get the ids and slugs of the cohorts of the academy that the activities reference, in one query.
+    """
+
+    values = [str(x['cohort']) for x in activities if isinstance(x, dict) and x.get('cohort')]
+    if not values:
+        return set()
 
+    ids = [x for x in values if x.isnumeric()]
+    slugs = [x for x in values if not x.isnumeric()]
+    cohorts = Cohort.objects.filter(Q(id__in=ids) | Q(slug__in=slugs),
+                                    academy__id=academy_id).values_list('id', 'slug')
+
+    return {str(x) for cohort in cohorts for x in cohort}
+
+
+def get_student_activity(user, data, academy_id, cohorts: Optional[set[str]] = None):
     validate_activity_fields(data)
     validate_require_activity_fields(data)
 
@@ -393,17 +455,24 @@ def add_student_activity(user, data, academy_id):
     validate_activity_have_correct_data_field(data)
 
     if 'cohort' in data:
-        _query = Cohort.objects.filter(academy__id=academy_id)
-        if data['cohort'].isnumeric():
-            _query = _query.filter(id=data['cohort'])
+        # the prefetched cohorts belong to the academy, the public activities are looked up in academy 0
+        if cohorts is not None and academy_id:
+            exists = str(data['cohort']) in cohorts
+
         else:
-            _query = _query.filter(slug=data['cohort'])
+            _query = Cohort.objects.filter(academy__id=academy_id)
+            if data['cohort'].isnumeric():
+                _query = _query.filter(id=data['cohort'])
+            else:
+                _query = _query.filter(slug=data['cohort'])
+
+            exists = _query.exists()
 
-        if not _query.exists():
+        if not exists:
             raise ValidationException(f"Cohort {str(data['cohort'])} doesn't exist in this academy",
                                       slug='cohort-not-exists')
 
-    fields = {
+    return {
         **data,
         'created_at': generate_created_at(),
         'slug': slug,
@@ -412,13 +481,28 @@ def add_student_activity(user, data, academy_id):
         'academy_id': int(academy_id),
     }
 
+
+def add_student_activity(user, data, academy_id):
+    from breathecode.services import Datastore
+
+    fields = get_student_activity(user, data, academy_id)
+
     datastore = Datastore()
     datastore.update('student_activity', fields)
 
     return fields
 
 
-class StudentActivityView(APIView, HeaderLimitOffsetPagination):
+def enqueue_student_activities(activities: list[dict]) -> Response:
+    """
+    Save the activities in background, the task writes them to Datastore in batches.
+    """
+
+    tasks.add_student_activities.delay([{**x, 'created_at': x['created_at'].isoformat()} for x in activities])
+    return Response(activities, status=status.HTTP_202_ACCEPTED)
+
+
+class StudentActivityView(CursorResponseMixin, APIView, HeaderLimitOffsetPagination):
 
     @capable_of('read_activity')
     def get(self, request, student_id=None, academy_id=None):
@@ -461,6 +545,16 @@ class StudentActivityView(APIView, HeaderLimitOffsetPagination):
         limit = request.GET.get('limit')
         offset = request.GET.get('offset')
 
+        # the offsets are billed per skipped entity, the cursors are not, and it is not counted
+        if 'cursor' in request.GET:
+            data, cursor = datastore.fetch_page(
+                int(limit) if limit else CURSOR_PAGE_SIZE,
+                request.GET.get('cursor') or None, **kwargs)
+
+            # like the offset pages, just the page is sorted
+            data.sort(key=lambda x: x['created_at'], reverse=True)
+            return self.get_cursor_response(data, cursor)
+
         # get the the total entities on db by kind
         if limit is not None or offset is not None:
             count = datastore.count(**kwargs)
@@ -494,9 +588,7 @@ class StudentActivityView(APIView, HeaderLimitOffsetPagination):
         if isinstance(data, list) == False:
             data = [data]
 
-        new_activities = []
         for activity in data:
-
             if 'cohort' not in activity:
                 raise ValidationException(
                     'Every activity specified for each student must have a cohort (slug)',
@@ -504,14 +596,20 @@ class StudentActivityView(APIView, HeaderLimitOffsetPagination):
             elif activity['cohort'].isnumeric():
                 raise ValidationException('Cohort must be a slug, not a numeric ID', slug='invalid-cohort')
 
-            student_id = activity['user_id']
-            del activity['user_id']
-            cohort_user = CohortUser.objects.filter(role='STUDENT',
-                                                    user__id=student_id,
-                                                    cohort__slug=activity['cohort']).first()
-            if cohort_user is None:
+        student_ids = get_student_ids(data)
+        cohort_users = CohortUser.objects.filter(role='STUDENT',
+                                                 user__id__in=[x for x in student_ids if x is not None],
+                                                 cohort__slug__in=[x['cohort'] for x in data
+                                                                   ]).select_related('user', 'cohort')
+        students = {(x.user.id, x.cohort.slug): x.user for x in cohort_users}
+        cohorts = get_cohort_keys(academy_id, data)
+
+        new_activities = []
+        for student_id, activity in zip(student_ids, data):
+            key = (student_id, activity['cohort'])
+            if key not in students:
                 raise ValidationException('Student not found in this cohort', slug='not-found-in-cohort')
 
-            new_activities.append(add_student_activity(cohort_user.user, activity, academy_id))
+            new_activities.append(get_student_activity(students[key], activity, academy_id, cohorts))
 
-        return Response(new_activities, status=status.HTTP_201_CREATED)
+        return enqueue_student_activities(new_activities)
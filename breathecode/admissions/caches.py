@@ -12,6 +12,8 @@ class CohortCache(Cache):
         'CohortUser', 'Task', 'UserInvite', 'UserSpecialty', 'Survey', 'SlackChannel', 'CohortTimeSlot',
         'FinalProject', 'GitpodUser', 'Answer', 'Review'
     ]
+    max_age = 60 * 60
+    soft_max_age = 60 * 5
 
 
 class TeacherCache(Cache):
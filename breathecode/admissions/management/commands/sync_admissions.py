@@ -4,6 +4,7 @@ from datetime import datetime
 from django.core.management.base import BaseCommand, CommandError
 from ...models import Academy, SyllabusSchedule, Cohort, User, CohortUser, Syllabus
 from breathecode.authenticate.models import Profile
+from breathecode.commons.actions import defer_cache_invalidation
 
 HOST_ASSETS = 'https://assets.breatheco.de/apis'
 API_URL = os.getenv('API_URL', '')
@@ -29,6 +30,7 @@ class Command(BaseCommand):
                             default=0,
                             help='How many to import')
 
+    @defer_cache_invalidation()
     def handle(self, *args, **options):
         try:
             func = getattr(self, options['entity'], 'entity_not_found')
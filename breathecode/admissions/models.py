@@ -389,6 +389,10 @@ class CohortUser(models.Model):
         super(CohortUser, self).__init__(*args, **kwargs)
         self.__old_edu_status = self.educational_status
 
+        # the receivers of the calendars compare them without reading the row again
+        self._old_cohort_id = self.cohort_id
+        self._old_role = self.role
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     cohort = models.ForeignKey(Cohort, on_delete=models.CASCADE)
     role = models.CharField(max_length=9, choices=COHORT_ROLE, default=STUDENT)
@@ -432,6 +436,9 @@ class CohortUser(models.Model):
 
         super().save(*args, **kwargs)  # Call the "real" save() method.
 
+        self._old_cohort_id = self.cohort_id
+        self._old_role = self.role
+
 
 DAILY = 'DAILY'
 WEEKLY = 'WEEKLY'
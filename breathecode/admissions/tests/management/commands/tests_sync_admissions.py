@@ -88,6 +88,8 @@ class AcademyCohortTestSuite(AdmissionsTestCase):
                 model = CohortUser.objects.filter(**filter).first().__dict__
                 del model['_state']
                 del model['_CohortUser__old_edu_status']
+                del model['_old_cohort_id']
+                del model['_old_role']
 
                 self.assertEqual(isinstance(model['created_at'], datetime.datetime), True)
                 del model['created_at']
@@ -152,6 +154,8 @@ class AcademyCohortTestSuite(AdmissionsTestCase):
                 model = CohortUser.objects.filter(**filter).first().__dict__
                 del model['_state']
                 del model['_CohortUser__old_edu_status']
+                del model['_old_cohort_id']
+                del model['_old_role']
 
                 self.assertEqual(isinstance(model['created_at'], datetime.datetime), True)
                 del model['created_at']
@@ -215,6 +219,8 @@ class AcademyCohortTestSuite(AdmissionsTestCase):
                 model = CohortUser.objects.filter(**filter).first().__dict__
                 del model['_state']
                 del model['_CohortUser__old_edu_status']
+                del model['_old_cohort_id']
+                del model['_old_role']
 
                 self.assertEqual(isinstance(model['created_at'], datetime.datetime), True)
                 del model['created_at']
@@ -279,6 +285,8 @@ class AcademyCohortTestSuite(AdmissionsTestCase):
                 model = CohortUser.objects.filter(**filter).first().__dict__
                 del model['_state']
                 del model['_CohortUser__old_edu_status']
+                del model['_old_cohort_id']
+                del model['_old_role']
 
                 self.assertEqual(isinstance(model['created_at'], datetime.datetime), True)
                 del model['created_at']
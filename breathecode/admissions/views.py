@@ -70,7 +70,7 @@ class AcademyTeacherView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = ProfileAcademy.objects.filter(academy__id=academy_id,
                                               role__slug__in=['teacher', 'assistant'
@@ -332,7 +332,7 @@ class CohortUserView(APIView, GenerateLookupsMixin):
 
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = CohortUser.objects.all()
 
@@ -1049,7 +1049,7 @@ class CohortMeView(APIView, GenerateLookupsMixin):
 
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         if cohort_id is not None:
             if cohort_id.isnumeric():
@@ -1104,7 +1104,7 @@ class AcademyCohortView(APIView, GenerateLookupsMixin):
 
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         if cohort_id is not None:
             item = None
@@ -1667,7 +1667,7 @@ class PublicCohortUserView(APIView, GenerateLookupsMixin):
 
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = CohortUser.objects.all()
 
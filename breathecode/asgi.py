@@ -19,13 +19,22 @@ app = get_asgi_application()
 from django.conf import settings
 import breathecode.settings as app_settings
 
+from django.urls import path, re_path
 from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
+from breathecode.media.consumers import masked_url_router
 from breathecode.websocket.urls import websocket_urlpatterns
 
 # settings.configure(INSTALLED_APPS=app_settings.INSTALLED_APPS, DATABASES=app_settings.DATABASES)
 
 application = ProtocolTypeRouter({
-    'http': app,
-    'websocket': AuthMiddlewareStack(URLRouter(websocket_urlpatterns)),
+    'http':
+    URLRouter([
+        # the masked files are relayed by an async consumer
+        path('v1/media/file/<int:media_id>', masked_url_router(app)),
+        path('v1/media/file/<str:media_slug>', masked_url_router(app)),
+        re_path(r'', app),
+    ]),
+    'websocket':
+    AuthMiddlewareStack(URLRouter(websocket_urlpatterns)),
 })
@@ -256,7 +256,7 @@ class CohortTaskView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = Task.objects.all()
         lookup = {}
@@ -5,20 +5,28 @@ import random
 import re
 import string
 import urllib.parse
+from typing import Optional
 from random import randint
 from django.core.handlers.wsgi import WSGIRequest
 
-from django.contrib.auth.models import User
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import CharField, Value
 from django.utils import timezone
 
 from breathecode.admissions.models import Academy
 from breathecode.notify.actions import send_email_message
 from breathecode.utils import ValidationException
+from breathecode.utils.cache import get_initial_version
 
 from .models import CredentialsGithub, DeviceId, GitpodUser, ProfileAcademy, Role, Token, UserSetting
 
 logger = logging.getLogger(__name__)
 
+# seconds, the snapshots are invalidated by the receivers, it just limits the memory
+SNAPSHOT_MAX_AGE = 60 * 60 * 24
+
 
 def get_user(github_id=None, email=None):
     user = None
@@ -319,3 +327,100 @@ def get_user_language(request: WSGIRequest):
         lang = 'en'
 
     return lang
+
+
+def get_snapshot_version(name: str, user_id: int) -> str:
+    keys = [f'{name}__version', f'{name}__user={user_id}__version']
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # add is atomic, if other worker set it first we keep its value
+            cache.add(key, get_initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return '.'.join([str(versions[x]) for x in keys])
+
+
+def bump_snapshot_version(name: str, user_id: Optional[int] = None) -> None:
+    key = f'{name}__user={user_id}__version' if user_id else f'{name}__version'
+
+    try:
+        cache.incr(key)
+
+    except ValueError:
+        cache.add(key, get_initial_version(), timeout=None)
+
+
+def clear_snapshot(name: str, user_id: Optional[int] = None) -> None:
+    bump_snapshot_version(name, user_id)
+
+    # the snapshots taken before the commit could include the previous rows
+    transaction.on_commit(lambda: bump_snapshot_version(name, user_id))
+
+
+def get_user_capabilities(user_id: int) -> dict[int, dict]:
+    """
+    Get the status and the capabilities of every academy of the user, like
+    `{academy_id: {'status': 'ACTIVE', 'capabilities': {'read_student', ...}}}`.
+    """
+
+    key = f'capabilities__user={user_id}__v{get_snapshot_version("capabilities", user_id)}'
+    if (capabilities := cache.get(key)) is not None:
+        return capabilities
+
+    capabilities = {}
+    rows = ProfileAcademy.objects.filter(user__id=user_id).values_list('academy__id', 'academy__status',
+                                                                       'role__capabilities__slug')
+
+    for academy_id, status, capability in rows:
+        academy = capabilities.setdefault(academy_id, {'status': status, 'capabilities': set()})
+        if capability:
+            academy['capabilities'].add(capability)
+
+    cache.set(key, capabilities, timeout=SNAPSHOT_MAX_AGE)
+    return capabilities
+
+
+def clear_user_capabilities(user_id: Optional[int] = None) -> None:
+    """
+    Invalidate the capabilities of the user, or the capabilities of everyone if it is not provided.
+    """
+
+    clear_snapshot('capabilities', user_id)
+
+
+def get_user_permissions(user_id: int) -> dict[str, set[str]]:
+    """
+    Get the codenames granted to the user, like `{'user': {...}, 'group': {...}}`, the group ones are
+    granted through its groups.
+    """
+
+    permissions = {'user': set(), 'group': set()}
+    if not user_id:
+        return permissions
+
+    key = f'permissions__user={user_id}__v{get_snapshot_version("permissions", user_id)}'
+    if (cached := cache.get(key)) is not None:
+        return cached
+
+    # the default ordering of the permissions is not allowed in a union
+    granted_to_user = Permission.objects.filter(user__id=user_id).annotate(
+        source=Value('user', output_field=CharField())).values_list('codename', 'source').order_by()
+
+    granted_to_groups = Permission.objects.filter(group__user__id=user_id).annotate(
+        source=Value('group', output_field=CharField())).values_list('codename', 'source').order_by()
+
+    for codename, source in granted_to_user.union(granted_to_groups):
+        permissions[source].add(codename)
+
+    cache.set(key, permissions, timeout=SNAPSHOT_MAX_AGE)
+    return permissions
+
+
+def clear_user_permissions(user_id: Optional[int] = None) -> None:
+    """
+    Invalidate the permissions of the user, or the permissions of everyone if it is not provided.
+    """
+
+    clear_snapshot('permissions', user_id)
@@ -1,9 +1,100 @@
 # authentication.py
 
+import hashlib
+from typing import Optional
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
 from django.utils import timezone
 
+# seconds, the entries are invalidated by the receivers, it just limits how long a change made without
+# signals, like a queryset update, could take to be seen
+TOKEN_CACHE_MAX_AGE = 60 * 5
+
+# the instances are rebuilt from these fields, the rest are deferred, so they are read from the database
+# if they are used, and the password hash is never cached
+TOKEN_CACHE_FIELDS = ['id', 'user_id', 'token_type', 'expires_at']
+USER_CACHE_FIELDS = [
+    'id', 'username', 'email', 'first_name', 'last_name', 'is_active', 'is_staff', 'is_superuser',
+    'last_login', 'date_joined'
+]
+
+
+def get_token_cache_key(key: str) -> str:
+    # the key is a credential, it should not be readable from the cache
+    return 'token__' + hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def get_user_cache_key(user_id: int) -> str:
+    return f'token__user__{user_id}'
+
+
+def clear_token_cache(*keys: str) -> None:
+    cache.delete_many([get_token_cache_key(x) for x in keys])
+
+
+def clear_user_cache(user_id: int) -> None:
+    cache.delete(get_user_cache_key(user_id))
+
+
+def from_cache(Model, data: dict):
+    # the values of from_db follow the order of the fields of the model
+    fields = [x.attname for x in Model._meta.concrete_fields if x.attname in data]
+    return Model.from_db(DEFAULT_DB_ALIAS, fields, [data[x] for x in fields])
+
+
+def get_token(key: str):
+    """
+    Get the token and its user, they are cached apart, so a change of the user does not need to clear the
+    entries of its tokens.
+    """
+
+    from django.contrib.auth.models import User
+    from .models import Token
+
+    if (data := cache.get(get_token_cache_key(key))) is None:
+        token = Token.objects.select_related('user').filter(key=key).first()
+        if token is None:
+            return None
+
+        timeout = get_token_cache_timeout(token)
+        if timeout:
+            cache.set_many(
+                {
+                    get_token_cache_key(key): {x: getattr(token, x)
+                                               for x in TOKEN_CACHE_FIELDS},
+                    get_user_cache_key(token.user.id): {x: getattr(token.user, x)
+                                                        for x in USER_CACHE_FIELDS},
+                },
+                timeout=timeout)
+
+        return token
+
+    token = from_cache(Token, {**data, 'key': key})
+
+    if (user := cache.get(get_user_cache_key(token.user_id))) is None:
+        token.user = User.objects.filter(id=token.user_id).only(*USER_CACHE_FIELDS).first()
+        if token.user is None:
+            return None
+
+        cache.set(get_user_cache_key(token.user_id), {x: getattr(token.user, x)
+                                                      for x in USER_CACHE_FIELDS},
+                  timeout=TOKEN_CACHE_MAX_AGE)
+        return token
+
+    token.user = from_cache(User, user)
+    return token
+
+
+def get_token_cache_timeout(token) -> Optional[int]:
+    if token.expires_at is None:
+        return TOKEN_CACHE_MAX_AGE
+
+    # the entry cannot outlive the token
+    seconds = int((token.expires_at - timezone.now()).total_seconds())
+    return min(seconds, TOKEN_CACHE_MAX_AGE) if seconds > 0 else None
+
 
 class ExpiringTokenAuthentication(TokenAuthentication):
     '''
@@ -13,9 +104,7 @@ class ExpiringTokenAuthentication(TokenAuthentication):
     '''
 
     def authenticate_credentials(self, key, request=None):
-        from .models import Token
-
-        token = Token.objects.select_related('user').filter(key=key).first()
+        token = get_token(key)
         if token is None:
             raise AuthenticationFailed({'error': 'Invalid or Inactive Token', 'is_authenticated': False})
 
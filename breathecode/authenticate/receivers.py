@@ -1,13 +1,18 @@
 import logging
+from typing import Optional
 
-from django.contrib.auth.models import Group, User
+from django.contrib.auth.models import Group, Permission, User
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from breathecode.authenticate.models import ProfileAcademy
+from breathecode.admissions.models import Academy
+from breathecode.authenticate.models import ProfileAcademy, Role, Token
 from breathecode.mentorship.models import MentorProfile
 
+from . import actions
+from .authentication import clear_token_cache, clear_user_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,3 +79,76 @@ def unset_user_group(sender, instance, **kwargs):
 
     if should_be_deleted and groups and group:
         groups.remove(group)
+
+
+@receiver(post_save, sender=ProfileAcademy)
+@receiver(post_delete, sender=ProfileAcademy)
+def clear_profile_academy_capabilities(sender, instance: ProfileAcademy, **kwargs):
+    if instance.user_id:
+        actions.clear_user_capabilities(instance.user_id)
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Academy)
+@receiver(post_delete, sender=Academy)
+def clear_capabilities(sender, **kwargs):
+    actions.clear_user_capabilities()
+
+
+@receiver(m2m_changed, sender=Role.capabilities.through)
+def clear_role_capabilities(sender, action: str, **kwargs):
+    if action in ['post_add', 'post_remove', 'post_clear']:
+        actions.clear_user_capabilities()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def clear_user_permissions(sender, instance, action: str, reverse: bool, pk_set: Optional[set[int]],
+                           **kwargs):
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+
+    if not reverse:
+        actions.clear_user_permissions(instance.id)
+
+    # a clear from the group or the permission side does not provide the users
+    elif pk_set is None:
+        actions.clear_user_permissions()
+
+    else:
+        for user_id in pk_set:
+            actions.clear_user_permissions(user_id)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def clear_permissions(sender, **kwargs):
+    actions.clear_user_permissions()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def clear_group_permissions(sender, action: str, **kwargs):
+    if action in ['post_add', 'post_remove', 'post_clear']:
+        actions.clear_user_permissions()
+
+
+@receiver(pre_save, sender=Token)
+def clear_previous_token(sender, instance: Token, **kwargs):
+    if instance.pk and (key := Token.objects.filter(pk=instance.pk).values_list('key', flat=True).first()):
+        clear_token_cache(key)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def clear_token(sender, instance: Token, **kwargs):
+    clear_token_cache(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def clear_user(sender, instance: User, **kwargs):
+    # the user is cached apart from its tokens, the deactivation must be seen right away
+    clear_user_cache(instance.id)
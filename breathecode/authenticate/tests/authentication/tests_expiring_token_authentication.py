@@ -0,0 +1,151 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from ..mixins.new_auth_test_case import AuthTestCase
+from ...authentication import (ExpiringTokenAuthentication, TOKEN_CACHE_MAX_AGE, get_token_cache_key,
+                               get_user_cache_key)
+
+UTC_NOW = timezone.now()
+
+
+class ExpiringTokenAuthenticationTestSuite(AuthTestCase):
+    """
+    🔽🔽🔽 Cached token
+    """
+
+    def test_authenticate_credentials__cached(self):
+        model = self.bc.database.create(user=1, token={'token_type': 'permanent'})
+        authentication = ExpiringTokenAuthentication()
+
+        with self.assertNumQueries(1):
+            user, token = authentication.authenticate_credentials(model.token.key)
+
+        self.assertEqual(user, model.user)
+        self.assertEqual(token, model.token)
+
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate_credentials(model.token.key)
+
+        self.assertEqual(user, model.user)
+        self.assertEqual(token, model.token)
+
+    def test_authenticate_credentials__key_is_not_stored_in_plain_text(self):
+        model = self.bc.database.create(user=1, token={'token_type': 'permanent'})
+        ExpiringTokenAuthentication().authenticate_credentials(model.token.key)
+
+        self.assertEqual(cache.get(get_token_cache_key(model.token.key)), {
+            'id': model.token.id,
+            'user_id': model.user.id,
+            'token_type': 'permanent',
+            'expires_at': None,
+        })
+        self.assertNotIn(model.token.key, get_token_cache_key(model.token.key))
+
+    def test_authenticate_credentials__password_is_not_cached(self):
+        model = self.bc.database.create(user=1, token={'token_type': 'permanent'})
+        authentication = ExpiringTokenAuthentication()
+        authentication.authenticate_credentials(model.token.key)
+
+        self.assertNotIn('password', cache.get(get_user_cache_key(model.user.id)))
+
+        user, _ = authentication.authenticate_credentials(model.token.key)
+
+        # the fields that are not cached are deferred, they are not overwritten
+        with self.assertNumQueries(1):
+            user.first_name = 'Konan'
+            user.save()
+
+        self.assertEqual(self.bc.database.list_of('auth.User'),
+                         [{
+                             **self.bc.format.to_dict(model.user),
+                             'first_name': 'Konan',
+                         }])
+
+    """
+    🔽🔽🔽 Timeout
+    """
+
+    @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
+    def test_authenticate_credentials__timeout_limited_by_expires_at(self):
+        token = {'token_type': 'temporal', 'expires_at': UTC_NOW + timedelta(seconds=30)}
+        model = self.bc.database.create(user=1, token=token)
+
+        with patch.object(cache, 'set_many', MagicMock(wraps=cache.set_many)):
+            ExpiringTokenAuthentication().authenticate_credentials(model.token.key)
+            self.assertEqual(cache.set_many.call_args.kwargs, {'timeout': 30})
+
+    @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
+    def test_authenticate_credentials__timeout_without_expires_at(self):
+        model = self.bc.database.create(user=1, token={'token_type': 'permanent'})
+
+        with patch.object(cache, 'set_many', MagicMock(wraps=cache.set_many)):
+            ExpiringTokenAuthentication().authenticate_credentials(model.token.key)
+            self.assertEqual(cache.set_many.call_args.kwargs, {'timeout': TOKEN_CACHE_MAX_AGE})
+
+    def test_authenticate_credentials__expired_while_it_is_cached(self):
+        token = {'token_type': 'temporal', 'expires_at': UTC_NOW + timedelta(seconds=30)}
+        model = self.bc.database.create(user=1, token=token)
+        authentication = ExpiringTokenAuthentication()
+
+        with patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW)):
+            authentication.authenticate_credentials(model.token.key)
+
+        with patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW + timedelta(seconds=31))):
+            with self.assertRaisesMessage(AuthenticationFailed, 'Token expired at'):
+                authentication.authenticate_credentials(model.token.key)
+
+    """
+    🔽🔽🔽 Invalidation
+    """
+
+    def test_authenticate_credentials__token_deleted(self):
+        model = self.bc.database.create(user=1, token={'token_type': 'permanent'})
+        authentication = ExpiringTokenAuthentication()
+        authentication.authenticate_credentials(model.token.key)
+
+        model.token.delete()
+
+        with self.assertRaisesMessage(AuthenticationFailed, 'Invalid or Inactive Token'):
+            authentication.authenticate_credentials(model.token.key)
+
+    def test_authenticate_credentials__token_key_changed(self):
+        model = self.bc.database.create(user=1, token={'token_type': 'permanent'})
+        authentication = ExpiringTokenAuthentication()
+        key = model.token.key
+        authentication.authenticate_credentials(key)
+
+        model.token.key = self.bc.fake.slug()[:40]
+        model.token.save()
+
+        with self.assertRaisesMessage(AuthenticationFailed, 'Invalid or Inactive Token'):
+            authentication.authenticate_credentials(key)
+
+    def test_authenticate_credentials__user_cleared(self):
+        model = self.bc.database.create(user=1, token={'token_type': 'permanent'})
+        authentication = ExpiringTokenAuthentication()
+        authentication.authenticate_credentials(model.token.key)
+
+        # the tokens of the user are not read
+        with self.assertNumQueries(1):
+            model.user.save()
+
+        self.assertEqual(cache.get(get_user_cache_key(model.user.id)), None)
+
+        with self.assertNumQueries(1):
+            user, token = authentication.authenticate_credentials(model.token.key)
+
+        self.assertEqual(user, model.user)
+        self.assertEqual(token, model.token)
+
+    def test_authenticate_credentials__user_deactivated(self):
+        model = self.bc.database.create(user=1, token={'token_type': 'permanent'})
+        authentication = ExpiringTokenAuthentication()
+        authentication.authenticate_credentials(model.token.key)
+
+        model.user.is_active = False
+        model.user.save()
+
+        with self.assertRaisesMessage(AuthenticationFailed, 'Invalid or inactive user'):
+            authentication.authenticate_credentials(model.token.key)
@@ -6,7 +6,8 @@ from breathecode.admissions.admin import CohortAdmin
 from .models import Badge, Specialty, UserSpecialty, UserProxy, LayoutDesign, CohortProxy
 from .tasks import remove_screenshot, reset_screenshot, generate_cohort_certificates
 from .actions import generate_certificate
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from breathecode.utils import iter_csv
 
 logger = logging.getLogger(__name__)
 
@@ -62,17 +63,18 @@ delete_screenshot.short_description = '⛔️ DELETE Screenshot'
 
 
 def export_user_specialty_csv(self, request, queryset):
-    response = HttpResponse(content_type='text/csv')
+    columns = [
+        ('First Name', 'user__first_name'),
+        ('Last Name', 'user__last_name'),
+        ('Specialty', 'specialty__name'),
+        ('Academy', 'academy__name'),
+        ('Cohort', 'cohort__name'),
+        ('Certificate', lambda x: f'https://certificate.breatheco.de/{x.token}'),
+        ('PDF', lambda x: f'https://certificate.breatheco.de/pdf/{x.token}'),
+    ]
+
+    response = StreamingHttpResponse(iter_csv(queryset, columns), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename=certificates.csv'
-    writer = csv.writer(response)
-    writer.writerow(['First Name', 'Last Name', 'Specialty', 'Academy', 'Cohort', 'Certificate', 'PDF'])
-    for obj in queryset:
-        row = writer.writerow([
-            obj.user.first_name, obj.user.last_name, obj.specialty.name, obj.academy.name, obj.cohort.name,
-            f'https://certificate.breatheco.de/{obj.token}',
-            f'https://certificate.breatheco.de/pdf/{obj.token}'
-        ])
-
     return response
 
 
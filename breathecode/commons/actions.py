@@ -1,9 +1,158 @@
+import threading
+from typing import Optional
+from functools import partial
+from contextlib import ContextDecorator
+from django.db import transaction
 from breathecode.utils import CACHE_DESCRIPTORS
 
-__all__ = ['clean_cache']
+__all__ = ['clean_cache', 'defer_cache_invalidation', 'flush_cache_invalidation']
 
+local = threading.local()
 
-def clean_cache(key):
-    if key in CACHE_DESCRIPTORS:
-        cache = CACHE_DESCRIPTORS[key]
-        cache.clear()
+# over this number of tags it is cheaper start a new generation of the descriptor
+MAX_TAGS = 100
+
+
+def get_pending() -> dict[int, set[Optional[str]]]:
+    if not hasattr(local, 'pending'):
+        local.pending = {}
+
+    return local.pending
+
+
+def get_deferred_depth() -> int:
+    return getattr(local, 'deferred_depth', 0)
+
+
+def get_invalidations(sender, instance) -> dict[int, set[Optional[str]]]:
+    """
+    Get the tags of each cache descriptor that must be invalidated after a row was saved or deleted, None
+    means that the whole descriptor must be cleared.
+    """
+
+    invalidations = {}
+    name = sender.__name__
+    own = CACHE_DESCRIPTORS.get(hash(sender))
+
+    for key, descriptor in CACHE_DESCRIPTORS.items():
+        if descriptor is own:
+            tags = descriptor.get_tags(instance)
+
+        elif name in descriptor.depends:
+            tags = descriptor.get_dependency_tags(instance)
+
+        # the parents that do not depend on the model cannot know which entries include it
+        elif own and descriptor.model.__name__ in own.parents:
+            tags = {None}
+
+        else:
+            continue
+
+        invalidations[key] = tags
+
+    return invalidations
+
+
+def add_pending(invalidations: dict[int, set[Optional[str]]]) -> None:
+    pending = get_pending()
+
+    for key, tags in invalidations.items():
+        pending.setdefault(key, set()).update(tags)
+
+
+def flush_cache_invalidation():
+    """
+    Invalidate once every tag collected in the current unit of work.
+    """
+
+    local.scheduled = None
+    pending = get_pending()
+
+    while pending:
+        key, tags = pending.popitem()
+        if key not in CACHE_DESCRIPTORS:
+            continue
+
+        descriptor = CACHE_DESCRIPTORS[key]
+        if None in tags or len(tags) > MAX_TAGS:
+            descriptor.clear()
+
+        else:
+            descriptor.invalidate(*tags)
+
+
+def schedule_flush() -> None:
+    # a new callable per transaction, to recognize it between the callbacks of the connection
+    local.scheduled = partial(flush_cache_invalidation)
+    transaction.on_commit(local.scheduled)
+
+
+def is_flush_scheduled() -> bool:
+    scheduled = getattr(local, 'scheduled', None)
+    if scheduled is None:
+        return False
+
+    # the callbacks are discarded after a rollback, so the next transaction schedule its own flush
+    connection = transaction.get_connection()
+    return any(x[1] is scheduled for x in connection.run_on_commit)
+
+
+def clean_cache(sender, instance):
+    invalidations = get_invalidations(sender, instance)
+    if not invalidations:
+        return
+
+    if get_deferred_depth():
+        add_pending(invalidations)
+        return
+
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        add_pending(invalidations)
+        flush_cache_invalidation()
+        return
+
+    if not is_flush_scheduled():
+        # the tags collected for a transaction that was rolled back must not be invalidated
+        get_pending().clear()
+        schedule_flush()
+
+    add_pending(invalidations)
+
+
+class defer_cache_invalidation(ContextDecorator):
+    """
+    Collect the cache invalidations of a batch job and invalidate every tag just once at the end.
+
+    Usage:
+
+    ```py
+    with defer_cache_invalidation():
+        for consumable in consumables:
+            consumable.save()
+
+    @defer_cache_invalidation()
+    def handle(self, *args, **options):
+        ...
+    ```
+    """
+
+    def __enter__(self):
+        local.deferred_depth = get_deferred_depth() + 1
+        return self
+
+    def __exit__(self, *exc):
+        local.deferred_depth = get_deferred_depth() - 1
+
+        if get_deferred_depth() or not get_pending():
+            return False
+
+        connection = transaction.get_connection()
+        if connection.in_atomic_block:
+            if not is_flush_scheduled():
+                schedule_flush()
+
+        else:
+            flush_cache_invalidation()
+
+        return False
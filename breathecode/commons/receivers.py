@@ -9,12 +9,10 @@ logger = logging.getLogger(__name__)
 
 
 @receiver(post_save)
-def clean_cache_after_save(sender, **kwargs):
-    key = hash(sender)
-    actions.clean_cache(key)
+def clean_cache_after_save(sender, instance, **kwargs):
+    actions.clean_cache(sender, instance)
 
 
 @receiver(post_delete)
-def clean_cache_after_delete(sender, **kwargs):
-    key = hash(sender)
-    actions.clean_cache(key)
+def clean_cache_after_delete(sender, instance, **kwargs):
+    actions.clean_cache(sender, instance)
@@ -0,0 +1,99 @@
+from functools import partial
+from unittest.mock import MagicMock, call, patch
+from django.core.cache import cache
+from breathecode.admissions.caches import CohortCache
+from breathecode.commons.actions import defer_cache_invalidation, flush_cache_invalidation
+from ..mixins import CommonsTestCase
+
+cohort_cache = CohortCache()
+
+
+def get_tags(n):
+    return {'*', 'academy=1', 'Academy=1', 'Academy=*', *[f'id={x + 1}' for x in range(n)]}
+
+
+def get_flushes(callbacks):
+    # the rest of receivers could schedule their own callbacks
+    return [x for x in callbacks if isinstance(x, partial) and x.func is flush_cache_invalidation]
+
+
+def get_invalidated_tags():
+    return [set(x.args) for x in CohortCache.invalidate.call_args_list]
+
+
+class DeferCacheInvalidationTestSuite(CommonsTestCase):
+    """
+    🔽🔽🔽 Transaction
+    """
+
+    @patch.object(CohortCache, 'invalidate', MagicMock())
+    def test_many_saves__in_one_transaction(self):
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.bc.database.create(cohort=3)
+            self.assertEqual(CohortCache.invalidate.call_args_list, [])
+
+        self.assertEqual(len(get_flushes(callbacks)), 1)
+        self.assertEqual(get_invalidated_tags(), [get_tags(3)])
+
+    @patch.object(CohortCache, 'invalidate', MagicMock())
+    def test_many_saves__transaction_without_commit(self):
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.bc.database.create(cohort=3)
+
+        self.assertEqual(len(get_flushes(callbacks)), 1)
+        self.assertEqual(CohortCache.invalidate.call_args_list, [])
+
+    """
+    🔽🔽🔽 defer_cache_invalidation
+    """
+
+    @patch.object(CohortCache, 'invalidate', MagicMock())
+    def test_many_saves__deferred(self):
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with defer_cache_invalidation():
+                model = self.bc.database.create(cohort=2)
+                model.cohort[0].save()
+
+                with defer_cache_invalidation():
+                    model.cohort[1].save()
+
+                self.assertEqual(len(get_flushes(callbacks)), 0)
+
+            self.assertEqual(CohortCache.invalidate.call_args_list, [])
+
+        self.assertEqual(len(get_flushes(callbacks)), 1)
+        self.assertEqual(get_invalidated_tags(), [get_tags(2)])
+
+    @patch.object(CohortCache, 'invalidate', MagicMock())
+    def test_many_saves__deferred__as_decorator(self):
+        cache.clear()
+
+        @defer_cache_invalidation()
+        def batch_job():
+            model = self.bc.database.create(cohort=2)
+            model.cohort[0].save()
+            model.cohort[1].save()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            batch_job()
+
+        self.assertEqual(len(get_flushes(callbacks)), 1)
+        self.assertEqual(get_invalidated_tags(), [get_tags(2)])
+
+    @patch('breathecode.commons.actions.MAX_TAGS', 2)
+    @patch.object(CohortCache, 'clear', MagicMock())
+    @patch.object(CohortCache, 'invalidate', MagicMock())
+    def test_many_saves__too_many_tags(self):
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bc.database.create(cohort=3)
+
+        self.assertEqual(CohortCache.invalidate.call_args_list, [])
+        self.assertEqual(CohortCache.clear.call_args_list, [call()])
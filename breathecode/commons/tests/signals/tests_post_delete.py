@@ -1,5 +1,4 @@
 import re
-import json
 from django.core.cache import cache
 from breathecode.admissions.caches import CohortCache
 from breathecode.events.caches import EventCache
@@ -28,25 +27,23 @@ class LeadTestSuite(CommonsTestCase):
             lookups = {attr: 1}
 
             for expected in cases:
+                with self.captureOnCommitCallbacks(execute=True):
+                    x = self.bc.database.create(**lookups)
 
-                json_data = json.dumps(expected)
+                CACHE[model].set(expected)
+                CACHE[model].set(expected, sort='slug', slug='100,101,110,111')
+                CACHE[model].set(expected, id=1)
+                CACHE[model].set(expected, id=2)
 
-                x = self.bc.database.create(**lookups)
+                version = CACHE[model].version()
 
-                cache.set(
-                    f'{model}__keys', f'["{model}__", "{model}__sort=slug&slug=100%2C101%2C110%2C111", '
-                    f'"{model}__id=1", "{model}__id=2"]')
+                with self.captureOnCommitCallbacks(execute=True):
+                    getattr(x, attr).delete()
 
-                cache.set(f'{model}__', json_data)
-                cache.set(f'{model}__sort=slug&slug=100%2C101%2C110%2C111', json_data)
-                cache.set(f'{model}__id=1', json_data)
-                cache.set(f'{model}__id=2', json_data)
+                # the rows are invalidated, the generation is kept
+                self.assertEqual(CACHE[model].version(), version)
 
-                getattr(x, attr).delete()
-
-                self.assertEqual(CACHE[model].keys(), [])
-
-                self.assertEqual(cache.get(f'{model}__'), None)
-                self.assertEqual(cache.get(f'{model}__sort=slug&slug=100%2C101%2C110%2C111'), None)
-                self.assertEqual(cache.get(f'{model}__id=1'), None)
-                self.assertEqual(cache.get(f'{model}__id=2'), None)
+                self.assertEqual(CACHE[model].get(), None)
+                self.assertEqual(CACHE[model].get(sort='slug', slug='100,101,110,111'), None)
+                self.assertEqual(CACHE[model].get(id=1), None)
+                self.assertEqual(CACHE[model].get(id=2), None)
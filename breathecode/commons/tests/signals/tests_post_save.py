@@ -1,5 +1,4 @@
 import re
-import json
 from django.core.cache import cache
 from breathecode.admissions.caches import CohortCache
 from breathecode.events.caches import EventCache
@@ -28,22 +27,59 @@ class LeadTestSuite(CommonsTestCase):
             lookups = {attr: 1}
 
             for expected in cases:
+                CACHE[model].set(expected)
+                CACHE[model].set(expected, sort='slug', slug='100,101,110,111')
+                CACHE[model].set(expected, id=1)
+                CACHE[model].set(expected, id=2)
 
-                json_data = json.dumps(expected)
-                cache.set(
-                    f'{model}__keys', f'["{model}__", "{model}__sort=slug&slug=100%2C101%2C110%2C111", '
-                    f'"{model}__id=1", "{model}__id=2"]')
+                version = CACHE[model].version()
 
-                cache.set(f'{model}__', json_data)
-                cache.set(f'{model}__sort=slug&slug=100%2C101%2C110%2C111', json_data)
-                cache.set(f'{model}__id=1', json_data)
-                cache.set(f'{model}__id=2', json_data)
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.bc.database.create(**lookups)
 
-                self.bc.database.create(**lookups)
+                # the rows are invalidated, the generation is kept
+                self.assertEqual(CACHE[model].version(), version)
 
-                self.assertEqual(CACHE[model].keys(), [])
+                self.assertEqual(CACHE[model].get(), None)
+                self.assertEqual(CACHE[model].get(sort='slug', slug='100,101,110,111'), None)
+                self.assertEqual(CACHE[model].get(id=1), None)
+                self.assertEqual(CACHE[model].get(id=2), None)
 
-                self.assertEqual(cache.get(f'{model}__'), None)
-                self.assertEqual(cache.get(f'{model}__sort=slug&slug=100%2C101%2C110%2C111'), None)
-                self.assertEqual(cache.get(f'{model}__id=1'), None)
-                self.assertEqual(cache.get(f'{model}__id=2'), None)
+    def test_post_save__cohort__just_the_rows_of_its_academy(self):
+        cache.clear()
+
+        cohort = {'id': 1, 'name': 'x', 'academy': {'id': 1}}
+        other = {'id': 5, 'name': 'y', 'academy': {'id': 2}}
+
+        cohort_cache.set([cohort, other])
+        cohort_cache.set([cohort], academy_id=1)
+        cohort_cache.set(cohort, id=1)
+        cohort_cache.set([other], academy_id=2)
+        cohort_cache.set(other, id=5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bc.database.create(cohort=1)
+
+        self.assertEqual(cohort_cache.get(), None)
+        self.assertEqual(cohort_cache.get(academy_id=1), None)
+        self.assertEqual(cohort_cache.get(id=1), None)
+        self.assertEqual(cohort_cache.get(academy_id=2), [other])
+        self.assertEqual(cohort_cache.get(id=5), other)
+
+    def test_post_save__academy__just_the_rows_that_depend_on_it(self):
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model = self.bc.database.create(cohort=1)
+
+        cohort = {'id': 1, 'name': 'x', 'academy': {'id': 1}}
+        other = {'id': 5, 'name': 'y', 'academy': 2}
+
+        cohort_cache.set(cohort, id=1)
+        cohort_cache.set(other, id=5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model.academy.save()
+
+        self.assertEqual(cohort_cache.get(id=1), None)
+        self.assertEqual(cohort_cache.get(id=5), other)
@@ -1,11 +1,16 @@
-from typing import Any
+from typing import Any, Callable, TypedDict
 import pytz
 import re
 import logging
+import time
+import hashlib
 
 from datetime import datetime, timedelta
+from django.core.cache import cache
+from django.db.models import Prefetch
 from django.utils import timezone
-from breathecode.admissions.models import Cohort, CohortTimeSlot, TimeSlot
+from icalendar import Calendar as iCalendar, Event as iEvent, vCalAddress, vText
+from breathecode.admissions.models import Cohort, CohortTimeSlot, CohortUser, TimeSlot
 from breathecode.utils.datetime_interger import DatetimeInteger
 
 from .models import Organization, Venue, Event, Organizer
@@ -14,6 +19,13 @@ from django.db.models import QuerySet
 
 logger = logging.getLogger(__name__)
 
+# seconds, the calendars are invalidated by the receivers, it just bounds how long a change of a row that the
+# receivers do not watch, like the name of a teacher or of a venue, takes to be seen
+ICAL_MAX_AGE = 60 * 60 * 24
+
+# seconds, the upcoming calendars depend on the time, it matches their REFRESH-INTERVAL
+ICAL_UPCOMING_MAX_AGE = 60 * 15
+
 status_map = {
     'draft': 'DRAFT',
     'live': 'ACTIVE',
@@ -569,3 +581,333 @@ def get_ical_cohort_description(item: Cohort):
     # TODO: add private url to meeting url
 
     return description
+
+
+class ICalFeed(TypedDict):
+    content: bytes
+    etag: str
+    last_modified: int
+    versions: dict[str, int]
+
+
+def get_ical_version_key(scope: str) -> str:
+    return f'ical__{scope}__version'
+
+
+def get_ical_versions(scopes: list[str]) -> dict[str, int]:
+    """
+    Get the version of each scope, like `academy__1` or `cohort__2`, the scopes never invalidated are 0.
+    """
+
+    versions = cache.get_many([get_ical_version_key(x) for x in scopes])
+    return {x: versions.get(get_ical_version_key(x), 0) for x in scopes}
+
+
+def invalidate_ical(*scopes: str) -> None:
+    """
+    Outdate the calendars and components built from any of the scopes.
+    """
+
+    for scope in scopes:
+        key = get_ical_version_key(scope)
+
+        try:
+            cache.incr(key)
+
+        except ValueError:
+            # the entries saw it as 0, it expires with the last entry that could see it
+            cache.add(key, int(time.time() * 1000), timeout=ICAL_MAX_AGE)
+
+
+def get_ical_feed(name: str,
+                  scopes: list[str],
+                  build: Callable[[], bytes],
+                  timeout: int = ICAL_MAX_AGE,
+                  **params) -> ICalFeed:
+    """
+    Get a calendar, it is built again just if any of its scopes was invalidated after it was cached.
+    """
+
+    key = f'ical__{name}__' + '&'.join([f'{k}={v}' for k, v in sorted(params.items())])
+
+    # they are read before the rows, a change made meanwhile outdates the new entry
+    versions = get_ical_versions(scopes)
+
+    feed = cache.get(key)
+    if feed is not None and feed['versions'] == versions:
+        return feed
+
+    content = build()
+    feed = {
+        'content': content,
+        'etag': '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"',
+        'last_modified': int(time.time()),
+        'versions': versions,
+    }
+
+    cache.set(key, feed, timeout=timeout)
+    return feed
+
+
+def get_ical_components(kind: str, scope: str, ids: list[int],
+                        build: Callable[[list[int]], dict[int, Any]]) -> dict[int, Any]:
+    """
+    Get the components of each row, they are built just for the rows that changed since they were cached,
+    `build` gets the ids of those rows.
+    """
+
+    versions = get_ical_versions([f'{scope}__{x}' for x in ids])
+    keys = {x: f'ical__{kind}__{x}__v{versions[f"{scope}__{x}"]}' for x in ids}
+
+    cached = cache.get_many(list(keys.values()))
+    components = {x: cached[keys[x]] for x in ids if keys[x] in cached}
+
+    if missing := [x for x in ids if x not in components]:
+        built = build(missing)
+        cache.set_many({keys[x]: built[x] for x in built}, timeout=ICAL_MAX_AGE)
+        components.update(built)
+
+    return components
+
+
+def render_ical(calendar: iCalendar, components: list[bytes]) -> bytes:
+    """
+    Render a calendar with components that were rendered before, it is the same than add them to it.
+    """
+
+    end = b'END:VCALENDAR\r\n'
+    content = calendar.to_ical()
+
+    return content[:-len(end)] + b''.join(components) + end
+
+
+def get_ical_organizer(user) -> vCalAddress:
+    organizer = vCalAddress(f'MAILTO:{user.email}')
+
+    if user.first_name and user.last_name:
+        organizer.params['cn'] = vText(f'{user.first_name} '
+                                       f'{user.last_name}')
+    elif user.first_name:
+        organizer.params['cn'] = vText(user.first_name)
+    elif user.last_name:
+        organizer.params['cn'] = vText(user.last_name)
+
+    organizer.params['role'] = vText('OWNER')
+    return organizer
+
+
+def get_ical_cohorts(ids: list[int]) -> list[Cohort]:
+    """
+    Get the cohorts with everything that their components need, in four queries.
+    """
+
+    return list(
+        Cohort.objects.filter(id__in=ids).select_related('academy').prefetch_related(
+            Prefetch('cohorttimeslot_set',
+                     queryset=CohortTimeSlot.objects.order_by('id'),
+                     to_attr='ical_timeslots'),
+            Prefetch('cohortuser_set',
+                     queryset=CohortUser.objects.filter(role='TEACHER').select_related('user').order_by('id'),
+                     to_attr='ical_teachers')))
+
+
+def get_ical_events(ids: list[int]) -> list[Event]:
+    return list(Event.objects.filter(id__in=ids).select_related('academy', 'venue', 'event_type', 'author'))
+
+
+def build_ical_cohort(item: Cohort, key: str) -> bytes:
+    """
+    Render the events of a cohort in the calendar of the cohorts, the first day, the cohort and the last day.
+    """
+
+    event = iEvent()
+    event_first_day = iEvent()
+    event_last_day = iEvent()
+    has_last_day = False
+
+    event.add('summary', item.name)
+    event.add('uid', f'breathecode_cohort_{item.id}_{key}')
+    event.add('dtstart', item.kickoff_date)
+
+    timeslots = update_timeslots_out_of_range(item.kickoff_date, item.ending_date, item.ical_timeslots)
+
+    first_timeslot = timeslots[0] if timeslots else None
+    if first_timeslot:
+        recurrent = first_timeslot['recurrent']
+        starting_at = first_timeslot['starting_at'] if not recurrent else fix_datetime_weekday(
+            item.kickoff_date, first_timeslot['starting_at'], next=True)
+        ending_at = first_timeslot['ending_at'] if not recurrent else fix_datetime_weekday(
+            item.kickoff_date, first_timeslot['ending_at'], next=True)
+
+        event_first_day.add('summary', f'{item.name} - First day')
+        event_first_day.add('uid', f'breathecode_cohort_{item.id}_first_{key}')
+        event_first_day.add('dtstart', starting_at)
+        event_first_day.add('dtend', ending_at)
+        event_first_day.add('dtstamp', first_timeslot['created_at'])
+
+    if item.ending_date:
+        event.add('dtend', item.ending_date)
+        timeslots_datetime = []
+
+        # fix the datetime to be use for get the last day
+        for timeslot in timeslots:
+            starting_at = timeslot['starting_at']
+            ending_at = timeslot['ending_at']
+            diff = ending_at - starting_at
+
+            if timeslot['recurrent']:
+                ending_at = fix_datetime_weekday(item.ending_date, ending_at, prev=True)
+                starting_at = ending_at - diff
+
+            timeslots_datetime.append((starting_at, ending_at))
+
+        last_timeslot = None
+
+        if timeslots_datetime:
+            timeslots_datetime.sort(key=lambda x: x[1], reverse=True)
+            last_timeslot = timeslots_datetime[0]
+            has_last_day = True
+
+            event_last_day.add('summary', f'{item.name} - Last day')
+
+            event_last_day.add('uid', f'breathecode_cohort_{item.id}_last_{key}')
+            event_last_day.add('dtstart', last_timeslot[0])
+            event_last_day.add('dtend', last_timeslot[1])
+            event_last_day.add('dtstamp', item.created_at)
+
+    event.add('dtstamp', item.created_at)
+
+    teacher = item.ical_teachers[0] if item.ical_teachers else None
+
+    if teacher:
+        organizer = get_ical_organizer(teacher.user)
+        event['organizer'] = organizer
+
+        if first_timeslot:
+            event_first_day['organizer'] = organizer
+
+        if has_last_day:
+            event_last_day['organizer'] = organizer
+
+    event['location'] = vText(item.online_meeting_url or item.academy.name)
+
+    if first_timeslot:
+        event_first_day['location'] = vText(item.online_meeting_url or item.academy.name)
+
+    if has_last_day:
+        event_last_day['location'] = vText(item.online_meeting_url or item.academy.name)
+
+    components = []
+
+    if first_timeslot:
+        components.append(event_first_day.to_ical())
+
+    components.append(event.to_ical())
+
+    if has_last_day:
+        components.append(event_last_day.to_ical())
+
+    return b''.join(components)
+
+
+def build_ical_cohort_timeslots(cohort: Cohort, key: str) -> list[tuple[int, bytes]]:
+    """
+    Render the events of the timeslots of a cohort in the calendar of a student, with the id of each
+    timeslot.
+    """
+
+    components = []
+    teacher = cohort.ical_teachers[0] if cohort.ical_teachers else None
+
+    for item in cohort.ical_timeslots:
+        event = iEvent()
+
+        event.add('summary', cohort.name)
+        event.add('uid', f'breathecode_cohort_time_slot_{item.id}_{key}')
+
+        stamp = DatetimeInteger.to_datetime(item.timezone, item.starting_at)
+        starting_at = fix_datetime_weekday(cohort.kickoff_date, stamp, next=True)
+        event.add('dtstart', starting_at)
+        event.add('dtstamp', stamp)
+
+        until_date = item.removed_at or cohort.ending_date
+
+        if not until_date:
+            until_date = timezone.make_aware(
+                datetime(year=2100, month=12, day=31, hour=12, minute=00, second=00))
+
+        ending_at = DatetimeInteger.to_datetime(item.timezone, item.ending_at)
+        ending_at = fix_datetime_weekday(cohort.kickoff_date, ending_at, next=True)
+        event.add('dtend', ending_at)
+
+        if item.recurrent:
+            utc_ending_at = ending_at.astimezone(pytz.UTC)
+
+            # is possible hour of cohort.ending_date are wrong filled, I's assumes the max diff between
+            # summer/winter timezone should have two hours
+            delta = timedelta(hours=utc_ending_at.hour - until_date.hour + 3,
+                              minutes=utc_ending_at.minute - until_date.minute,
+                              seconds=utc_ending_at.second - until_date.second)
+
+            event.add('rrule', {'freq': item.recurrency_type, 'until': until_date + delta})
+
+        if teacher:
+            event['organizer'] = get_ical_organizer(teacher.user)
+
+        event['location'] = vText(cohort.online_meeting_url or cohort.academy.name)
+
+        components.append((item.id, event.to_ical()))
+
+    return components
+
+
+def build_ical_event(item: Event, key: str) -> bytes:
+    event = iEvent()
+
+    if item.title:
+        event.add('summary', item.title)
+
+    description = ''
+    description = f'{description}Url: {item.url}\n'
+
+    if item.academy:
+        description = f'{description}Academy: {item.academy.name}\n'
+
+    if item.venue and item.venue.title:
+        description = f'{description}Venue: {item.venue.title}\n'
+
+    if item.event_type:
+        description = f'{description}Event type: {item.event_type.name}\n'
+
+    if item.online_event:
+        description = f'{description}Location: online\n'
+
+    event.add('description', description)
+    event.add('uid', f'breathecode_event_{item.id}_{key}')
+    event.add('dtstart', item.starting_at)
+    event.add('dtend', item.ending_at)
+    event.add('dtstamp', item.created_at)
+
+    if item.author and item.author.email:
+        event['organizer'] = get_ical_organizer(item.author)
+
+    if item.venue and (item.venue.country or item.venue.state or item.venue.city
+                       or item.venue.street_address):
+        value = ''
+
+        if item.venue.street_address:
+            value = f'{value}{item.venue.street_address}, '
+
+        if item.venue.city:
+            value = f'{value}{item.venue.city}, '
+
+        if item.venue.state:
+            value = f'{value}{item.venue.state}, '
+
+        if item.venue.country:
+            value = f'{value}{item.venue.country}'
+
+        value = re.sub(', $', '', value)
+        event['location'] = vText(value)
+
+    return event.to_ical()
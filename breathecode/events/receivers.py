@@ -1,12 +1,12 @@
 import logging
 from typing import Any, Type
 from django.dispatch import receiver
-from breathecode.admissions.models import CohortTimeSlot
+from breathecode.admissions.models import Cohort, CohortTimeSlot, CohortUser
 from breathecode.events.signals import event_saved
 from breathecode.events.models import Event
 from .tasks import async_export_event_to_eventbrite
-from django.db.models.signals import post_save
-from breathecode.events import tasks
+from django.db.models.signals import post_delete, post_save, pre_save
+from breathecode.events import actions, tasks
 
 logger = logging.getLogger(__name__)
 
@@ -22,3 +22,92 @@ def post_save_event(sender: Type[Event], instance: Event, **kwargs: Any):
 def post_save_cohort_time_slot(sender: Type[CohortTimeSlot], instance: CohortTimeSlot, **kwargs: Any):
     logger.info('Procesing CohortTimeSlot save')
     tasks.build_live_classes_from_timeslot.delay(instance.id)
+
+
+def get_cohort_scopes(cohort_id: int) -> list[str]:
+    academy_id = Cohort.objects.filter(id=cohort_id).values_list('academy_id', flat=True).first()
+    scopes = [f'cohort__{cohort_id}']
+
+    if academy_id:
+        scopes.append(f'academy__{academy_id}')
+
+    return scopes
+
+
+@receiver(pre_save, sender=Cohort)
+def keep_previous_cohort_academy(sender: Type[Cohort], instance: Cohort, **kwargs: Any):
+    # a cohort moved to other academy leaves the calendar of the previous one
+    instance._previous_academy_id = None
+    if instance.id:
+        instance._previous_academy_id = Cohort.objects.filter(id=instance.id).values_list('academy_id',
+                                                                                          flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Cohort)
+def invalidate_cohort_calendars(sender: Type[Cohort], instance: Cohort, **kwargs: Any):
+    scopes = [f'cohort__{instance.id}', f'academy__{instance.academy_id}']
+
+    previous_academy_id = getattr(instance, '_previous_academy_id', None)
+    if previous_academy_id and previous_academy_id != instance.academy_id:
+        scopes.append(f'academy__{previous_academy_id}')
+
+    actions.invalidate_ical(*scopes)
+
+
+@receiver([post_save, post_delete], sender=CohortTimeSlot)
+def invalidate_cohort_time_slot_calendars(sender: Type[CohortTimeSlot], instance: CohortTimeSlot,
+                                          **kwargs: Any):
+    actions.invalidate_ical(*get_cohort_scopes(instance.cohort_id))
+
+
+@receiver(post_save, sender=CohortUser)
+def invalidate_cohort_user_calendars(sender: Type[CohortUser], instance: CohortUser, created: bool,
+                                     **kwargs: Any):
+    scopes = []
+
+    # the calendar of the user lists its cohorts
+    if created or instance.cohort_id != instance._old_cohort_id:
+        scopes.append(f'user__{instance.user_id}')
+
+    # the teachers are the organizers of the events of the cohort, the students are not in them
+    if instance.role == 'TEACHER' or instance.role != instance._old_role:
+        scopes += get_cohort_scopes(instance.cohort_id)
+
+        if instance._old_cohort_id and instance.cohort_id != instance._old_cohort_id:
+            scopes += get_cohort_scopes(instance._old_cohort_id)
+
+    if scopes:
+        actions.invalidate_ical(*scopes)
+
+
+@receiver(post_delete, sender=CohortUser)
+def invalidate_deleted_cohort_user_calendars(sender: Type[CohortUser], instance: CohortUser, **kwargs: Any):
+    scopes = [f'user__{instance.user_id}']
+
+    if instance.role == 'TEACHER':
+        scopes += get_cohort_scopes(instance.cohort_id)
+
+    actions.invalidate_ical(*scopes)
+
+
+@receiver(pre_save, sender=Event)
+def keep_previous_event_academy(sender: Type[Event], instance: Event, **kwargs: Any):
+    # an event moved to other academy leaves the calendar of the previous one
+    instance._previous_academy_id = None
+    if instance.id:
+        instance._previous_academy_id = Event.objects.filter(id=instance.id).values_list('academy_id',
+                                                                                         flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_event_calendars(sender: Type[Event], instance: Event, **kwargs: Any):
+    scopes = [f'event__{instance.id}']
+
+    if instance.academy_id:
+        scopes.append(f'academy__{instance.academy_id}')
+
+    previous_academy_id = getattr(instance, '_previous_academy_id', None)
+    if previous_academy_id and previous_academy_id != instance.academy_id:
+        scopes.append(f'academy__{previous_academy_id}')
+
+    actions.invalidate_ical(*scopes)
@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock, call, patch
+from breathecode.admissions.models import CohortUser
+from ..mixins.new_events_tests_case import EventTestCase
+from ... import actions
+
+
+class AcademyEventTestSuite(EventTestCase):
+    """
+    🔽🔽🔽 CohortUser
+    """
+
+    def test_cohort_user__student_saved(self):
+        model = self.bc.database.create(cohort_user={'role': 'STUDENT'})
+
+        with patch.object(actions, 'invalidate_ical', MagicMock()):
+            model.cohort_user.educational_status = 'ACTIVE'
+            model.cohort_user.save()
+
+            self.assertEqual(actions.invalidate_ical.call_args_list, [])
+
+    def test_cohort_user__student_created(self):
+        model = self.bc.database.create(cohort=1, user=1)
+
+        with patch.object(actions, 'invalidate_ical', MagicMock()):
+            CohortUser.objects.create(role='STUDENT', cohort=model.cohort, user=model.user)
+
+            self.assertEqual(actions.invalidate_ical.call_args_list, [call('user__1')])
+
+    def test_cohort_user__teacher_saved(self):
+        model = self.bc.database.create(cohort_user={'role': 'TEACHER'})
+
+        with patch.object(actions, 'invalidate_ical', MagicMock()):
+            model.cohort_user.watching = True
+            model.cohort_user.save()
+
+            self.assertEqual(actions.invalidate_ical.call_args_list, [call('cohort__1', 'academy__1')])
+
+    def test_cohort_user__role_changed(self):
+        model = self.bc.database.create(cohort_user={'role': 'TEACHER'})
+
+        with patch.object(actions, 'invalidate_ical', MagicMock()):
+            model.cohort_user.role = 'STUDENT'
+            model.cohort_user.save()
+
+            self.assertEqual(actions.invalidate_ical.call_args_list, [call('cohort__1', 'academy__1')])
+
+    def test_cohort_user__deleted(self):
+        model = self.bc.database.create(cohort_user={'role': 'STUDENT'})
+
+        with patch.object(actions, 'invalidate_ical', MagicMock()):
+            model.cohort_user.delete()
+
+            self.assertEqual(actions.invalidate_ical.call_args_list, [call('user__1')])
+
+    """
+    🔽🔽🔽 Event
+    """
+
+    def test_event__moved_to_other_academy(self):
+        model = self.bc.database.create(academy=2, event={'academy_id': 1})
+
+        with patch.object(actions, 'invalidate_ical', MagicMock()):
+            model.event.academy = model.academy[1]
+            model.event.save()
+
+            self.assertEqual(actions.invalidate_ical.call_args_list,
+                             [call('event__1', 'academy__2', 'academy__1')])
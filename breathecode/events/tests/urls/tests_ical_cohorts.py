@@ -1263,3 +1263,94 @@ class AcademyCohortTestSuite(EventTestCase):
 
         self.assertEqual(response.content.decode('utf-8'), expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    """
+    🔽🔽🔽 Cached calendar
+    """
+
+    def test_ical_cohorts__cached__not_modified(self):
+        device_id_kwargs = {'name': 'server'}
+        cohort = {
+            'ending_date': timezone.now() + timedelta(weeks=10 * 52),
+            'kickoff_date': datetime.today().isoformat()
+        }
+        model = self.generate_models(academy=True,
+                                     cohort=cohort,
+                                     device_id=True,
+                                     device_id_kwargs=device_id_kwargs)
+        url = reverse_lazy('events:ical_cohorts')
+        args = {'academy': '1'}
+        response = self.client.get(url + '?' + urllib.parse.urlencode(args))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        # just the academies are checked
+        with self.assertNumQueries(1):
+            cached = self.client.get(url + '?' + urllib.parse.urlencode(args))
+
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+
+        not_modified = self.client.get(url + '?' + urllib.parse.urlencode(args),
+                                       HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_ical_cohorts__cached__cohort_changed(self):
+        from breathecode.events.actions import build_ical_cohort
+
+        device_id_kwargs = {'name': 'server'}
+        cohort = {
+            'ending_date': timezone.now() + timedelta(weeks=10 * 52),
+            'kickoff_date': datetime.today().isoformat()
+        }
+        model = self.generate_models(academy=True,
+                                     cohort=(2, cohort),
+                                     device_id=True,
+                                     device_id_kwargs=device_id_kwargs)
+        url = reverse_lazy('events:ical_cohorts')
+        args = {'academy': '1'}
+        response = self.client.get(url + '?' + urllib.parse.urlencode(args))
+
+        model.cohort[0].name = 'Potato cohort'
+        model.cohort[0].save()
+
+        with patch('breathecode.events.views.build_ical_cohort', MagicMock(wraps=build_ical_cohort)) as mock:
+            changed = self.client.get(url + '?' + urllib.parse.urlencode(args),
+                                      HTTP_IF_NONE_MATCH=response['ETag'])
+
+            # the components of the other cohort were reused
+            self.assertEqual([x[0][0].id for x in mock.call_args_list], [1])
+
+        self.assertIn(b'SUMMARY:Potato cohort', changed.content)
+        self.assertIn(f'SUMMARY:{model.cohort[1].name}'.encode('utf-8'), changed.content)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+
+    def test_ical_cohorts__cached__cohort_moved_to_other_academy(self):
+        cohort = {
+            'ending_date': timezone.now() + timedelta(weeks=10 * 52),
+            'kickoff_date': datetime.today().isoformat(),
+            'name': 'Potato cohort',
+        }
+        model = self.bc.database.create(academy=2, cohort=cohort, device_id={'name': 'server'})
+        url = reverse_lazy('events:ical_cohorts')
+        args = {'academy': '1'}
+        response = self.client.get(url + '?' + urllib.parse.urlencode(args))
+
+        self.assertIn(b'SUMMARY:Potato cohort', response.content)
+
+        model.cohort.academy = model.academy[1]
+        model.cohort.save()
+
+        # the calendar of the previous academy is invalidated too
+        moved = self.client.get(url + '?' + urllib.parse.urlencode(args))
+
+        self.assertNotIn(b'SUMMARY:Potato cohort', moved.content)
+        self.assertNotEqual(moved['ETag'], response['ETag'])
+        self.assertEqual(moved.status_code, status.HTTP_200_OK)
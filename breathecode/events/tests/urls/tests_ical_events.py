@@ -799,3 +799,36 @@ class AcademyCohortTestSuite(EventTestCase):
     #         file.write(response.content.decode('utf-8').replace('\r', ''))
 
     #     assert False
+    """
+    🔽🔽🔽 Cached calendar
+    """
+
+    def test_ical_events__cached__event_changed(self):
+        device_id_kwargs = {'name': 'server'}
+        event_kwargs = {'status': 'ACTIVE', 'title': 'Potato'}
+        model = self.generate_models(academy=True,
+                                     event=True,
+                                     device_id=True,
+                                     event_kwargs=event_kwargs,
+                                     device_id_kwargs=device_id_kwargs)
+
+        url = reverse_lazy('events:ical_events')
+        args = {'academy': '1'}
+        response = self.client.get(url + '?' + urllib.parse.urlencode(args))
+
+        self.assertIn(b'SUMMARY:Potato', response.content)
+
+        not_modified = self.client.get(url + '?' + urllib.parse.urlencode(args),
+                                       HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        model.event.title = 'Tomato'
+        model.event.save()
+
+        changed = self.client.get(url + '?' + urllib.parse.urlencode(args),
+                                  HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertIn(b'SUMMARY:Tomato', changed.content)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
@@ -1,4 +1,6 @@
-from breathecode.events.actions import fix_datetime_weekday, update_timeslots_out_of_range
+from breathecode.events.actions import (ICAL_MAX_AGE, ICAL_UPCOMING_MAX_AGE, ICalFeed, build_ical_cohort,
+                                        build_ical_cohort_timeslots, build_ical_event, get_ical_cohorts,
+                                        get_ical_events, get_ical_components, get_ical_feed, render_ical)
 import os
 
 from django.contrib.auth.models import User
@@ -15,6 +17,8 @@ from django.core.exceptions import FieldError
 from django.contrib.auth.hashers import check_password, make_password
 
 from django.http.response import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from breathecode.utils.api_view_extensions.api_view_extensions import APIViewExtensions
 from breathecode.utils.cache import Cache
 from django.shortcuts import render
@@ -427,7 +431,7 @@ class AcademyEventView(APIView, GenerateLookupsMixin):
 
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         if event_id is not None:
             single_event = Event.objects.filter(id=event_id, academy__id=academy_id).first()
@@ -919,102 +923,95 @@ def ical_academies_repr(slugs=None, ids=None):
     return ret
 
 
-class ICalStudentView(APIView):
-    permission_classes = [AllowAny]
-
-    def get(self, request, user_id):
-        if not User.objects.filter(id=user_id).count():
-            raise ValidationException('Student not exist', 404, slug='student-not-exist')
-
-        cohort_ids = (CohortUser.objects.filter(user__id=user_id,
-                                                cohort__ending_date__isnull=False,
-                                                cohort__never_ends=False).values_list(
-                                                    'cohort_id', flat=True).exclude(cohort__stage='DELETED'))
-
-        items = CohortTimeSlot.objects.filter(cohort__id__in=cohort_ids).order_by('id')
+def get_ical_academies(ids: list[str], slugs: list[str]) -> list[int]:
+    """
+    Get the ids of the academies of a calendar, in one query.
+    """
 
-        upcoming = request.GET.get('upcoming')
-        if upcoming == 'true':
-            now = timezone.now()
-            items = items.filter(cohort__kickoff_date__gte=now)
+    if not ids and not slugs:
+        raise ValidationException(
+            'You need to specify at least one academy or academy_slug (comma separated) in the querystring')
 
-        key = server_id()
+    academies = Academy.objects.filter(Q(id__in=ids) | Q(slug__in=slugs)).values_list('id', 'slug')
 
-        calendar = iCalendar()
-        calendar.add('prodid', f'-//BreatheCode//Student Schedule ({user_id}) {key}//EN')
-        calendar.add('METHOD', 'PUBLISH')
-        calendar.add('X-WR-CALNAME', f'Academy - Schedule')
-        calendar.add('X-WR-CALDESC', '')
-        calendar.add('REFRESH-INTERVAL;VALUE=DURATION', 'PT15M')
+    if (len([x for x in academies if str(x[0]) in ids]) != len(ids)
+            or len([x for x in academies if x[1] in slugs]) != len(slugs)):
+        raise ValidationException('Some academy not exist')
 
-        url = os.getenv('API_URL')
-        if url:
-            url = re.sub(r'/$', '', url) + '/v1/events/ical/student/' + str(user_id)
-            calendar.add('url', url)
+    return [x[0] for x in academies]
 
-        calendar.add('version', '2.0')
 
-        for item in items:
-            event = iEvent()
+def ical_response(request, feed: ICalFeed) -> HttpResponse:
+    response = HttpResponse(feed['content'], content_type='text/calendar')
+    response['Content-Disposition'] = 'attachment; filename="calendar.ics"'
+    response['ETag'] = feed['etag']
+    response['Last-Modified'] = http_date(feed['last_modified'])
 
-            event.add('summary', item.cohort.name)
-            event.add('uid', f'breathecode_cohort_time_slot_{item.id}_{key}')
+    return get_conditional_response(request,
+                                    etag=feed['etag'],
+                                    last_modified=feed['last_modified'],
+                                    response=response)
 
-            stamp = DatetimeInteger.to_datetime(item.timezone, item.starting_at)
-            starting_at = fix_datetime_weekday(item.cohort.kickoff_date, stamp, next=True)
-            event.add('dtstart', starting_at)
-            event.add('dtstamp', stamp)
 
-            until_date = item.removed_at or item.cohort.ending_date
+class ICalStudentView(APIView):
+    permission_classes = [AllowAny]
 
-            if not until_date:
-                until_date = timezone.make_aware(
-                    datetime(year=2100, month=12, day=31, hour=12, minute=00, second=00))
+    def get(self, request, user_id):
+        if not User.objects.filter(id=user_id).count():
+            raise ValidationException('Student not exist', 404, slug='student-not-exist')
 
-            ending_at = DatetimeInteger.to_datetime(item.timezone, item.ending_at)
-            ending_at = fix_datetime_weekday(item.cohort.kickoff_date, ending_at, next=True)
-            event.add('dtend', ending_at)
+        upcoming = request.GET.get('upcoming') == 'true'
 
-            if item.recurrent:
-                utc_ending_at = ending_at.astimezone(pytz.UTC)
+        # any of the cohorts of the student could get in or out of the calendar
+        cohorts = CohortUser.objects.filter(user__id=user_id).values_list('cohort_id', flat=True)
+        scopes = [f'user__{user_id}'] + [f'cohort__{x}' for x in cohorts]
 
-                # is possible hour of cohort.ending_date are wrong filled, I's assumes the max diff between
-                # summer/winter timezone should have two hours
-                delta = timedelta(hours=utc_ending_at.hour - until_date.hour + 3,
-                                  minutes=utc_ending_at.minute - until_date.minute,
-                                  seconds=utc_ending_at.second - until_date.second)
+        def build():
+            cohort_ids = (CohortUser.objects.filter(user__id=user_id,
+                                                    cohort__ending_date__isnull=False,
+                                                    cohort__never_ends=False).values_list(
+                                                        'cohort_id',
+                                                        flat=True).exclude(cohort__stage='DELETED'))
 
-                event.add('rrule', {'freq': item.recurrency_type, 'until': until_date + delta})
+            items = Cohort.objects.filter(id__in=cohort_ids)
 
-            teacher = CohortUser.objects.filter(role='TEACHER', cohort__id=item.cohort.id).first()
+            if upcoming:
+                now = timezone.now()
+                items = items.filter(kickoff_date__gte=now)
 
-            if teacher:
-                organizer = vCalAddress(f'MAILTO:{teacher.user.email}')
+            key = server_id()
 
-                if teacher.user.first_name and teacher.user.last_name:
-                    organizer.params['cn'] = vText(f'{teacher.user.first_name} '
-                                                   f'{teacher.user.last_name}')
-                elif teacher.user.first_name:
-                    organizer.params['cn'] = vText(teacher.user.first_name)
-                elif teacher.user.last_name:
-                    organizer.params['cn'] = vText(teacher.user.last_name)
+            calendar = iCalendar()
+            calendar.add('prodid', f'-//BreatheCode//Student Schedule ({user_id}) {key}//EN')
+            calendar.add('METHOD', 'PUBLISH')
+            calendar.add('X-WR-CALNAME', f'Academy - Schedule')
+            calendar.add('X-WR-CALDESC', '')
+            calendar.add('REFRESH-INTERVAL;VALUE=DURATION', 'PT15M')
 
-                organizer.params['role'] = vText('OWNER')
-                event['organizer'] = organizer
+            url = os.getenv('API_URL')
+            if url:
+                url = re.sub(r'/$', '', url) + '/v1/events/ical/student/' + str(user_id)
+                calendar.add('url', url)
 
-            location = item.cohort.academy.name
+            calendar.add('version', '2.0')
 
-            if item.cohort.academy.website_url:
-                location = f'{location} ({item.cohort.academy.website_url})'
-            event['location'] = vText(item.cohort.online_meeting_url or item.cohort.academy.name)
+            components = get_ical_components(
+                'cohort_timeslots', 'cohort', list(items.values_list('id', flat=True)),
+                lambda ids: {x.id: build_ical_cohort_timeslots(x, key)
+                             for x in get_ical_cohorts(ids)})
 
-            calendar.add_component(event)
+            # the timeslots of every cohort are sorted together, like they were fetched
+            timeslots = sorted([y for x in components.values() for y in x], key=lambda x: x[0])
+            return render_ical(calendar, [x[1] for x in timeslots])
 
-        calendar_text = calendar.to_ical()
+        feed = get_ical_feed('student',
+                             scopes,
+                             build,
+                             timeout=ICAL_UPCOMING_MAX_AGE if upcoming else ICAL_MAX_AGE,
+                             user=user_id,
+                             upcoming=upcoming)
 
-        response = HttpResponse(calendar_text, content_type='text/calendar')
-        response['Content-Disposition'] = 'attachment; filename="calendar.ics"'
-        return response
+        return ical_response(request, feed)
 
 
 class ICalCohortsView(APIView):
@@ -1027,299 +1024,139 @@ class ICalCohortsView(APIView):
         ids = ids.split(',') if ids else []
         slugs = slugs.split(',') if slugs else []
 
-        if ids:
-            items = Cohort.objects.filter(ending_date__isnull=False, never_ends=False,
-                                          academy__id__in=ids).order_by('id')
-
-        elif slugs:
-            items = Cohort.objects.filter(ending_date__isnull=False,
-                                          never_ends=False,
-                                          academy__slug__in=slugs).order_by('id')
-
-        else:
-            items = []
-
-        if not ids and not slugs:
-            raise ValidationException(
-                'You need to specify at least one academy or academy_slug (comma separated) in the querystring'
-            )
-
-        if (Academy.objects.filter(id__in=ids).count() != len(ids)
-                or Academy.objects.filter(slug__in=slugs).count() != len(slugs)):
-            raise ValidationException('Some academy not exist')
-
-        items = items.exclude(stage='DELETED')
-
-        upcoming = request.GET.get('upcoming')
-        if upcoming == 'true':
-            now = timezone.now()
-            items = items.filter(kickoff_date__gte=now)
-
-        academies_repr = ical_academies_repr(ids=ids, slugs=slugs)
-        key = server_id()
-
-        calendar = iCalendar()
-        calendar.add('prodid', f'-//BreatheCode//Academy Cohorts{academies_repr} {key}//EN')
-        calendar.add('METHOD', 'PUBLISH')
-        calendar.add('X-WR-CALNAME', f'Academy - Cohorts')
-        calendar.add('X-WR-CALDESC', '')
-        calendar.add('REFRESH-INTERVAL;VALUE=DURATION', 'PT15M')
-
-        url = os.getenv('API_URL')
-        if url:
-            url = re.sub(r'/$', '', url) + '/v1/events/ical/cohorts'
-            if ids or slugs:
-                url = url + '?'
-
-                if ids:
-                    url = url + 'academy=' + ','.join(ids)
-
-                if ids and slugs:
-                    url = url + '&'
-
-                if slugs:
-                    url = url + 'academy_slug=' + ','.join(slugs)
-
-            calendar.add('url', url)
-
-        calendar.add('version', '2.0')
-
-        for item in items:
-            event = iEvent()
-            event_first_day = iEvent()
-            event_last_day = iEvent()
-            has_last_day = False
-
-            event.add('summary', item.name)
-            event.add('uid', f'breathecode_cohort_{item.id}_{key}')
-            event.add('dtstart', item.kickoff_date)
+        academies = get_ical_academies(ids, slugs)
+        upcoming = request.GET.get('upcoming') == 'true'
 
-            timeslots = update_timeslots_out_of_range(item.kickoff_date, item.ending_date,
-                                                      CohortTimeSlot.objects.filter(cohort__id=item.id))
+        def build():
+            if ids:
+                items = Cohort.objects.filter(ending_date__isnull=False,
+                                              never_ends=False,
+                                              academy__id__in=ids).order_by('id')
 
-            first_timeslot = timeslots[0] if timeslots else None
-            if first_timeslot:
-                recurrent = first_timeslot['recurrent']
-                starting_at = first_timeslot['starting_at'] if not recurrent else fix_datetime_weekday(
-                    item.kickoff_date, first_timeslot['starting_at'], next=True)
-                ending_at = first_timeslot['ending_at'] if not recurrent else fix_datetime_weekday(
-                    item.kickoff_date, first_timeslot['ending_at'], next=True)
-
-                event_first_day.add('summary', f'{item.name} - First day')
-                event_first_day.add('uid', f'breathecode_cohort_{item.id}_first_{key}')
-                event_first_day.add('dtstart', starting_at)
-                event_first_day.add('dtend', ending_at)
-                event_first_day.add('dtstamp', first_timeslot['created_at'])
-
-            if item.ending_date:
-                event.add('dtend', item.ending_date)
-                timeslots_datetime = []
-
-                # fix the datetime to be use for get the last day
-                for timeslot in timeslots:
-                    starting_at = timeslot['starting_at']
-                    ending_at = timeslot['ending_at']
-                    diff = ending_at - starting_at
-
-                    if timeslot['recurrent']:
-                        ending_at = fix_datetime_weekday(item.ending_date, ending_at, prev=True)
-                        starting_at = ending_at - diff
-
-                    timeslots_datetime.append((starting_at, ending_at))
-
-                last_timeslot = None
-
-                if timeslots_datetime:
-                    timeslots_datetime.sort(key=lambda x: x[1], reverse=True)
-                    last_timeslot = timeslots_datetime[0]
-                    has_last_day = True
-
-                    event_last_day.add('summary', f'{item.name} - Last day')
-
-                    event_last_day.add('uid', f'breathecode_cohort_{item.id}_last_{key}')
-                    event_last_day.add('dtstart', last_timeslot[0])
-                    event_last_day.add('dtend', last_timeslot[1])
-                    event_last_day.add('dtstamp', item.created_at)
-
-            event.add('dtstamp', item.created_at)
-
-            teacher = CohortUser.objects.filter(role='TEACHER', cohort__id=item.id).first()
+            else:
+                items = Cohort.objects.filter(ending_date__isnull=False,
+                                              never_ends=False,
+                                              academy__slug__in=slugs).order_by('id')
 
-            if teacher:
-                organizer = vCalAddress(f'MAILTO:{teacher.user.email}')
+            items = items.exclude(stage='DELETED')
 
-                if teacher.user.first_name and teacher.user.last_name:
-                    organizer.params['cn'] = vText(f'{teacher.user.first_name} '
-                                                   f'{teacher.user.last_name}')
-                elif teacher.user.first_name:
-                    organizer.params['cn'] = vText(teacher.user.first_name)
-                elif teacher.user.last_name:
-                    organizer.params['cn'] = vText(teacher.user.last_name)
+            if upcoming:
+                now = timezone.now()
+                items = items.filter(kickoff_date__gte=now)
 
-                organizer.params['role'] = vText('OWNER')
-                event['organizer'] = organizer
+            academies_repr = ical_academies_repr(ids=ids, slugs=slugs)
+            key = server_id()
 
-                if first_timeslot:
-                    event_first_day['organizer'] = organizer
+            calendar = iCalendar()
+            calendar.add('prodid', f'-//BreatheCode//Academy Cohorts{academies_repr} {key}//EN')
+            calendar.add('METHOD', 'PUBLISH')
+            calendar.add('X-WR-CALNAME', f'Academy - Cohorts')
+            calendar.add('X-WR-CALDESC', '')
+            calendar.add('REFRESH-INTERVAL;VALUE=DURATION', 'PT15M')
 
-                if has_last_day:
-                    event_last_day['organizer'] = organizer
+            url = os.getenv('API_URL')
+            if url:
+                url = re.sub(r'/$', '', url) + '/v1/events/ical/cohorts'
+                if ids or slugs:
+                    url = url + '?'
 
-            location = item.academy.name
+                    if ids:
+                        url = url + 'academy=' + ','.join(ids)
 
-            if item.academy.website_url:
-                location = f'{location} ({item.academy.website_url})'
+                    if ids and slugs:
+                        url = url + '&'
 
-            event['location'] = vText(item.online_meeting_url or item.academy.name)
+                    if slugs:
+                        url = url + 'academy_slug=' + ','.join(slugs)
 
-            if first_timeslot:
-                event_first_day['location'] = vText(item.online_meeting_url or item.academy.name)
+                calendar.add('url', url)
 
-            if has_last_day:
-                event_last_day['location'] = vText(item.online_meeting_url or item.academy.name)
+            calendar.add('version', '2.0')
 
-            if first_timeslot:
-                calendar.add_component(event_first_day)
-            calendar.add_component(event)
+            ids_of_items = list(items.values_list('id', flat=True))
+            components = get_ical_components(
+                'cohort', 'cohort', ids_of_items,
+                lambda ids: {x.id: build_ical_cohort(x, key)
+                             for x in get_ical_cohorts(ids)})
 
-            if has_last_day:
-                calendar.add_component(event_last_day)
+            return render_ical(calendar, [components[x] for x in ids_of_items])
 
-        calendar_text = calendar.to_ical()
+        feed = get_ical_feed('cohorts', [f'academy__{x}' for x in academies],
+                             build,
+                             timeout=ICAL_UPCOMING_MAX_AGE if upcoming else ICAL_MAX_AGE,
+                             academy=','.join(ids),
+                             academy_slug=','.join(slugs),
+                             upcoming=upcoming)
 
-        response = HttpResponse(calendar_text, content_type='text/calendar')
-        response['Content-Disposition'] = 'attachment; filename="calendar.ics"'
-        return response
+        return ical_response(request, feed)
 
 
 class ICalEventView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        items = Event.objects.filter(status='ACTIVE')
-
         ids = request.GET.get('academy', '')
         slugs = request.GET.get('academy_slug', '')
 
         ids = ids.split(',') if ids else []
         slugs = slugs.split(',') if slugs else []
 
-        if ids:
-            items = Event.objects.filter(academy__id__in=ids, status='ACTIVE').order_by('id')
-
-        elif slugs:
-            items = Event.objects.filter(academy__slug__in=slugs, status='ACTIVE').order_by('id')
-
-        else:
-            items = []
-
-        if not ids and not slugs:
-            raise ValidationException(
-                'You need to specify at least one academy or academy_slug (comma separated) in the querystring'
-            )
-
-        if (Academy.objects.filter(id__in=ids).count() != len(ids)
-                or Academy.objects.filter(slug__in=slugs).count() != len(slugs)):
-            raise ValidationException('Some academy not exist')
-
-        upcoming = request.GET.get('upcoming')
-        if items and upcoming == 'true':
-            now = timezone.now()
-            items = items.filter(starting_at__gte=now)
-
-        academies_repr = ical_academies_repr(ids=ids, slugs=slugs)
-        key = server_id()
-
-        calendar = iCalendar()
-        calendar.add('prodid', f'-//BreatheCode//Academy Events{academies_repr} {key}//EN')
-        calendar.add('METHOD', 'PUBLISH')
-        calendar.add('X-WR-CALNAME', f'Academy - Events')
-        calendar.add('X-WR-CALDESC', '')
-        calendar.add('REFRESH-INTERVAL;VALUE=DURATION', 'PT15M')
-
-        url = os.getenv('API_URL')
-        if url:
-            url = re.sub(r'/$', '', url) + '/v1/events/ical/events'
-            if ids or slugs:
-                url = url + '?'
-
-                if ids:
-                    url = url + 'academy=' + ','.join(ids)
-
-                if ids and slugs:
-                    url = url + '&'
-
-                if slugs:
-                    url = url + 'academy_slug=' + ','.join(slugs)
+        academies = get_ical_academies(ids, slugs)
+        upcoming = request.GET.get('upcoming') == 'true'
 
-            calendar.add('url', url)
+        def build():
+            if ids:
+                items = Event.objects.filter(academy__id__in=ids, status='ACTIVE').order_by('id')
 
-        calendar.add('version', '2.0')
-
-        for item in items:
-            event = iEvent()
-
-            if item.title:
-                event.add('summary', item.title)
-
-            description = ''
-            description = f'{description}Url: {item.url}\n'
-
-            if item.academy:
-                description = f'{description}Academy: {item.academy.name}\n'
-
-            if item.venue and item.venue.title:
-                description = f'{description}Venue: {item.venue.title}\n'
-
-            if item.event_type:
-                description = f'{description}Event type: {item.event_type.name}\n'
-
-            if item.online_event:
-                description = f'{description}Location: online\n'
+            else:
+                items = Event.objects.filter(academy__slug__in=slugs, status='ACTIVE').order_by('id')
 
-            event.add('description', description)
-            event.add('uid', f'breathecode_event_{item.id}_{key}')
-            event.add('dtstart', item.starting_at)
-            event.add('dtend', item.ending_at)
-            event.add('dtstamp', item.created_at)
+            if upcoming:
+                now = timezone.now()
+                items = items.filter(starting_at__gte=now)
 
-            if item.author and item.author.email:
-                organizer = vCalAddress(f'MAILTO:{item.author.email}')
+            academies_repr = ical_academies_repr(ids=ids, slugs=slugs)
+            key = server_id()
 
-                if item.author.first_name and item.author.last_name:
-                    organizer.params['cn'] = vText(f'{item.author.first_name} '
-                                                   f'{item.author.last_name}')
-                elif item.author.first_name:
-                    organizer.params['cn'] = vText(item.author.first_name)
-                elif item.author.last_name:
-                    organizer.params['cn'] = vText(item.author.last_name)
+            calendar = iCalendar()
+            calendar.add('prodid', f'-//BreatheCode//Academy Events{academies_repr} {key}//EN')
+            calendar.add('METHOD', 'PUBLISH')
+            calendar.add('X-WR-CALNAME', f'Academy - Events')
+            calendar.add('X-WR-CALDESC', '')
+            calendar.add('REFRESH-INTERVAL;VALUE=DURATION', 'PT15M')
 
-                organizer.params['role'] = vText('OWNER')
-                event['organizer'] = organizer
+            url = os.getenv('API_URL')
+            if url:
+                url = re.sub(r'/$', '', url) + '/v1/events/ical/events'
+                if ids or slugs:
+                    url = url + '?'
 
-            if item.venue and (item.venue.country or item.venue.state or item.venue.city
-                               or item.venue.street_address):
-                value = ''
+                    if ids:
+                        url = url + 'academy=' + ','.join(ids)
 
-                if item.venue.street_address:
-                    value = f'{value}{item.venue.street_address}, '
+                    if ids and slugs:
+                        url = url + '&'
 
-                if item.venue.city:
-                    value = f'{value}{item.venue.city}, '
+                    if slugs:
+                        url = url + 'academy_slug=' + ','.join(slugs)
 
-                if item.venue.state:
-                    value = f'{value}{item.venue.state}, '
+                calendar.add('url', url)
 
-                if item.venue.country:
-                    value = f'{value}{item.venue.country}'
+            calendar.add('version', '2.0')
 
-                value = re.sub(', $', '', value)
-                event['location'] = vText(value)
+            ids_of_items = list(items.values_list('id', flat=True))
+            components = get_ical_components(
+                'event', 'event', ids_of_items,
+                lambda ids: {x.id: build_ical_event(x, key)
+                             for x in get_ical_events(ids)})
 
-            calendar.add_component(event)
+            return render_ical(calendar, [components[x] for x in ids_of_items])
 
-        calendar_text = calendar.to_ical()
+        feed = get_ical_feed('events', [f'academy__{x}' for x in academies],
+                             build,
+                             timeout=ICAL_UPCOMING_MAX_AGE if upcoming else ICAL_MAX_AGE,
+                             academy=','.join(ids),
+                             academy_slug=','.join(slugs),
+                             upcoming=upcoming)
 
-        response = HttpResponse(calendar_text, content_type='text/calendar')
-        response['Content-Disposition'] = 'attachment; filename="calendar.ics"'
-        return response
+        return ical_response(request, feed)
@@ -1,8 +1,9 @@
-import re
-from breathecode.notify.actions import send_email_message, send_slack
+from breathecode.notify.actions import send_email_message, send_email_messages, send_slack
 import logging, json
+from django.db import connection
 from django.utils import timezone
-from django.db.models import Avg
+from typing import Optional
+from django.db.models import Avg, Count, Q, Sum
 from breathecode.utils import ValidationException
 from breathecode.authenticate.models import Token
 from .models import Answer, Survey, Review, ReviewPlatform
@@ -34,16 +35,17 @@ def send_survey_group(survey=None, cohort=None):
             cohort = survey.cohort
 
         cohort_teacher = CohortUser.objects.filter(cohort=survey.cohort, role='TEACHER')
-        if cohort_teacher.count() == 0:
+        if not cohort_teacher.exists():
             raise ValidationException('This cohort must have a teacher assigned to be able to survey it',
                                       400,
                                       slug='cohort-must-have-teacher-assigned-to-survey')
 
-        ucs = CohortUser.objects.filter(cohort=cohort, role='STUDENT').filter()
+        ucs = CohortUser.objects.filter(cohort=cohort, role='STUDENT').select_related('user')
 
+        user_ids = []
         for uc in ucs:
             if uc.educational_status in ['ACTIVE', 'GRADUATED']:
-                tasks.send_cohort_survey.delay(uc.user.id, survey.id)
+                user_ids.append(uc.user.id)
 
                 logger.debug(f'Survey scheduled to send for {uc.user.email}')
                 result['success'].append(f'Survey scheduled to send for {uc.user.email}')
@@ -63,6 +65,10 @@ def send_survey_group(survey=None, cohort=None):
         survey.status_json = json.dumps(result)
         survey.save()
 
+        # the whole cohort is surveyed by one task
+        if user_ids:
+            tasks.send_cohort_surveys.delay(survey.id, user_ids)
+
     except Exception as e:
 
         survey.status = 'FATAL'
@@ -74,6 +80,17 @@ def send_survey_group(survey=None, cohort=None):
     return result
 
 
+def create_with_ids(Model, instances):
+    # the ids are needed in the links, not every database returns them from a bulk insert
+    if connection.features.can_return_rows_from_bulk_insert:
+        return Model.objects.bulk_create(instances)
+
+    for instance in instances:
+        instance.save()
+
+    return instances
+
+
 def send_question(user, cohort=None):
     answer = Answer(user=user)
 
@@ -82,7 +99,8 @@ def send_question(user, cohort=None):
     if cohort:
         cu_kwargs['cohort'] = cohort
 
-    cu = CohortUser.objects.filter(**cu_kwargs).order_by('-cohort__kickoff_date').first()
+    cu = CohortUser.objects.filter(**cu_kwargs).select_related(
+        'cohort__academy', 'cohort__syllabus_version__syllabus').order_by('-cohort__kickoff_date').first()
     if not cu:
         raise ValidationException(
             'Impossible to determine the student cohort, maybe it has more than one, or cero.',
@@ -103,30 +121,31 @@ def send_question(user, cohort=None):
         raise ValidationException('Cohort not have one SyllabusVersion',
                                   slug='cohort-without-syllabus-version')
 
-    if not answer.cohort.schedule:
+    if not answer.cohort.schedule_id:
         raise ValidationException('Cohort not have one SyllabusSchedule',
                                   slug='cohort-without-specialty-mode')
 
-    question_was_sent_previously = Answer.objects.filter(cohort=answer.cohort, user=user,
-                                                         status='SENT').count()
+    previous_answer = Answer.objects.filter(cohort=answer.cohort, user=user, status='SENT').first()
+    question_was_sent_previously = previous_answer is not None
 
     question = tasks.build_question(answer)
 
     if question_was_sent_previously:
-        answer = Answer.objects.filter(cohort=answer.cohort, user=user, status='SENT').first()
+        answer = previous_answer
         Token.objects.filter(id=answer.token_id).delete()
 
     else:
         answer.title = question['title']
         answer.lowest = question['lowest']
         answer.highest = question['highest']
+        answer.question_type = question['type']
         answer.lang = answer.cohort.language.lower()
-        answer.save()
 
     token, created = Token.get_or_create(user, token_type='temporal', hours_length=48)
 
-    token_id = Token.objects.filter(key=token).values_list('id', flat=True).first()
-    answer.token_id = token_id
+    answer.token = token
+    # keep track of sent survays until they get answered
+    answer.status = 'SENT'
     answer.save()
 
     data = {
@@ -142,19 +161,132 @@ def send_question(user, cohort=None):
     if user.email:
         send_email_message('nps', user.email, data)
 
-    if hasattr(user, 'slackuser') and hasattr(answer.cohort.academy, 'slackteam'):
+    if has_slackuser and hasattr(answer.cohort.academy, 'slackteam'):
         send_slack('nps', user.slackuser, answer.cohort.academy.slackteam, data=data)
 
-    # keep track of sent survays until they get answered
     if not question_was_sent_previously:
         logger.info(f'Survey was sent for user: {str(user.id)}')
-        answer.status = 'SENT'
-        answer.save()
-        return True
 
     else:
         logger.info(f'Survey was resent for user: {str(user.id)}')
-        return True
+
+    return True
+
+
+def send_questions(cohort_users: QuerySet[CohortUser]) -> dict:
+    """
+    Send the question about its cohort to many students at once, the questions that were sent before and
+    were not answered yet are sent again with a new token.
+
+    The emails of each cohort are sent in one batch, it returns the successes and the errors like
+    send_survey_group.
+    """
+
+    result = {'success': [], 'error': []}
+    cohort_users = cohort_users.select_related('user', 'user__slackuser', 'cohort__academy',
+                                               'cohort__syllabus_version__syllabus')
+
+    valid = []
+    for cu in cohort_users:
+        user, cohort = cu.user, cu.cohort
+
+        if cu.educational_status not in ['ACTIVE', 'GRADUATED']:
+            result['error'].append(
+                'Impossible to determine the student cohort, maybe it has more than one, or cero.')
+
+        elif not user.email and not hasattr(user, 'slackuser'):
+            result['error'].append(
+                f'User not have email and slack, this survey cannot be send: {str(user.id)}')
+
+        elif not cohort.syllabus_version:
+            result['error'].append('Cohort not have one SyllabusVersion')
+
+        elif not cohort.schedule_id:
+            result['error'].append('Cohort not have one SyllabusSchedule')
+
+        else:
+            valid.append(cu)
+
+    if not valid:
+        return result
+
+    previous_answers = {}
+    for answer in Answer.objects.filter(status='SENT',
+                                        user__id__in={x.user.id
+                                                      for x in valid},
+                                        cohort__id__in={x.cohort.id
+                                                        for x in valid}).order_by('id'):
+        previous_answers.setdefault((answer.cohort_id, answer.user_id), answer)
+
+    Token.objects.filter(id__in=[x.token_id for x in previous_answers.values() if x.token_id]).delete()
+
+    questions = {}
+    answers = []
+    for cu in valid:
+        answer = previous_answers.get((cu.cohort.id, cu.user.id))
+        if answer is None:
+            answer = Answer(user=cu.user, cohort=cu.cohort, lang=cu.cohort.language.lower(), status='SENT')
+            if cu.cohort.id not in questions:
+                questions[cu.cohort.id] = tasks.build_question(answer)
+
+            answer.title = questions[cu.cohort.id]['title']
+            answer.lowest = questions[cu.cohort.id]['lowest']
+            answer.highest = questions[cu.cohort.id]['highest']
+            answer.question_type = questions[cu.cohort.id]['type']
+
+        answers.append(answer)
+
+    tokens = create_with_ids(Token, tasks.build_temporal_tokens([x.user for x in valid]))
+    for answer, token in zip(answers, tokens):
+        answer.token = token
+
+    Answer.objects.bulk_update([x for x in answers if x.id], ['token'])
+    create_with_ids(Answer, [x for x in answers if not x.id])
+
+    # {cohort id: [(cohort user, answer, link)]}
+    cohorts = {}
+    for cu, answer, token in zip(valid, answers, tokens):
+        link = f'https://nps.breatheco.de/{answer.id}?token={token.key}'
+        cohorts.setdefault(cu.cohort.id, []).append((cu, answer, link))
+
+    for rows in cohorts.values():
+        cohort = rows[0][0].cohort
+        answer = rows[0][1]
+        data = {
+            'QUESTION': answer.title,
+            'HIGHEST': answer.highest,
+            'LOWEST': answer.lowest,
+            'SUBJECT': answer.title,
+            'BUTTON': strings[cohort.language.lower()]['button_label'],
+        }
+
+        sent = send_email_messages('nps', {
+            cu.user.email: {
+                'ANSWER_ID': answer.id,
+                'LINK': link
+            }
+            for cu, answer, link in rows if cu.user.email
+        }, data)
+
+        has_slackteam = hasattr(cohort.academy, 'slackteam')
+        for cu, answer, link in rows:
+            if has_slackteam and hasattr(cu.user, 'slackuser'):
+                send_slack('nps',
+                           cu.user.slackuser,
+                           cohort.academy.slackteam,
+                           data={
+                               **data, 'ANSWER_ID': answer.id,
+                               'LINK': link
+                           })
+
+            if cu.user.email and not sent[cu.user.email]:
+                result['error'].append(f'Survey could not be sent to {cu.user.email}')
+                continue
+
+            logger.info(f'Survey was sent for user: {str(cu.user.id)}')
+            result['success'].append(f'Survey sent to {cu.user.email or cu.user.id}')
+
+    return result
 
 
 def answer_survey(user, data):
@@ -208,55 +340,60 @@ def create_user_graduation_reviews(user, cohort):
     return False
 
 
-def calculate_survey_response_rate(survey_id: int) -> float:
-    total_responses = Answer.objects.filter(survey__id=survey_id).count()
-    answered_responses = Answer.objects.filter(survey__id=survey_id, status='ANSWERED').count()
-    response_rate = (answered_responses / total_responses) * 100
-
-    return response_rate
-
+def get_survey_stats(survey_id: int) -> dict:
+    """
+    Aggregate the answers of a survey in one query, grouped by the type of question and by mentor, it
+    returns the response rate and the scores.
+    """
 
-def calculate_survey_scores(survey_id: int) -> dict:
+    answered = Q(status='ANSWERED')
+    fields = ['question_type', 'mentor__id', 'mentor__first_name', 'mentor__last_name']
 
-    def get_average(answers: QuerySet[Answer]) -> float:
-        result = answers.aggregate(Avg('score'))
-        return result['score__avg']
+    rows = Answer.objects.filter(survey__id=survey_id).values(*fields).order_by()
+    rows = list(
+        rows.annotate(total=Count('id'),
+                      answered=Count('id', filter=answered),
+                      score_sum=Sum('score', filter=answered),
+                      scored=Count('score', filter=answered)))
 
-    survey = Survey.objects.filter(id=survey_id).first()
-    if not survey:
-        raise ValidationException('Survey not found', code=404, slug='not-found')
+    def get_average(rows: list[dict]) -> Optional[float]:
+        scored = sum([x['scored'] for x in rows])
+        if not scored:
+            return None
 
-    answers = Answer.objects.filter(survey=survey, status='ANSWERED')
-    total = get_average(answers)
+        return sum([x['score_sum'] or 0 for x in rows]) / scored
 
-    academy_pattern = strings[survey.lang]['academy']['title'].split('{}')
-    cohort_pattern = strings[survey.lang]['cohort']['title'].split('{}')
-    mentor_pattern = strings[survey.lang]['mentor']['title'].split('{}')
+    # {mentor id: [rows]}
+    mentor_rows = {}
+    for row in rows:
+        if row['question_type'] == 'MENTOR' and row['answered']:
+            mentor_rows.setdefault(row['mentor__id'], []).append(row)
 
-    academy = get_average(
-        answers.filter(title__startswith=academy_pattern[0], title__endswith=academy_pattern[1]))
+    mentors = [{
+        'name': f"{x[0]['mentor__first_name']} {x[0]['mentor__last_name']}",
+        'score': get_average(x),
+    } for x in mentor_rows.values()]
 
-    cohort = get_average(
-        answers.filter(title__startswith=cohort_pattern[0], title__endswith=cohort_pattern[1]))
+    total = sum([x['total'] for x in rows])
+    response_rate = sum([x['answered'] for x in rows]) / total * 100 if total else None
 
-    all_mentors = {
-        x.title
-        for x in answers.filter(title__startswith=mentor_pattern[0], title__endswith=mentor_pattern[1])
+    return {
+        'response_rate': response_rate,
+        'scores': {
+            'total': get_average(rows),
+            'academy': get_average([x for x in rows if x['question_type'] == 'ACADEMY']),
+            'cohort': get_average([x for x in rows if x['question_type'] == 'COHORT']),
+            'mentors': sorted(mentors, key=lambda x: x['name']),
+        },
     }
 
-    full_mentor_pattern = (mentor_pattern[0].replace('?', '\\?') + r'([\w ]+)' +
-                           mentor_pattern[1].replace('?', '\\?'))
 
-    mentors = []
-    for mentor in all_mentors:
-        name = re.findall(full_mentor_pattern, mentor)[0]
-        score = get_average(answers.filter(title=mentor))
+def calculate_survey_response_rate(survey_id: int) -> float:
+    return get_survey_stats(survey_id)['response_rate']
 
-        mentors.append({'name': name, 'score': score})
 
-    return {
-        'total': total,
-        'academy': academy,
-        'cohort': cohort,
-        'mentors': sorted(mentors, key=lambda x: x['name']),
-    }
+def calculate_survey_scores(survey_id: int) -> dict:
+    if not Survey.objects.filter(id=survey_id).exists():
+        raise ValidationException('Survey not found', code=404, slug='not-found')
+
+    return get_survey_stats(survey_id)['scores']
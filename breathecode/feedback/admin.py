@@ -14,31 +14,38 @@ from breathecode.utils.admin import change_field
 logger = logging.getLogger(__name__)
 
 
-def send_bulk_survey(modeladmin, request, queryset):
-    # mocking tools are poor to apply it
-    from django.contrib import messages
+def notify_bulk_survey_errors(request, errors):
+    counts = {}
+    for error in errors:
+        logger.fatal(error)
+        counts[error] = counts.get(error, 0) + 1
+
+    if counts:
+        message = ' - '.join([f'{error} ({counts[error]})' for error in counts.keys()])
+        messages.error(request, message=message)
+    else:
+        messages.success(request, message='Survey was successfully sent')
 
-    user = queryset.all()
-    errors = {}
 
-    for u in user:
-        try:
-            actions.send_question(u)
-        except Exception as e:
-            error = str(e)
+def send_bulk_survey(modeladmin, request, queryset):
+    from breathecode.admissions.models import CohortUser
 
-            if error in errors:
-                errors[error] += 1
-            else:
-                errors[error] = 1
+    users = queryset.all()
 
-            logger.fatal(error)
+    # the question is about the last cohort of each user
+    latest = {}
+    for cu in CohortUser.objects.filter(user__in=users, educational_status__in=[
+            'ACTIVE', 'GRADUATED'
+    ]).order_by('-cohort__kickoff_date').values('id', 'user__id'):
+        latest.setdefault(cu['user__id'], cu['id'])
 
-    if errors:
-        message = ' - '.join([f'{error} ({errors[error]})' for error in errors.keys()])
-        messages.error(request, message=message)
-    else:
-        messages.success(request, message='Survey was successfully sent')
+    errors = [
+        'Impossible to determine the student cohort, maybe it has more than one, or cero.' for x in users
+        if x.id not in latest
+    ]
+    errors += actions.send_questions(CohortUser.objects.filter(id__in=latest.values()))['error']
+
+    notify_bulk_survey_errors(request, errors)
 
 
 send_bulk_survey.short_description = 'Send General NPS Survey'
@@ -51,29 +58,8 @@ class UserAdmin(UserAdmin):
 
 
 def send_bulk_cohort_user_survey(modeladmin, request, queryset):
-    from django.contrib import messages
-
-    cus = queryset.all()
-    errors = {}
-
-    for cu in cus:
-        try:
-            actions.send_question(cu.user, cu.cohort)
-        except Exception as e:
-            error = str(e)
-
-            if error in errors:
-                errors[error] += 1
-            else:
-                errors[error] = 1
-
-            logger.fatal(error)
-
-    if errors:
-        message = ' - '.join([f'{error} ({errors[error]})' for error in errors.keys()])
-        messages.error(request, message=message)
-    else:
-        messages.success(request, message='Survey was successfully sent')
+    result = actions.send_questions(queryset.all())
+    notify_bulk_survey_errors(request, result['error'])
 
 
 send_bulk_cohort_user_survey.short_description = 'Send General NPS Survey'
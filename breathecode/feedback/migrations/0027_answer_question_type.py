@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:31
+
+from django.db import migrations, models
+
+
+def set_question_type(apps, schema_editor):
+    Answer = apps.get_model('feedback', 'Answer')
+
+    # the same precedence of build_question, the last update wins
+    for question_type, field in [('ACADEMY', 'academy'), ('COHORT', 'cohort'), ('MENTOR', 'mentor'),
+                                 ('EVENT', 'event'), ('SESSION', 'mentorship_session')]:
+        Answer.objects.filter(**{f'{field}__isnull': False}).update(question_type=question_type)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0026_auto_20220830_0808'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='question_type',
+            field=models.CharField(blank=True,
+                                   choices=[('ACADEMY', 'Academy'), ('COHORT', 'Cohort'),
+                                            ('MENTOR', 'Mentor'), ('SESSION', 'Mentorship session'),
+                                            ('EVENT', 'Event')],
+                                   default=None,
+                                   help_text='What the question is about, the scores are grouped by it',
+                                   max_length=15,
+                                   null=True),
+        ),
+        migrations.RunPython(set_question_type, migrations.RunPython.noop),
+    ]
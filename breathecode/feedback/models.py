@@ -84,6 +84,19 @@ SURVEY_STATUS = (
     (EXPIRED, 'Expired'),
 )
 
+ACADEMY = 'ACADEMY'
+COHORT = 'COHORT'
+MENTOR = 'MENTOR'
+SESSION = 'SESSION'
+EVENT = 'EVENT'
+QUESTION_TYPE = (
+    (ACADEMY, 'Academy'),
+    (COHORT, 'Cohort'),
+    (MENTOR, 'Mentor'),
+    (SESSION, 'Mentorship session'),
+    (EVENT, 'Event'),
+)
+
 
 class Answer(models.Model):
 
@@ -95,6 +108,12 @@ class Answer(models.Model):
     lowest = models.CharField(max_length=50, default='not likely')
     highest = models.CharField(max_length=50, default='very likely')
     lang = models.CharField(max_length=3, blank=True, default='en')
+    question_type = models.CharField(max_length=15,
+                                     choices=QUESTION_TYPE,
+                                     default=None,
+                                     blank=True,
+                                     null=True,
+                                     help_text='What the question is about, the scores are grouped by it')
 
     event = models.ForeignKey(Event, on_delete=models.SET_NULL, default=None, blank=True, null=True)
     mentorship_session = models.ForeignKey(MentorshipSession,
@@ -153,7 +153,7 @@ class AnswerPUTSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Answer
-        exclude = ('token', )
+        exclude = ('token', 'question_type')
 
     def validate(self, data):
         utc_now = timezone.now()
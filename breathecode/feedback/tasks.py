@@ -33,22 +33,25 @@ class BaseTaskWithRetry(Task):
 
 def build_question(answer):
     lang = answer.lang.lower()
-    question = {'title': '', 'lowest': '', 'highest': ''}
+    question = {'title': '', 'lowest': '', 'highest': '', 'type': None}
     if answer.mentorship_session is not None:
         question['title'] = strings[lang]['session']['title'].format(
             f'{answer.mentorship_session.mentor.user.first_name} {answer.mentorship_session.mentor.user.last_name}'
         )
         question['lowest'] = strings[lang]['session']['lowest']
         question['highest'] = strings[lang]['session']['highest']
+        question['type'] = 'SESSION'
     elif answer.event is not None:
         question['title'] = strings[lang]['event']['title']
         question['lowest'] = strings[lang]['event']['lowest']
         question['highest'] = strings[lang]['event']['highest']
+        question['type'] = 'EVENT'
     elif answer.mentor is not None:
         question['title'] = strings[lang]['mentor']['title'].format(answer.mentor.first_name + ' ' +
                                                                     answer.mentor.last_name)
         question['lowest'] = strings[lang]['mentor']['lowest']
         question['highest'] = strings[lang]['mentor']['highest']
+        question['type'] = 'MENTOR'
     elif answer.cohort is not None:
         title = answer.cohort.syllabus_version.syllabus.name if answer.cohort.syllabus_version \
             and answer.cohort.syllabus_version.syllabus.name else answer.cohort.name
@@ -56,10 +59,12 @@ def build_question(answer):
         question['title'] = strings[lang]['cohort']['title'].format(title)
         question['lowest'] = strings[lang]['cohort']['lowest']
         question['highest'] = strings[lang]['cohort']['highest']
+        question['type'] = 'COHORT'
     elif answer.academy is not None:
         question['title'] = strings[lang]['academy']['title'].format(answer.academy.name)
         question['lowest'] = strings[lang]['academy']['lowest']
         question['highest'] = strings[lang]['academy']['highest']
+        question['type'] = 'ACADEMY'
 
     return question
 
@@ -92,6 +97,7 @@ def generate_user_cohort_survey_answers(user, survey, status='OPENED'):
         answer.title = question['title']
         answer.lowest = question['lowest']
         answer.highest = question['highest']
+        answer.question_type = question['type']
         answer.user = user
         answer.status = status
         answer.survey = survey
@@ -141,6 +147,75 @@ def generate_user_cohort_survey_answers(user, survey, status='OPENED'):
     return _answers
 
 
+def generate_cohort_survey_answers(users, survey, status='OPENED'):
+    """
+    Generate the answers of a survey for many students at once, the questions are built once and copied to
+    each student, the students that have answers already keep them.
+    """
+
+    cohort = survey.cohort
+    statuses = ['ACTIVE', 'GRADUATED']
+
+    teachers = list(
+        CohortUser.objects.filter(cohort=cohort, role='TEACHER',
+                                  educational_status__in=statuses).select_related('user'))
+    if not teachers:
+        raise ValidationException('This cohort must have a teacher assigned to be able to survey it', 400)
+
+    assistants = CohortUser.objects.filter(cohort=cohort, role='ASSISTANT',
+                                           educational_status__in=statuses).select_related('user')
+
+    # the cohort in general, the first teachers and assistants, and the whole academy
+    questions = [Answer(cohort=cohort, academy=cohort.academy, lang=survey.lang)]
+    questions += [
+        Answer(mentor=x.user, cohort=cohort, academy=cohort.academy, lang=survey.lang)
+        for x in teachers[:survey.max_teachers_to_ask] + list(assistants[:survey.max_assistants_to_ask])
+    ]
+    questions.append(Answer(academy=cohort.academy, lang=survey.lang))
+
+    for answer in questions:
+        question = build_question(answer)
+        answer.title = question['title']
+        answer.lowest = question['lowest']
+        answer.highest = question['highest']
+        answer.question_type = question['type']
+
+    answered = set(Answer.objects.filter(survey=survey, user__in=users).values_list('user__id', flat=True))
+    utc_now = timezone.now()
+
+    answers = [
+        Answer(title=x.title,
+               lowest=x.lowest,
+               highest=x.highest,
+               question_type=x.question_type,
+               lang=x.lang,
+               mentor=x.mentor,
+               cohort=x.cohort,
+               academy=x.academy,
+               user=user,
+               status=status,
+               survey=survey,
+               opened_at=utc_now) for user in users if user.id not in answered for x in questions
+    ]
+
+    return Answer.objects.bulk_create(answers)
+
+
+def build_temporal_tokens(users, hours_length=48):
+    """
+    Build a temporal token per user, they are not saved, Token.save is skipped by a bulk insert, so the key
+    and the expiration are set here.
+    """
+
+    Token.delete_expired_tokens()
+
+    expires_at = timezone.now() + timedelta(hours=hours_length)
+    return [
+        Token(user=user, key=Token.generate_key(), token_type='temporal', expires_at=expires_at)
+        for user in users
+    ]
+
+
 def api_url():
     return os.getenv('API_URL', '')
 
@@ -198,6 +273,72 @@ def send_cohort_survey(self, user_id, survey_id):
         notify_actions.send_slack('nps_survey', user.slackuser, survey.cohort.academy.slackteam, data=data)
 
 
+@shared_task(bind=True, base=BaseTaskWithRetry)
+def send_cohort_surveys(self, survey_id, user_ids):
+    logger.debug('Starting send_cohort_surveys')
+    survey = Survey.objects.filter(id=survey_id).select_related('cohort__academy',
+                                                                'cohort__syllabus_version__syllabus').first()
+    if survey is None:
+        logger.error('Survey not found')
+        return False
+
+    utc_now = timezone.now()
+
+    if utc_now > survey.created_at + survey.duration:
+        logger.error('This survey has already expired')
+        return False
+
+    cohort_users = CohortUser.objects.filter(cohort=survey.cohort,
+                                             role='STUDENT',
+                                             user__id__in=user_ids,
+                                             educational_status__in=['ACTIVE', 'GRADUATED']).select_related(
+                                                 'user', 'user__slackuser')
+
+    users = []
+    for cu in cohort_users:
+        if not cu.user.email and not hasattr(cu.user, 'slackuser'):
+            logger.error(f'Author not have email and slack, this survey cannot be send by {str(cu.user.id)}')
+            continue
+
+        users.append(cu.user)
+
+    if not users:
+        logger.error('There are no students to send this survey')
+        return False
+
+    generate_cohort_survey_answers(users, survey, status='SENT')
+    tokens = Token.objects.bulk_create(build_temporal_tokens(users))
+    links = {
+        token.user.id: f'https://nps.breatheco.de/survey/{survey_id}?token={token.key}'
+        for token in tokens
+    }
+
+    data = {
+        'SUBJECT': strings[survey.lang]['survey_subject'],
+        'MESSAGE': strings[survey.lang]['survey_message'],
+        'TRACKER_URL': f'{api_url()}/v1/feedback/survey/{survey_id}/tracker.png',
+        'BUTTON': strings[survey.lang]['button_label'],
+    }
+
+    notify_actions.send_email_messages('nps_survey',
+                                       {x.email: {
+                                           'LINK': links[x.id]
+                                       }
+                                        for x in users if x.email}, data)
+
+    if hasattr(survey.cohort.academy, 'slackteam'):
+        for user in users:
+            if hasattr(user, 'slackuser'):
+                notify_actions.send_slack('nps_survey',
+                                          user.slackuser,
+                                          survey.cohort.academy.slackteam,
+                                          data={
+                                              **data, 'LINK': links[user.id]
+                                          })
+
+    return True
+
+
 @shared_task(bind=True, base=BaseTaskWithRetry)
 def process_student_graduation(self, cohort_id, user_id):
     from .actions import create_user_graduation_reviews
@@ -225,8 +366,9 @@ def recalculate_survey_scores(self, survey_id):
         logger.error('Survey not found')
         return
 
-    survey.response_rate = actions.calculate_survey_response_rate(survey.id)
-    survey.scores = actions.calculate_survey_scores(survey.id)
+    stats = actions.get_survey_stats(survey.id)
+    survey.response_rate = stats['response_rate']
+    survey.scores = stats['scores']
     survey.save()
 
 
@@ -248,8 +390,10 @@ def process_answer_received(self, answer_id):
         logger.error('No survey connected to answer.')
         return
 
-    answer.survey.response_rate = actions.calculate_survey_response_rate(answer.survey.id)
-    answer.survey.scores = actions.calculate_survey_scores(answer.survey.id)
+    # the scores of the survey are aggregated again in one query with this answer
+    stats = actions.get_survey_stats(answer.survey.id)
+    answer.survey.response_rate = stats['response_rate']
+    answer.survey.scores = stats['scores']
     answer.survey.save()
 
     if answer.user and answer.academy and answer.score is not None and answer.score < 8:
@@ -322,6 +466,7 @@ def send_mentorship_session_survey(self, session_id):
         answer.title = question['title']
         answer.lowest = question['lowest']
         answer.highest = question['highest']
+        answer.question_type = question['type']
         answer.user = session.mentee
         answer.status = 'SENT'
         answer.save()
@@ -5,7 +5,7 @@ import random
 from unittest.mock import patch, MagicMock, call
 from django.urls.base import reverse_lazy
 from rest_framework import status
-from breathecode.feedback.actions import calculate_survey_scores
+from breathecode.feedback.actions import calculate_survey_scores, get_survey_stats
 
 from breathecode.utils.api_view_extensions.api_view_extension_handlers import APIViewExtensionHandlers
 from breathecode.utils.validation_exception import ValidationException
@@ -134,33 +134,41 @@ class SurveyTestSuite(FeedbackTestCase):
             'status': 'ANSWERED',
             'score': random.randint(1, 11),
             'title': strings['en']['academy']['title'].format('asd'),
+            'question_type': 'ACADEMY',
         } for _ in range(0, size_of_academy_answers)]
 
         cohort_answers = [{
             'status': 'ANSWERED',
             'score': random.randint(1, 11),
             'title': strings['en']['cohort']['title'].format('asd'),
+            'question_type': 'COHORT',
         } for _ in range(0, size_of_cohort_answers)]
 
         mentor1_answers = [{
             'status': 'ANSWERED',
             'score': random.randint(1, 11),
-            'title': strings['en']['mentor']['title'].format('asd1'),
+            'title': strings['en']['mentor']['title'].format('John Doe'),
+            'question_type': 'MENTOR',
+            'mentor_id': 1,
         } for _ in range(0, size_of_mentor1_answers)]
 
         mentor2_answers = [{
             'status': 'ANSWERED',
             'score': random.randint(1, 11),
-            'title': strings['en']['mentor']['title'].format('asd2'),
+            'title': strings['en']['mentor']['title'].format('Jane Doe'),
+            'question_type': 'MENTOR',
+            'mentor_id': 2,
         } for _ in range(0, size_of_mentor2_answers)]
 
         answers = academy_answers + cohort_answers + mentor1_answers + mentor2_answers
 
         survey = {'response_rate': random.randint(1, 101)}
+        mentors = [{'first_name': 'John', 'last_name': 'Doe'}, {'first_name': 'Jane', 'last_name': 'Doe'}]
         model = self.generate_models(authenticate=True,
                                      profile_academy=True,
                                      capability='read_survey',
                                      role=1,
+                                     user=mentors,
                                      survey=survey,
                                      answer=answers)
 
@@ -172,12 +180,12 @@ class SurveyTestSuite(FeedbackTestCase):
             sum([x['score'] for x in cohort_answers]) / size_of_cohort_answers,
             'mentors': [
                 {
-                    'name': 'asd1',
-                    'score': sum([x['score'] for x in mentor1_answers]) / size_of_mentor1_answers,
+                    'name': 'Jane Doe',
+                    'score': sum([x['score'] for x in mentor2_answers]) / size_of_mentor2_answers,
                 },
                 {
-                    'name': 'asd2',
-                    'score': sum([x['score'] for x in mentor2_answers]) / size_of_mentor2_answers,
+                    'name': 'John Doe',
+                    'score': sum([x['score'] for x in mentor1_answers]) / size_of_mentor1_answers,
                 },
             ],
             'total':
@@ -195,3 +203,57 @@ class SurveyTestSuite(FeedbackTestCase):
             self.bc.database.list_of('feedback.Answer'),
             self.bc.format.to_dict(model.answer),
         )
+
+    """
+    🔽🔽🔽 Scores and response rate in one query
+    """
+
+    @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
+    def test_get_survey_stats__in_one_query(self):
+        answers = [
+            {
+                'status': 'ANSWERED',
+                'score': 10,
+                'question_type': 'ACADEMY'
+            },
+            {
+                'status': 'ANSWERED',
+                'score': 6,
+                'question_type': 'COHORT'
+            },
+            {
+                'status': 'ANSWERED',
+                'score': 8,
+                'question_type': 'MENTOR',
+                'mentor_id': 1
+            },
+            {
+                'status': 'SENT',
+                'score': None,
+                'question_type': 'MENTOR',
+                'mentor_id': 1
+            },
+        ]
+        model = self.bc.database.create(user={
+            'first_name': 'John',
+            'last_name': 'Doe'
+        },
+                                        survey=1,
+                                        answer=answers)
+
+        with self.assertNumQueries(1):
+            stats = get_survey_stats(1)
+
+        self.assertEqual(
+            stats, {
+                'response_rate': 75.0,
+                'scores': {
+                    'total': 8.0,
+                    'academy': 10.0,
+                    'cohort': 6.0,
+                    'mentors': [{
+                        'name': 'John Doe',
+                        'score': 8.0
+                    }],
+                },
+            })
@@ -112,6 +112,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
                 'lowest': translations['event']['lowest'],
                 'highest': translations['event']['highest'],
                 'lang': 'en',
+                'question_type': None,
                 'event_id': None,
                 'mentor_id': None,
                 'cohort_id': n + 1,
@@ -169,6 +170,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
                 'lowest': translations['event']['lowest'],
                 'highest': translations['event']['highest'],
                 'lang': 'en',
+                'question_type': None,
                 'event_id': None,
                 'mentor_id': None,
                 'cohort_id': n + 1,
@@ -228,6 +230,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
                 'highest': 'very good',
                 'id': n + 1,
                 'lang': 'en',
+                'question_type': 'COHORT',
                 'lowest': 'not good',
                 'mentor_id': None,
                 'mentorship_session_id': None,
@@ -288,6 +291,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
                 'highest': 'very good',
                 'id': n + 1,
                 'lang': 'en',
+                'question_type': 'COHORT',
                 'lowest': 'not good',
                 'mentor_id': None,
                 'mentorship_session_id': None,
@@ -352,6 +356,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
                 'lowest': 'not good',
                 'highest': 'very good',
                 'lang': 'en',
+                'question_type': 'COHORT',
                 'cohort_id': n + 1,
                 'academy_id': None,
                 'mentor_id': None,
@@ -419,6 +424,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
                 'lowest': 'not good',
                 'highest': 'very good',
                 'lang': 'en',
+                'question_type': 'COHORT',
                 'cohort_id': n + 1,
                 'academy_id': None,
                 'mentor_id': None,
@@ -488,6 +494,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
                 'highest': 'muy buena',
                 'id': n + 1,
                 'lang': 'es',
+                'question_type': 'COHORT',
                 'lowest': 'mala',
                 'mentor_id': None,
                 'mentorship_session_id': None,
@@ -0,0 +1,130 @@
+"""
+Test send_questions
+"""
+from unittest.mock import MagicMock, call, patch
+from ..mixins import FeedbackTestCase
+from ...actions import send_questions
+from breathecode.feedback import actions
+
+
+def send_email_messages_mock():
+
+    def send_email_messages(template_slug, recipients, data={}):
+        return {x: True for x in recipients}
+
+    return MagicMock(side_effect=send_email_messages)
+
+
+class SendQuestionsTestSuite(FeedbackTestCase):
+
+    def get_cohort_users(self):
+        return self.bc.database.get_model('admissions.CohortUser').objects.all()
+
+    def get_links(self):
+        return {
+            x['user_id']: f"https://nps.breatheco.de/{x['id']}?token={x['token__key']}"
+            for x in self.bc.database.get_model('feedback.Answer').objects.values(
+                'id', 'user_id', 'token__key')
+        }
+
+    """
+    🔽🔽🔽 With errors
+    """
+
+    @patch('breathecode.feedback.actions.send_email_messages', send_email_messages_mock())
+    def test_send_questions__with_errors(self):
+        cohort_users = [{
+            'user_id': n,
+            'educational_status': status
+        } for n, status in [(1, 'DROPPED'), (2, 'ACTIVE')]]
+        self.bc.database.create(user=2, cohort=1, cohort_user=cohort_users)
+
+        result = send_questions(self.get_cohort_users())
+
+        self.assertEqual(
+            result, {
+                'success': [],
+                'error': [
+                    'Impossible to determine the student cohort, maybe it has more than one, or cero.',
+                    'Cohort not have one SyllabusVersion',
+                ],
+            })
+        self.assertEqual(self.bc.database.list_of('feedback.Answer'), [])
+        self.assertEqual(actions.send_email_messages.call_args_list, [])
+
+    """
+    🔽🔽🔽 With many students
+    """
+
+    @patch('breathecode.feedback.actions.send_email_messages', send_email_messages_mock())
+    def test_send_questions__one_batch_per_cohort(self):
+        cohort_users = [{'user_id': n, 'educational_status': 'ACTIVE'} for n in range(1, 3)]
+        model = self.bc.database.create(user=2,
+                                        cohort={'language': 'en'},
+                                        cohort_user=cohort_users,
+                                        syllabus_version=1,
+                                        syllabus_schedule=1,
+                                        syllabus={'name': 'Full Stack'})
+
+        result = send_questions(self.get_cohort_users())
+
+        title = 'How has been your experience studying Full Stack so far?'
+        self.assertEqual(result, {'success': [f'Survey sent to {x.email}' for x in model.user], 'error': []})
+        self.assertEqual([(x['user_id'], x['title'], x['status'], x['token_id'])
+                          for x in self.bc.database.list_of('feedback.Answer')], [
+                              (1, title, 'SENT', 1),
+                              (2, title, 'SENT', 2),
+                          ])
+
+        links = self.get_links()
+        self.assertEqual(actions.send_email_messages.call_args_list, [
+            call(
+                'nps', {
+                    model.user[0].email: {
+                        'ANSWER_ID': 1,
+                        'LINK': links[1]
+                    },
+                    model.user[1].email: {
+                        'ANSWER_ID': 2,
+                        'LINK': links[2]
+                    },
+                }, {
+                    'QUESTION': title,
+                    'HIGHEST': 'very good',
+                    'LOWEST': 'not good',
+                    'SUBJECT': title,
+                    'BUTTON': 'Answer the question',
+                }),
+        ])
+
+    """
+    🔽🔽🔽 With a question sent before
+    """
+
+    @patch('breathecode.feedback.actions.send_email_messages', send_email_messages_mock())
+    def test_send_questions__sent_again(self):
+        model = self.bc.database.create(user=1,
+                                        cohort={'language': 'en'},
+                                        cohort_user={'educational_status': 'ACTIVE'},
+                                        syllabus_version=1,
+                                        syllabus_schedule=1,
+                                        token=1,
+                                        answer={
+                                            'status': 'SENT',
+                                            'title': 'How are you?'
+                                        })
+
+        send_questions(self.get_cohort_users())
+
+        # the same answer with a new token
+        self.assertEqual(self.bc.database.list_of('feedback.Answer'),
+                         [{
+                             **self.bc.format.to_dict(model.answer),
+                             'token_id': 2,
+                         }])
+        self.assertEqual([x['id'] for x in self.bc.database.list_of('authenticate.Token')], [2])
+        self.assertEqual(actions.send_email_messages.call_args_list[0][0][1],
+                         {model.user.email: {
+                             'ANSWER_ID': 1,
+                             'LINK': self.get_links()[1]
+                         }})
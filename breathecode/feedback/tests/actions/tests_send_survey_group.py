@@ -15,15 +15,15 @@ UTC_NOW = timezone.now()
 
 class AnswerTestSuite(FeedbackTestCase):
 
-    @patch('breathecode.feedback.tasks.send_cohort_survey.delay', MagicMock())
+    @patch('breathecode.feedback.tasks.send_cohort_surveys.delay', MagicMock())
     def test_send_survey_group(self):
 
         with self.assertRaisesMessage(ValidationException, 'missing-survey-or-cohort'):
 
             send_survey_group()
-        self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+        self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
 
-    @patch('breathecode.feedback.tasks.send_cohort_survey.delay', MagicMock())
+    @patch('breathecode.feedback.tasks.send_cohort_surveys.delay', MagicMock())
     def test_when_survey_and_cohort_do_not_match(self):
 
         model = self.generate_models(cohort=2, survey=1)
@@ -31,9 +31,9 @@ class AnswerTestSuite(FeedbackTestCase):
         with self.assertRaisesMessage(ValidationException, 'survey-does-not-match-cohort'):
 
             send_survey_group(model.survey, model.cohort[1])
-        self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+        self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
 
-    @patch('breathecode.feedback.tasks.send_cohort_survey.delay', MagicMock())
+    @patch('breathecode.feedback.tasks.send_cohort_surveys.delay', MagicMock())
     def test_when_cohort_does_not_have_teacher_assigned_to_survey(self):
         wrong_roles = ['ASSISTANT', 'REVIEWER', 'STUDENT']
 
@@ -44,9 +44,9 @@ class AnswerTestSuite(FeedbackTestCase):
             with self.assertRaisesMessage(ValidationException, 'cohort-must-have-teacher-assigned-to-survey'):
 
                 send_survey_group(model.survey, model.cohort)
-            self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+            self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
 
-    @patch('breathecode.feedback.tasks.send_cohort_survey.delay', MagicMock())
+    @patch('breathecode.feedback.tasks.send_cohort_surveys.delay', MagicMock())
     @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
     def test_when_educational_status_is_active_or_graduated(self):
 
@@ -77,11 +77,11 @@ class AnswerTestSuite(FeedbackTestCase):
             }])
 
             self.bc.database.delete('feedback.Survey')
-            self.assertEqual(tasks.send_cohort_survey.delay.call_args_list,
-                             [call(model.user.id, model.survey.id)])
-            tasks.send_cohort_survey.delay.call_args_list = []
+            self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list,
+                             [call(model.survey.id, [model.user.id])])
+            tasks.send_cohort_surveys.delay.call_args_list = []
 
-    @patch('breathecode.feedback.tasks.send_cohort_survey.delay', MagicMock())
+    @patch('breathecode.feedback.tasks.send_cohort_surveys.delay', MagicMock())
     @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
     def test_when_educational_status_is_all_of_the_others_error(self):
 
@@ -116,9 +116,9 @@ class AnswerTestSuite(FeedbackTestCase):
                 f"{model.user.email} because it's not an active or graduated student\"]"
                 '}'
             }])
-            self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+            self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
 
-    @patch('breathecode.feedback.tasks.send_cohort_survey.delay', MagicMock())
+    @patch('breathecode.feedback.tasks.send_cohort_surveys.delay', MagicMock())
     @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
     def test_when_some_cases_are_successful_and_some_are_error(self):
 
@@ -159,11 +159,11 @@ class AnswerTestSuite(FeedbackTestCase):
         }])
 
         self.bc.database.delete('feedback.Survey')
-        self.assertEqual(tasks.send_cohort_survey.delay.call_args_list,
-                         [call(model.user.id, model.survey.id)])
-        tasks.send_cohort_survey.delay.call_args_list = []
+        self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list,
+                         [call(model.survey.id, [model.user.id])])
+        tasks.send_cohort_surveys.delay.call_args_list = []
 
-    @patch('breathecode.feedback.tasks.send_cohort_survey.delay', MagicMock())
+    @patch('breathecode.feedback.tasks.send_cohort_surveys.delay', MagicMock())
     @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
     def test_when_survey_is_none(self):
 
@@ -207,4 +207,4 @@ class AnswerTestSuite(FeedbackTestCase):
             'scores':
             None,
         }])
-        self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+        self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
@@ -4,27 +4,34 @@ Test /answer
 import logging
 from unittest.mock import MagicMock, call, patch
 from django.http.request import HttpRequest
-from django.contrib.auth.models import User
 from ..mixins import FeedbackTestCase
 from ...admin import send_bulk_cohort_user_survey
 
-from ..mixins import FeedbackTestCase
 from ... import actions
 
 from django.contrib.messages import api
 
 
+def send_questions_mock(*errors):
+    return MagicMock(return_value={'success': [], 'error': list(errors)})
+
+
 class SendSurveyTestSuite(FeedbackTestCase):
+
+    def get_cohort_users(self):
+        return [[x.id for x in args[0]] for args, _ in actions.send_questions.call_args_list]
+
     """
     🔽🔽🔽 With zero CohortUser
     """
 
     @patch('django.contrib.messages.api.add_message', MagicMock())
-    @patch('breathecode.feedback.actions.send_question', MagicMock())
+    @patch('breathecode.feedback.actions.send_questions', send_questions_mock())
     def test_with_zero_cohort_users(self):
         request = HttpRequest()
+        CohortUser = self.bc.database.get_model('admissions.CohortUser')
 
-        queryset = User.objects.all()
+        queryset = CohortUser.objects.all()
         result = send_bulk_cohort_user_survey(None, request, queryset)
 
         self.assertEqual(result, None)
@@ -33,14 +40,14 @@ class SendSurveyTestSuite(FeedbackTestCase):
         self.assertEqual(api.add_message.call_args_list, [
             call(request, 25, 'Survey was successfully sent', extra_tags='', fail_silently=False),
         ])
-        self.assertEqual(actions.send_question.call_args_list, [])
+        self.assertEqual(self.get_cohort_users(), [[]])
 
     """
     🔽🔽🔽 With two CohortUser
     """
 
     @patch('django.contrib.messages.api.add_message', MagicMock())
-    @patch('breathecode.feedback.actions.send_question', MagicMock())
+    @patch('breathecode.feedback.actions.send_questions', send_questions_mock())
     def test_with_two_cohort_users(self):
         request = HttpRequest()
         CohortUser = self.bc.database.get_model('admissions.CohortUser')
@@ -59,19 +66,18 @@ class SendSurveyTestSuite(FeedbackTestCase):
             str([
                 call(request, 25, 'Survey was successfully sent', extra_tags='', fail_silently=False),
             ]))
-        self.assertEqual(actions.send_question.call_args_list, [
-            call(model.user, model.cohort),
-            call(model.user, model.cohort),
-        ])
+
+        # all of them are sent at once
+        self.assertEqual(self.get_cohort_users(), [[1, 2]])
 
     """
-    🔽🔽🔽 With two CohortUser raise exceptions
+    🔽🔽🔽 With two CohortUser with errors
     """
 
     @patch('django.contrib.messages.api.add_message', MagicMock())
-    @patch('breathecode.feedback.actions.send_question', MagicMock(side_effect=Exception('qwerty')))
+    @patch('breathecode.feedback.actions.send_questions', send_questions_mock('qwerty', 'qwerty'))
     @patch('logging.Logger.fatal', MagicMock())
-    def test_with_two_cohort_users__raises_exceptions__same_exception(self):
+    def test_with_two_cohort_users__with_errors__same_error(self):
         request = HttpRequest()
         CohortUser = self.bc.database.get_model('admissions.CohortUser')
 
@@ -84,20 +90,16 @@ class SendSurveyTestSuite(FeedbackTestCase):
         self.assertEqual(result, None)
         self.assertEqual(self.bc.database.list_of('admissions.CohortUser'), db)
 
-        self.assertEqual(actions.send_question.call_args_list, [
-            call(model.user, model.cohort),
-            call(model.user, model.cohort),
-        ])
+        self.assertEqual(self.get_cohort_users(), [[1, 2]])
         self.assertEqual(api.add_message.call_args_list, [
             call(request, 40, 'qwerty (2)', extra_tags='', fail_silently=False),
         ])
         self.assertEqual(logging.Logger.fatal.call_args_list, [call('qwerty'), call('qwerty')])
 
     @patch('django.contrib.messages.api.add_message', MagicMock())
-    @patch('breathecode.feedback.actions.send_question',
-           MagicMock(side_effect=[Exception('qwerty1'), Exception('qwerty2')]))
+    @patch('breathecode.feedback.actions.send_questions', send_questions_mock('qwerty1', 'qwerty2'))
     @patch('logging.Logger.fatal', MagicMock())
-    def test_with_two_cohort_users__raises_exceptions__different_exceptions(self):
+    def test_with_two_cohort_users__with_errors__different_errors(self):
         request = HttpRequest()
         CohortUser = self.bc.database.get_model('admissions.CohortUser')
 
@@ -110,10 +112,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
         self.assertEqual(result, None)
         self.assertEqual(self.bc.database.list_of('admissions.CohortUser'), db)
 
-        self.assertEqual(actions.send_question.call_args_list, [
-            call(model.user, model.cohort),
-            call(model.user, model.cohort),
-        ])
+        self.assertEqual(self.get_cohort_users(), [[1, 2]])
         self.assertEqual(api.add_message.call_args_list, [
             call(request, 40, 'qwerty1 (1) - qwerty2 (1)', extra_tags='', fail_silently=False),
         ])
@@ -2,7 +2,7 @@
 Test /answer
 """
 import logging
-from datetime import datetime
+from datetime import timedelta
 from unittest.mock import MagicMock, call, patch
 from django.http.request import HttpRequest
 from ..mixins import FeedbackTestCase
@@ -10,15 +10,26 @@ from ...admin import send_bulk_survey
 from ... import actions
 
 from django.contrib.messages import api
+from django.utils import timezone
+
+WITHOUT_COHORT = 'Impossible to determine the student cohort, maybe it has more than one, or cero.'
+
+
+def send_questions_mock(*errors):
+    return MagicMock(return_value={'success': [], 'error': list(errors)})
 
 
 class SendSurveyTestSuite(FeedbackTestCase):
+
+    def get_cohort_users(self):
+        return [[x.id for x in args[0]] for args, _ in actions.send_questions.call_args_list]
+
     """
     🔽🔽🔽 With zero User
     """
 
     @patch('django.contrib.messages.api.add_message', MagicMock())
-    @patch('breathecode.feedback.actions.send_question', MagicMock())
+    @patch('breathecode.feedback.actions.send_questions', send_questions_mock())
     def test_with_zero_users(self):
         request = HttpRequest()
         User = self.bc.database.get_model('auth.User')
@@ -32,15 +43,16 @@ class SendSurveyTestSuite(FeedbackTestCase):
         self.assertEqual(api.add_message.call_args_list, [
             call(request, 25, 'Survey was successfully sent', extra_tags='', fail_silently=False),
         ])
-        self.assertEqual(actions.send_question.call_args_list, [])
+        self.assertEqual(self.get_cohort_users(), [[]])
 
     """
-    🔽🔽🔽 With two User
+    🔽🔽🔽 With two User without cohort
     """
 
     @patch('django.contrib.messages.api.add_message', MagicMock())
-    @patch('breathecode.feedback.actions.send_question', MagicMock())
-    def test_with_two_users(self):
+    @patch('breathecode.feedback.actions.send_questions', send_questions_mock())
+    @patch('logging.Logger.fatal', MagicMock())
+    def test_with_two_users__without_cohort(self):
         request = HttpRequest()
         User = self.bc.database.get_model('auth.User')
 
@@ -54,22 +66,28 @@ class SendSurveyTestSuite(FeedbackTestCase):
         self.assertEqual(self.bc.database.list_of('auth.User'), db)
 
         self.assertEqual(api.add_message.call_args_list, [
-            call(request, 25, 'Survey was successfully sent', extra_tags='', fail_silently=False),
+            call(request, 40, f'{WITHOUT_COHORT} (2)', extra_tags='', fail_silently=False),
         ])
-        self.assertEqual(actions.send_question.call_args_list, [call(model.user[0]), call(model.user[1])])
+        self.assertEqual(self.get_cohort_users(), [[]])
+        self.assertEqual(logging.Logger.fatal.call_args_list, [call(WITHOUT_COHORT), call(WITHOUT_COHORT)])
 
     """
-    🔽🔽🔽 With two User raise exceptions
+    🔽🔽🔽 With two User in two cohorts
     """
 
     @patch('django.contrib.messages.api.add_message', MagicMock())
-    @patch('breathecode.feedback.actions.send_question', MagicMock(side_effect=Exception('qwerty')))
-    @patch('logging.Logger.fatal', MagicMock())
-    def test_with_two_users__raises_exceptions__same_exception(self):
+    @patch('breathecode.feedback.actions.send_questions', send_questions_mock())
+    def test_with_two_users__the_last_cohort_of_each_one(self):
         request = HttpRequest()
         User = self.bc.database.get_model('auth.User')
 
-        model = self.bc.database.create(user=2)
+        cohorts = [{'kickoff_date': timezone.now() + timedelta(days=n)} for n in range(2)]
+        cohort_users = [{
+            'user_id': user,
+            'cohort_id': cohort,
+            'educational_status': 'ACTIVE'
+        } for user in range(1, 3) for cohort in range(1, 3)]
+        model = self.bc.database.create(user=2, cohort=cohorts, cohort_user=cohort_users)
         db = self.bc.format.to_dict(model.user)
 
         queryset = User.objects.all()
@@ -78,21 +96,24 @@ class SendSurveyTestSuite(FeedbackTestCase):
         self.assertEqual(result, None)
         self.assertEqual(self.bc.database.list_of('auth.User'), db)
 
-        self.assertEqual(actions.send_question.call_args_list, [call(model.user[0]), call(model.user[1])])
         self.assertEqual(api.add_message.call_args_list, [
-            call(request, 40, 'qwerty (2)', extra_tags='', fail_silently=False),
+            call(request, 25, 'Survey was successfully sent', extra_tags='', fail_silently=False),
         ])
-        self.assertEqual(logging.Logger.fatal.call_args_list, [call('qwerty'), call('qwerty')])
+        self.assertEqual(self.get_cohort_users(), [[2, 4]])
+
+    """
+    🔽🔽🔽 With two User with errors
+    """
 
     @patch('django.contrib.messages.api.add_message', MagicMock())
-    @patch('breathecode.feedback.actions.send_question',
-           MagicMock(side_effect=[Exception('qwerty1'), Exception('qwerty2')]))
+    @patch('breathecode.feedback.actions.send_questions', send_questions_mock('qwerty1', 'qwerty2'))
     @patch('logging.Logger.fatal', MagicMock())
-    def test_with_two_users__raises_exceptions__different_exceptions(self):
+    def test_with_two_users__with_errors__different_errors(self):
         request = HttpRequest()
         User = self.bc.database.get_model('auth.User')
 
-        model = self.bc.database.create(user=2)
+        cohort_users = [{'user_id': n, 'educational_status': 'ACTIVE'} for n in range(1, 3)]
+        model = self.bc.database.create(user=2, cohort_user=cohort_users)
         db = self.bc.format.to_dict(model.user)
 
         queryset = User.objects.all()
@@ -101,7 +122,7 @@ class SendSurveyTestSuite(FeedbackTestCase):
         self.assertEqual(result, None)
         self.assertEqual(self.bc.database.list_of('auth.User'), db)
 
-        self.assertEqual(actions.send_question.call_args_list, [call(model.user[0]), call(model.user[1])])
+        self.assertEqual(self.get_cohort_users(), [[1, 2]])
         self.assertEqual(api.add_message.call_args_list, [
             call(request, 40, 'qwerty1 (1) - qwerty2 (1)', extra_tags='', fail_silently=False),
         ])
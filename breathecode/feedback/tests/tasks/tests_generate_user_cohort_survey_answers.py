@@ -25,6 +25,7 @@ def answer(data={}):
         'id': 0,
         'lang': 'en',
         'lowest': 'not good',
+        'question_type': None,
         'mentor_id': None,
         'mentorship_session_id': None,
         'opened_at': UTC_NOW,
@@ -77,6 +78,7 @@ class SendCohortSurvey(FeedbackTestCase):
 
             self.assertEqual(self.bc.database.list_of('feedback.Answer'), [
                 answer({
+                    'question_type': 'COHORT',
                     'title': f'How has been your experience studying {model.cohort.name} so far?',
                     'user_id': n + 1,
                     'survey_id': n + 1,
@@ -88,6 +90,7 @@ class SendCohortSurvey(FeedbackTestCase):
                     'token_id': None
                 }),
                 answer({
+                    'question_type': 'MENTOR',
                     'title':
                     f'How has been your experience with your mentor {model.user.first_name} {model.user.last_name} so far?',
                     'lang': 'en',
@@ -105,6 +108,7 @@ class SendCohortSurvey(FeedbackTestCase):
                     'academy_id': n + 1
                 }),
                 answer({
+                    'question_type': 'ACADEMY',
                     'title': f'How likely are you to recommend {model.academy.name} to your friends '
                     'and family?',
                     'user_id': n + 1,
@@ -138,6 +142,7 @@ class SendCohortSurvey(FeedbackTestCase):
 
             self.assertEqual(self.bc.database.list_of('feedback.Answer'), [
                 answer({
+                    'question_type': 'COHORT',
                     'title': f'How has been your experience studying {model.cohort.name} so far?',
                     'user_id': n + 1,
                     'survey_id': n + 1,
@@ -149,6 +154,7 @@ class SendCohortSurvey(FeedbackTestCase):
                     'token_id': None
                 }),
                 answer({
+                    'question_type': 'MENTOR',
                     'title':
                     f'How has been your experience with your mentor {model.user.first_name} {model.user.last_name} so far?',
                     'lang': 'en',
@@ -166,6 +172,7 @@ class SendCohortSurvey(FeedbackTestCase):
                     'academy_id': n + 1
                 }),
                 answer({
+                    'question_type': 'ACADEMY',
                     'title': f'How likely are you to recommend {model.academy.name} to your friends '
                     'and family?',
                     'user_id': n + 1,
@@ -207,6 +214,7 @@ class SendCohortSurvey(FeedbackTestCase):
 
             self.assertEqual(self.bc.database.list_of('feedback.Answer'), [
                 answer({
+                    'question_type': 'COHORT',
                     'title': f'How has been your experience studying {model.cohort.name} so far?',
                     'user_id': n + 1,
                     'survey_id': n + 1,
@@ -218,6 +226,7 @@ class SendCohortSurvey(FeedbackTestCase):
                     'token_id': None
                 }),
                 answer({
+                    'question_type': 'MENTOR',
                     'title':
                     f'How has been your experience with your mentor {model.user.first_name} {model.user.last_name} so far?',
                     'lang': 'en',
@@ -235,6 +244,7 @@ class SendCohortSurvey(FeedbackTestCase):
                     'academy_id': n + 1
                 }),
                 answer({
+                    'question_type': 'MENTOR',
                     'title':
                     f'How has been your experience with your mentor {model.user.first_name} {model.user.last_name} so far?',
                     'user_id': n + 1,
@@ -247,6 +257,7 @@ class SendCohortSurvey(FeedbackTestCase):
                     'mentor_id': n + 1
                 }),
                 answer({
+                    'question_type': 'ACADEMY',
                     'title': f'How likely are you to recommend {model.academy.name} to your friends '
                     'and family?',
                     'user_id': n + 1,
@@ -21,10 +21,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
     @patch('logging.Logger.warn', MagicMock())
     @patch('logging.Logger.error', MagicMock())
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_without_answer(self):
 
         import logging
@@ -35,17 +32,13 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
 
         self.assertEqual(logging.Logger.warn.call_args_list, [])
         self.assertEqual(logging.Logger.error.call_args_list, [call('Answer not found')])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [])
 
     @patch('logging.Logger.warn', MagicMock())
     @patch('logging.Logger.error', MagicMock())
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_without_survey(self):
 
         import logging
@@ -56,17 +49,13 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
 
         self.assertEqual(logging.Logger.warn.call_args_list, [])
         self.assertEqual(logging.Logger.error.call_args_list, [call('No survey connected to answer.')])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [])
 
     @patch('logging.Logger.warn', MagicMock())
     @patch('logging.Logger.error', MagicMock())
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_with_survey(self):
 
         import logging
@@ -78,8 +67,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
 
         self.assertEqual(logging.Logger.warn.call_args_list, [])
         self.assertEqual(logging.Logger.error.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [{
             **survey_db,
             'response_rate': 0.0,
@@ -95,10 +83,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
     @patch('logging.Logger.error', MagicMock())
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
     @patch('breathecode.notify.actions.send_email_message', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_with_survey_score_seven(self):
 
         from breathecode.notify.actions import send_email_message
@@ -113,8 +98,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
         self.assertEqual(logging.Logger.warn.call_args_list, [])
         self.assertEqual(logging.Logger.error.call_args_list, [])
         self.assertEqual(send_email_message.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [{
             **survey_db,
             'response_rate': 100.0,
@@ -130,10 +114,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
     @patch('logging.Logger.error', MagicMock())
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
     @patch('breathecode.notify.actions.send_email_message', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_with_survey_score_seven__with_academy(self):
 
         from breathecode.notify.actions import send_email_message
@@ -148,8 +129,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
         self.assertEqual(logging.Logger.warn.call_args_list, [])
         self.assertEqual(logging.Logger.error.call_args_list, [])
         self.assertEqual(send_email_message.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [{
             **survey_db,
             'response_rate': 100.0,
@@ -165,10 +145,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
     @patch('os.getenv', MagicMock(return_value=None))
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
     @patch('breathecode.notify.actions.send_email_message', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_with_survey_score_seven__with_academy__with_user__without_system_email__without_feedback_email(
             self):
 
@@ -186,8 +163,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
                           call('academy-feedback-email-not-found')])
         self.assertEqual(os.getenv.call_args_list, [call('ENV', ''), call('SYSTEM_EMAIL'), call('ADMIN_URL')])
         self.assertEqual(send_email_message.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [{
             **survey_db,
             'response_rate': 0.0,
@@ -207,10 +183,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
            })))
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
     @patch('breathecode.notify.actions.send_email_message', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_with_survey_score_seven__with_academy__with_user__without_system_email__with_feedback_email(
             self):
 
@@ -237,8 +210,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
                      'LINK': f'https://www.whatever.com/feedback/surveys/{model.answer.academy.slug}/1'
                  })
         ])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [{
             **survey_db,
             'response_rate': 0.0,
@@ -258,10 +230,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
            })))
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
     @patch('breathecode.notify.actions.send_email_message', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_with_survey_score_seven__with_academy__with_user__with_system_email__without_feedback_email(
             self):
 
@@ -287,8 +256,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
                      'LINK': f'https://www.whatever.com/feedback/surveys/{model.answer.academy.slug}/1'
                  })
         ])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [{
             **survey_db,
             'response_rate': 0.0,
@@ -308,10 +276,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
            })))
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
     @patch('breathecode.notify.actions.send_email_message', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_with_survey_score_seven__with_academy__with_user__with_system_email__with_feedback_email(
             self):
 
@@ -338,8 +303,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
                      'LINK': f'https://www.whatever.com/feedback/surveys/{model.answer.academy.slug}/1'
                  })
         ])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [{
             **survey_db,
             'response_rate': 0.0,
@@ -355,10 +319,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
     @patch('logging.Logger.error', MagicMock())
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
     @patch('breathecode.notify.actions.send_email_message', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores',
-           MagicMock(wraps=actions.calculate_survey_scores))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(wraps=actions.calculate_survey_response_rate))
+    @patch('breathecode.feedback.actions.get_survey_stats', MagicMock(wraps=actions.get_survey_stats))
     def test_survey_answered_task_with_survey_score_ten__with_academy__with_user(self):
 
         from breathecode.notify.actions import send_email_message
@@ -373,8 +334,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
         self.assertEqual(logging.Logger.warn.call_args_list, [])
         self.assertEqual(logging.Logger.error.call_args_list, [])
         self.assertEqual(send_email_message.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [{
             **survey_db,
             'response_rate': 100.0,
@@ -44,16 +44,17 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
     @patch('logging.Logger.debug', MagicMock())
     @patch('logging.Logger.error', MagicMock())
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores', MagicMock(return_value=get_scores()))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(return_value=RESPONSE_RATE))
+    @patch('breathecode.feedback.actions.get_survey_stats',
+           MagicMock(return_value={
+               'response_rate': RESPONSE_RATE,
+               'scores': get_scores()
+           }))
     def test_with_zero_surveys(self):
         recalculate_survey_scores.delay(1)
 
         self.assertEqual(logging.Logger.debug.call_args_list, [call('Starting recalculate_survey_score')])
         self.assertEqual(logging.Logger.error.call_args_list, [call('Survey not found')])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [])
 
     """
@@ -63,9 +64,11 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
     @patch('logging.Logger.debug', MagicMock())
     @patch('logging.Logger.error', MagicMock())
     @patch('breathecode.feedback.signals.survey_answered.send', MagicMock())
-    @patch('breathecode.feedback.actions.calculate_survey_scores', MagicMock(return_value=get_scores()))
-    @patch('breathecode.feedback.actions.calculate_survey_response_rate',
-           MagicMock(return_value=RESPONSE_RATE))
+    @patch('breathecode.feedback.actions.get_survey_stats',
+           MagicMock(return_value={
+               'response_rate': RESPONSE_RATE,
+               'scores': get_scores()
+           }))
     def test_with_one_surveys(self):
         model = self.bc.database.create(survey=1)
 
@@ -75,8 +78,7 @@ class SurveyAnsweredTestSuite(FeedbackTestCase):
 
         self.assertEqual(logging.Logger.debug.call_args_list, [call('Starting recalculate_survey_score')])
         self.assertEqual(logging.Logger.error.call_args_list, [])
-        self.assertEqual(actions.calculate_survey_scores.call_args_list, [call(1)])
-        self.assertEqual(actions.calculate_survey_response_rate.call_args_list, [call(1)])
+        self.assertEqual(actions.get_survey_stats.call_args_list, [call(1)])
         self.assertEqual(self.bc.database.list_of('feedback.Survey'), [
             {
                 **self.bc.format.to_dict(model.survey),
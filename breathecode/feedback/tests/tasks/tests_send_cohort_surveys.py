@@ -0,0 +1,122 @@
+"""
+Test send_cohort_surveys
+"""
+import logging
+from unittest.mock import MagicMock, call, patch
+from breathecode.feedback.tasks import send_cohort_surveys
+import breathecode.notify.actions as actions
+from ..mixins import FeedbackTestCase
+
+SURVEY_DATA = {
+    'SUBJECT': 'We need your feedback',
+    'MESSAGE': 'Please take 5 minutes to give us feedback about your experience at the academy so far.',
+    'TRACKER_URL': '/v1/feedback/survey/1/tracker.png',
+    'BUTTON': 'Answer the question',
+}
+
+
+def get_cohort_users(*students):
+    return [{
+        'user_id': 1,
+        'role': 'TEACHER',
+        'educational_status': 'ACTIVE'
+    }] + [{
+        'user_id': n,
+        'role': 'STUDENT',
+        'educational_status': 'ACTIVE'
+    } for n in students]
+
+
+class SendCohortSurveysTestSuite(FeedbackTestCase):
+
+    def get_links(self):
+        return {
+            x.user.id: f'https://nps.breatheco.de/survey/1?token={x.key}'
+            for x in self.bc.database.get_model('authenticate.Token').objects.all()
+        }
+
+    """
+    🔽🔽🔽 Without Survey
+    """
+
+    @patch('logging.Logger.error', MagicMock())
+    @patch('breathecode.notify.actions.send_email_messages', MagicMock())
+    def test_send_cohort_surveys__without_survey(self):
+        self.assertFalse(send_cohort_surveys(1, [1]))
+
+        self.assertEqual(logging.Logger.error.call_args_list, [call('Survey not found')])
+        self.assertEqual(actions.send_email_messages.call_args_list, [])
+
+    """
+    🔽🔽🔽 With many students
+    """
+
+    @patch('breathecode.notify.actions.send_email_messages', MagicMock())
+    @patch('breathecode.notify.actions.send_slack', MagicMock())
+    @patch('breathecode.admissions.signals.student_edu_status_updated.send', MagicMock())
+    @patch('breathecode.notify.utils.hook_manager.HookManagerClass.process_model_event', MagicMock())
+    def test_send_cohort_surveys__one_batch(self):
+        model = self.bc.database.create(user=3, cohort=1, survey=1, cohort_user=get_cohort_users(2, 3))
+
+        self.assertTrue(send_cohort_surveys(1, [2, 3]))
+
+        # the cohort, the teacher and the academy for each student
+        answers = [(x['user_id'], x['mentor_id'], x['status'], x['survey_id'])
+                   for x in self.bc.database.list_of('feedback.Answer')]
+        self.assertEqual(answers,
+                         [(user, mentor, 'SENT', 1) for user in [2, 3] for mentor in [None, 1, None]])
+
+        links = self.get_links()
+        self.assertEqual(actions.send_email_messages.call_args_list, [
+            call('nps_survey', {
+                model.user[1].email: {
+                    'LINK': links[2]
+                },
+                model.user[2].email: {
+                    'LINK': links[3]
+                },
+            }, SURVEY_DATA),
+        ])
+        self.assertEqual(actions.send_slack.call_args_list, [])
+
+    @patch('logging.Logger.error', MagicMock())
+    @patch('breathecode.notify.actions.send_email_messages', MagicMock())
+    @patch('breathecode.admissions.signals.student_edu_status_updated.send', MagicMock())
+    @patch('breathecode.notify.utils.hook_manager.HookManagerClass.process_model_event', MagicMock())
+    def test_send_cohort_surveys__student_without_email(self):
+        model = self.bc.database.create(user=[{}, {
+            'email': ''
+        }, {}],
+                                        cohort=1,
+                                        survey=1,
+                                        cohort_user=get_cohort_users(2, 3))
+
+        self.assertTrue(send_cohort_surveys(1, [2, 3]))
+
+        self.assertEqual(logging.Logger.error.call_args_list,
+                         [call('Author not have email and slack, this survey cannot be send by 2')])
+        self.assertEqual({x['user_id'] for x in self.bc.database.list_of('feedback.Answer')}, {3})
+        self.assertEqual(actions.send_email_messages.call_args_list, [
+            call('nps_survey', {model.user[2].email: {
+                                    'LINK': self.get_links()[3]
+                                }}, SURVEY_DATA),
+        ])
+
+    @patch('breathecode.notify.actions.send_email_messages', MagicMock())
+    @patch('breathecode.admissions.signals.student_edu_status_updated.send', MagicMock())
+    @patch('breathecode.notify.utils.hook_manager.HookManagerClass.process_model_event', MagicMock())
+    def test_send_cohort_surveys__answers_generated_before(self):
+        self.bc.database.create(user=2,
+                                cohort=1,
+                                survey=1,
+                                cohort_user=get_cohort_users(2),
+                                answer={
+                                    'user_id': 2,
+                                    'survey_id': 1
+                                })
+
+        self.assertTrue(send_cohort_surveys(1, [2]))
+
+        # the survey is sent again with the same answers
+        self.assertEqual(len(self.bc.database.list_of('feedback.Answer')), 1)
+        self.assertEqual(len(actions.send_email_messages.call_args_list), 1)
@@ -26,6 +26,7 @@ def build_answer_dict(attrs={}):
         'mentor_id': None,
         'mentorship_session_id': None,
         'opened_at': None,
+        'question_type': None,
         'score': None,
         'sent_at': None,
         'status': 'PENDING',
@@ -250,6 +251,7 @@ class ActionCertificateScreenshotTestCase(FeedbackTestCase):
                 'lowest': strings['en']['session']['lowest'],
                 'highest': strings['en']['session']['highest'],
                 'mentorship_session_id': 1,
+                'question_type': 'SESSION',
                 'sent_at': UTC_NOW,
                 'status': 'SENT',
                 'user_id': 1,
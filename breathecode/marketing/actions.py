@@ -1,8 +1,11 @@
 import os, re, requests
-from typing import Optional
+from typing import Iterator, Optional
 from itertools import chain
+from django.db import connection
+from django.db.models.signals import post_save
 from django.utils import timezone
 
+from breathecode.admissions.models import Academy
 from breathecode.utils.i18n import translation
 from .models import FormEntry, Tag, Automation, ActiveCampaignAcademy, AcademyAlias
 from rest_framework.exceptions import APIException
@@ -13,6 +16,7 @@ from breathecode.utils.validation_exception import ValidationException
 from breathecode.marketing.models import Tag
 from breathecode.utils import getLogger
 import numpy as np
+import pandas as pd
 
 logger = getLogger(__name__)
 
@@ -575,3 +579,145 @@ def convert_data_frame(item):
         if isinstance(item[key], np.ndarray):
             item[key] = item[key].tolist()
     return item
+
+
+# rows read, validated and inserted at once while a csv upload is imported
+CSV_IMPORT_BATCH_SIZE = 2000
+
+NAME_PATTERN = r'^[A-Za-zÀ-ÖØ-öø-ÿ ]+$'
+EMAIL_PATTERN = r'(?:[a-z0-9!#$%&\'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&\'*+/=?^_`{|}~-]+)*|"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])'
+
+
+def get_academy_lookup() -> tuple[dict[str, int], set[str]]:
+    """
+    Get the academy ids by slug and the active campaign slugs, the aliases take precedence over the
+    academies, like in `create_form_entry`.
+    """
+
+    academies = dict(Academy.objects.values_list('slug', 'id'))
+    academies.update(AcademyAlias.objects.values_list('slug', 'academy_id'))
+
+    locations = set(
+        Academy.objects.exclude(active_campaign_slug=None).values_list('active_campaign_slug', flat=True))
+    locations.update(AcademyAlias.objects.values_list('active_campaign_slug', flat=True))
+    locations.discard('')
+
+    return academies, locations
+
+
+def get_csv_column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name not in df:
+        return pd.Series('', index=df.index)
+
+    return df[name].fillna('').astype(str).str.strip()
+
+
+def validate_form_entries(df: pd.DataFrame, academies: dict[str, int], locations: set[str]) -> pd.DataFrame:
+    """
+    Validate a batch of rows at once, it returns the fields of the entries and their errors, an empty
+    string if the row is valid.
+    """
+
+    first_name = get_csv_column(df, 'first_name')
+    last_name = get_csv_column(df, 'last_name')
+    email = get_csv_column(df, 'email')
+    location = get_csv_column(df, 'location')
+    academy = get_csv_column(df, 'academy')
+
+    academy_id = academy.map(academies)
+    valid_location = location.isin(locations)
+
+    checks = [
+        (location.ne('') & ~valid_location,
+         'No academy exists with this academy active_campaign_slug: ' + location),
+        (academy.ne('') & academy_id.isna(), 'No academy exists with this academy slug: ' + academy),
+        (first_name.eq(''), 'No first name in form entry'),
+        (first_name.ne('') & ~first_name.str.match(NAME_PATTERN), 'first name has incorrect characters'),
+        (last_name.eq(''), 'No last name in form entry'),
+        (last_name.ne('') & ~last_name.str.match(NAME_PATTERN), 'last name has incorrect characters'),
+        (email.eq(''), 'No email in form entry'),
+        (email.ne('') & ~email.str.contains(EMAIL_PATTERN, flags=re.IGNORECASE),
+         'email has incorrect format'),
+        (~valid_location | academy_id.isna(), 'No location or academy in form entry'),
+    ]
+
+    errors = pd.Series('', index=df.index)
+    for mask, message in checks:
+        errors += (pd.Series(message, index=df.index) + ', ').where(mask, '')
+
+    # the messages of a row are separated by commas and finished by a dot, like in `create_form_entry`
+    errors = errors.str[:-2].where(errors.eq(''), errors.str[:-2] + '. ')
+
+    return pd.DataFrame({
+        'first_name': first_name,
+        'last_name': last_name,
+        'email': email,
+        'location': location,
+        'academy_id': academy_id,
+        'errors': errors,
+    })
+
+
+def create_form_entries(entries: list[FormEntry]) -> list[FormEntry]:
+    # the ids are needed to persist the leads, not every database returns them from a bulk insert
+    if connection.features.can_return_rows_from_bulk_insert:
+        entries = FormEntry.objects.bulk_create(entries)
+
+        # the signals are not sent by a bulk insert, the hooks of the new leads must be triggered anyway
+        for entry in entries:
+            post_save.send(sender=FormEntry,
+                           instance=entry,
+                           created=True,
+                           raw=False,
+                           using=connection.alias,
+                           update_fields=None)
+
+        return entries
+
+    for entry in entries:
+        entry.save()
+
+    return entries
+
+
+def import_form_entries(csv_upload,
+                        file,
+                        batch_size: int = CSV_IMPORT_BATCH_SIZE) -> Iterator[list[FormEntry]]:
+    """
+    Import the leads of a csv upload, the file is read, validated and inserted in batches, it yields the
+    entries created per batch, the errors of each row are appended to the log of the upload.
+    """
+
+    academies, locations = get_academy_lookup()
+    failed = False
+
+    # every cell is read as text, the phones or the names could be parsed as numbers
+    for df in pd.read_csv(file, chunksize=batch_size, dtype=str, keep_default_na=False):
+        rows = validate_form_entries(df, academies, locations)
+        valid = rows[rows.errors.eq('')]
+        invalid = rows[rows.errors.ne('')]
+
+        entries = create_form_entries([
+            FormEntry(first_name=x.first_name,
+                      last_name=x.last_name,
+                      email=x.email,
+                      location=x.location,
+                      academy_id=int(x.academy_id)) for x in valid.itertuples(index=False)
+        ])
+
+        if len(invalid):
+            failed = True
+
+            # the rows are numbered like in a spreadsheet, the first one is the header
+            log = ''.join([f'Row {i + 2}: {x}' for i, x in invalid.errors.items()])
+            csv_upload.log = (csv_upload.log or '') + log
+            csv_upload.status = 'ERROR'
+            csv_upload.save()
+
+            logger.error(f'{len(invalid)} rows of the csv upload {csv_upload.id} are invalid')
+
+        yield entries
+
+    if not failed:
+        csv_upload.status = 'DONE'
+        csv_upload.save()
@@ -13,7 +13,8 @@ from breathecode.utils.validation_exception import ValidationException
 from .models import AcademyAlias, FormEntry, ShortLink, ActiveCampaignWebhook, ActiveCampaignAcademy, Tag, Downloadable
 from breathecode.monitoring.models import CSVUpload
 from .serializers import (PostFormEntrySerializer)
-from .actions import register_new_lead, save_get_geolocal, acp_ids
+from .actions import (register_new_lead, save_get_geolocal, acp_ids, import_form_entries, NAME_PATTERN,
+                      EMAIL_PATTERN)
 
 logger = getLogger(__name__)
 is_test_env = os.getenv('ENV') == 'test'
@@ -413,7 +414,7 @@ def create_form_entry(self, csv_upload_id, **item):
         error_message += f'{message}, '
         logger.error(message)
 
-    if form_entry.first_name and not re.findall(r'^[A-Za-zÀ-ÖØ-öø-ÿ ]+$', form_entry.first_name):
+    if form_entry.first_name and not re.findall(NAME_PATTERN, form_entry.first_name):
         message = 'first name has incorrect characters'
         error_message += f'{message}, '
         logger.error(message)
@@ -423,7 +424,7 @@ def create_form_entry(self, csv_upload_id, **item):
         error_message += f'{message}, '
         logger.error(message)
 
-    if form_entry.last_name and not re.findall(r'^[A-Za-zÀ-ÖØ-öø-ÿ ]+$', form_entry.last_name):
+    if form_entry.last_name and not re.findall(NAME_PATTERN, form_entry.last_name):
         message = 'last name has incorrect characters'
         error_message += f'{message}, '
         logger.error(message)
@@ -433,8 +434,6 @@ def create_form_entry(self, csv_upload_id, **item):
         error_message += f'{message}, '
         logger.error(message)
 
-    EMAIL_PATTERN = r'(?:[a-z0-9!#$%&\'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&\'*+/=?^_`{|}~-]+)*|"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])'
-
     if form_entry.email and not re.findall(EMAIL_PATTERN, form_entry.email, re.IGNORECASE):
         message = 'email has incorrect format'
         error_message += f'{message}, '
@@ -472,3 +471,37 @@ def create_form_entry(self, csv_upload_id, **item):
 
     # state = vars(form_entry).copy()
     # del state['_state']
+
+
+# it is not retried, the entries of the batches that were imported before an error would be duplicated
+@shared_task(bind=True)
+def async_import_csv_upload(self, csv_upload_id):
+    logger.info('Starting async_import_csv_upload')
+
+    csv_upload = CSVUpload.objects.filter(id=csv_upload_id).first()
+
+    if not csv_upload:
+        logger.error('No CSVUpload found with this id')
+        return
+
+    from ..services.google_cloud import Storage
+
+    created = 0
+    try:
+        storage = Storage()
+        cloud_file = storage.file(os.getenv('DOWNLOADS_BUCKET', None), csv_upload.hash)
+
+        # the file is downloaded in chunks while the rows are imported
+        with cloud_file.open('rb') as file:
+            for entries in import_form_entries(csv_upload, file):
+                created += len(entries)
+                for entry in entries:
+                    persist_single_lead.delay(entry.toFormData())
+
+    except Exception as e:
+        logger.exception(f'There was an error importing the csv upload {csv_upload.id}')
+        csv_upload.status = 'ERROR'
+        csv_upload.status_message = str(e)
+        csv_upload.save()
+
+    logger.info(f'{created} form entries were imported from the csv upload {csv_upload.id}')
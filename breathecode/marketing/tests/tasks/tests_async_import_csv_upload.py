@@ -0,0 +1,166 @@
+"""
+Test async_import_csv_upload
+"""
+import io
+import os
+import logging
+from unittest.mock import MagicMock, PropertyMock, call, patch
+from django.utils import timezone
+from breathecode.marketing import tasks
+from breathecode.marketing.actions import import_form_entries
+from breathecode.marketing.tasks import async_import_csv_upload
+from ..mixins import MarketingTestCase
+
+UTC_NOW = timezone.now()
+HEADER = 'first_name,last_name,email,location,academy,phone,language\n'
+
+
+def get_file(*rows):
+    return io.BytesIO((HEADER + ''.join([','.join(x) + '\n' for x in rows])).encode('utf-8'))
+
+
+def storage_mock(file):
+    return patch.multiple('breathecode.services.google_cloud.File',
+                          __init__=MagicMock(return_value=None),
+                          bucket=PropertyMock(),
+                          file_name=PropertyMock(),
+                          open=MagicMock(return_value=file),
+                          create=True)
+
+
+def get_form_entries(self):
+    return [(x['first_name'], x['last_name'], x['email'], x['location'], x['academy_id'])
+            for x in self.bc.database.list_of('marketing.FormEntry')]
+
+
+class AsyncImportCSVUploadTestSuite(MarketingTestCase):
+    """
+    🔽🔽🔽 Without CSVUpload
+    """
+
+    @patch('logging.Logger.error', MagicMock())
+    @patch('breathecode.marketing.tasks.persist_single_lead.delay', MagicMock())
+    def test_async_import_csv_upload__without_csv_upload(self):
+        async_import_csv_upload(1)
+
+        self.assertEqual(self.bc.database.list_of('marketing.FormEntry'), [])
+        self.assertEqual(logging.Logger.error.call_args_list, [call('No CSVUpload found with this id')])
+        self.assertEqual(tasks.persist_single_lead.delay.call_args_list, [])
+
+    """
+    🔽🔽🔽 With valid and invalid rows
+    """
+
+    @patch('breathecode.services.google_cloud.Storage.__init__', MagicMock(return_value=None))
+    @patch('breathecode.services.google_cloud.Storage.client', PropertyMock(), create=True)
+    @patch.dict(os.environ, {'DOWNLOADS_BUCKET': 'downloads'})
+    @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
+    @patch('breathecode.marketing.tasks.persist_single_lead.delay', MagicMock())
+    def test_async_import_csv_upload__valid_and_invalid_rows(self):
+        from breathecode.services.google_cloud import File
+
+        model = self.bc.database.create(csv_upload={
+            'log': '',
+            'hash': 'abc'
+        },
+                                        academy={
+                                            'slug': 'downtown',
+                                            'active_campaign_slug': 'downtown-miami'
+                                        },
+                                        academy_alias={
+                                            'slug': 'miami',
+                                            'active_campaign_slug': 'miami-alias'
+                                        })
+
+        file = get_file(
+            ['John', 'Smith', 'john@gmail.com', 'downtown-miami', 'downtown', '123', 'en'],
+            ['', 'Smith', 'jane@gmail.com', 'downtown-miami', 'miami', '123', 'en'],
+            ['Jane', 'Doe', 'jane@gmail.com', 'miami-alias', 'miami', '123', 'en'],
+            ['Rene', 'Descartes2', 'rene.net', 'madrid', 'madrid', '123', 'en'],
+        )
+
+        with storage_mock(file):
+            async_import_csv_upload(1)
+            self.assertEqual(File.open.call_args_list, [call('rb')])
+
+        self.assertEqual(get_form_entries(self), [
+            ('John', 'Smith', 'john@gmail.com', 'downtown-miami', 1),
+            ('Jane', 'Doe', 'jane@gmail.com', 'miami-alias', 1),
+        ])
+        self.assertEqual(self.bc.database.list_of('monitoring.CSVUpload'), [{
+            **self.bc.format.to_dict(model.csv_upload),
+            'status':
+            'ERROR',
+            'finished_at':
+            UTC_NOW,
+            'log':
+            'Row 3: No first name in form entry. '
+            'Row 5: No academy exists with this academy active_campaign_slug: madrid, '
+            'No academy exists with this academy slug: madrid, '
+            'last name has incorrect characters, email has incorrect format, '
+            'No location or academy in form entry. ',
+        }])
+
+        form_entries = self.bc.database.get_model('marketing.FormEntry').objects.all()
+        self.assertEqual(tasks.persist_single_lead.delay.call_args_list,
+                         [call(x.toFormData()) for x in form_entries])
+
+    """
+    🔽🔽🔽 In batches
+    """
+
+    @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
+    def test_import_form_entries__in_batches(self):
+        model = self.bc.database.create(csv_upload={'log': ''},
+                                        academy={
+                                            'slug': 'downtown',
+                                            'active_campaign_slug': 'downtown-miami'
+                                        })
+
+        file = get_file(
+            *[[name, 'Smith', f'{name.lower()}@gmail.com', 'downtown-miami', 'downtown', '1', 'en']
+              for name in ['John', 'Jane', 'Rene']])
+
+        batches = [[x.first_name for x in entries]
+                   for entries in import_form_entries(model.csv_upload, file, 2)]
+
+        self.assertEqual(batches, [['John', 'Jane'], ['Rene']])
+        self.assertEqual(get_form_entries(self), [
+            ('John', 'Smith', 'john@gmail.com', 'downtown-miami', 1),
+            ('Jane', 'Smith', 'jane@gmail.com', 'downtown-miami', 1),
+            ('Rene', 'Smith', 'rene@gmail.com', 'downtown-miami', 1),
+        ])
+        self.assertEqual(self.bc.database.list_of('monitoring.CSVUpload'),
+                         [{
+                             **self.bc.format.to_dict(model.csv_upload),
+                             'status': 'DONE',
+                             'finished_at': UTC_NOW,
+                         }])
+
+    """
+    🔽🔽🔽 With an error reading the file
+    """
+
+    @patch('breathecode.services.google_cloud.Storage.__init__', MagicMock(return_value=None))
+    @patch('breathecode.services.google_cloud.Storage.client', PropertyMock(), create=True)
+    @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
+    @patch('logging.Logger.exception', MagicMock())
+    @patch('breathecode.marketing.tasks.persist_single_lead.delay', MagicMock())
+    def test_async_import_csv_upload__error_reading_the_file(self):
+        model = self.bc.database.create(csv_upload={'log': ''})
+
+        with storage_mock(None), patch('breathecode.services.google_cloud.File.open',
+                                       MagicMock(side_effect=Exception('Not found'))):
+            async_import_csv_upload(1)
+
+        self.assertEqual(self.bc.database.list_of('marketing.FormEntry'), [])
+        self.assertEqual(self.bc.database.list_of('monitoring.CSVUpload'),
+                         [{
+                             **self.bc.format.to_dict(model.csv_upload),
+                             'status': 'ERROR',
+                             'status_message': 'Not found',
+                             'finished_at': UTC_NOW,
+                         }])
+        self.assertEqual(logging.Logger.exception.call_args_list,
+                         [call('There was an error importing the csv upload 1', exc_info=True)])
+        self.assertEqual(tasks.persist_single_lead.delay.call_args_list, [])
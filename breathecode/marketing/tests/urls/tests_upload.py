@@ -108,7 +108,7 @@ class MarketingTestSuite(MarketingTestCase):
         self.assertEqual(File.upload.call_args_list, [])
         self.assertEqual(File.url.call_args_list, [])
 
-    @patch('breathecode.marketing.tasks.create_form_entry.delay', MagicMock())
+    @patch('breathecode.marketing.tasks.async_import_csv_upload.delay', MagicMock())
     @patch.multiple('breathecode.services.google_cloud.Storage',
                     __init__=MagicMock(return_value=None),
                     client=PropertyMock(),
@@ -124,7 +124,7 @@ class MarketingTestSuite(MarketingTestCase):
     @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
     def test_upload_random(self):
         from breathecode.services.google_cloud import Storage, File
-        from breathecode.marketing.tasks import create_form_entry
+        from breathecode.marketing.tasks import async_import_csv_upload
 
         self.headers(academy=1)
 
@@ -175,35 +175,7 @@ class MarketingTestSuite(MarketingTestCase):
 
             self.assertEqual(json, expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(create_form_entry.delay.call_args_list, [
-                call(
-                    1, **{
-                        'first_name': df.iloc[0]['first_name'],
-                        'last_name': df.iloc[0]['last_name'],
-                        'email': df.iloc[0]['email'],
-                        'location': df.iloc[0]['location'],
-                        'phone': df.iloc[0]['phone'],
-                        'language': df.iloc[0]['language'],
-                    }),
-                call(
-                    1, **{
-                        'first_name': df.iloc[1]['first_name'],
-                        'last_name': df.iloc[1]['last_name'],
-                        'email': df.iloc[1]['email'],
-                        'location': df.iloc[1]['location'],
-                        'phone': df.iloc[1]['phone'],
-                        'language': df.iloc[1]['language'],
-                    }),
-                call(
-                    1, **{
-                        'first_name': df.iloc[2]['first_name'],
-                        'last_name': df.iloc[2]['last_name'],
-                        'email': df.iloc[2]['email'],
-                        'location': df.iloc[2]['location'],
-                        'phone': df.iloc[2]['phone'],
-                        'language': df.iloc[2]['language'],
-                    })
-            ])
+            self.assertEqual(async_import_csv_upload.delay.call_args_list, [call(1)])
 
             self.assertEqual(self.bc.database.list_of('monitoring.CSVUpload'),
                              [{
@@ -38,7 +38,7 @@ from .serializers import (
     ActiveCampaignAcademySerializer,
 )
 from breathecode.services.activecampaign import ActiveCampaign
-from .actions import convert_data_frame, sync_tags, sync_automations
+from .actions import sync_tags, sync_automations
 from .tasks import persist_single_lead, update_link_viewcount, async_activecampaign_webhook
 from .models import ShortLink, ActiveCampaignAcademy, FormEntry, Tag, Automation, Downloadable, LeadGenerationApp, UTMField, AcademyAlias
 from breathecode.admissions.models import Academy
@@ -904,16 +904,15 @@ class UploadView(APIView):
         if file.content_type != MIME_ALLOW:
             raise ValidationException(f'You can upload only files on the following formats: {MIME_ALLOW}')
 
-        file_bytes = file.read()
+        sha256 = hashlib.sha256()
+        for chunk in file.chunks():
+            sha256.update(chunk)
 
-        file_name = hashlib.sha256(file_bytes).hexdigest()
+        file_name = sha256.hexdigest()
 
-        file_bytes = file_bytes.decode('utf-8')
-
-        with open(file.name, 'w') as f:
-            f.write(file_bytes)
-        df = pd.read_csv(file.name)
-        os.remove(file.name)
+        # just the header is read here, the rows are imported by a task
+        file.seek(0)
+        df = pd.read_csv(file, nrows=0)
         required_fields = ['first_name', 'last_name', 'email', 'location', 'phone', 'language']
 
         # Think about uploading correct files and leaving out incorrect ones
@@ -935,11 +934,7 @@ class UploadView(APIView):
         csv_upload.academy_id = academy_id
         csv_upload.save()
 
-        for num in range(len(df)):
-            value = df.iloc[num]
-            logger.info(dict(value))
-            parsed = convert_data_frame(dict(value))
-            tasks.create_form_entry.delay(csv_upload.id, **parsed)
+        tasks.async_import_csv_upload.delay(csv_upload.id)
 
         return data
 
@@ -0,0 +1,435 @@
+import hashlib, logging, os, threading, time
+from typing import Mapping, Optional
+import requests
+from django.core.cache import cache
+from django.db.models import F
+from breathecode.media.models import Media, MediaResolution
+from breathecode.services.google_cloud import FunctionV1
+from breathecode.utils.validation_exception import ValidationException
+
+__all__ = [
+    'add_media_hit', 'add_resolution_hit', 'schedule_hits_flush', 'flush_hits', 'get_resolution',
+    'cache_resolution', 'clear_resolution_cache', 'resolution_lock', 'get_media_url', 'get_proxy_session',
+    'open_proxy', 'ProxyStream', 'get_proxy_response_headers', 'hash_media_file', 'upload_media_file'
+]
+
+logger = logging.getLogger(__name__)
+
+MEDIA_HITS_KEY = 'media__hits'
+RESOLUTION_HITS_KEY = 'media_resolution__hits'
+
+# seconds that the hits wait in Redis before they are written
+HITS_FLUSH_INTERVAL = 60
+
+# seconds, the entries written for a size that the cloud function did not return are not cleared by the
+# size of the resolution, so they expire anyway
+RESOLUTION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# seconds that a resize can hold the lock of its size
+RESIZE_LOCK_TIMEOUT = 30
+
+# seconds that a request waits for the resize made by another request, then it gets the original file
+RESIZE_WAIT_TIMEOUT = 3
+RESIZE_POLL_INTERVAL = 0.2
+
+# headers of the request that are passed through to the storage
+PROXY_REQUEST_HEADERS = ['Range', 'If-Range', 'If-Match', 'If-None-Match', 'If-Modified-Since']
+
+# headers of the storage that are relayed, the content is relayed as is, so it keeps its encoding
+PROXY_RESPONSE_HEADERS = [
+    'Accept-Ranges', 'Cache-Control', 'Content-Disposition', 'Content-Encoding', 'Content-Language',
+    'Content-Length', 'Content-Range', 'Content-Type', 'ETag', 'Expires', 'Last-Modified'
+]
+
+PROXY_CHUNK_SIZE = 64 * 1024
+PROXY_POOL_SIZE = 32
+# seconds to connect and between the bytes of the response
+PROXY_TIMEOUT = (3.05, 30)
+
+# bytes read per iteration while an upload is hashed
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_CONCURRENT_UPLOADS = 4
+
+lock = threading.Lock()
+session = None
+
+
+def media_gallery_bucket():
+    return os.getenv('MEDIA_GALLERY_BUCKET')
+
+
+def google_project_id():
+    return os.getenv('GOOGLE_PROJECT_ID', '')
+
+
+def get_redis():
+    """
+    Get the connection of Redis, None if the cache is not backed by Redis, like in the tests.
+    """
+
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def add_hit(Model, key: str, id: int) -> None:
+    redis = get_redis()
+
+    # the hits are aggregated in a hash and written by flush_hits
+    if redis is not None:
+        redis.hincrby(key, str(id), 1)
+        schedule_hits_flush()
+        return
+
+    Model.objects.filter(id=id).update(hits=F('hits') + 1)
+
+
+def add_media_hit(media_id: int) -> None:
+    add_hit(Media, MEDIA_HITS_KEY, media_id)
+
+
+def add_resolution_hit(resolution_id: int) -> None:
+    add_hit(MediaResolution, RESOLUTION_HITS_KEY, resolution_id)
+
+
+def schedule_hits_flush() -> None:
+    """
+    Schedule the flush of the hits, once per interval, the flag expires when the flush is due, so the hits
+    that arrive before it are written by it.
+    """
+
+    from .tasks import async_flush_hits
+
+    if cache.add(MEDIA_HITS_KEY + '__scheduled', 1, timeout=HITS_FLUSH_INTERVAL):
+        async_flush_hits.apply_async(countdown=HITS_FLUSH_INTERVAL)
+
+
+def flush_hits() -> int:
+    """
+    Write the hits aggregated in Redis, it returns the number of rows updated.
+    """
+
+    redis = get_redis()
+    if redis is None:
+        return 0
+
+    updated = 0
+    for Model, key in [(Media, MEDIA_HITS_KEY), (MediaResolution, RESOLUTION_HITS_KEY)]:
+        # read and reset the counters in one transaction, the new hits start a new hash
+        pipe = redis.pipeline(transaction=True)
+        pipe.hgetall(key)
+        pipe.delete(key)
+        hits, _ = pipe.execute()
+
+        # one update per distinct number of hits
+        groups = {}
+        for id, value in hits.items():
+            groups.setdefault(int(value), []).append(int(id))
+
+        for value, ids in groups.items():
+            updated += Model.objects.filter(id__in=ids).update(hits=F('hits') + value)
+
+    return updated
+
+
+def get_resolution_cache_key(hash: str, width: Optional[int] = None, height: Optional[int] = None) -> str:
+    if width:
+        return f'media__resolution__{hash}__width__{width}'
+
+    return f'media__resolution__{hash}__height__{height}'
+
+
+def get_resolution_keys_key(hash: str) -> str:
+    return f'media__resolution__{hash}__keys'
+
+
+def set_resolution_cache(hash: str, key: str, data: dict) -> None:
+    """
+    Cache a resolution and record the key by hash, the requested size could differ from the size of the
+    resolution, so the keys cannot be built again when it changes.
+    """
+
+    keys_key = get_resolution_keys_key(hash)
+    redis = get_redis()
+
+    # the concurrent resizes of the same hash add their keys to the same set
+    if redis is not None:
+        pipe = redis.pipeline(transaction=True)
+        pipe.sadd(keys_key, key)
+        pipe.expire(keys_key, RESOLUTION_CACHE_TIMEOUT)
+        pipe.execute()
+
+    else:
+        keys = cache.get(keys_key) or set()
+        cache.set(keys_key, keys | {key}, timeout=RESOLUTION_CACHE_TIMEOUT)
+
+    cache.set(key, data, timeout=RESOLUTION_CACHE_TIMEOUT)
+
+
+def pop_resolution_keys(hash: str) -> set[str]:
+    keys_key = get_resolution_keys_key(hash)
+    redis = get_redis()
+
+    if redis is None:
+        keys = cache.get(keys_key) or set()
+        cache.delete(keys_key)
+        return keys
+
+    pipe = redis.pipeline(transaction=True)
+    pipe.smembers(keys_key)
+    pipe.delete(keys_key)
+    keys, _ = pipe.execute()
+
+    return {x.decode('utf-8') if isinstance(x, bytes) else x for x in keys}
+
+
+def get_resolution(hash: str, width: Optional[int] = None, height: Optional[int] = None) -> Optional[dict]:
+    """
+    Get the id, width and height of the resolution of a file, it is cached by hash and size.
+    """
+
+    key = get_resolution_cache_key(hash, width, height)
+    if (resolution := cache.get(key)) is not None:
+        return resolution
+
+    resolution = MediaResolution.objects.filter(hash=hash)
+    resolution = resolution.filter(width=width) if width else resolution.filter(height=height)
+    resolution = resolution.values('id', 'width', 'height').first()
+
+    if resolution is not None:
+        set_resolution_cache(hash, key, resolution)
+
+    return resolution
+
+
+def cache_resolution(resolution: MediaResolution,
+                     width: Optional[int] = None,
+                     height: Optional[int] = None) -> dict:
+    """
+    Cache a resolution for the size that was requested, the cloud function could return another one.
+    """
+
+    data = {'id': resolution.id, 'width': resolution.width, 'height': resolution.height}
+    set_resolution_cache(resolution.hash, get_resolution_cache_key(resolution.hash, width, height), data)
+    return data
+
+
+def clear_resolution_cache(resolution: MediaResolution) -> None:
+    """
+    Clear every size cached for the hash of a resolution, the other resolutions are read again.
+    """
+
+    keys = pop_resolution_keys(resolution.hash)
+
+    cache.delete_many([
+        get_resolution_cache_key(resolution.hash, width=resolution.width),
+        get_resolution_cache_key(resolution.hash, height=resolution.height),
+        *keys,
+    ])
+
+
+class resolution_lock:
+    """
+    Coalesce the concurrent requests of a resolution that does not exist yet, just the holder of the lock
+    resizes the file, the rest wait for its resolution for a few seconds, then neither the lock nor the
+    resolution are available, and the original file should be served.
+
+    Usage:
+
+    ```py
+    with resolution_lock(hash, width=width) as lock:
+        if lock.acquired:
+            resolution = lock.resolution or resize(...)
+    ```
+    """
+
+    def __init__(self, hash: str, width: Optional[int] = None, height: Optional[int] = None):
+        self.hash = hash
+        self.width = width
+        self.height = height
+        self.key = get_resolution_cache_key(hash, width, height) + '__lock'
+        self.acquired = False
+        self.resolution = None
+
+    def __enter__(self):
+        deadline = time.monotonic() + RESIZE_WAIT_TIMEOUT
+
+        while not (acquired := cache.add(self.key, 1, timeout=RESIZE_LOCK_TIMEOUT)):
+            if (resolution := get_resolution(self.hash, self.width, self.height)) is not None:
+                self.resolution = resolution
+                return self
+
+            # the request worker is not tied up while other request resizes it
+            if time.monotonic() > deadline:
+                logger.warning(f'Resize of {self.hash} is taking too long, the original file is served')
+                return self
+
+            time.sleep(RESIZE_POLL_INTERVAL)
+
+        self.acquired = acquired
+
+        # it could have been resized between the lookup and the lock
+        self.resolution = get_resolution(self.hash, self.width, self.height)
+        return self
+
+    def __exit__(self, *exc):
+        if self.acquired:
+            cache.delete(self.key)
+
+        return False
+
+
+def get_media_url(media_id: Optional[int] = None,
+                  media_slug: Optional[str] = None,
+                  width: Optional[str] = None,
+                  height: Optional[str] = None) -> tuple[str, bool]:
+    """
+    Get the url of a file, or of one of its resolutions, it registers the hit and resizes the file if it
+    was not resized to that size before. It returns the url and False when the original file is served
+    instead of the requested size because other request is still resizing it.
+    """
+
+    lookups = {}
+    if media_id:
+        lookups['id'] = media_id
+    elif media_slug:
+        lookups['slug'] = media_slug.split('.')[0]  #ignore extension
+
+    media = Media.objects.filter(**lookups).first()
+    if not media:
+        raise ValidationException('Resource not found', code=404)
+
+    url = media.url
+
+    if width and height:
+        raise ValidationException(
+            'You need to pass either width or height, not both, in order to avoid losing aspect ratio',
+            code=400,
+            slug='width-and-height-in-querystring')
+
+    if (width or height) and not media.mime.startswith('image/'):
+        raise ValidationException('cannot resize this resource', code=400, slug='cannot-resize-media')
+
+    # register click
+    add_media_hit(media.id)
+
+    if not width and not height:
+        return url, True
+
+    resolution = get_resolution(media.hash, width, height)
+
+    if not resolution:
+        # the concurrent requests of the same size wait for the first one
+        with resolution_lock(media.hash, width=width, height=height) as lock:
+            resolution = lock.resolution
+
+            if resolution is None and not lock.acquired:
+                return url, False
+
+            if resolution is None:
+                func = FunctionV1(region='us-central1', project_id=google_project_id(), name='resize-image')
+
+                func_request = func.call({
+                    'width': width,
+                    'height': height,
+                    'filename': media.hash,
+                    'bucket': media_gallery_bucket(),
+                })
+
+                res = func_request.json()
+
+                if not res['status_code'] == 200 or not res['message'] == 'Ok':
+                    if 'message' in res:
+                        raise ValidationException(res['message'], code=500, slug='cloud-function-bad-input')
+
+                    raise ValidationException('Unhandled request from cloud functions',
+                                              code=500,
+                                              slug='unhandled-cloud-function')
+
+                resolution = MediaResolution(width=res['width'], height=res['height'], hash=media.hash)
+                resolution.save()
+
+                resolution = cache_resolution(resolution, width, height)
+
+    add_resolution_hit(resolution['id'])
+    return f'{url}-{resolution["width"]}x{resolution["height"]}', True
+
+
+def get_proxy_session() -> requests.Session:
+    """
+    Get the session of the process, it keeps the connections to the storage alive between the requests.
+    """
+
+    global session
+
+    if session is None:
+        with lock:
+            if session is None:
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=PROXY_POOL_SIZE)
+                s = requests.Session()
+                s.mount('https://', adapter)
+                s.mount('http://', adapter)
+                session = s
+
+    return session
+
+
+def get_proxy_request_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    return {x: headers[x] for x in PROXY_REQUEST_HEADERS if headers.get(x)}
+
+
+def get_proxy_response_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    return {x: headers[x] for x in PROXY_RESPONSE_HEADERS if headers.get(x)}
+
+
+def open_proxy(url: str, headers: Mapping[str, str]) -> requests.Response:
+    """
+    Open the file in the storage, the body is not read yet.
+    """
+
+    return get_proxy_session().get(url,
+                                   headers=get_proxy_request_headers(headers),
+                                   stream=True,
+                                   timeout=PROXY_TIMEOUT)
+
+
+class ProxyStream:
+    """
+    Relay the body as it comes, the connection goes back to the pool when it is closed, even if the body
+    was not read.
+    """
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+
+    def __iter__(self):
+        return self.response.raw.stream(PROXY_CHUNK_SIZE, decode_content=False)
+
+    def close(self):
+        self.response.close()
+
+
+def hash_media_file(file) -> str:
+    """
+    Hash an uploaded file in chunks, Django keeps the big uploads in a temporary file, so they are never
+    loaded whole in memory.
+    """
+
+    sha256 = hashlib.sha256()
+    for chunk in file.chunks(UPLOAD_CHUNK_SIZE):
+        sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+def upload_media_file(storage, hash: str, file) -> str:
+    """
+    Upload a file to the media gallery, it is named by its hash, it returns its url.
+    """
+
+    cloud_file = storage.file(media_gallery_bucket(), hash)
+    cloud_file.upload(file, content_type=file.content_type)
+    return cloud_file.url()
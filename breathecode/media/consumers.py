@@ -0,0 +1,80 @@
+import json, logging
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.generic.http import AsyncHttpConsumer
+from django.http import QueryDict
+from requests.structures import CaseInsensitiveDict
+from breathecode.utils.validation_exception import ValidationException
+from .actions import ProxyStream, get_media_url, get_proxy_response_headers, open_proxy
+
+__all__ = ['MaskingUrlConsumer', 'masked_url_router']
+
+logger = logging.getLogger(__name__)
+
+
+def is_masked(scope) -> bool:
+    return QueryDict(scope.get('query_string', b'')).get('mask') == 'true'
+
+
+def masked_url_router(app):
+    """
+    Serve the masked files with `MaskingUrlConsumer` and the rest of the requests with the Django app.
+    """
+
+    consumer = MaskingUrlConsumer.as_asgi()
+
+    async def router(scope, receive, send):
+        if is_masked(scope):
+            return await consumer(scope, receive, send)
+
+        return await app(scope, receive, send)
+
+    return router
+
+
+class MaskingUrlConsumer(AsyncHttpConsumer):
+    """
+    Async version of the mask mode of `MaskingUrlView`, the file is relayed while it is downloaded, the
+    request does not hold a worker of the server for the whole transfer.
+    """
+
+    async def handle(self, body):
+        kwargs = self.scope['url_route']['kwargs']
+        query = QueryDict(self.scope.get('query_string', b''))
+        headers = CaseInsensitiveDict(
+            {k.decode('latin1'): v.decode('latin1')
+             for k, v in self.scope['headers']})
+
+        try:
+            url, _ = await database_sync_to_async(get_media_url)(media_id=kwargs.get('media_id'),
+                                                                 media_slug=kwargs.get('media_slug'),
+                                                                 width=query.get('width'),
+                                                                 height=query.get('height'))
+
+        except ValidationException as e:
+            data = {'detail': str(e.detail), 'status_code': e.status_code}
+            return await self.send_response(e.status_code,
+                                            json.dumps(data).encode('utf-8'),
+                                            headers=[(b'Content-Type', b'application/json'),
+                                                     (b'Access-Control-Allow-Origin', b'*')])
+
+        # the blocking calls of the session run out of the event loop, one chunk at a time
+        response = await sync_to_async(open_proxy, thread_sensitive=False)(url, headers)
+        stream = ProxyStream(response)
+
+        try:
+            relayed = get_proxy_response_headers(response.headers)
+            await self.send_headers(status=response.status_code,
+                                    headers=[(k.encode('latin1'), v.encode('latin1'))
+                                             for k, v in relayed.items()] +
+                                    [(b'Access-Control-Allow-Origin', b'*')])
+
+            chunks = iter(stream)
+            while (chunk := await sync_to_async(next, thread_sensitive=False)(chunks, None)) is not None:
+                await self.send_body(chunk, more_body=True)
+
+            await self.send_body(b'')
+
+        finally:
+            # the connection goes back to the pool
+            stream.close()
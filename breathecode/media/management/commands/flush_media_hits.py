@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ...actions import flush_hits
+
+
+class Command(BaseCommand):
+    help = 'Write the hits of the medias and resolutions aggregated in Redis'
+
+    def handle(self, *args, **options):
+        count = flush_hits()
+        self.stdout.write(self.style.SUCCESS(f'{count} medias and resolutions were updated'))
@@ -0,0 +1,17 @@
+import logging
+from django.dispatch import receiver
+from django.db.models.signals import post_delete, post_save
+from .models import MediaResolution
+from .actions import clear_resolution_cache
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=MediaResolution)
+def post_resolution_saved(sender, instance: MediaResolution, **kwargs):
+    clear_resolution_cache(instance)
+
+
+@receiver(post_delete, sender=MediaResolution)
+def post_resolution_deleted(sender, instance: MediaResolution, **kwargs):
+    clear_resolution_cache(instance)
@@ -0,0 +1,11 @@
+import logging
+from celery import shared_task
+from .actions import flush_hits
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def async_flush_hits():
+    logger.debug('Starting async_flush_hits')
+    return flush_hits()
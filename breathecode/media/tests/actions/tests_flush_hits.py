@@ -0,0 +1,93 @@
+"""
+Test flush_hits
+"""
+from unittest.mock import MagicMock, call, patch
+
+from breathecode.media.actions import add_media_hit, add_resolution_hit, flush_hits
+from ..mixins import MediaTestCase
+
+
+class FakePipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def hgetall(self, key):
+        self.commands.append(
+            lambda: {k.encode(): str(v).encode()
+                     for k, v in self.redis.hashes.get(key, {}).items()})
+
+    def delete(self, key):
+        self.commands.append(lambda: int(self.redis.hashes.pop(key, None) is not None))
+
+    def execute(self):
+        return [x() for x in self.commands]
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hincrby(self, key, field, amount):
+        self.hashes.setdefault(key, {})
+        self.hashes[key][field] = self.hashes[key].get(field, 0) + amount
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class MediaTestSuite(MediaTestCase):
+    """
+    🔽🔽🔽 Without Redis
+    """
+
+    def test_without_redis__hits_written_at_once(self):
+        model = self.bc.database.create(media=2, media_resolution=1)
+
+        add_media_hit(1)
+        add_media_hit(1)
+        add_resolution_hit(1)
+
+        self.assertEqual(flush_hits(), 0)
+        self.assertEqual([x['hits'] for x in self.bc.database.list_of('media.Media')],
+                         [model.media[0].hits + 2, model.media[1].hits])
+        self.assertEqual([x['hits'] for x in self.bc.database.list_of('media.MediaResolution')],
+                         [model.media_resolution.hits + 1])
+
+    """
+    🔽🔽🔽 With Redis
+    """
+
+    @patch('breathecode.media.tasks.async_flush_hits.apply_async', MagicMock())
+    def test_with_redis(self):
+        from breathecode.media.tasks import async_flush_hits
+
+        model = self.bc.database.create(media=3, media_resolution=1)
+        redis = FakeRedis()
+
+        with patch('breathecode.media.actions.get_redis', MagicMock(return_value=redis)):
+            add_media_hit(1)
+            add_media_hit(1)
+            add_media_hit(2)
+            add_media_hit(2)
+            add_resolution_hit(1)
+
+            # nothing is written until the flush
+            self.assertEqual([x['hits'] for x in self.bc.database.list_of('media.Media')],
+                             [x.hits for x in model.media])
+
+            with self.assertNumQueries(2):
+                self.assertEqual(flush_hits(), 3)
+
+            self.assertEqual(flush_hits(), 0)
+
+        self.assertEqual([x['hits'] for x in self.bc.database.list_of('media.Media')],
+                         [model.media[0].hits + 2, model.media[1].hits + 2, model.media[2].hits])
+        self.assertEqual([x['hits'] for x in self.bc.database.list_of('media.MediaResolution')],
+                         [model.media_resolution.hits + 1])
+        self.assertEqual(redis.hashes, {})
+
+        # one flush per interval
+        self.assertEqual(async_flush_hits.apply_async.call_args_list, [call(countdown=60)])
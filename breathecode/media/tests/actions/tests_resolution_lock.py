@@ -0,0 +1,140 @@
+"""
+Test get_resolution and resolution_lock
+"""
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+
+from breathecode.media import actions
+from breathecode.media.actions import cache_resolution, clear_resolution_cache, get_resolution, resolution_lock
+from ..mixins import MediaTestCase
+
+
+class FakePipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def sadd(self, key, *values):
+        self.commands.append(
+            lambda: self.redis.sets.setdefault(key, set()).update(x.encode() for x in values))
+
+    def smembers(self, key):
+        self.commands.append(lambda: set(self.redis.sets.get(key, set())))
+
+    def expire(self, key, timeout):
+        self.commands.append(lambda: key in self.redis.sets)
+
+    def delete(self, key):
+        self.commands.append(lambda: int(self.redis.sets.pop(key, None) is not None))
+
+    def execute(self):
+        return [x() for x in self.commands]
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.sets = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class MediaTestSuite(MediaTestCase):
+    """
+    🔽🔽🔽 get_resolution
+    """
+
+    def test_get_resolution__cached(self):
+        model = self.bc.database.create(media_resolution={'hash': 'abc', 'width': 100, 'height': 50})
+        expected = {'id': 1, 'width': 100, 'height': 50}
+
+        self.assertEqual(get_resolution('abc', width='100'), expected)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_resolution('abc', width='100'), expected)
+
+        self.assertEqual(get_resolution('abc', height='50'), expected)
+        self.assertEqual(get_resolution('abc', width='200'), None)
+
+    def test_get_resolution__deleted(self):
+        model = self.bc.database.create(media_resolution={'hash': 'abc', 'width': 100, 'height': 50})
+
+        get_resolution('abc', width='100')
+        model.media_resolution.delete()
+
+        self.assertEqual(get_resolution('abc', width='100'), None)
+
+    def test_cache_resolution__other_size_deleted(self):
+        model = self.bc.database.create(media_resolution={'hash': 'abc', 'width': 100, 'height': 50})
+
+        # the cloud function returned another size than the requested one
+        cache_resolution(model.media_resolution, width='120')
+        self.assertEqual(get_resolution('abc', width='120'), {'id': 1, 'width': 100, 'height': 50})
+
+        model.media_resolution.delete()
+
+        self.assertEqual(get_resolution('abc', width='120'), None)
+
+    def test_cache_resolution__with_redis(self):
+        model = self.bc.database.create(media_resolution={'hash': 'abc', 'width': 100, 'height': 50})
+        redis = FakeRedis()
+
+        with patch('breathecode.media.actions.get_redis', MagicMock(return_value=redis)):
+            # the concurrent resizes of other sizes keep every key
+            cache_resolution(model.media_resolution, width='120')
+            cache_resolution(model.media_resolution, width='130')
+
+            self.assertEqual(
+                redis.sets, {
+                    'media__resolution__abc__keys': {
+                        b'media__resolution__abc__width__120',
+                        b'media__resolution__abc__width__130',
+                    },
+                })
+
+            clear_resolution_cache(model.media_resolution)
+
+            self.assertEqual(redis.sets, {})
+            self.assertEqual(cache.get('media__resolution__abc__width__120'), None)
+            self.assertEqual(cache.get('media__resolution__abc__width__130'), None)
+
+    """
+    🔽🔽🔽 resolution_lock
+    """
+
+    def test_lock__acquired(self):
+        with resolution_lock('abc', width='100') as lock:
+            self.assertTrue(lock.acquired)
+            self.assertEqual(lock.resolution, None)
+            self.assertEqual(cache.get('media__resolution__abc__width__100__lock'), 1)
+
+        self.assertEqual(cache.get('media__resolution__abc__width__100__lock'), None)
+
+    def test_lock__resized_by_other_request(self):
+        cache.set('media__resolution__abc__width__100__lock', 1)
+
+        def resize(*args):
+            self.bc.database.create(media_resolution={'hash': 'abc', 'width': 100, 'height': 50})
+
+        with patch('time.sleep', MagicMock(side_effect=resize)):
+            with resolution_lock('abc', width='100') as lock:
+                self.assertFalse(lock.acquired)
+                self.assertEqual(lock.resolution, {'id': 1, 'width': 100, 'height': 50})
+
+        # the lock belongs to the other request
+        self.assertEqual(cache.get('media__resolution__abc__width__100__lock'), 1)
+
+    @patch('time.sleep', MagicMock())
+    @patch.object(actions, 'RESIZE_WAIT_TIMEOUT', -1)
+    def test_lock__timeout(self):
+        cache.set('media__resolution__abc__width__100__lock', 1)
+
+        with resolution_lock('abc', width='100') as lock:
+            self.assertFalse(lock.acquired)
+            self.assertEqual(lock.resolution, None)
+
+        # it does not wait for the lock, the original file is served
+        self.assertEqual(cache.get('media__resolution__abc__width__100__lock'), 1)
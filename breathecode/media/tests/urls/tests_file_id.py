@@ -14,6 +14,24 @@ from ..mixins import MediaTestCase
 RESIZE_IMAGE_URL = 'https://us-central1-labor-day-story.cloudfunctions.net/resize-image'
 
 
+class ProxyResponse:
+
+    def __init__(self, content=b'', status_code=200, headers={}):
+        self.content = content
+        self.status_code = status_code
+        self.reason = 'OK'
+        self.headers = headers
+        self.raw = MagicMock()
+        self.raw.stream.return_value = iter([content] if content else [])
+        self.close = MagicMock()
+
+
+def proxy_session_mock(response: ProxyResponse):
+    session = MagicMock()
+    session.get.return_value = response
+    return MagicMock(return_value=session)
+
+
 def apply_get_env(configuration={}):
 
     def get_env(key, value=None):
@@ -111,7 +129,7 @@ class MediaTestSuite(MediaTestCase):
                'GOOGLE_PROJECT_ID': 'labor-day-story',
                'MEDIA_GALLERY_BUCKET': 'bucket-name',
            })))
-    @patch(REQUESTS_PATH['get'], apply_requests_get_mock([(200, 'https://potato.io', 'ok')]))
+    @patch('breathecode.media.actions.get_proxy_session', proxy_session_mock(ProxyResponse(b'ok')))
     def test_file_id_with_mask_true(self):
         """Test /answer without auth"""
         self.headers(academy=1)
@@ -129,6 +147,66 @@ class MediaTestSuite(MediaTestCase):
                          }])
         self.assertEqual(self.all_media_resolution_dict(), [])
 
+    @patch('os.getenv',
+           MagicMock(side_effect=apply_get_env({
+               'GOOGLE_PROJECT_ID': 'labor-day-story',
+               'MEDIA_GALLERY_BUCKET': 'bucket-name',
+           })))
+    def test_file_id_with_mask_true__range(self):
+        """Test /answer without auth"""
+        headers = {
+            'Content-Type': 'video/mp4',
+            'Content-Range': 'bytes 0-1/10',
+            'Content-Length': '2',
+            'ETag': '"abc"',
+            'Connection': 'keep-alive',
+        }
+        proxy_response = ProxyResponse(b'ok', status_code=206, headers=headers)
+        media_kwargs = {'url': 'https://potato.io'}
+        model = self.generate_models(academy=True, media=True, media_kwargs=media_kwargs)
+        url = reverse_lazy('media:file_id', kwargs={'media_id': 1}) + '?mask=true'
+
+        get_proxy_session = proxy_session_mock(proxy_response)
+
+        with patch('breathecode.media.actions.get_proxy_session', get_proxy_session):
+            response = self.client.get(url, HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"abc"', HTTP_COOKIE='a=1')
+            content = response.getvalue()
+
+            self.assertEqual(get_proxy_session().get.call_args_list, [
+                call('https://potato.io',
+                     headers={
+                         'Range': 'bytes=0-1',
+                         'If-Range': '"abc"',
+                     },
+                     stream=True,
+                     timeout=(3.05, 30)),
+            ])
+
+        self.assertEqual(content, b'ok')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response['Content-Range'], 'bytes 0-1/10')
+        self.assertEqual(response['ETag'], '"abc"')
+        self.assertFalse(response.has_header('Connection'))
+        self.assertEqual(proxy_response.close.call_args_list, [call()])
+
+    @patch('os.getenv',
+           MagicMock(side_effect=apply_get_env({
+               'GOOGLE_PROJECT_ID': 'labor-day-story',
+               'MEDIA_GALLERY_BUCKET': 'bucket-name',
+           })))
+    @patch('breathecode.media.actions.get_proxy_session',
+           proxy_session_mock(ProxyResponse(status_code=304, headers={'ETag': '"abc"'})))
+    def test_file_id_with_mask_true__not_modified(self):
+        """Test /answer without auth"""
+        media_kwargs = {'url': 'https://potato.io'}
+        model = self.generate_models(academy=True, media=True, media_kwargs=media_kwargs)
+        url = reverse_lazy('media:file_id', kwargs={'media_id': 1}) + '?mask=true'
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"abc"')
+
+        self.assertEqual(response.getvalue(), b'')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], '"abc"')
+
     """
     🔽🔽🔽 Width in querystring
     """
@@ -240,6 +318,39 @@ class MediaTestSuite(MediaTestCase):
                 'hits': model['media_resolution'].hits + 1,
             }])
 
+    @patch('os.getenv',
+           MagicMock(side_effect=apply_get_env({
+               'GOOGLE_PROJECT_ID': 'labor-day-story',
+               'MEDIA_GALLERY_BUCKET': 'bucket-name',
+           })))
+    @patch('time.sleep', MagicMock())
+    @patch('breathecode.media.actions.RESIZE_WAIT_TIMEOUT', -1)
+    def test_file_id__with_width_in_querystring__resized_by_other_request(self):
+        """Test /answer without auth"""
+        from django.core.cache import cache
+
+        self.headers(academy=1)
+        media_kwargs = {'url': 'https://potato.io/harcoded', 'mime': 'image/png', 'hash': 'harcoded'}
+        model = self.generate_models(academy=True, media=True, media_kwargs=media_kwargs)
+
+        # other request is resizing the file
+        cache.set('media__resolution__harcoded__width__1000__lock', 1)
+
+        with patch(REQUESTS_PATH['request'], apply_requests_request_mock([resized_response()])) as mock:
+            url = reverse_lazy('media:file_id', kwargs={'media_id': 1}) + '?width=1000'
+            response = self.client.get(url)
+
+        self.assertEqual(response.url, 'https://potato.io/harcoded')
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+
+        self.assertEqual(mock.call_args_list, [])
+        self.assertEqual(self.all_media_dict(),
+                         [{
+                             **self.model_to_dict(model, 'media'),
+                             'hits': model['media'].hits + 1,
+                         }])
+        self.assertEqual(self.all_media_resolution_dict(), [])
+
     @patch('os.getenv',
            MagicMock(side_effect=apply_get_env({
                'GOOGLE_PROJECT_ID': 'labor-day-story',
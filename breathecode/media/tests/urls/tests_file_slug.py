@@ -11,6 +11,24 @@ from ..mixins import MediaTestCase
 RESIZE_IMAGE_URL = 'https://us-central1-labor-day-story.cloudfunctions.net/resize-image'
 
 
+class ProxyResponse:
+
+    def __init__(self, content=b'', status_code=200, headers={}):
+        self.content = content
+        self.status_code = status_code
+        self.reason = 'OK'
+        self.headers = headers
+        self.raw = MagicMock()
+        self.raw.stream.return_value = iter([content] if content else [])
+        self.close = MagicMock()
+
+
+def proxy_session_mock(response: ProxyResponse):
+    session = MagicMock()
+    session.get.return_value = response
+    return MagicMock(return_value=session)
+
+
 def apply_get_env(configuration={}):
 
     def get_env(key, value=None):
@@ -102,7 +120,7 @@ class MediaTestSuite(MediaTestCase):
                          }])
         self.assertEqual(self.all_media_resolution_dict(), [])
 
-    @patch(REQUESTS_PATH['get'], apply_requests_get_mock([(200, 'https://potato.io', 'ok')]))
+    @patch('breathecode.media.actions.get_proxy_session', proxy_session_mock(ProxyResponse(b'ok')))
     @patch('os.getenv',
            MagicMock(side_effect=apply_get_env({
                'GOOGLE_PROJECT_ID': 'labor-day-story',
@@ -592,14 +592,16 @@ class MediaTestSuite(MediaTestCase):
                 'url': 'https://storage.cloud.google.com/media-breathecode/hardcoded_url'
             }])
 
-        self.assertEqual(Storage.__init__.call_args_list, [call(), call()])
-        self.assertEqual(File.__init__.call_args_list, [
+        # one client per request, the files are uploaded concurrently, so in any order
+        self.assertEqual(Storage.__init__.call_args_list, [call()])
+        self.assertCountEqual(File.__init__.call_args_list, [
             call(Storage().client.bucket('bucket'), hash1),
             call(Storage().client.bucket('bucket'), hash2),
         ])
 
-        args1, kwargs1 = File.upload.call_args_list[0]
-        args2, kwargs2 = File.upload.call_args_list[1]
+        uploads = {x[0][0].name: x for x in File.upload.call_args_list}
+        args1, kwargs1 = uploads[os.path.basename(file1.name)]
+        args2, kwargs2 = uploads[os.path.basename(file2.name)]
 
         self.assertEqual(len(File.upload.call_args_list), 2)
         self.assertEqual(len(args1), 1)
@@ -734,3 +736,81 @@ class MediaTestSuite(MediaTestCase):
 
             self.assertEqual(json, expected)
             self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch.multiple('breathecode.services.google_cloud.Storage',
+                    __init__=MagicMock(return_value=None),
+                    client=PropertyMock(),
+                    create=True)
+    @patch.multiple(
+        'breathecode.services.google_cloud.File',
+        __init__=MagicMock(return_value=None),
+        bucket=PropertyMock(),
+        file_name=PropertyMock(),
+        upload=MagicMock(),
+        url=MagicMock(return_value='https://storage.cloud.google.com/media-breathecode/hardcoded_url'),
+        create=True)
+    def test_upload__two_items__same_file(self):
+        from breathecode.services.google_cloud import Storage, File
+
+        self.headers(academy=1)
+
+        model = self.generate_models(authenticate=True,
+                                     profile_academy=True,
+                                     capability='crud_media',
+                                     role='potato')
+        url = reverse_lazy('media:upload')
+
+        file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+        file.write(os.urandom(1024))
+        file.close()
+
+        with open(file.name, 'rb') as data:
+            hash = hashlib.sha256(data.read()).hexdigest()
+
+        file1 = open(file.name, 'rb')
+        file2 = open(file.name, 'rb')
+
+        data = {'name': ['filename1.png', 'filename2.png'], 'file': [file1, file2]}
+        response = self.client.put(url, data, format='multipart')
+        json = response.json()
+
+        expected = [{
+            'academy': 1,
+            'categories': [],
+            'hash': hash,
+            'hits': 0,
+            'id': 1,
+            'mime': 'image/png',
+            'name': 'filename1.png',
+            'slug': 'filename1-png',
+            'thumbnail': 'https://storage.cloud.google.com/media-breathecode/hardcoded_url-thumbnail',
+            'url': 'https://storage.cloud.google.com/media-breathecode/hardcoded_url'
+        }, {
+            'academy': 1,
+            'categories': [],
+            'hash': hash,
+            'hits': 0,
+            'id': 2,
+            'mime': 'image/png',
+            'name': 'filename2.png',
+            'slug': 'filename2-png',
+            'thumbnail': 'https://storage.cloud.google.com/media-breathecode/hardcoded_url-thumbnail',
+            'url': 'https://storage.cloud.google.com/media-breathecode/hardcoded_url'
+        }]
+
+        self.assertEqual(json, expected)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # the content is sent to the bucket once
+        self.assertEqual(Storage.__init__.call_args_list, [call()])
+        self.assertEqual(File.__init__.call_args_list, [
+            call(Storage().client.bucket('bucket'), hash),
+        ])
+
+        args, kwargs = File.upload.call_args_list[0]
+
+        self.assertEqual(len(File.upload.call_args_list), 1)
+        self.assertEqual(args[0].size, 1024)
+        self.assertEqual(kwargs, {'content_type': 'image/png'})
+
+        self.assertEqual(File.url.call_args_list, [call()])
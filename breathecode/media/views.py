@@ -1,9 +1,13 @@
 # from breathecode.media.schemas import MediaSchema
 from breathecode.media.schemas import FileSchema, MediaSchema
 import os, hashlib, requests, logging, datetime
+from concurrent.futures import ThreadPoolExecutor
 from breathecode.services.google_cloud import FunctionV1
 from django.shortcuts import redirect
 from breathecode.media.models import Media, Category, MediaResolution
+from breathecode.media.actions import (MAX_CONCURRENT_UPLOADS, ProxyStream, get_media_url,
+                                       get_proxy_response_headers, google_project_id, hash_media_file,
+                                       media_gallery_bucket, open_proxy, upload_media_file)
 from breathecode.utils import GenerateLookupsMixin, num_to_roman
 from rest_framework.views import APIView
 from rest_framework.viewsets import ViewSet
@@ -27,14 +31,6 @@ MIME_ALLOW = [
 ]
 
 
-def media_gallery_bucket():
-    return os.getenv('MEDIA_GALLERY_BUCKET')
-
-
-def google_project_id():
-    return os.getenv('GOOGLE_PROJECT_ID', '')
-
-
 class MediaView(ViewSet, GenerateLookupsMixin):
     """
     get:
@@ -405,11 +401,31 @@ class UploadView(APIView):
                 raise ValidationException(
                     f'You can upload only files on the following formats: {",".join(MIME_ALLOW)}')
 
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UPLOADS) as executor:
+            hashes = list(executor.map(hash_media_file, files))
+
+            # backwards, so the lowest id of each hash is written last and wins, like `.first()` did
+            academy_media = dict(
+                Media.objects.filter(hash__in=hashes,
+                                     academy__id=academy_id).order_by('-id').values_list('hash', 'id'))
+            urls = dict(Media.objects.filter(hash__in=hashes).order_by('-id').values_list('hash', 'url'))
+
+            # the files that are not in the gallery yet, the same file is uploaded once per request
+            pending = {}
+            for hash, file in zip(hashes, files):
+                if hash not in academy_media and not urls.get(hash):
+                    pending.setdefault(hash, file)
+
+            uploads = {}
+            if pending:
+                storage = Storage()
+                uploads = dict(
+                    zip(pending, executor.map(lambda x: upload_media_file(storage, *x), pending.items())))
+
         for index in range(0, len(files)):
             file = files[index]
             name = names[index] if len(names) else file.name
-            file_bytes = file.read()
-            hash = hashlib.sha256(file_bytes).hexdigest()
+            hash = hashes[index]
             slug = slugify(name)
 
             slug_number = Media.objects.filter(slug__startswith=slug).exclude(hash=hash).count() + 1
@@ -437,26 +453,18 @@ class UploadView(APIView):
             elif 'Categories' in request.headers:
                 data['categories'] = request.headers['Categories'].split(',')
 
-            media = Media.objects.filter(hash=hash, academy__id=academy_id).first()
-            if media:
-                data['id'] = media.id
+            if hash in academy_media:
+                data['id'] = academy_media[hash]
 
-                url = Media.objects.filter(hash=hash).values_list('url', flat=True).first()
-                if url:
-                    data['url'] = url
+                if urls.get(hash):
+                    data['url'] = urls[hash]
 
-            else:
-                url = Media.objects.filter(hash=hash).values_list('url', flat=True).first()
-                if url:
-                    data['url'] = url
+            elif urls.get(hash):
+                data['url'] = urls[hash]
 
-                else:
-                    # upload file section
-                    storage = Storage()
-                    cloud_file = storage.file(media_gallery_bucket(), hash)
-                    cloud_file.upload(file, content_type=file.content_type)
-                    data['url'] = cloud_file.url()
-                    data['thumbnail'] = data['url'] + '-thumbnail'
+            else:
+                data['url'] = uploads[hash]
+                data['thumbnail'] = data['url'] + '-thumbnail'
 
             result['data'].append(data)
 
@@ -498,87 +506,25 @@ class MaskingUrlView(APIView):
     schema = FileSchema()
 
     def get(self, request, media_id=None, media_slug=None):
-        lookups = {}
-        if media_id:
-            lookups['id'] = media_id
-        elif media_slug:
-            lookups['slug'] = media_slug.split('.')[0]  #ignore extension
-
-        width = request.GET.get('width')
-        height = request.GET.get('height')
-
-        media = Media.objects.filter(**lookups).first()
-        if not media:
-            raise ValidationException('Resource not found', code=404)
-
-        url = media.url
-
-        if width and height:
-            raise ValidationException(
-                'You need to pass either width or height, not both, in order to avoid losing aspect ratio',
-                code=400,
-                slug='width-and-height-in-querystring')
-
-        if (width or height) and not media.mime.startswith('image/'):
-            raise ValidationException('cannot resize this resource', code=400, slug='cannot-resize-media')
-
-        # register click
-        media.hits = media.hits + 1
-        media.save()
-
-        resolution = MediaResolution.objects.filter(Q(width=width)
-                                                    | Q(height=height), hash=media.hash).first()
-
-        if (width or height) and not resolution:
-            func = FunctionV1(region='us-central1', project_id=google_project_id(), name='resize-image')
-
-            func_request = func.call({
-                'width': width,
-                'height': height,
-                'filename': media.hash,
-                'bucket': media_gallery_bucket(),
-            })
-
-            res = func_request.json()
-
-            if not res['status_code'] == 200 or not res['message'] == 'Ok':
-                if 'message' in res:
-                    raise ValidationException(res['message'], code=500, slug='cloud-function-bad-input')
-
-                raise ValidationException('Unhandled request from cloud functions',
-                                          code=500,
-                                          slug='unhandled-cloud-function')
-
-            width = res['width']
-            height = res['height']
-            resolution = MediaResolution(width=width, height=height, hash=media.hash)
-            resolution.save()
-
-        if (width or height):
-            width = resolution.width
-            height = resolution.height
-
-            url = f'{url}-{width}x{height}'
-            resolution.hits = resolution.hits + 1
-            resolution.save()
+        url, requested = get_media_url(media_id=media_id,
+                                       media_slug=media_slug,
+                                       width=request.GET.get('width'),
+                                       height=request.GET.get('height'))
 
+        # the original file is served while the size is being resized, it must not be cached by the clients
         if request.GET.get('mask') != 'true':
-            return redirect(url, permanent=True)
+            return redirect(url, permanent=requested)
 
-        response = requests.get(url, stream=True)
+        # the range and conditional headers are passed through to the storage
+        response = open_proxy(url, request.headers)
         resource = StreamingHttpResponse(
-            response.raw,
+            ProxyStream(response),
             status=response.status_code,
             reason=response.reason,
         )
 
-        header_keys = [
-            x for x in response.headers.keys() if x != 'Transfer-Encoding' and x != 'Content-Encoding'
-            and x != 'Keep-Alive' and x != 'Connection'
-        ]
-
-        for header in header_keys:
-            resource[header] = response.headers[header]
+        for key, value in get_proxy_response_headers(response.headers).items():
+            resource[key] = value
 
         return resource
 
@@ -2,7 +2,7 @@ import logging, time, datetime, hashlib, requests, csv
 from io import StringIO
 import json, re, os, subprocess, sys
 from django.utils import timezone
-from breathecode.utils import ScriptNotification
+from breathecode.utils import ScriptNotification, write_csv
 from breathecode.admissions.models import Academy
 from .models import CSVUpload, Endpoint, CSVDownload
 from breathecode.services.slack.actions.monitoring import render_snooze_text_endpoint, render_snooze_script
@@ -311,7 +311,7 @@ def run_script(script):
     return content is not None and script.status_code == 0
 
 
-def download_csv(module, model_name, ids_to_download, academy_id=None):
+def download_csv(module, model_name, ids_to_download, academy_id=None, columns=None, compress=False):
 
     download = CSVDownload()
 
@@ -331,27 +331,32 @@ def download_csv(module, model_name, ids_to_download, academy_id=None):
         import importlib
         model = getattr(importlib.import_module(module), model_name)
 
+        # rebuild query from the admin
+        queryset = model.objects.filter(pk__in=ids_to_download)
+
         # finish the file name with <academy_slug>+<model_name>+<epoc_time>.csv
         download.name = model_name + str(int(time.time())) + '.csv'
-        download.save()
+        if compress:
+            download.name += '.gz'
 
-        meta = model._meta
-        field_names = [field.name for field in meta.fields]
-        # rebuild query from the admin
-        queryset = model.objects.filter(pk__in=ids_to_download)
+        download.total_rows = queryset.count()
+        download.save()
 
-        #write csv
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow(field_names)
-        for obj in queryset:
-            writer.writerow((getattr(obj, field) for field in field_names))
+        def progress(rows):
+            CSVDownload.objects.filter(id=download.id).update(exported_rows=rows)
+            download.exported_rows = rows
 
-        # upload to google cloud bucket
+        # upload to google cloud bucket, in chunks, while the rows are read
         from ..services.google_cloud import Storage
         storage = Storage()
-        cloud_file = storage.file(os.getenv('DOWNLOADS_BUCKET', None), download.name)
-        cloud_file.upload(buffer.getvalue(), content_type='text/csv')
+        cloud_file = storage.file(downloads_bucket, download.name)
+
+        file = cloud_file.open('wb', content_type='application/gzip' if compress else 'text/csv')
+        write_csv(queryset, file, columns, compress=compress, progress=progress)
+
+        # the upload is committed when it is closed, so a failed export does not leave a partial file
+        file.close()
+
         download.url = cloud_file.url()
         download.status = 'DONE'
         download.save()
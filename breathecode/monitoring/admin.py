@@ -153,9 +153,12 @@ class MonitorScriptAdmin(admin.ModelAdmin):
 
 @admin.register(CSVDownload)
 class CSVDownloadAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'current_status', 'created_at', 'finished_at', 'download')
+    list_display = ('id', 'name', 'current_status', 'progress', 'created_at', 'finished_at', 'download')
     list_filter = ['academy', 'status']
 
+    def progress(self, obj):
+        return f'{obj.exported_rows}/{obj.total_rows}'
+
     def current_status(self, obj):
         colors = {
             'DONE': 'bg-success',
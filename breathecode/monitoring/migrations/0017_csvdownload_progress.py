@@ -0,0 +1,23 @@
+# Generated by Django 3.2.16 on 2026-10-17 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0016_csvupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csvdownload',
+            name='exported_rows',
+            field=models.IntegerField(default=0, help_text='Rows already written to the file'),
+        ),
+        migrations.AddField(
+            model_name='csvdownload',
+            name='total_rows',
+            field=models.IntegerField(default=0, help_text='Rows to be exported'),
+        ),
+    ]
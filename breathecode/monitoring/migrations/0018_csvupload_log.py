@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0017_csvdownload_progress'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='csvupload',
+            name='log',
+            field=models.TextField(),
+        ),
+    ]
@@ -146,6 +146,9 @@ class CSVDownload(models.Model):
 
     academy = models.ForeignKey(Academy, on_delete=models.CASCADE, null=True, blank=True, default=None)
 
+    total_rows = models.IntegerField(default=0, help_text='Rows to be exported')
+    exported_rows = models.IntegerField(default=0, help_text='Rows already written to the file')
+
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     finished_at = models.DateTimeField(auto_now=True, editable=False)
 
@@ -163,7 +166,7 @@ class CSVUpload(models.Model):
     url = models.URLField()
     status = models.CharField(max_length=20, choices=UPLOAD_STATUS, default=PENDING)
     status_message = models.TextField(null=True, blank=True, default=None)
-    log = models.CharField(max_length=50)
+    log = models.TextField()
     academy = models.ForeignKey(Academy, on_delete=models.CASCADE, null=True, blank=True, default=None)
     hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
@@ -13,6 +13,8 @@ class CSVDownloadSmallSerializer(serpy.Serializer):
     name = serpy.Field()
     url = serpy.Field()
     status = serpy.Field()
+    total_rows = serpy.Field()
+    exported_rows = serpy.Field()
     created_at = serpy.Field()
     finished_at = serpy.Field()
 
@@ -111,6 +111,6 @@ def execute_scripts(self, script_id):
 
 
 @shared_task(bind=True, base=BaseTaskWithRetry)
-def async_download_csv(self, module, model_name, ids_to_download):
+def async_download_csv(self, module, model_name, ids_to_download, columns=None, compress=False):
     logger.debug('Starting to download csv for ')
-    return download_csv(module, model_name, ids_to_download)
+    return download_csv(module, model_name, ids_to_download, columns=columns, compress=compress)
@@ -0,0 +1,161 @@
+"""
+Test download_csv
+"""
+import gzip
+import io
+import os
+from unittest.mock import MagicMock, PropertyMock, call, patch
+from django.utils import timezone
+from ..mixins import MonitoringTestCase
+from ...actions import download_csv
+
+URL = 'https://storage.cloud.google.com/downloads/hardcoded_url'
+NOW = 1_700_000_000
+UTC_NOW = timezone.now()
+
+
+def get_writer():
+    writer = io.BytesIO()
+    writer.close = MagicMock()
+    return writer
+
+
+def csv_download_item(data={}):
+    return {
+        'id': 1,
+        'academy_id': None,
+        'name': f'CohortUser{NOW}.csv',
+        'status': 'DONE',
+        'status_message': None,
+        'url': URL,
+        'total_rows': 0,
+        'exported_rows': 0,
+        'finished_at': UTC_NOW,
+        **data,
+    }
+
+
+def storage_mocks(writer):
+    return [
+        patch.multiple('breathecode.services.google_cloud.Storage',
+                       __init__=MagicMock(return_value=None),
+                       client=PropertyMock(),
+                       create=True),
+        patch.multiple('breathecode.services.google_cloud.File',
+                       __init__=MagicMock(return_value=None),
+                       bucket=PropertyMock(),
+                       file_name=PropertyMock(),
+                       open=MagicMock(return_value=writer),
+                       url=MagicMock(return_value=URL),
+                       create=True),
+        patch.dict(os.environ, {'DOWNLOADS_BUCKET': 'downloads'}),
+        patch('time.time', MagicMock(return_value=NOW)),
+        patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW)),
+    ]
+
+
+class DownloadCSVTestSuite(MonitoringTestCase):
+
+    def run_download(self, writer, *args, **kwargs):
+        """
+        Run download_csv with the bucket mocked, it returns its result and the mock of `File.open`.
+        """
+
+        from breathecode.services.google_cloud import File
+
+        mocks = storage_mocks(writer)
+        for mock in mocks:
+            mock.start()
+
+        try:
+            return download_csv(*args, **kwargs), File.open
+
+        finally:
+            for mock in reversed(mocks):
+                mock.stop()
+
+    def test_download_csv__without_bucket(self):
+        with patch.dict(os.environ, {}, clear=True), patch('django.utils.timezone.now',
+                                                           MagicMock(return_value=UTC_NOW)):
+            result = download_csv('breathecode.admissions.models', 'CohortUser', [])
+
+        self.assertFalse(result)
+        self.assertEqual(self.bc.database.list_of('monitoring.CSVDownload'), [
+            csv_download_item({
+                'name': '',
+                'status': 'ERROR',
+                'status_message': 'Unknown DOWNLOADS_BUCKET configuration, please set env variable',
+                'url': '',
+            }),
+        ])
+
+    def test_download_csv(self):
+        model = self.bc.database.create(cohort_user=2)
+        writer = get_writer()
+
+        result, open_mock = self.run_download(writer,
+                                              'breathecode.admissions.models',
+                                              'CohortUser', [1, 2],
+                                              columns=['id', 'user__email'])
+
+        self.assertTrue(result)
+        self.assertEqual(self.bc.database.list_of('monitoring.CSVDownload'), [
+            csv_download_item({
+                'total_rows': 2,
+                'exported_rows': 2,
+            }),
+        ])
+
+        self.assertEqual(open_mock.call_args_list, [call('wb', content_type='text/csv')])
+        self.assertEqual(writer.close.call_args_list, [call()])
+        self.assertEqual(
+            writer.getvalue().decode('utf-8'), ''.join([
+                'id,user__email\r\n',
+                f'1,{model.user.email}\r\n',
+                f'2,{model.user.email}\r\n',
+            ]))
+
+    def test_download_csv__compressed(self):
+        model = self.bc.database.create(cohort_user=1)
+        writer = get_writer()
+
+        result, open_mock = self.run_download(writer,
+                                              'breathecode.admissions.models',
+                                              'CohortUser', [1],
+                                              columns=['id', 'user__email'],
+                                              compress=True)
+
+        self.assertTrue(result)
+        self.assertEqual(self.bc.database.list_of('monitoring.CSVDownload'), [
+            csv_download_item({
+                'name': f'CohortUser{NOW}.csv.gz',
+                'total_rows': 1,
+                'exported_rows': 1,
+            }),
+        ])
+
+        self.assertEqual(open_mock.call_args_list, [call('wb', content_type='application/gzip')])
+        self.assertEqual(
+            gzip.decompress(writer.getvalue()).decode('utf-8'), f'id,user__email\r\n1,{model.user.email}\r\n')
+
+    def test_download_csv__bad_column(self):
+        model = self.bc.database.create(cohort_user=1)
+        writer = get_writer()
+
+        result, open_mock = self.run_download(writer,
+                                              'breathecode.admissions.models',
+                                              'CohortUser', [1],
+                                              columns=['id', 'potato'])
+
+        self.assertFalse(result)
+        self.assertEqual(self.bc.database.list_of('monitoring.CSVDownload'), [
+            csv_download_item({
+                'status': 'ERROR',
+                'status_message': "'CohortUser' object has no attribute 'potato'",
+                'url': '',
+                'total_rows': 1,
+            }),
+        ])
+
+        # a failed export is not committed to the bucket
+        self.assertEqual(writer.close.call_args_list, [])
@@ -13,6 +13,9 @@ from breathecode.utils import ValidationException
 from rest_framework import status
 from django.http import StreamingHttpResponse
 
+# bytes requested to the bucket per read while a download is relayed
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -44,10 +47,17 @@ def get_download(request, download_id=None):
             from ..services.google_cloud import Storage
             storage = Storage()
             cloud_file = storage.file(os.getenv('DOWNLOADS_BUCKET', None), download.name)
-            buffer = cloud_file.stream_download()
+
+            try:
+                reader = cloud_file.open('rb')
+
+            except FileNotFoundError:
+                raise ValidationException(f'File of the CSV Download {download_id} not found',
+                                          code=status.HTTP_404_NOT_FOUND)
+
             return StreamingHttpResponse(
-                buffer.all(),
-                content_type='text/csv',
+                iter(lambda: reader.read(DOWNLOAD_CHUNK_SIZE), b''),
+                content_type='application/gzip' if download.name.endswith('.gz') else 'text/csv',
                 headers={'Content-Disposition': f'attachment; filename={download.name}'},
             )
         else:
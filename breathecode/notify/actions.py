@@ -1,10 +1,12 @@
 from django.core.mail import EmailMultiAlternatives
+from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework.exceptions import APIException
-import os, logging, json, re
+import os, logging, json, re, threading
 from django.template.loader import get_template
 from django.contrib.auth.models import User
 from django.template import Context
 from django.utils import timezone
+from django.utils.html import escape
 from pyfcm import FCMNotification
 from breathecode.services.slack import client
 from breathecode.admissions.models import Cohort, CohortUser
@@ -21,6 +23,33 @@ if FIREBASE_KEY is not None and FIREBASE_KEY != '':
 
 logger = logging.getLogger(__name__)
 
+# recipients per request, the limit of the batch sending of Mailgun
+MAILGUN_BATCH_SIZE = 1000
+MAILGUN_POOL_SIZE = 8
+# seconds to connect and between the bytes of the response
+MAILGUN_TIMEOUT = (3.05, 30)
+
+lock = threading.Lock()
+session = None
+
+
+def get_mailgun_session() -> requests.Session:
+    """
+    Get the session of the process, it keeps the connections to Mailgun alive between the batches.
+    """
+
+    global session
+
+    if session is None:
+        with lock:
+            if session is None:
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=MAILGUN_POOL_SIZE)
+                s = requests.Session()
+                s.mount('https://', adapter)
+                session = s
+
+    return session
+
 
 def send_email_message(template_slug, to, data={}):
 
@@ -56,6 +85,83 @@ def send_email_message(template_slug, to, data={}):
         return True
 
 
+def send_email_messages(template_slug: str, recipients: dict[str, dict], data: dict = {}) -> dict[str, bool]:
+    """
+    Send the same email to many recipients with the batch sending of Mailgun, it returns if the email was
+    sent to each recipient.
+
+    The template is rendered once, the keys of the data of each recipient are rendered as
+    `%recipient.<key>%` and replaced by Mailgun, so they should not be used in the conditions of the
+    template, the values are escaped in the html like the template would do it.
+
+    Usage:
+
+    ```py
+    send_email_messages('message', {'john@gmail.com': {'LINK': 'https://...'}}, {'SUBJECT': 'Hi'})
+    ```
+    """
+
+    results = {x: False for x in recipients}
+    emails = [x for x in recipients if x]
+
+    if not emails:
+        return results
+
+    if os.getenv('EMAIL_NOTIFICATIONS_ENABLED', False) != 'TRUE':
+        logger.warning(
+            f'Email to {len(emails)} recipients not sent because EMAIL_NOTIFICATIONS_ENABLED != TRUE')
+        return {**results, **{x: True for x in emails}}
+
+    keys = sorted({key for x in emails for key in (recipients[x] or {})})
+    template = get_template_content(template_slug, {
+        **data,
+        **{x: f'%recipient.{x}%'
+           for x in keys},
+    }, ['email'])
+
+    # Mailgun does not escape the variables, the html gets its own placeholders with the escaped values
+    html = template['html']
+    for key in keys:
+        html = html.replace(f'%recipient.{key}%', f'%recipient.{key}__html%')
+
+    for i in range(0, len(emails), MAILGUN_BATCH_SIZE):
+        batch = emails[i:i + MAILGUN_BATCH_SIZE]
+
+        variables = {}
+        for x in batch:
+            # the recipients without some key get it empty instead of the placeholder
+            values = {key: (recipients[x] or {}).get(key, '') for key in keys}
+            variables[x] = {**values, **{f'{key}__html': escape(value) for key, value in values.items()}}
+
+        try:
+            result = get_mailgun_session().post(
+                f"https://api.mailgun.net/v3/{os.environ.get('MAILGUN_DOMAIN')}/messages",
+                auth=('api', os.environ.get('MAILGUN_API_KEY', '')),
+                data={
+                    'from': f"BreatheCode <mailgun@{os.environ.get('MAILGUN_DOMAIN')}>",
+                    'to': batch,
+                    'subject': template['subject'],
+                    'text': template['text'],
+                    'html': html,
+                    'recipient-variables': json.dumps(variables, cls=DjangoJSONEncoder),
+                },
+                timeout=MAILGUN_TIMEOUT)
+
+        except requests.RequestException:
+            logger.exception(f'Error sending email {template_slug} to {len(batch)} recipients')
+            continue
+
+        if result.status_code != 200:
+            logger.error(f'Error sending email, mailgun status code: {str(result.status_code)}')
+            logger.error(result.text)
+            continue
+
+        logger.debug(f'Email notification {template_slug} sent to {len(batch)} recipients')
+        results.update({x: True for x in batch})
+
+    return results
+
+
 def send_sms(slug, phone_number, data={}):
 
     template = get_template_content(slug, data, ['sms'])
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notify', '0010_auto_20220901_0323'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hook',
+            name='batch_deliveries',
+            field=models.BooleanField(
+                default=False,
+                help_text='Receive the payloads in arrays, the events of the same target are grouped'),
+        ),
+    ]
@@ -147,6 +147,8 @@ class AbstractHook(models.Model):
     event = models.CharField('Event', max_length=64, db_index=True)
     target = models.URLField('Target URL', max_length=255)
     service_id = models.CharField('Service ID', max_length=64, null=True, default=None, blank=True)
+    batch_deliveries = models.BooleanField(
+        default=False, help_text='Receive the payloads in arrays, the events of the same target are grouped')
     sample_data = models.JSONField(null=True,
                                    default=None,
                                    blank=True,
@@ -1,4 +1,5 @@
 import logging
+from django.contrib.auth.models import User
 from django.dispatch import receiver
 from django.db.models import Avg
 from breathecode.mentorship.models import MentorshipSession
@@ -36,6 +37,9 @@ def model_saved(sender, instance, created, raw, using, **kwargs):
     Automatically triggers "created" and "updated" actions.
     """
     model_label = get_model_label(instance)
+    if not HookManager.has_model_events(model_label):
+        return
+
     action = 'created' if created else 'updated'
     HookManager.process_model_event(instance, model_label, action)
 
@@ -46,4 +50,33 @@ def model_deleted(sender, instance, using, **kwargs):
     Automatically triggers "deleted" actions.
     """
     model_label = get_model_label(instance)
+    if not HookManager.has_model_events(model_label):
+        return
+
     HookManager.process_model_event(instance, model_label, 'deleted')
+
+
+HookModel = HookManager.get_hook_model()
+
+
+@receiver(post_save, sender=HookModel)
+def hook_saved(sender, instance, **kwargs):
+    table = HookManager.get_routing_table(build=False)
+
+    # the deliveries save the stats of the hook, they do not change its routes
+    if table is not None and not table.routes_hook(instance):
+        HookManager.clear_routing_table()
+
+
+@receiver(post_delete, sender=HookModel)
+def hook_deleted(sender, instance, **kwargs):
+    HookManager.clear_routing_table()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    table = HookManager.get_routing_table(build=False)
+
+    # the hooks are routed by the username and the superuser flag of their owner
+    if table is not None and not table.routes_user(instance):
+        HookManager.clear_routing_table()
@@ -1,7 +1,5 @@
-import logging, os, requests, json
+import logging, os
 from celery import shared_task, Task
-from django.core.serializers.json import DjangoJSONEncoder
-from django.utils import timezone
 from .actions import sync_slack_team_channel, sync_slack_team_users, send_email_message
 from breathecode.services.slack.client import Slack
 from breathecode.mentorship.models import MentorshipSession
@@ -89,40 +87,58 @@ def async_slack_command(post_data):
 
 @shared_task
 def async_deliver_hook(target, payload, hook_id=None, **kwargs):
-    logger.debug('Starting async_deliver_hook')
-    from .utils.hook_manager import HookManager
     """
+    Deliver a payload at once, it is used when the payloads cannot be queued.
+
     target:     the url to receive the payload.
     payload:    a python primitive data structure
-    instance:   a possibly null "trigger" instance
-    hook:       the defining Hook object (useful for removing)
+    hook_id:    the id of the defining Hook object, to save its calls
     """
-    response = requests.post(url=target,
-                             data=json.dumps(payload, cls=DjangoJSONEncoder),
-                             headers={'Content-Type': 'application/json'},
-                             timeout=2)
 
-    if hook_id:
-        HookModel = HookManager.get_hook_model()
-        hook = HookModel.objects.get(id=hook_id)
-        if response.status_code == 410:
-            hook.delete()
+    logger.debug('Starting async_deliver_hook')
+    from .utils.hook_delivery import deliver_hook_payloads, HookDeliveryError
 
-        else:
-            data = hook.sample_data
-            if not isinstance(data, list):
-                data = []
-
-            if 'data' in payload and isinstance(payload['data'], dict):
-                data.append(payload['data'])
-            elif isinstance(payload, dict):
-                data.append(payload)
-
-            if len(data) > 10:
-                data = data[1:10]
-
-            hook.last_response_code = response.status_code
-            hook.last_call_at = timezone.now()
-            hook.sample_data = data
-            hook.total_calls = hook.total_calls + 1
-            hook.save()
+    try:
+        deliver_hook_payloads(target, [{'hook_id': hook_id, 'payload': payload}])
+
+    except HookDeliveryError as e:
+        logger.error(f'The payload of the hook {hook_id} was not delivered: {e}')
+
+
+@shared_task(bind=True, max_retries=8)
+def async_deliver_hooks(self, target):
+    logger.debug('Starting async_deliver_hooks')
+    from .utils.hook_delivery import (deliver_hook_payloads, pop_hook_payloads, has_hook_payloads,
+                                      discard_hook_payloads, schedule_hook_delivery, schedule_hook_retry,
+                                      clear_hook_delivery_schedule, delivery_slot, HookDeliveryError,
+                                      HOOK_BACKOFF, HOOK_MAX_BACKOFF)
+
+    # the payloads queued from now on need other delivery, this one could have read the queue already
+    clear_hook_delivery_schedule(target)
+
+    with delivery_slot(target) as slot:
+        if not slot.acquired:
+            logger.debug(f'Too many deliveries in progress to {target}, they will deliver the payloads')
+            return
+
+        try:
+            while items := pop_hook_payloads(target):
+                deliver_hook_payloads(target, items)
+
+        except HookDeliveryError as e:
+            if self.request.retries >= self.max_retries:
+                discarded = discard_hook_payloads(target)
+                logger.error(f'Delivery to {target} failed {self.request.retries + 1} times, '
+                             f'{discarded} payloads were discarded: {e}')
+                return
+
+            countdown = e.retry_after or min(HOOK_BACKOFF * 2**self.request.retries, HOOK_MAX_BACKOFF)
+            logger.warning(f'Delivery to {target} failed, it will be retried in {countdown} seconds: {e}')
+
+            # the retry delivers the payloads queued while it waits
+            schedule_hook_retry(target, countdown)
+            raise self.retry(countdown=countdown)
+
+    # payloads queued after the last read of a delivery that did not get a slot
+    if has_hook_payloads(target) and schedule_hook_delivery(target):
+        async_deliver_hooks.delay(target)
@@ -0,0 +1,139 @@
+"""
+Test send_email_messages
+"""
+import json
+import os
+from unittest.mock import MagicMock, call, patch
+from breathecode.notify import actions
+from breathecode.notify.actions import get_template_content, send_email_messages
+from ..mixins import NotifyTestCase
+
+MAILGUN_DOMAIN = 'breatheco.de'
+
+
+def response(status_code):
+    return MagicMock(status_code=status_code, text='')
+
+
+def session_mock(*responses):
+    session = MagicMock()
+    session.post.side_effect = list(responses)
+    return patch('breathecode.notify.actions.get_mailgun_session', MagicMock(return_value=session))
+
+
+def post_call(to, variables, template, html=None):
+    return call(f'https://api.mailgun.net/v3/{MAILGUN_DOMAIN}/messages',
+                auth=('api', ''),
+                data={
+                    'from': f'BreatheCode <mailgun@{MAILGUN_DOMAIN}>',
+                    'to': to,
+                    'subject': template['subject'],
+                    'text': template['text'],
+                    'html': html or template['html'],
+                    'recipient-variables': json.dumps(variables),
+                },
+                timeout=(3.05, 30))
+
+
+@patch.dict(os.environ, {'EMAIL_NOTIFICATIONS_ENABLED': 'TRUE', 'MAILGUN_DOMAIN': MAILGUN_DOMAIN})
+class SendEmailMessagesTestSuite(NotifyTestCase):
+
+    def get_session(self):
+        return actions.get_mailgun_session()
+
+    """
+    🔽🔽🔽 Without recipients
+    """
+
+    def test_send_email_messages__without_recipients(self):
+        with session_mock():
+            self.assertEqual(send_email_messages('message', {'': {}}), {'': False})
+            self.assertEqual(self.get_session().post.call_args_list, [])
+
+    """
+    🔽🔽🔽 One request per batch
+    """
+
+    @patch('breathecode.notify.actions.MAILGUN_BATCH_SIZE', 2)
+    def test_send_email_messages__in_batches(self):
+        recipients = {
+            'john@gmail.com': {
+                'LINK': 'https://4geeks.com/1'
+            },
+            'jane@gmail.com': {
+                'LINK': 'https://4geeks.com/2'
+            },
+            'rene@gmail.com': {},
+        }
+
+        with session_mock(response(200), response(500)):
+            result = send_email_messages('message', recipients, {'SUBJECT': 'Hi', 'BUTTON': 'Answer'})
+
+            template = get_template_content('message', {
+                'SUBJECT': 'Hi',
+                'BUTTON': 'Answer',
+                'LINK': '%recipient.LINK%',
+            }, ['email'])
+            html = template['html'].replace('%recipient.LINK%', '%recipient.LINK__html%')
+
+            self.assertEqual(self.get_session().post.call_args_list, [
+                post_call(
+                    ['john@gmail.com', 'jane@gmail.com'], {
+                        'john@gmail.com': {
+                            'LINK': 'https://4geeks.com/1',
+                            'LINK__html': 'https://4geeks.com/1',
+                        },
+                        'jane@gmail.com': {
+                            'LINK': 'https://4geeks.com/2',
+                            'LINK__html': 'https://4geeks.com/2',
+                        },
+                    }, template, html),
+                post_call(['rene@gmail.com'], {'rene@gmail.com': {
+                    'LINK': '',
+                    'LINK__html': '',
+                }}, template, html),
+            ])
+
+        self.assertEqual(result, {'john@gmail.com': True, 'jane@gmail.com': True, 'rene@gmail.com': False})
+
+    """
+    🔽🔽🔽 With the notifications disabled
+    """
+
+    @patch.dict(os.environ, {'EMAIL_NOTIFICATIONS_ENABLED': 'FALSE'})
+    def test_send_email_messages__disabled(self):
+        with session_mock():
+            result = send_email_messages('message', {'john@gmail.com': {}, '': {}})
+            self.assertEqual(self.get_session().post.call_args_list, [])
+
+        self.assertEqual(result, {'john@gmail.com': True, '': False})
+
+    """
+    🔽🔽🔽 Escaped in the html
+    """
+
+    def test_send_email_messages__escaped_in_html(self):
+        recipients = {'john@gmail.com': {'MESSAGE': 'Tom & <Jerry>'}}
+
+        with session_mock(response(200)):
+            result = send_email_messages('message', recipients, {'SUBJECT': 'Hi'})
+
+            template = get_template_content('message', {
+                'SUBJECT': 'Hi',
+                'MESSAGE': '%recipient.MESSAGE%',
+            }, ['email'])
+            html = template['html'].replace('%recipient.MESSAGE%', '%recipient.MESSAGE__html%')
+
+            self.assertIn('%recipient.MESSAGE%', template['text'])
+            self.assertIn('%recipient.MESSAGE__html%', html)
+            self.assertEqual(self.get_session().post.call_args_list, [
+                post_call(
+                    ['john@gmail.com'], {
+                        'john@gmail.com': {
+                            'MESSAGE': 'Tom & <Jerry>',
+                            'MESSAGE__html': 'Tom &amp; &lt;Jerry&gt;',
+                        },
+                    }, template, html),
+            ])
+
+        self.assertEqual(result, {'john@gmail.com': True})
@@ -0,0 +1,297 @@
+"""
+Test async_deliver_hook and async_deliver_hooks
+"""
+import json
+import logging
+from unittest.mock import MagicMock, call, patch
+from django.utils import timezone
+from breathecode.notify.tasks import async_deliver_hook, async_deliver_hooks
+from breathecode.notify.utils.hook_delivery import get_queue_key
+from breathecode.notify.utils.hook_manager import HookManager
+from ..mixins import NotifyTestCase
+
+UTC_NOW = timezone.now()
+TARGET = 'https://hooks.zapier.com/1/'
+
+
+class FakePipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def lrange(self, key, start, end):
+        self.commands.append(lambda: self.redis.lists.get(key, [])[start:end + 1])
+
+    def llen(self, key):
+        self.commands.append(lambda: len(self.redis.lists.get(key, [])))
+
+    def delete(self, key):
+        self.commands.append(lambda: bool(self.redis.lists.pop(key, None)))
+
+    def ltrim(self, key, start, end):
+
+        def ltrim():
+            self.redis.lists[key] = self.redis.lists.get(key, [])[start:]
+            return True
+
+        self.commands.append(ltrim)
+
+    def execute(self):
+        return [x() for x in self.commands]
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    def lpush(self, key, *values):
+        for value in values:
+            self.lists.setdefault(key, []).insert(0, value)
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def response(status_code, headers={}):
+    return MagicMock(status_code=status_code, headers=headers)
+
+
+def session_mock(*responses):
+    session = MagicMock()
+    session.post.side_effect = list(responses)
+    return patch('breathecode.notify.utils.hook_delivery.get_hook_session', MagicMock(return_value=session))
+
+
+def post_call(data):
+    return call(TARGET,
+                data=json.dumps(data),
+                headers={'Content-Type': 'application/json'},
+                timeout=(3.05, 10))
+
+
+class DeliverHooksTestSuite(NotifyTestCase):
+
+    def get_session(self):
+        from breathecode.notify.utils.hook_delivery import get_hook_session
+        return get_hook_session()
+
+    def queue(self, redis):
+        return [json.loads(x) for x in redis.lists.get(get_queue_key(TARGET), [])]
+
+    """
+    🔽🔽🔽 Without Redis
+    """
+
+    @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
+    def test_async_deliver_hook__counters(self):
+        model = self.bc.database.create(hook={'target': TARGET, 'total_calls': 3, 'sample_data': [{'x': 0}]})
+
+        with session_mock(response(200)):
+            async_deliver_hook(TARGET, {'data': {'x': 1}}, hook_id=1)
+            self.assertEqual(self.get_session().post.call_args_list, [post_call({'data': {'x': 1}})])
+
+        self.assertEqual(self.bc.database.list_of('notify.Hook'),
+                         [{
+                             **self.bc.format.to_dict(model.hook),
+                             'total_calls': 4,
+                             'sample_data': [{
+                                 'x': 0
+                             }, {
+                                 'x': 1
+                             }],
+                             'last_call_at': UTC_NOW,
+                             'last_response_code': 200,
+                         }])
+
+    def test_async_deliver_hook__gone(self):
+        self.bc.database.create(hook={'target': TARGET})
+
+        with session_mock(response(410)):
+            async_deliver_hook(TARGET, {'data': {'x': 1}}, hook_id=1)
+
+        self.assertEqual(self.bc.database.list_of('notify.Hook'), [])
+
+    """
+    🔽🔽🔽 With Redis
+    """
+
+    @patch('breathecode.notify.tasks.async_deliver_hooks.apply_async', MagicMock())
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    def test_deliver_hook__queued_per_target(self):
+        redis = FakeRedis()
+        model = self.bc.database.create(hook=[{'target': TARGET}, {'target': TARGET}])
+
+        with patch('breathecode.notify.utils.hook_delivery.get_redis', MagicMock(return_value=redis)):
+            HookManager.deliver_hook(model.hook[0], None, payload_override={'x': 1})
+            HookManager.deliver_hook(model.hook[1], None, payload_override={'x': 2})
+
+        self.assertEqual(self.queue(redis), [
+            {
+                'hook_id': 1,
+                'payload': {
+                    'x': 1
+                }
+            },
+            {
+                'hook_id': 2,
+                'payload': {
+                    'x': 2
+                }
+            },
+        ])
+
+        # one delivery for both payloads
+        self.assertEqual(async_deliver_hooks.apply_async.call_args_list, [call(args=(TARGET, ), countdown=1)])
+        self.assertEqual(async_deliver_hook.delay.call_args_list, [])
+
+    @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
+    def test_async_deliver_hooks__batched_and_single(self):
+        redis = FakeRedis()
+        model = self.bc.database.create(hook=[{
+            'target': TARGET,
+            'batch_deliveries': True,
+            'sample_data': None,
+            'total_calls': 0,
+        }, {
+            'target': TARGET,
+            'batch_deliveries': False,
+            'sample_data': None,
+            'total_calls': 0,
+        }])
+
+        redis.rpush(
+            get_queue_key(TARGET), *[
+                json.dumps({
+                    'hook_id': hook_id,
+                    'payload': {
+                        'data': {
+                            'x': n
+                        }
+                    }
+                }) for n, hook_id in enumerate([1, 2, 1, 2])
+            ])
+
+        with patch('breathecode.notify.utils.hook_delivery.get_redis', MagicMock(return_value=redis)), \
+                session_mock(response(200), response(200), response(200)):
+            async_deliver_hooks(TARGET)
+
+            self.assertEqual(self.get_session().post.call_args_list, [
+                post_call({'data': {
+                    'x': 1
+                }}),
+                post_call({'data': {
+                    'x': 3
+                }}),
+                post_call([{
+                    'data': {
+                        'x': 0
+                    }
+                }, {
+                    'data': {
+                        'x': 2
+                    }
+                }]),
+            ])
+
+        self.assertEqual(self.queue(redis), [])
+        self.assertEqual(self.bc.database.list_of('notify.Hook'), [
+            {
+                **self.bc.format.to_dict(model.hook[0]),
+                'total_calls': 2,
+                'sample_data': [{
+                    'x': 0
+                }, {
+                    'x': 2
+                }],
+                'last_call_at': UTC_NOW,
+                'last_response_code': 200,
+            },
+            {
+                **self.bc.format.to_dict(model.hook[1]),
+                'total_calls': 2,
+                'sample_data': [{
+                    'x': 1
+                }, {
+                    'x': 3
+                }],
+                'last_call_at': UTC_NOW,
+                'last_response_code': 200,
+            },
+        ])
+
+    @patch('django.utils.timezone.now', MagicMock(return_value=UTC_NOW))
+    @patch('breathecode.notify.tasks.async_deliver_hooks.apply_async', MagicMock())
+    @patch('breathecode.notify.tasks.async_deliver_hooks.retry', MagicMock(side_effect=Exception('retry')))
+    def test_async_deliver_hooks__backoff(self):
+        redis = FakeRedis()
+        model = self.bc.database.create(hook={'target': TARGET, 'sample_data': None, 'total_calls': 0})
+
+        items = [{'hook_id': 1, 'payload': {'data': {'x': n}}} for n in range(3)]
+        redis.rpush(get_queue_key(TARGET), *[json.dumps(x) for x in items])
+
+        with patch('breathecode.notify.utils.hook_delivery.get_redis', MagicMock(return_value=redis)), \
+                session_mock(response(200), response(503, {'Retry-After': '120'})):
+            with self.assertRaisesMessage(Exception, 'retry'):
+                async_deliver_hooks(TARGET)
+
+            # the payloads of new events wait for the retry
+            HookManager.deliver_hook(model.hook, None, payload_override={'data': {'x': 3}})
+
+        # the payloads not delivered go back to the front of the queue
+        self.assertEqual(self.queue(redis), items[1:] + [{'hook_id': 1, 'payload': {'data': {'x': 3}}}])
+        self.assertEqual(async_deliver_hooks.retry.call_args_list, [call(countdown=120)])
+        self.assertEqual(async_deliver_hooks.apply_async.call_args_list, [])
+        self.assertEqual(self.bc.database.list_of('notify.Hook'),
+                         [{
+                             **self.bc.format.to_dict(model.hook),
+                             'total_calls': 1,
+                             'sample_data': [{
+                                 'x': 0
+                             }],
+                             'last_call_at': UTC_NOW,
+                             'last_response_code': 200,
+                         }])
+
+    def test_async_deliver_hooks__without_slots(self):
+        from django.core.cache import cache
+
+        redis = FakeRedis()
+        redis.rpush(get_queue_key(TARGET), json.dumps({'hook_id': None, 'payload': {}}))
+
+        # two deliveries are in progress
+        cache.set_many({f'{get_queue_key(TARGET)}__slot__{n}': 1 for n in range(2)})
+
+        with patch('breathecode.notify.utils.hook_delivery.get_redis', MagicMock(return_value=redis)), \
+                session_mock():
+            async_deliver_hooks(TARGET)
+            self.assertEqual(self.get_session().post.call_args_list, [])
+
+        self.assertEqual(self.queue(redis), [{'hook_id': None, 'payload': {}}])
+
+    @patch('logging.Logger.error', MagicMock())
+    @patch('breathecode.notify.tasks.async_deliver_hooks.retry', MagicMock(side_effect=Exception('retry')))
+    def test_async_deliver_hooks__max_retries(self):
+        redis = FakeRedis()
+        self.bc.database.create(hook={'target': TARGET, 'sample_data': None, 'total_calls': 0})
+
+        items = [{'hook_id': 1, 'payload': {'data': {'x': n}}} for n in range(3)]
+        redis.rpush(get_queue_key(TARGET), *[json.dumps(x) for x in items])
+
+        with patch('breathecode.notify.utils.hook_delivery.get_redis', MagicMock(return_value=redis)), \
+                session_mock(response(503)):
+            async_deliver_hooks.apply(args=(TARGET, ), retries=8)
+
+        # the target did not recover, the payloads are discarded
+        self.assertEqual(self.queue(redis), [])
+        self.assertEqual(async_deliver_hooks.retry.call_args_list, [])
+        self.assertEqual(logging.Logger.error.call_args_list, [
+            call(f'Delivery to {TARGET} failed 9 times, 3 payloads were discarded: {TARGET} responded 503'),
+        ])
@@ -0,0 +1,181 @@
+"""
+Test HookManager
+"""
+from unittest.mock import MagicMock, call, patch
+from breathecode.notify.utils.hook_manager import HookManager
+from ..mixins import NotifyTestCase
+
+
+class HookManagerTestSuite(NotifyTestCase):
+
+    def fire(self, form_entry):
+        from breathecode.notify.tasks import async_deliver_hook
+
+        async_deliver_hook.delay.call_args_list = []
+        HookManager.process_model_event(form_entry, 'marketing.FormEntry', 'created')
+        return [(args[0], kwargs['hook_id']) for args, kwargs in async_deliver_hook.delay.call_args_list]
+
+    """
+    🔽🔽🔽 Without hooks
+    """
+
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    def test_process_model_event__without_hooks(self):
+        model = self.bc.database.create(form_entry=1, academy=1)
+
+        self.assertEqual(self.fire(model.form_entry), [])
+
+        # the table is built once, the events without hooks do not read the academy
+        model.form_entry.refresh_from_db()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.fire(model.form_entry), [])
+
+    """
+    🔽🔽🔽 With hooks of the academy, of other academy and of a superuser
+    """
+
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    @patch('breathecode.notify.models.Hook.serialize_hook', MagicMock(return_value={}))
+    def test_process_model_event__routed_by_academy(self):
+        users = [{
+            'username': 'downtown'
+        }, {
+            'username': 'uptown'
+        }, {
+            'username': 'admin',
+            'is_superuser': True
+        }]
+        hooks = [{
+            'user_id': n,
+            'event': 'form_entry.added',
+            'target': f'https://{n}.io/'
+        } for n in range(1, 4)]
+        # the hooks are committed
+        with self.captureOnCommitCallbacks(execute=True):
+            model = self.bc.database.create(user=users,
+                                            hook=hooks,
+                                            academy={'slug': 'downtown'},
+                                            form_entry=1)
+
+        self.assertEqual(self.fire(model.form_entry), [('https://3.io/', 3), ('https://1.io/', 1)])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.fire(model.form_entry), [('https://3.io/', 3), ('https://1.io/', 1)])
+
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    def test_process_model_event__payload(self):
+        from breathecode.notify.tasks import async_deliver_hook
+
+        model = self.bc.database.create(user={'username': 'downtown'},
+                                        hook={'event': 'form_entry.added'},
+                                        academy={'slug': 'downtown'},
+                                        form_entry=1)
+
+        self.fire(model.form_entry)
+
+        self.assertEqual(async_deliver_hook.delay.call_args_list, [
+            call(model.hook.target, model.hook.serialize_hook(model.form_entry), hook_id=1),
+        ])
+
+    """
+    🔽🔽🔽 Invalidation
+    """
+
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    def test_process_model_event__hook_changed(self):
+        model = self.bc.database.create(user={'username': 'downtown'},
+                                        hook={
+                                            'event': 'form_entry.added',
+                                            'target': 'https://old.io/'
+                                        },
+                                        academy={'slug': 'downtown'},
+                                        form_entry=1)
+
+        self.assertEqual(self.fire(model.form_entry), [('https://old.io/', 1)])
+
+        model.hook.target = 'https://new.io/'
+        model.hook.save()
+
+        self.assertEqual(self.fire(model.form_entry), [('https://new.io/', 1)])
+
+        model.hook.delete()
+
+        self.assertEqual(self.fire(model.form_entry), [])
+
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    def test_process_model_event__hook_stats_saved(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            model = self.bc.database.create(user={'username': 'downtown'},
+                                            hook={'event': 'form_entry.added'},
+                                            academy={'slug': 'downtown'},
+                                            form_entry=1)
+
+        self.fire(model.form_entry)
+        table = HookManager.get_routing_table()
+
+        model.hook.total_calls += 1
+        model.hook.save()
+
+        # the deliveries do not outdate the table
+        self.assertIs(HookManager.get_routing_table(), table)
+
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    def test_process_model_event__user_promoted_to_superuser(self):
+        model = self.bc.database.create(user={'username': 'uptown'},
+                                        hook={'event': 'form_entry.added'},
+                                        academy={'slug': 'downtown'},
+                                        form_entry=1)
+
+        self.assertEqual(self.fire(model.form_entry), [])
+
+        model.user.is_superuser = True
+        model.user.save()
+
+        self.assertEqual(self.fire(model.form_entry), [(model.hook.target, 1)])
+
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    def test_process_model_event__hook_created_in_a_transaction(self):
+        from breathecode.notify.utils import hook_manager
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model = self.bc.database.create(user={'username': 'downtown'},
+                                            academy={'slug': 'downtown'},
+                                            form_entry=1)
+
+        self.assertEqual(self.fire(model.form_entry), [])
+        version = HookManager.get_routing_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            hook = self.bc.database.create(hook={'event': 'form_entry.added', 'user_id': 1}).hook
+
+            # the transaction sees its own hook, the rest of processes keep the table until the commit
+            self.assertEqual(self.fire(model.form_entry), [(hook.target, 1)])
+            self.assertEqual(HookManager.get_routing_version(), version)
+            self.assertEqual(hook_manager.cache.get(f'notify__hook_routing__table__{version}'), [])
+
+        self.assertEqual(HookManager.get_routing_version(), version + 1)
+        self.assertEqual(self.fire(model.form_entry), [(hook.target, 1)])
+
+    @patch('breathecode.notify.tasks.async_deliver_hook.delay', MagicMock())
+    def test_process_model_event__cleared_while_built(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            model = self.bc.database.create(user={'username': 'downtown'},
+                                            hook={'event': 'form_entry.added'},
+                                            academy={'slug': 'downtown'},
+                                            form_entry=1)
+
+        HookModel = HookManager.get_hook_model()
+        values = HookModel.objects.values
+
+        def clear_while_built(*args):
+            rows = values(*args)
+            list(rows)
+            HookManager.bump_routing_version()
+            return rows
+
+        HookManager._ROUTING_TABLE = None
+        with patch.object(HookModel.objects, 'values', MagicMock(side_effect=clear_while_built)):
+            table = HookManager.get_routing_table()
+
+        # the table was stored under the version read before the hooks, it is built again
+        self.assertIsNot(HookManager.get_routing_table(), table)
@@ -0,0 +1,324 @@
+import hashlib, json, logging, threading
+from typing import Optional
+import requests
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# payloads sent per iteration of a delivery, and per request to the hooks that receive arrays
+HOOK_BATCH_SIZE = 100
+
+# seconds that the payloads wait to be grouped with the next ones
+HOOK_BATCH_WINDOW = 1
+
+# deliveries at the same time to the same target
+MAX_CONCURRENT_DELIVERIES = 2
+
+# seconds, a slot that was not released, like by a worker that died, is freed after it
+DELIVERY_SLOT_TIMEOUT = 60 * 5
+
+HOOK_POOL_SIZE = 16
+# seconds to connect and between the bytes of the response
+HOOK_TIMEOUT = (3.05, 10)
+
+# seconds, the delay before the retry n is HOOK_BACKOFF * 2^n
+HOOK_BACKOFF = 10
+HOOK_MAX_BACKOFF = 60 * 30
+
+# the target could be overloaded or down for a while, the payloads are sent again later
+RETRYABLE_STATUS_CODES = [408, 425, 429, 500, 502, 503, 504]
+
+SAMPLE_DATA_SIZE = 10
+
+lock = threading.Lock()
+session = None
+
+
+class HookDeliveryError(Exception):
+
+    def __init__(self, message: str, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def get_redis():
+    """
+    Get the connection of Redis, the payloads are delivered one by one without it, like in the tests.
+    """
+
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def get_hook_session() -> requests.Session:
+    """
+    Get the session of the process, it keeps the connections to the targets alive between the deliveries.
+    """
+
+    global session
+
+    if session is None:
+        with lock:
+            if session is None:
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=HOOK_POOL_SIZE)
+                s = requests.Session()
+                s.mount('https://', adapter)
+                s.mount('http://', adapter)
+                session = s
+
+    return session
+
+
+def get_queue_key(target: str) -> str:
+    return 'notify__hook_queue__' + hashlib.sha1(target.encode('utf-8')).hexdigest()
+
+
+def enqueue_hook_payload(target: str, payload, hook_id: Optional[int] = None) -> bool:
+    """
+    Queue a payload to be delivered with the rest of the payloads of its target, False if there is not a
+    queue.
+    """
+
+    redis = get_redis()
+    if redis is None:
+        return False
+
+    item = json.dumps({'hook_id': hook_id, 'payload': payload}, cls=DjangoJSONEncoder)
+    redis.rpush(get_queue_key(target), item)
+    return True
+
+
+def pop_hook_payloads(target: str, size: int = HOOK_BATCH_SIZE) -> list[dict]:
+    redis = get_redis()
+    if redis is None:
+        return []
+
+    key = get_queue_key(target)
+    pipe = redis.pipeline(transaction=True)
+    pipe.lrange(key, 0, size - 1)
+    pipe.ltrim(key, size, -1)
+    items, _ = pipe.execute()
+
+    return [json.loads(x) for x in items]
+
+
+def requeue_hook_payloads(target: str, items: list[dict]) -> None:
+    redis = get_redis()
+    if redis is None or not items:
+        return
+
+    # they go back to the front, in the same order
+    redis.lpush(get_queue_key(target), *[json.dumps(x, cls=DjangoJSONEncoder) for x in reversed(items)])
+
+
+def has_hook_payloads(target: str) -> bool:
+    redis = get_redis()
+    return redis is not None and redis.llen(get_queue_key(target)) > 0
+
+
+def discard_hook_payloads(target: str) -> int:
+    """
+    Discard the payloads queued for a target, it returns the number of payloads discarded.
+    """
+
+    redis = get_redis()
+    if redis is None:
+        return 0
+
+    key = get_queue_key(target)
+    pipe = redis.pipeline(transaction=True)
+    pipe.llen(key)
+    pipe.delete(key)
+    discarded, _ = pipe.execute()
+
+    return discarded
+
+
+def schedule_hook_delivery(target: str) -> bool:
+    """
+    Mark the delivery of a target as scheduled, False if it was scheduled already.
+    """
+
+    return cache.add(get_queue_key(target) + '__scheduled', 1, timeout=DELIVERY_SLOT_TIMEOUT)
+
+
+def schedule_hook_retry(target: str, countdown: int) -> None:
+    """
+    Keep the delivery of a target as scheduled while it backs off, the new payloads wait for the retry
+    instead of hitting the target again.
+    """
+
+    cache.set(get_queue_key(target) + '__scheduled', 1, timeout=countdown + DELIVERY_SLOT_TIMEOUT)
+
+
+def clear_hook_delivery_schedule(target: str) -> None:
+    cache.delete(get_queue_key(target) + '__scheduled')
+
+
+class delivery_slot:
+    """
+    Take one of the slots of a target, the deliveries that do not get one leave the payloads to the
+    deliveries in progress.
+
+    Usage:
+
+    ```py
+    with delivery_slot(target) as slot:
+        if slot.acquired:
+            ...
+    ```
+    """
+
+    def __init__(self, target: str):
+        self.keys = [f'{get_queue_key(target)}__slot__{i}' for i in range(MAX_CONCURRENT_DELIVERIES)]
+        self.key = None
+
+    @property
+    def acquired(self) -> bool:
+        return self.key is not None
+
+    def __enter__(self):
+        for key in self.keys:
+            if cache.add(key, 1, timeout=DELIVERY_SLOT_TIMEOUT):
+                self.key = key
+                break
+
+        return self
+
+    def __exit__(self, *exc):
+        if self.key:
+            cache.delete(self.key)
+
+        return False
+
+
+def get_retry_after(response: requests.Response) -> Optional[int]:
+    value = response.headers.get('Retry-After', '')
+    return min(int(value), HOOK_MAX_BACKOFF) if value.isdigit() else None
+
+
+def post_hook_payload(target: str, data) -> requests.Response:
+    """
+    Post a payload, it raises HookDeliveryError if it could be delivered later.
+    """
+
+    try:
+        response = get_hook_session().post(target,
+                                           data=json.dumps(data, cls=DjangoJSONEncoder),
+                                           headers={'Content-Type': 'application/json'},
+                                           timeout=HOOK_TIMEOUT)
+
+    except requests.RequestException as e:
+        raise HookDeliveryError(str(e))
+
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise HookDeliveryError(f'{target} responded {response.status_code}', get_retry_after(response))
+
+    return response
+
+
+def get_sample(payload):
+    if isinstance(payload, dict) and isinstance(payload.get('data'), dict):
+        return payload['data']
+
+    if isinstance(payload, dict):
+        return payload
+
+    return None
+
+
+def record_hook_calls(calls: dict[int, dict]) -> None:
+    """
+    Save the calls of each hook, the counters are incremented by the database and the samples are updated
+    with the rows locked, so the concurrent deliveries do not overwrite each other, the hooks that are gone,
+    the 410 responses, are deleted.
+    """
+
+    from .hook_manager import HookManager
+
+    HookModel = HookManager.get_hook_model()
+    gone = [id for id, x in calls.items() if x['status_code'] == 410]
+    if gone:
+        HookModel.objects.filter(id__in=gone).delete()
+
+    calls = {id: x for id, x in calls.items() if id not in gone}
+    if not calls:
+        return
+
+    now = timezone.now()
+    with transaction.atomic():
+        hooks = HookModel.objects.select_for_update().filter(id__in=calls.keys()).only('id', 'sample_data')
+
+        for hook in hooks:
+            call = calls[hook.id]
+            samples = hook.sample_data if isinstance(hook.sample_data, list) else []
+            samples += [x for x in [get_sample(x) for x in call['payloads']] if x is not None]
+
+            HookModel.objects.filter(id=hook.id).update(total_calls=F('total_calls') + len(call['payloads']),
+                                                        last_call_at=now,
+                                                        last_response_code=call['status_code'],
+                                                        sample_data=samples[-SAMPLE_DATA_SIZE:])
+
+
+def deliver_hook_payloads(target: str, items: list[dict]) -> int:
+    """
+    Deliver the payloads of a target, the hooks that opted in receive them in arrays, the rest one per
+    request over the same connection, it returns the number of requests.
+
+    If the target could receive them later, the payloads that were not delivered are queued again and
+    HookDeliveryError is raised.
+    """
+
+    from .hook_manager import HookManager
+
+    HookModel = HookManager.get_hook_model()
+    ids = {x['hook_id'] for x in items if x['hook_id']}
+    hooks = {x['id']: x for x in HookModel.objects.filter(id__in=ids).values('id', 'batch_deliveries')}
+
+    # [(items, data)]
+    deliveries = []
+    batches = {}
+    for item in items:
+        hook_id = item['hook_id']
+        if hook_id and hook_id not in hooks:
+            logger.debug(f'Hook {hook_id} was deleted, its payload is discarded')
+            continue
+
+        if hook_id and hooks[hook_id]['batch_deliveries']:
+            batches.setdefault(hook_id, []).append(item)
+            continue
+
+        deliveries.append(([item], item['payload']))
+
+    deliveries += [(x, [y['payload'] for y in x]) for x in batches.values()]
+
+    calls = {}
+    delivered = 0
+
+    try:
+        for group, data in deliveries:
+            response = post_hook_payload(target, data)
+            delivered += 1
+
+            for item in group:
+                if item['hook_id']:
+                    call = calls.setdefault(item['hook_id'], {'payloads': []})
+                    call['payloads'].append(item['payload'])
+                    call['status_code'] = response.status_code
+
+    except HookDeliveryError:
+        requeue_hook_payloads(target, [x for group, _ in deliveries[delivered:] for x in group])
+        raise
+
+    finally:
+        record_hook_calls(calls)
+
+    return delivered
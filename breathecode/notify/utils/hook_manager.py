@@ -1,14 +1,76 @@
-import logging
+import logging, threading, time
+from functools import partial
+from typing import Optional
 from django.conf import settings
-from ..tasks import async_deliver_hook
+from django.core.cache import cache
+from django.db import transaction
+from ..tasks import async_deliver_hook, async_deliver_hooks
+from .hook_delivery import HOOK_BATCH_WINDOW, enqueue_hook_payload, schedule_hook_delivery
 from django.apps import apps as django_apps
 from django.core.exceptions import ImproperlyConfigured
 
 logger = logging.getLogger(__name__)
+local = threading.local()
+
+HOOK_ROUTING_VERSION_KEY = 'notify__hook_routing__version'
+HOOK_ROUTING_TABLE_KEY = 'notify__hook_routing__table__{version}'
+
+# seconds, the table is invalidated by the receivers, it just limits how long a change made without
+# signals, like a queryset update, could take to be seen
+HOOK_ROUTING_MAX_AGE = 60 * 5
+
+
+class HookRoutingTable:
+    """
+    Hook ids and targets by event and academy slug, the hooks of the superusers are routed with the slug
+    None, they receive the events of every academy.
+    """
+
+    def __init__(self, version: int, rows: list[dict]):
+        self.version = version
+        self.rows = rows
+        self.built_at = time.monotonic()
+
+        # (event, academy slug) -> [(hook id, target)]
+        self.routes: dict[tuple[str, Optional[str]], list[tuple[int, str]]] = {}
+        self.events: set[str] = set()
+
+        # the fields that decide the routes, to know if a change of a hook or a user outdates the table
+        self.hooks: dict[int, tuple[str, str, int]] = {}
+        self.users: dict[int, tuple[str, bool]] = {}
+
+        for row in rows:
+            slug = None if row['user__is_superuser'] else row['user__username']
+            self.routes.setdefault((row['event'], slug), []).append((row['id'], row['target']))
+            self.events.add(row['event'])
+            self.hooks[row['id']] = (row['event'], row['target'], row['user_id'])
+            self.users[row['user_id']] = (row['user__username'], row['user__is_superuser'])
+
+    def is_expired(self) -> bool:
+        return time.monotonic() - self.built_at > HOOK_ROUTING_MAX_AGE
+
+    def has_event(self, event_name: str) -> bool:
+        return event_name in self.events
+
+    def get_routes(self, event_name: str, academy_slug: Optional[str] = None) -> list[tuple[int, str]]:
+        routes = self.routes.get((event_name, None), [])
+        if academy_slug is not None:
+            routes = routes + self.routes.get((event_name, academy_slug), [])
+
+        return routes
+
+    def routes_hook(self, hook) -> bool:
+        return self.hooks.get(hook.id) == (hook.event, hook.target, hook.user_id)
+
+    def routes_user(self, user) -> bool:
+        # the users without hooks do not have routes
+        return self.users.get(user.id,
+                              (user.username, user.is_superuser)) == (user.username, user.is_superuser)
 
 
 class HookManagerClass(object):
     _HOOK_EVENT_ACTIONS_CONFIG = None
+    _ROUTING_TABLE = None
     HOOK_EVENTS = {}
 
     def __init__(self):
@@ -92,31 +154,121 @@ class HookManagerClass(object):
                         "HOOK_CUSTOM_MODEL refers to model '%s' that cannot be imported" % model_label)
             return
 
+    def get_routing_version(self) -> int:
+        version = cache.get(HOOK_ROUTING_VERSION_KEY)
+
+        if version is None:
+            # add is atomic, if other process set it first we keep its value
+            cache.add(HOOK_ROUTING_VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(HOOK_ROUTING_VERSION_KEY)
+
+        return version
+
+    def get_routing_table(self, build: bool = True) -> Optional[HookRoutingTable]:
+        """
+        Get the routing table of the process, it is built again when it was invalidated by any process, or
+        None if it does not exist and `build` is False.
+
+        The table is stored by the version read before the hooks, so a table built while the hooks changed
+        is never seen after the invalidation.
+        """
+
+        HookModel = self.get_hook_model()
+
+        # the transaction changed the routes, its table is built by itself until it is committed
+        if self.is_routing_table_changing():
+            if not build:
+                return None
+
+            rows = HookModel.objects.values('id', 'event', 'target', 'user_id', 'user__username',
+                                            'user__is_superuser')
+            return HookRoutingTable(None, list(rows))
+
+        version = self.get_routing_version()
+        table = self._ROUTING_TABLE
+
+        if table is not None and table.version == version and not table.is_expired():
+            return table
+
+        # other process could have built it already
+        key = HOOK_ROUTING_TABLE_KEY.format(version=version)
+        if (rows := cache.get(key)) is not None:
+            self._ROUTING_TABLE = HookRoutingTable(version, rows)
+            return self._ROUTING_TABLE
+
+        if not build:
+            return None
+
+        rows = list(
+            HookModel.objects.values('id', 'event', 'target', 'user_id', 'user__username',
+                                     'user__is_superuser'))
+
+        cache.set(key, rows, timeout=HOOK_ROUTING_MAX_AGE)
+
+        self._ROUTING_TABLE = HookRoutingTable(version, rows)
+        return self._ROUTING_TABLE
+
+    def bump_routing_version(self) -> None:
+        try:
+            # it is a INCR in redis, so it is safe between processes
+            cache.incr(HOOK_ROUTING_VERSION_KEY)
+
+        except ValueError:
+            # the counter was evicted, start a new version that was never used before
+            cache.add(HOOK_ROUTING_VERSION_KEY, time.time_ns(), timeout=None)
+
+    def clear_routing_table(self) -> None:
+        """
+        Outdate the routing table of every process, once the transaction is committed, so the table is not
+        built again from the rows that are being changed.
+        """
+
+        self._ROUTING_TABLE = None
+
+        if not self.is_routing_table_changing():
+            # a new callable per transaction, to recognize it between the callbacks of the connection
+            local.routing_commit = partial(self.commit_routing_table)
+            transaction.on_commit(local.routing_commit)
+
+    def commit_routing_table(self) -> None:
+        local.routing_commit = None
+        self.bump_routing_version()
+
+    def is_routing_table_changing(self) -> bool:
+        scheduled = getattr(local, 'routing_commit', None)
+        if scheduled is None:
+            return False
+
+        # the callbacks are discarded after a rollback, so the shared table is used again
+        connection = transaction.get_connection()
+        return any(x[1] is scheduled for x in connection.run_on_commit)
+
+    def has_model_events(self, model_label: str) -> bool:
+        return model_label in self.get_event_actions_config()
+
     def find_and_fire_hook(self, event_name, instance, user_override=None, payload_override=None):
         """
         Look up Hooks that apply
         """
-        try:
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
-        except ImportError:
-            from django.contrib.auth.models import User
 
         if event_name not in self.HOOK_EVENTS.keys():
             raise Exception('"{}" does not exist in `settings.HOOK_EVENTS`.'.format(event_name))
 
-        filters = {'event': event_name}
+        table = self.get_routing_table()
+
+        # nobody subscribes to it, the academy is not even read
+        if not table.has_event(event_name):
+            return
 
         # only process hooks from instances from the same academy
         if hasattr(instance, 'academy') and instance.academy is not None:
-            superadmins = User.objects.filter(is_superuser=True).values_list('username', flat=True)
-            filters['user__username__in'] = [instance.academy.slug] + list(superadmins)
+            routes = table.get_routes(event_name, instance.academy.slug)
         else:
             logger.debug(
                 f'Only admin will receive hook notification for {event_name} because entity has not academy property'
             )
             # Only the admin can retrieve events from objects that don't belong to any academy
-            filters['user__is_superuser'] = True
+            routes = table.get_routes(event_name)
 
         # Ignore the user if the user_override is False
         # if user_override is not False:
@@ -130,8 +282,9 @@ class HookManagerClass(object):
         #         raise Exception('{} has no `user` property. REST Hooks needs this.'.format(repr(instance)))
 
         HookModel = self.get_hook_model()
-        hooks = HookModel.objects.filter(**filters)
-        for hook in hooks:
+        for id, target in routes:
+            # the payload just includes the id, the event and the target of the hook
+            hook = HookModel(id=id, event=event_name, target=target)
             self.deliver_hook(hook, instance, payload_override=payload_override)
 
     def process_model_event(
@@ -207,6 +360,13 @@ class HookManagerClass(object):
         if callable(payload):
             payload = payload(hook, instance)
 
+        # the payloads of the same target are delivered together
+        if enqueue_hook_payload(hook.target, payload, hook_id=hook.id):
+            if schedule_hook_delivery(hook.target):
+                async_deliver_hooks.apply_async(args=(hook.target, ), countdown=HOOK_BATCH_WINDOW)
+
+            return None
+
         logger.debug(f'Calling delayed task deliver_hook for hook {hook.id}')
         async_deliver_hook.delay(hook.target, payload, hook_id=hook.id)
 
@@ -6,6 +6,7 @@ from django.utils import timezone
 
 from celery import Task, shared_task
 from breathecode.authenticate.actions import get_user_settings
+from breathecode.commons.actions import defer_cache_invalidation
 
 from breathecode.notify import actions as notify_actions
 from breathecode.payments import actions
@@ -27,6 +28,7 @@ class BaseTaskWithRetry(Task):
 
 
 @shared_task(bind=True, base=BaseTaskWithRetry)
+@defer_cache_invalidation()
 def renew_consumables(self, subscription_id: int):
     """
     The purpose of this function is renew every service items belongs to a subscription.
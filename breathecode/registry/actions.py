@@ -1,4 +1,6 @@
 import logging, json, os, re, pathlib, base64, hashlib, requests
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
 from typing import Optional
 from breathecode.media.models import Media, MediaResolution
 from breathecode.media.views import media_gallery_bucket
@@ -23,6 +25,12 @@ logger = logging.getLogger(__name__)
 
 ASSET_STATUS_DICT = [x for x, y in ASSET_STATUS]
 
+# concurrent downloads of the images of a readme
+MAX_IMAGE_DOWNLOADS = 8
+IMAGE_CHUNK_SIZE = 64 * 1024
+# bytes of a download kept in memory before it is moved to the disk
+IMAGE_SPOOL_SIZE = 1024 * 1024
+
 
 def allowed_mimes():
     return ['image/png', 'image/svg+xml', 'image/jpeg', 'image/gif', 'image/jpg']
@@ -657,42 +665,171 @@ def test_asset(asset):
         return False
 
 
-def upload_image_to_bucket(img, asset):
-
-    from ..services.google_cloud import Storage
-
-    link = img.original_url
+def get_image_download_url(link: str) -> str:
     if 'github.com' in link and not 'raw=true' in link:
         if '?' in link:
             link = link + '&raw=true'
         else:
             link = link + '?raw=true'
 
-    r = requests.get(link, stream=True, timeout=2)
-    if r.status_code != 200:
-        raise Exception(f'Error downloading image from asset {asset.slug}: {link}')
+    return link
+
+
+def download_image(session, link: str, asset_slug: str) -> tuple[str, str, SpooledTemporaryFile]:
+    """
+    Download an image in chunks, it returns its hash, its mime and the file, the file is kept in memory
+    until it reaches `IMAGE_SPOOL_SIZE`, then it is moved to the disk.
+    """
+
+    with session.get(get_image_download_url(link), stream=True, timeout=2) as r:
+        if r.status_code != 200:
+            raise Exception(f'Error downloading image from asset {asset_slug}: {link}')
+
+        found_mime = [mime for mime in allowed_mimes() if r.headers['content-type'] in mime]
+        if len(found_mime) == 0:
+            raise Exception(
+                f"Skipping image download for {link} in asset {asset_slug}, invalid mime {r.headers['content-type']}"
+            )
+
+        sha256 = hashlib.sha256()
+        file = SpooledTemporaryFile(max_size=IMAGE_SPOOL_SIZE)
+
+        try:
+            for chunk in r.iter_content(chunk_size=IMAGE_CHUNK_SIZE):
+                sha256.update(chunk)
+                file.write(chunk)
+
+        except Exception:
+            file.close()
+            raise
+
+    return sha256.hexdigest(), found_mime[0], file
+
 
-    found_mime = [mime for mime in allowed_mimes() if r.headers['content-type'] in mime]
-    if len(found_mime) == 0:
-        raise Exception(
-            f"Skipping image download for {link} in asset {asset.slug}, invalid mime {r.headers['content-type']}"
-        )
+def upload_image_file(storage, name: str, hash: str, mime: str, file) -> str:
+    """
+    Upload the file of an image if it is not in the bucket yet, it returns its url.
+    """
 
-    img.hash = hashlib.sha256(r.content).hexdigest()
+    extension = pathlib.Path(name).suffix
+    cloud_file = storage.file(asset_images_bucket(), hash + extension)
 
-    storage = Storage()
+    # the file gets the blob when it exists
+    if cloud_file.blob is None:
+        cloud_file.upload(file, content_type=mime)
 
-    extension = pathlib.Path(img.name).suffix
-    cloud_file = storage.file(asset_images_bucket(), img.hash + extension)
-    if not cloud_file.exists():
-        cloud_file.upload(r.content)
+    return cloud_file.url()
+
+
+def upload_image_to_bucket(img, asset):
+
+    from ..services.google_cloud import Storage
+
+    with requests.Session() as session:
+        img.hash, img.mime, file = download_image(session, img.original_url, asset.slug)
+
+    with file:
+        img.bucket_url = upload_image_file(Storage(), img.name, img.hash, img.mime, file)
 
-    img.hash = img.hash
-    img.mime = found_mime[0]
-    img.bucket_url = cloud_file.url()
     img.download_status = 'OK'
     img.save()
 
     img.assets.add(asset)
 
     return img
+
+
+def get_image_name(link: str) -> str:
+    return link.split('/')[-1].split('?')[0]
+
+
+def mirror_readme_images(asset, links: list[str]) -> dict[str, AssetImage]:
+    """
+    Mirror the images of a readme in the bucket of the assets, it returns the images mirrored by link.
+
+    The images that were mirrored before are reused, the rest are downloaded and uploaded by a bounded pool
+    of threads, the threads do not touch the database, the results are saved with bulk writes.
+    """
+
+    from ..services.google_cloud import Storage
+
+    links = list(dict.fromkeys(links))
+    now = timezone.now()
+
+    images = {x.original_url: x for x in AssetImage.objects.filter(original_url__in=links)}
+    pending = [x for x in links if x not in images or images[x].download_status != 'OK']
+
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=MAX_IMAGE_DOWNLOADS) as executor:
+        session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=MAX_IMAGE_DOWNLOADS))
+        session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=MAX_IMAGE_DOWNLOADS))
+
+        def download(link):
+            try:
+                return download_image(session, link, asset.slug)
+            except Exception as e:
+                return e
+
+        downloads = dict(zip(pending, executor.map(download, pending)))
+
+        # the content that was already mirrored from another link does not need to be uploaded again
+        hashes = [x[0] for x in downloads.values() if not isinstance(x, Exception)]
+        known = dict(
+            AssetImage.objects.filter(hash__in=hashes,
+                                      download_status='OK').exclude(bucket_url='').values_list(
+                                          'hash', 'bucket_url'))
+
+        storage = Storage() if [x for x in hashes if x not in known] else None
+
+        def upload(item):
+            link, (hash, mime, file) = item
+            with file:
+                if hash in known:
+                    return known[hash]
+
+                try:
+                    return upload_image_file(storage, get_image_name(link), hash, mime, file)
+                except Exception as e:
+                    return e
+
+        downloaded = [x for x in downloads.items() if not isinstance(x[1], Exception)]
+        uploads = dict(zip([x[0] for x in downloaded], executor.map(upload, downloaded)))
+
+    to_create = []
+    to_update = []
+    for link in pending:
+        img = images.get(link)
+        if img is None:
+            img = AssetImage(name=get_image_name(link), original_url=link)
+            to_create.append(img)
+        else:
+            to_update.append(img)
+
+        img.last_download_at = now
+        result = uploads.get(link, downloads[link])
+
+        if isinstance(result, Exception):
+            logger.error(str(result))
+            img.download_status = 'ERROR'
+            img.download_details = str(result)
+            continue
+
+        img.hash, img.mime = downloads[link][0], downloads[link][1]
+        img.bucket_url = result
+        img.download_status = 'OK'
+        img.download_details = f'Downloaded {link}'
+
+    if to_update:
+        AssetImage.objects.bulk_update(
+            to_update,
+            ['hash', 'mime', 'bucket_url', 'download_status', 'download_details', 'last_download_at'])
+
+    if to_create:
+        AssetImage.objects.bulk_create(to_create)
+
+        # not every database returns the primary keys of a bulk insert
+        images.update({x.original_url: x for x in AssetImage.objects.filter(original_url__in=links)})
+
+    mirrored = {x: images[x] for x in links if x in images and images[x].download_status == 'OK'}
+    asset.images.add(*mirrored.values())
+
+    return mirrored
@@ -6,6 +6,8 @@ class AssetCache(Cache):
     model = Asset
     depends = ['User', 'AssetTechnology', 'AssetCategory', 'KeywordCluster', 'AssetKeyword', 'Assessment']
     parents = ['AssetAlias', 'AssetErrorLog']
+    max_age = 60 * 60
+    soft_max_age = 60 * 5
 
 
 class AssetCommentCache(Cache):
@@ -0,0 +1,27 @@
+import logging
+from django.core.management.base import BaseCommand
+from breathecode.admissions.models import Academy
+from breathecode.services.seo import SEOAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run the SEO report of every asset tracked, each academy is scanned in a pool of processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--academy', type=int, default=None, help='Only scan the assets of this academy')
+        parser.add_argument('--processes', type=int, default=None, help='Defaults to the number of CPUs')
+
+    def handle(self, *args, **options):
+        academies = Academy.objects.all()
+        if options['academy']:
+            academies = academies.filter(id=options['academy'])
+
+        for academy_id in academies.values_list('id', flat=True):
+            result = SEOAnalyzer.bulk(academy_id, processes=options['processes'])
+            failed = len([x for x in result.values() if x is None])
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Academy {academy_id}: {len(result) - failed} assets scanned, {failed} failed'))
@@ -1,6 +1,8 @@
 import base64, frontmatter, markdown, pathlib, logging, re, hashlib, json
+from typing import Optional
 from urllib.parse import urlencode, urlparse, urlunparse, parse_qs
 from django.db import models
+from django.core.cache import cache
 from django.contrib.auth.models import User
 from django.contrib.auth.models import AnonymousUser
 from django.template.loader import get_template
@@ -23,6 +25,9 @@ VISIBILITY = (
     (UNLISTED, 'Unlisted'),
     (PRIVATE, 'Private'),
 )
+# seconds, the entries are addressed by the content of the readme, so they never become stale
+README_CACHE_MAX_AGE = 60 * 60 * 24
+
 SORT_PRIORITY = (
     (1, 1),
     (2, 2),
@@ -503,7 +508,32 @@ class Asset(models.Model):
                               status_text='Invalid Readme URL').save()
         return readme
 
+    @staticmethod
+    def get_readme_cache_key(readme: Optional[str], format: str) -> str:
+        digest = hashlib.sha256(f'{format}:{readme or ""}'.encode('utf-8')).hexdigest()
+        return f'asset__readme__{digest}'
+
+    def clear_readme_cache(self) -> None:
+        cache.delete_many([Asset.get_readme_cache_key(self.readme, x) for x in ['markdown', 'notebook']])
+
     def parse(self, readme, format='markdown', remove_frontmatter=False):
+        """
+        Add the frontmatter and the html to the readme, the render is cached by the content of the readme.
+        """
+
+        key = Asset.get_readme_cache_key(readme['clean'], format)
+        if (parsed := cache.get(key)) is not None:
+            readme.update(parsed)
+            return readme
+
+        readme = self.render(readme, format=format)
+
+        parsed = {x: readme[x] for x in ['decoded', 'frontmatter', 'html'] if x in readme}
+        cache.set(key, parsed, timeout=README_CACHE_MAX_AGE)
+
+        return readme
+
+    def render(self, readme, format='markdown'):
         if format == 'markdown':
             _data = frontmatter.loads(readme['decoded'])
             readme['frontmatter'] = _data.metadata
@@ -28,6 +28,7 @@ def post_asset_slug_modified(sender, instance: Asset, **kwargs):
 @receiver(asset_readme_modified, sender=Asset)
 def post_asset_readme_modified(sender, instance: Asset, **kwargs):
     logger.debug('Cleaning asset raw readme')
+    instance.clear_readme_cache()
     async_regenerate_asset_readme.delay(instance.slug)
 
 
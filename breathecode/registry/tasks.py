@@ -7,6 +7,7 @@ import pathlib
 from typing import Optional
 from celery import shared_task, Task
 from breathecode.services.seo import SEOAnalyzer
+from django.db.models import Count
 from django.utils import timezone
 from bs4 import BeautifulSoup
 from breathecode.media.models import Media, MediaResolution
@@ -16,7 +17,7 @@ from breathecode.services.google_cloud.storage import Storage
 from breathecode.utils.views import set_query_parameter
 from .models import Asset, AssetImage
 from .actions import (pull_from_github, screenshots_bucket, test_asset, clean_asset_readme,
-                      upload_image_to_bucket, asset_images_bucket)
+                      upload_image_to_bucket, asset_images_bucket, mirror_readme_images)
 
 logger = logging.getLogger(__name__)
 
@@ -265,16 +266,29 @@ def async_download_readme_images(asset_slug):
     for link in image_links:
         if link in no_longer_used:
             del no_longer_used[link]
-        async_download_single_readme_image.delay(asset_slug, link)
+
+    images = mirror_readme_images(asset, image_links)
+    logger.debug(f'{len(images)} of {len(image_links)} images were mirrored on asset {asset_slug}')
+
+    if images:
+        readme = asset.get_readme()['decoded']
+        for link, img in images.items():
+            readme = readme.replace(link, img.bucket_url)
+
+        asset.set_readme(readme)
+        asset.save()
 
     # delete asset from this image
     logger.debug(f'Found {len(no_longer_used)} images no longer used on asset {asset_slug}')
-    for old_img in no_longer_used:
-        no_longer_used[old_img].assets.remove(asset)
+    if no_longer_used:
+        asset.images.remove(*no_longer_used.values())
 
         # if its not being sed on any other asset, we delete it from cloud
-        if no_longer_used[old_img].assets.count() == 0:
-            async_remove_img_from_cloud(no_longer_used[old_img].id)
+        unused = AssetImage.objects.filter(id__in=[x.id for x in no_longer_used.values()]).annotate(
+            total_assets=Count('assets')).filter(total_assets=0)
+
+        for img in unused:
+            async_remove_img_from_cloud(img.id)
 
     return True
 
@@ -352,26 +366,11 @@ def async_download_single_readme_image(asset_slug, link):
     if asset is None:
         raise Exception(f'Asset with slug {asset_slug} not found')
 
-    img = AssetImage.objects.filter(original_url=link).first()
-    if img is None:
-        temp_filename = link.split('/')[-1].split('?')[0]
-        img = AssetImage(name=temp_filename, original_url=link, last_download_at=timezone.now())
-
-    if img.download_status != 'OK':
-
-        img.download_status = 'PENDING'
-        img.download_details = f'Downloading {link}'
-        img.save()
-
-        try:
-            img = upload_image_to_bucket(img, asset)
-        except Exception as e:
-            img.download_details = str(e)
-            img.download_status = 'ERROR'
-            logger.error(str(e))
-            return False
+    images = mirror_readme_images(asset, [link])
+    if link not in images:
+        return False
 
-    img.save()
+    img = images[link]
     readme = asset.get_readme()
     asset.set_readme(readme['decoded'].replace(link, img.bucket_url))
     asset.save()
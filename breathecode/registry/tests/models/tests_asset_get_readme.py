@@ -0,0 +1,108 @@
+"""
+Test Asset.get_readme
+"""
+from unittest.mock import MagicMock, call, patch
+
+import markdown
+from django.core.cache import cache
+
+from breathecode.registry.models import Asset
+from ..mixins import RegistryTestCase
+
+README = """---
+title: Hello
+---
+# Hello world"""
+
+
+class RegistryTestSuite(RegistryTestCase):
+    """
+    🔽🔽🔽 Without parse
+    """
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    @patch('markdown.markdown', MagicMock(wraps=markdown.markdown))
+    def test_without_parse(self):
+        model = self.bc.database.create(asset={
+            'readme': Asset.encode(README),
+            'readme_raw': Asset.encode(README)
+        })
+
+        readme = model.asset.get_readme()
+
+        self.assertEqual(readme['decoded'], README)
+        self.assertEqual(markdown.markdown.call_args_list, [])
+
+    """
+    🔽🔽🔽 Parse
+    """
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    @patch('markdown.markdown', MagicMock(wraps=markdown.markdown))
+    def test_parse(self):
+        model = self.bc.database.create(asset={
+            'readme': Asset.encode(README),
+            'readme_raw': Asset.encode(README)
+        })
+
+        readme = model.asset.get_readme(parse=True)
+
+        self.assertEqual(readme['decoded'], '# Hello world')
+        self.assertEqual(readme['frontmatter'], {'title': 'Hello', 'format': 'markdown'})
+        self.assertEqual(readme['html'], '<h1>Hello world</h1>')
+        self.assertEqual(markdown.markdown.call_args_list, [
+            call('# Hello world', extensions=['markdown.extensions.fenced_code']),
+        ])
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    @patch('markdown.markdown', MagicMock(wraps=markdown.markdown))
+    def test_parse__twice__rendered_once(self):
+        model = self.bc.database.create(asset={
+            'readme': Asset.encode(README),
+            'readme_raw': Asset.encode(README)
+        })
+
+        first = model.asset.get_readme(parse=True)
+        first['frontmatter']['title'] = 'Modified by the caller'
+
+        readme = model.asset.get_readme(parse=True)
+
+        self.assertEqual(readme['decoded'], '# Hello world')
+        self.assertEqual(readme['frontmatter'], {'title': 'Hello', 'format': 'markdown'})
+        self.assertEqual(readme['html'], '<h1>Hello world</h1>')
+        self.assertEqual(len(markdown.markdown.call_args_list), 1)
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    @patch('markdown.markdown', MagicMock(wraps=markdown.markdown))
+    def test_parse__other_readme__rendered_again(self):
+        model = self.bc.database.create(asset={
+            'readme': Asset.encode(README),
+            'readme_raw': Asset.encode(README)
+        })
+
+        model.asset.get_readme(parse=True)
+        model.asset.readme = Asset.encode('# Bye')
+        readme = model.asset.get_readme(parse=True)
+
+        self.assertEqual(readme['html'], '<h1>Bye</h1>')
+        self.assertEqual(len(markdown.markdown.call_args_list), 2)
+
+    """
+    🔽🔽🔽 Invalidation
+    """
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    def test_readme_modified__clear_the_cache(self):
+        model = self.bc.database.create(asset={
+            'readme': Asset.encode(README),
+            'readme_raw': Asset.encode(README)
+        })
+
+        model.asset.get_readme(parse=True)
+        key = Asset.get_readme_cache_key(model.asset.readme, 'markdown')
+        self.assertIsNotNone(cache.get(key))
+
+        model.asset.readme_raw = Asset.encode('# Bye')
+        model.asset.save()
+
+        self.assertIsNone(cache.get(key))
@@ -0,0 +1,138 @@
+"""
+Test async_download_readme_images
+"""
+import hashlib
+import os
+from unittest.mock import MagicMock, call, patch
+
+import requests
+
+from breathecode.registry.models import Asset
+from breathecode.registry.tasks import async_download_readme_images
+from breathecode.services.google_cloud import Storage
+
+from ..mixins import RegistryTestCase
+
+README = """# Images
+
+![a](https://example.com/a.png)
+![b](https://example.com/b.png)
+![c](https://example.com/c.png)
+"""
+
+
+class Response:
+
+    def __init__(self, content, status_code=200, content_type='image/png'):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {'content-type': content_type}
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+RESPONSES = {
+    'https://example.com/a.png': Response(b'a'),
+    'https://example.com/b.png': Response(b'b'),
+    'https://example.com/c.png': Response(b'', status_code=404),
+}
+
+
+def get_mock(url, **kwargs):
+    return RESPONSES[url]
+
+
+def file_mock(bucket_name, file_name):
+    file = MagicMock()
+    file.blob = None
+    file.url.return_value = f'https://storage.googleapis.com/{bucket_name}/{file_name}'
+    return file
+
+
+def sha256(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def asset_kwargs():
+    return {'readme': Asset.encode(README), 'readme_raw': Asset.encode(README)}
+
+
+class RegistryTestSuite(RegistryTestCase):
+    """
+    🔽🔽🔽 Mirror the images in one pass
+    """
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    @patch('breathecode.registry.tasks.async_download_single_readme_image.delay', MagicMock())
+    @patch.object(requests.Session, 'get', MagicMock(side_effect=get_mock))
+    @patch.object(Storage, '__init__', MagicMock(return_value=None))
+    @patch.object(Storage, 'file', MagicMock(side_effect=file_mock))
+    @patch.dict(os.environ, {'ASSET_IMAGES_BUCKET': 'bucket'})
+    def test_mirror(self):
+        from breathecode.registry.tasks import async_download_single_readme_image
+
+        model = self.bc.database.create_v2(asset=asset_kwargs())
+        async_download_readme_images.delay(model.asset.slug)
+
+        images = self.bc.database.list_of('registry.AssetImage')
+        self.assertEqual([(x['original_url'], x['download_status'], x['hash'], x['bucket_url'])
+                          for x in images], [
+                              ('https://example.com/a.png', 'OK', sha256(b'a'),
+                               f'https://storage.googleapis.com/bucket/{sha256(b"a")}.png'),
+                              ('https://example.com/b.png', 'OK', sha256(b'b'),
+                               f'https://storage.googleapis.com/bucket/{sha256(b"b")}.png'),
+                              ('https://example.com/c.png', 'ERROR', '', ''),
+                          ])
+
+        asset = Asset.objects.get(id=model.asset.id)
+        self.assertEqual(
+            asset.get_readme()['decoded'],
+            README.replace('https://example.com/a.png',
+                           f'https://storage.googleapis.com/bucket/{sha256(b"a")}.png').replace(
+                               'https://example.com/b.png',
+                               f'https://storage.googleapis.com/bucket/{sha256(b"b")}.png'))
+        self.assertEqual(sorted([x.id for x in asset.images.all()]), [1, 2])
+        self.assertEqual(async_download_single_readme_image.delay.call_args_list, [])
+        self.assertEqual(len(Storage.file.call_args_list), 2)
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    @patch.object(requests.Session, 'get', MagicMock(side_effect=get_mock))
+    @patch.object(Storage, '__init__', MagicMock(return_value=None))
+    @patch.object(Storage, 'file', MagicMock(side_effect=file_mock))
+    @patch.dict(os.environ, {'ASSET_IMAGES_BUCKET': 'bucket'})
+    def test_mirror__images_reused(self):
+        asset_images = [{
+            'original_url': 'https://example.com/a.png',
+            'download_status': 'OK',
+            'hash': sha256(b'a'),
+            'bucket_url': 'https://storage.googleapis.com/bucket/a.png',
+        }, {
+            'original_url': 'https://example.com/other.png',
+            'download_status': 'OK',
+            'hash': sha256(b'b'),
+            'bucket_url': 'https://storage.googleapis.com/bucket/b.png',
+        }]
+        self.bc.database.create_v2(asset_image=asset_images)
+        model = self.bc.database.create_v2(asset=asset_kwargs())
+        async_download_readme_images.delay(model.asset.slug)
+
+        # a was mirrored and b has the same content than other.png
+        self.assertEqual([x[0][0] for x in requests.Session.get.call_args_list],
+                         ['https://example.com/b.png', 'https://example.com/c.png'])
+        self.assertEqual(Storage.file.call_args_list, [])
+
+        images = self.bc.database.list_of('registry.AssetImage')
+        self.assertEqual([(x['original_url'], x['download_status'], x['bucket_url']) for x in images], [
+            ('https://example.com/a.png', 'OK', 'https://storage.googleapis.com/bucket/a.png'),
+            ('https://example.com/other.png', 'OK', 'https://storage.googleapis.com/bucket/b.png'),
+            ('https://example.com/b.png', 'OK', 'https://storage.googleapis.com/bucket/b.png'),
+            ('https://example.com/c.png', 'ERROR', ''),
+        ])
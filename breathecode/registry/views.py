@@ -124,7 +124,7 @@ class AcademyTechnologyView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = AssetTechnology.objects.all()
         lookup = {}
@@ -355,7 +355,7 @@ class AssetView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         if asset_slug is not None:
             asset = Asset.get_by_slug(asset_slug, request)
@@ -612,7 +612,7 @@ class AcademyAssetView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         if asset_slug is not None:
             asset = Asset.get_by_slug(asset_slug, request)
@@ -855,7 +855,7 @@ class AcademyAssetCommentView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = AssetComment.objects.filter(asset__academy__id=academy_id)
         lookup = {}
@@ -960,7 +960,7 @@ class AcademyCategoryView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = AssetCategory.objects.filter(academy__id=academy_id)
         lookup = {}
@@ -1044,7 +1044,7 @@ class AcademyKeywordView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = AssetKeyword.objects.filter(academy__id=academy_id)
         lookup = {}
@@ -1137,7 +1137,7 @@ class AcademyKeywordClusterView(APIView, GenerateLookupsMixin):
         handler = self.extensions(request)
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         items = KeywordCluster.objects.filter(academy__id=academy_id)
         lookup = {}
@@ -1,12 +1,17 @@
 import logging
+from typing import Optional
 
 import google.cloud.datastore as datastore
+from google.api_core.exceptions import BadRequest
 
 from .credentials import resolve_credentials
 
 logger = logging.getLogger(__name__)
 
-__all__ = ['Datastore']
+__all__ = ['Datastore', 'MAX_ENTITIES_PER_COMMIT']
+
+# it is the limit of Datastore
+MAX_ENTITIES_PER_COMMIT = 500
 
 
 class Datastore:
@@ -48,6 +53,46 @@ class Datastore:
 
         return list(query.fetch(limit=limit, offset=offset))
 
+    def fetch_page(self,
+                   page_size: int,
+                   cursor: Optional[str] = None,
+                   order_by=None,
+                   **kwargs) -> tuple[list, Optional[str]]:
+        """Get a page and the opaque cursor of the next one, None if it is the last page
+
+        Args:
+            page_size: Max number of entities
+            cursor: Cursor returned with the previous page
+            **kwargs: Arguments to Google Cloud Datastore
+
+        Returns:
+            tuple: Entities and cursor
+        """
+        from breathecode.utils.validation_exception import ValidationException
+
+        kind = kwargs.pop('kind')
+        query = self.client.query(kind=kind)
+
+        for key in kwargs:
+            query.add_filter(key, '=', kwargs[key])
+
+        if order_by:
+            query.order = order_by
+
+        # the cursor is resolved by Datastore, the entities before it are neither skipped nor billed
+        iterator = query.fetch(limit=page_size, start_cursor=cursor)
+
+        try:
+            results = list(iterator)
+
+        except (ValueError, BadRequest):
+            raise ValidationException('Invalid cursor', slug='invalid-cursor')
+
+        if iterator.next_page_token is None:
+            return results, None
+
+        return results, iterator.next_page_token.decode('utf-8')
+
     def update(self, key: str, data: dict):
         """Get Fetch object
 
@@ -61,6 +106,22 @@ class Datastore:
         entity.update(data)
         self.client.put(entity)
 
+    def update_many(self, key: str, data: list[dict]):
+        """Save many entities in one commit
+
+        Args:
+            key: Kind of the entities
+            data: Entities, up to MAX_ENTITIES_PER_COMMIT
+        """
+        entities = []
+
+        for fields in data:
+            entity = datastore.Entity(self.client.key(key))
+            entity.update(fields)
+            entities.append(entity)
+
+        self.client.put_multi(entities)
+
     def count(self, order_by=None, **kwargs):
         """
         Count method for total entities on a query
@@ -73,6 +134,11 @@ class Datastore:
         for key in kwargs:
             query.add_filter(key, '=', kwargs[key])
 
-        query.keys_only()
+        # it is counted by Datastore, instead of fetch every key
+        aggregation = self.client.aggregation_query(query).count(alias='total')
+
+        for results in aggregation.fetch():
+            for result in results:
+                return result.value
 
-        return len(list(query.fetch()))
+        return 0
@@ -1,11 +1,16 @@
 import logging, os
 from io import StringIO
+from google.api_core.exceptions import NotFound
 from google.cloud.storage import Bucket, Blob
 
 logger = logging.getLogger(__name__)
 
 __all__ = ['File']
 
+# the files bigger than 8 MB are uploaded in a resumable session, in requests of this size instead of 100 MB,
+# it must be a multiple of 256 KB
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class File:
     """Google Cloud Storage"""
@@ -25,7 +30,7 @@ class File:
 
     def upload(self, content, public: bool = False, content_type: str = 'text/plain') -> None:
         """Upload Blob from Bucket"""
-        self.blob = self.bucket.blob(self.file_name)
+        self.blob = self.bucket.blob(self.file_name, chunk_size=UPLOAD_CHUNK_SIZE)
 
         if (isinstance(content, str) or isinstance(content, bytes)):
             self.blob.upload_from_string(content, content_type=content_type)
@@ -36,6 +41,26 @@ class File:
         if public:
             self.blob.make_public()
 
+    def open(self, mode: str = 'rb', content_type: str = 'text/plain', chunk_size: int = UPLOAD_CHUNK_SIZE):
+        """Open Blob as a file, the writes are uploaded in a resumable session, one chunk at a time"""
+
+        if 'w' in mode:
+            self.blob = self.bucket.blob(self.file_name, chunk_size=chunk_size)
+            # the writer is closed to commit the upload, the flushes of the wrappers, like gzip, are ignored
+            return self.blob.open(mode, content_type=content_type, ignore_flush=True)
+
+        # it does not depend on the blob read by the constructor, that is None if the file did not exist then
+        blob = self.bucket.blob(self.file_name)
+
+        try:
+            # the size and the generation are read once, so every chunk is read from the same version
+            blob.reload()
+
+        except NotFound:
+            raise FileNotFoundError(f'File {self.file_name} not found in the bucket {self.bucket.name}')
+
+        return blob.open(mode, chunk_size=chunk_size)
+
     def exists(self) -> bool:
         """Check if Blob exists in Bucket"""
 
@@ -1,7 +1,4 @@
 import logging
-from django.contrib.auth.models import User
-from django.utils import timezone
-from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
@@ -11,18 +8,16 @@ def general_structure(client, report):
 
     asset = client.asset
 
-    readme = asset.get_readme(parse=True)
-    if 'html' not in readme:
-        report.fatal(f'Asset with {asset_slug} readme cannot be parse into an HTML')
+    document = client.get_document()
+    if document is None:
+        report.fatal(f'Asset with {asset.slug} readme cannot be parse into an HTML')
         return False
 
-    h1s = BeautifulSoup(readme['html'], features='html.parser').find_all('h1')
-    total_h1s = len(h1s)
+    total_h1s = len(document['headings']['h1'])
     if total_h1s > 0:
         report.bad(-20, f'We found {total_h1s} please remove all of them')
 
-    h2s = BeautifulSoup(readme['html'], features='html.parser').find_all('h2')
-    if len(h2s) == 0:
+    if len(document['headings']['h2']) == 0:
         report.bad(-20, f'Include at least one h2 heading in the article')
 
 
@@ -1,7 +1,4 @@
 import logging
-from django.contrib.auth.models import User
-from django.utils import timezone
-from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
@@ -11,17 +8,16 @@ def keyword_density(client, report):
 
     asset = client.asset
 
-    readme = asset.get_readme(parse=True)
-    if 'html' not in readme:
-        report.fatal(f'Asset with {asset_slug} readme cannot be parse into an HTML')
+    document = client.get_document()
+    if document is None:
+        report.fatal(f'Asset with {asset.slug} readme cannot be parse into an HTML')
         return False
 
     all_h2s = []
-    h2s = BeautifulSoup(readme['html'], features='html.parser').find_all('h2')
-    for h in h2s:
+    for h in document['headings']['h2']:
         all_h2s.append(h.contents[0])
 
-    for keyword in asset.seo_keywords.all():
+    for keyword in client.get_keywords():
         h2s_with_keywords = []
         for h2 in all_h2s:
             if keyword.title in h2:
@@ -1,8 +1,5 @@
 import logging
 from urllib.parse import urlparse
-from django.contrib.auth.models import User
-from django.utils import timezone
-from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +11,7 @@ def internal_linking(client, report):
 
     missing_cluster_paths = []
     main_domain = ''
-    for keyword in asset.seo_keywords.all():
+    for keyword in client.get_keywords():
         if keyword.cluster is not None:
             if keyword.cluster.landing_page_url is None or keyword.cluster.landing_page_url == '':
                 report.fatal(f'Cluster {keyword.cluster.slug} its missing a landing page url')
@@ -28,12 +25,12 @@ def internal_linking(client, report):
     if len(missing_cluster_paths) == 0:
         report.fatal('No valid clusters landing urls')
 
-    readme = asset.get_readme(parse=True)
-    if 'html' not in readme:
-        logger.fatal(f'Asset with {asset_slug} readme cannot be parse into an HTML')
+    document = client.get_document()
+    if document is None:
+        logger.fatal(f'Asset with {asset.slug} readme cannot be parse into an HTML')
         return False
 
-    links = BeautifulSoup(readme['html'], features='html.parser').find_all('a')
+    links = document['links']
     found_links_to_clusters = []
     internal_links = []
     for link in links:
@@ -1,3 +1,6 @@
 from ._0_general_structure import general_structure
 from ._1_keyword_density import keyword_density
 from ._2_internal_linking import internal_linking
+
+# the reports in the order they are executed, they are registered once when the module is imported
+ACTIONS = [general_structure, keyword_density, internal_linking]
@@ -1,17 +1,52 @@
-import os, ast, requests, json, logging, re
+import logging, multiprocessing, re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from bs4 import BeautifulSoup
+from django.core.cache import close_caches
+from django.db import connections
 import breathecode.services.seo.actions as actions
-from breathecode.registry.models import SEOReport
-from breathecode.utils import APIException
+from breathecode.registry.models import Asset, SEOReport
 from django.utils import timezone
-from slugify import slugify
 
 logger = logging.getLogger(__name__)
 
+HEADINGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+
+def scan_asset(asset_id: int) -> Optional[dict]:
+    """
+    Scan an asset, it is the job of the workers of `SEOAnalyzer.bulk`.
+    """
+
+    asset = Asset.objects.filter(id=asset_id).first()
+    if asset is None:
+        logger.error(f'Asset {asset_id} not found')
+        return None
+
+    try:
+        return SEOAnalyzer(asset).start()
+
+    except Exception:
+        logger.exception(f'Error running SEO report asset {asset.slug}')
+        return None
+
+
+def close_redis_connections() -> None:
+    """
+    Close the sockets of the pool of Redis, the cache of django-redis keeps them open after `close_caches`.
+    """
+
+    try:
+        from django_redis import get_redis_connection
+        get_redis_connection('default').connection_pool.disconnect()
+
+    except (ImportError, NotImplementedError):
+        pass
+
 
 class SEOAnalyzer:
     asset = None
     excluded = []
-    shared_state = {}
     influence = {
         'general_structure': 0.2,
         'keyword_density': 0.4,
@@ -24,6 +59,9 @@ class SEOAnalyzer:
 
         self.asset = asset
         self.excluded = [*exclude, '__init__']
+        self.shared_state = {}
+        self._document = None
+        self._keywords = None
 
         total_influence = 0
         for slug in self.influence:
@@ -32,20 +70,73 @@ class SEOAnalyzer:
             raise Exception(
                 f'Total influence from all SEO reports should sum 1 but its {str(total_influence)}')
 
+    @staticmethod
+    def bulk(academy_id: int, processes: Optional[int] = None) -> dict[int, Optional[dict]]:
+        """
+        Scan every asset tracked of the academy in a pool of processes, it returns the status of each asset.
+        """
+
+        ids = list(
+            Asset.objects.filter(academy__id=academy_id, is_seo_tracked=True).values_list('id', flat=True))
+
+        if processes == 1 or len(ids) < 2:
+            return {x: scan_asset(x) for x in ids}
+
+        # the forked processes must open their own connections
+        connections.close_all()
+        close_caches()
+        close_redis_connections()
+
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            return dict(zip(ids, executor.map(scan_asset, ids)))
+
+    def get_document(self) -> Optional[dict]:
+        """
+        Get the readme parsed once per scan, with the headings and the links of its html indexed, it is
+        shared by all the reports, None if the readme cannot be parsed into html.
+        """
+
+        if self._document is not None:
+            return self._document or None
+
+        readme = self.asset.get_readme(parse=True)
+        if 'html' not in readme:
+            self._document = {}
+            return None
+
+        soup = BeautifulSoup(readme['html'], features='html.parser')
+        headings = {x: [] for x in HEADINGS}
+
+        for heading in soup.find_all(HEADINGS):
+            headings[heading.name].append(heading)
+
+        self._document = {
+            'readme': readme,
+            'soup': soup,
+            'headings': headings,
+            'links': soup.find_all('a'),
+        }
+
+        return self._document
+
+    def get_keywords(self) -> list:
+        if self._keywords is None:
+            self._keywords = list(self.asset.seo_keywords.select_related('cluster'))
+
+        return self._keywords
+
     def _get_actions(self):
-        actions = []
-        dir_path = os.path.dirname(os.path.realpath(__file__))
-        files = os.listdir(dir_path + '/actions')
-        for file_name in files:
-            if '.py' not in file_name:
-                continue
-            actions.append(file_name[0:-3])
-        return sorted(actions, key=str.lower)
+        # the actions can be excluded by name or by script name, like _0_general_structure
+        return [
+            x for x in actions.ACTIONS
+            if x.__name__ not in self.excluded and x.__module__.split('.')[-1] not in self.excluded
+        ]
 
     def start(self):
         rating = 0
         log = []
-        actions = self._get_actions()
+        reports = []
 
         self.asset.last_seo_scan_at = timezone.now()
         self.asset.save()
@@ -53,18 +144,18 @@ class SEOAnalyzer:
         # Start reports fro scratch
         SEOReport.objects.filter(asset__slug=self.asset.slug).delete()
 
-        for act in actions:
-            if act in self.excluded:
-                continue
-            else:
-                report = self.execute_report(act)
+        for fn in self._get_actions():
+            report = self.execute_report(fn.__name__)
+            reports.append(report)
+
+            if report.report_type not in self.influence:
+                logger.error(f'Influence for report {report.report_type} its not specified')
+                self.influence[report.report_type] = 0
 
-                if report.report_type not in self.influence:
-                    logger.error(f'Influence for report {report.report_type} its not specified')
-                    self.influence[report.report_type] = 0
+            rating += report.get_rating() * self.influence[report.report_type]
+            log += report.get_log()
 
-                rating += report.get_rating() * self.influence[report.report_type]
-                log += report.get_log()
+        SEOReport.objects.bulk_create(reports)
 
         self.asset.last_seo_scan_at = timezone.now()
         self.asset.optimization_rating = rating
@@ -73,10 +164,13 @@ class SEOAnalyzer:
         return self.asset.seo_json_status
 
     def execute_report(self, script_slug):
+        """
+        Run a report, it is not saved, `start` saves all the reports at once.
+        """
 
         action_name = re.sub(r'_[0-9]+_', '', script_slug)
 
-        logger.debug(f'Executing SEP Report => {script_slug}')
+        logger.debug(f'Executing SEP Report => {action_name}')
         report = SEOReport(
             report_type=action_name,
             asset=self.asset,
@@ -90,7 +184,7 @@ class SEOAnalyzer:
 
             try:
 
-                if self.asset.seo_keywords is None or self.asset.seo_keywords.count() == 0:
+                if len(self.get_keywords()) == 0:
                     raise Exception('Asset has not keywords associated')
 
                 if self.asset.readme is None:
@@ -106,7 +200,6 @@ class SEOAnalyzer:
 
                 report.log = report.get_log()
                 report.status = 'OK'
-                report.save()
 
                 self.shared_state = report.__shared_state
 
@@ -115,7 +208,6 @@ class SEOAnalyzer:
                 report.rating = None
                 report.log = str(e)
                 report.status = 'ERROR'
-                report.save()
 
         else:
             message = f'SEO Report `{action_name}` is not implemented'
@@ -123,6 +215,5 @@ class SEOAnalyzer:
             report.rating = None
             report.status = 'ERROR'
             report.log = message
-            report.save()
 
         return report
@@ -0,0 +1,158 @@
+"""
+Test SEOAnalyzer
+"""
+from unittest.mock import MagicMock, call, patch
+
+from bs4 import BeautifulSoup
+
+from breathecode.registry.models import Asset, SEOReport
+from breathecode.registry.tests.mixins import RegistryTestCase
+from breathecode.services.seo import SEOAnalyzer
+
+README = """# Title
+
+## Learn python
+
+[Python](https://4geeks.com/python) [one](https://4geeks.com/one) [two](https://4geeks.com/two)
+[three](https://4geeks.com/three)
+"""
+
+
+def get_asset_kwargs(readme=README):
+    return {'readme': Asset.encode(readme), 'readme_raw': Asset.encode(readme)}
+
+
+def get_keyword_cluster_kwargs():
+    return {'landing_page_url': 'https://4geeks.com/python'}
+
+
+class SEOAnalyzerTestSuite(RegistryTestCase):
+    """
+    🔽🔽🔽 Start
+    """
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    def test_start(self):
+        model = self.bc.database.create(asset=get_asset_kwargs(),
+                                        asset_keyword={'title': 'python'},
+                                        keyword_cluster=get_keyword_cluster_kwargs())
+
+        result = SEOAnalyzer(model.asset).start()
+
+        self.assertEqual(
+            result, {
+                'rating': 80 * 0.2 + 100 * 0.4 + 100 * 0.4,
+                'log': [{
+                    'rating': -20,
+                    'msg': 'We found 1 please remove all of them'
+                }],
+            })
+
+        reports = SEOReport.objects.order_by('id')
+        self.assertEqual([(x.report_type, x.status, x.rating) for x in reports], [
+            ('general_structure', 'OK', 80),
+            ('keyword_density', 'OK', 100),
+            ('internal_linking', 'OK', 100),
+        ])
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    def test_start__without_keywords(self):
+        model = self.bc.database.create(asset=get_asset_kwargs())
+
+        SEOAnalyzer(model.asset).start()
+
+        reports = SEOReport.objects.order_by('id')
+        self.assertEqual([(x.report_type, x.status, x.log) for x in reports], [
+            ('general_structure', 'ERROR', 'Asset has not keywords associated'),
+            ('keyword_density', 'ERROR', 'Asset has not keywords associated'),
+            ('internal_linking', 'ERROR', 'Asset has not keywords associated'),
+        ])
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    def test_start__excluded(self):
+        model = self.bc.database.create(asset=get_asset_kwargs(),
+                                        asset_keyword={'title': 'python'},
+                                        keyword_cluster=get_keyword_cluster_kwargs())
+
+        SEOAnalyzer(model.asset, exclude=['keyword_density', '_2_internal_linking']).start()
+
+        reports = SEOReport.objects.order_by('id')
+        self.assertEqual([x.report_type for x in reports], ['general_structure'])
+
+    """
+    🔽🔽🔽 One parse per scan
+    """
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    def test_start__readme_parsed_once(self):
+        model = self.bc.database.create(asset=get_asset_kwargs(),
+                                        asset_keyword={'title': 'python'},
+                                        keyword_cluster=get_keyword_cluster_kwargs())
+
+        with patch.object(Asset, 'get_readme', MagicMock(wraps=model.asset.get_readme)) as get_readme:
+            with patch('breathecode.services.seo.client.BeautifulSoup',
+                       MagicMock(wraps=BeautifulSoup)) as soup:
+                SEOAnalyzer(model.asset).start()
+
+                self.assertEqual(get_readme.call_args_list, [call(parse=True)])
+                self.assertEqual(len(soup.call_args_list), 1)
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    def test_start__reports_saved_at_once(self):
+        model = self.bc.database.create(asset=get_asset_kwargs(),
+                                        asset_keyword={'title': 'python'},
+                                        keyword_cluster=get_keyword_cluster_kwargs())
+
+        with patch.object(SEOReport.objects, 'bulk_create',
+                          MagicMock(wraps=SEOReport.objects.bulk_create)) as m:
+            SEOAnalyzer(model.asset).start()
+
+            self.assertEqual(len(m.call_args_list), 1)
+            self.assertEqual(len(m.call_args[0][0]), 3)
+
+    """
+    🔽🔽🔽 Bulk
+    """
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    def test_bulk__one_process(self):
+        assets = [{**get_asset_kwargs(), 'slug': f'asset-{n}'} for n in range(2)]
+        model = self.bc.database.create(asset=assets,
+                                        academy=1,
+                                        asset_keyword={'title': 'python'},
+                                        keyword_cluster=get_keyword_cluster_kwargs())
+
+        result = SEOAnalyzer.bulk(1, processes=1)
+
+        self.assertEqual(list(result), [x.id for x in model.asset])
+        self.assertEqual([x['rating'] for x in result.values()], [96.0, 96.0])
+        self.assertEqual(SEOReport.objects.count(), 6)
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    def test_bulk__from_other_academy(self):
+        self.bc.database.create(asset=get_asset_kwargs(), academy=2)
+
+        result = SEOAnalyzer.bulk(2, processes=1)
+        self.assertEqual(result, {})
+
+    @patch('breathecode.registry.tasks.async_regenerate_asset_readme.delay', MagicMock())
+    @patch('breathecode.services.seo.client.close_caches', MagicMock())
+    @patch('breathecode.services.seo.client.close_redis_connections', MagicMock())
+    def test_bulk__connections_closed_before_fork(self):
+        from breathecode.services.seo import client
+
+        self.bc.database.create(asset=[{
+            **get_asset_kwargs(), 'slug': f'asset-{n}'
+        } for n in range(2)],
+                                academy=1)
+
+        executor = MagicMock()
+        executor.__enter__.return_value.map.return_value = [None, None]
+
+        with patch('breathecode.services.seo.client.ProcessPoolExecutor', MagicMock(return_value=executor)):
+            result = SEOAnalyzer.bulk(1, processes=2)
+
+        # the processes must not share the sockets of the cache
+        self.assertEqual(result, {1: None, 2: None})
+        self.assertEqual(client.close_caches.call_args_list, [call()])
+        self.assertEqual(client.close_redis_connections.call_args_list, [call()])
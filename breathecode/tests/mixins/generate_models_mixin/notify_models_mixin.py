@@ -16,11 +16,13 @@ class NotifyModelsMixin(ModelsMixin):
                                slack_user_team=False,
                                slack_channel=False,
                                cohort=False,
+                               hook=False,
                                device_kwargs={},
                                slack_team_kwargs={},
                                slack_user_kwargs={},
                                slack_user_team_kwargs={},
                                slack_channel_kwargs={},
+                               hook_kwargs={},
                                models={},
                                **kwargs):
         """Generate models"""
@@ -87,4 +89,12 @@ class NotifyModelsMixin(ModelsMixin):
                 **slack_channel_kwargs
             })
 
+        if not 'hook' in models and is_valid(hook):
+            kargs = {}
+
+            if 'user' in models:
+                kargs['user'] = just_one(models['user'])
+
+            models['hook'] = create_models(hook, 'notify.Hook', **{**kargs, **hook_kwargs})
+
         return models
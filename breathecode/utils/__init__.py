@@ -26,3 +26,4 @@ from .payment_exception import *
 # from .validators import *
 from .i18n import *
 from .custom_serpy import *
+from .csv_export import *
@@ -1,34 +1,22 @@
-import csv
+from typing import Optional
 from django.http import StreamingHttpResponse
 from django.contrib import admin, messages
 from django.utils.safestring import mark_safe
+from .csv_export import iter_csv
 
 __all__ = ['AdminExportCsvMixin']
 
 
-class Echo:
-    """An object that implements just the write method of the file-like
-    interface.
-    """
-
-    def write(self, value):
-        """Write the value by returning it, instead of storing in a buffer."""
-        return value
-
-
 class AdminExportCsvMixin:
+    # the paths of the exported columns, like `user__email`, None exports the fields of the model
+    csv_columns: Optional[list[str]] = None
 
     def export_as_csv(self, request, queryset):
 
         meta = self.model._meta
-        field_names = [field.name for field in meta.fields]
-
-        pseudo_buffer = Echo()
-        writer = csv.writer(pseudo_buffer)
 
-        writer.writerow(field_names)
         return StreamingHttpResponse(
-            (writer.writerow((getattr(obj, field) for field in field_names)) for obj in queryset),
+            iter_csv(queryset, self.csv_columns),
             content_type='text/csv',
             headers={'Content-Disposition': 'attachment; filename={}.csv'.format(meta)},
         )
@@ -37,7 +25,7 @@ class AdminExportCsvMixin:
         from breathecode.monitoring.tasks import async_download_csv
         meta = self.model._meta
         ids = list(queryset.values_list('pk', flat=True))
-        async_download_csv.delay(self.model.__module__, meta.object_name, ids)
+        async_download_csv.delay(self.model.__module__, meta.object_name, ids, columns=self.csv_columns)
         messages.add_message(
             request, messages.INFO,
             mark_safe(
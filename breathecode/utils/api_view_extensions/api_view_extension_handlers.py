@@ -77,6 +77,10 @@ class APIViewExtensionHandlers:
         for extension in extensions:
             data, headers = extension._apply_response_mutation(data, headers)
 
+        # the cache extension rendered the document to store it, so it is not rendered again
+        if (cache := getattr(self, 'cache', None)) and (response := cache._get_response()):
+            return response
+
         return Response(data, status=status.HTTP_200_OK, headers=headers)
 
     def _register_valid_extensions(self) -> None:
@@ -1,7 +1,10 @@
 from typing import Optional
+from django.http import HttpResponse
+from django.utils.http import parse_etags
+from rest_framework import status
 from breathecode.utils.api_view_extensions.extension_base import ExtensionBase
 from breathecode.utils.api_view_extensions.priorities.response_order import ResponseOrder
-from breathecode.utils.cache import Cache
+from breathecode.utils.cache import Cache, CacheEntry, CacheContext
 
 __all__ = ['CacheExtension']
 
@@ -11,9 +14,13 @@ class CacheExtension(ExtensionBase):
     _cache: Cache
     _cache_per_user: bool
     _cache_prefix: str
+    _entry: Optional[CacheEntry]
+    _context: Optional[CacheContext]
 
     def __init__(self, cache: Cache, **kwargs) -> None:
         self._cache = cache()
+        self._entry = None
+        self._context = None
 
     def _optional_dependencies(self, cache_per_user: bool = False, cache_prefix: str = '', **kwargs):
         self._cache_per_user = cache_per_user
@@ -33,17 +40,66 @@ class CacheExtension(ExtensionBase):
 
         return {**self._request.GET.dict(), **self._request.parser_context['kwargs'], **extends}
 
-    def get(self) -> dict:
+    def _is_cacheable(self) -> bool:
+        # the documents are stored already rendered by the codec, other formats like csv are not cached
+        renderer = getattr(self._request, 'accepted_renderer', None)
+        return renderer is None or renderer.media_type == self._cache.codec.content_type
+
+    def _not_modified(self, entry: CacheEntry) -> bool:
+        if not (header := self._request.META.get('HTTP_IF_NONE_MATCH')):
+            return False
+
+        etags = [x.removeprefix('W/') for x in parse_etags(header)]
+        return '*' in etags or entry['etag'] in etags
+
+    def _build_response(self, entry: CacheEntry) -> HttpResponse:
+        if self._not_modified(entry):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+
+        else:
+            response = HttpResponse(entry['content'],
+                                    content_type=self._cache.codec.content_type,
+                                    status=status.HTTP_200_OK)
+
+            for key, value in entry['headers'].items():
+                response[key] = value
+
+        response['ETag'] = entry['etag']
+        return response
+
+    def get(self) -> Optional[HttpResponse]:
+        """
+        Get the cached response, it's built from the stored bytes, so it is not rendered again.
+        """
+
+        if not self._is_cacheable():
+            return None
+
         params = self._get_params()
-        return self._cache.get(**params)
+        entry, self._context = self._cache.lookup(**params)
+
+        if entry is None:
+            return None
+
+        return self._build_response(entry)
 
     def _get_order_of_response(self) -> int:
         return int(ResponseOrder.CACHE)
 
     def _can_modify_response(self) -> bool:
-        return True
+        return self._is_cacheable()
 
     def _apply_response_mutation(self, data: list[dict] | dict, headers: dict = {}):
         params = self._get_params()
-        self._cache.set(data, **params)
+        self._entry = self._cache.set(data, headers, self._context, **params)
         return (data, headers)
+
+    def _get_response(self) -> Optional[HttpResponse]:
+        """
+        Get the response of the document rendered while it was being cached.
+        """
+
+        if self._entry is None:
+            return None
+
+        return self._build_response(self._entry)
@@ -1,105 +1,390 @@
 from __future__ import annotations
-import urllib.parse, json
+import urllib.parse, json, time, zlib, hashlib, uuid
+from typing import Any, Optional, TypedDict
+import orjson
 from django.core.cache import cache
-from datetime import datetime
-from breathecode.tests.mixins import DatetimeMixin
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from rest_framework.utils.encoders import JSONEncoder
 
-__all__ = ['Cache', 'CACHE_DESCRIPTORS']
+__all__ = [
+    'Cache', 'CACHE_DESCRIPTORS', 'CacheCodec', 'JSONCodec', 'OrjsonCodec', 'CacheEntry', 'CacheContext'
+]
 CACHE_DESCRIPTORS: dict[int, Cache] = {}
 
+# it matches any row, it is used by the lists that could include a new row and by the relations that
+# cannot be read from the document
+ANY = '*'
 
-class Cache(DatetimeMixin):
+
+class CacheEntry(TypedDict):
+    content: bytes
+    compressed: bool
+    etag: str
+    headers: dict[str, str]
+    expires_at: Optional[float]
+    tags: dict[str, int]
+
+
+class CacheContext(TypedDict):
+    # what the caller read before it computed the document, `set` saves it just if it is still current
+    version: int
+    invalidations: int
+    lock: Optional[str]
+    token: Optional[str]
+
+
+def get_initial_version() -> int:
+    # a timestamp avoid reuse the generations of a counter that was evicted
+    return int(time.time() * 1000)
+
+
+class CacheCodec:
+    """
+    Transform the cached data to bytes and back, the bytes are sent to the client as is.
+    """
+
+    content_type = 'application/json'
+
+    def encode(self, data: Any) -> bytes:
+        raise NotImplementedError()
+
+    def decode(self, value: bytes) -> Any:
+        raise NotImplementedError()
+
+
+class JSONCodec(CacheCodec):
+    """
+    It renders like the JSONRenderer of rest framework.
+    """
+
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, value: bytes) -> Any:
+        return json.loads(value)
+
+
+class OrjsonCodec(CacheCodec):
+    """
+    It handles datetimes, dates and uuids natively, the rest of types fall back to the rest framework encoder.
+    """
+
+    encoder = JSONEncoder()
+
+    def encode(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=self.encoder.default, option=orjson.OPT_UTC_Z)
+
+    def decode(self, value: bytes) -> Any:
+        return orjson.loads(value)
+
+
+class Cache:
     model: str
-    parents: list[str]
+    depends: list[str] = []
+    parents: list[str] = []
+    codec: CacheCodec = OrjsonCodec()
+
+    # seconds, after max_age the entry is removed, after soft_max_age it is served stale while one worker
+    # recomputes it, None disables the stale-while-revalidate behavior
+    max_age: Optional[int] = DEFAULT_TIMEOUT
+    soft_max_age: Optional[int] = None
+    lock_timeout: int = 10
+
+    # seconds that the callers without the lock wait for a missing entry before they compute it by themselves
+    lock_wait: float = 2
+    lock_poll_interval: float = 0.05
+
+    # bytes, None disables the compression
+    compress_threshold: Optional[int] = 1024 * 4
+    compress_level: int = 6
 
     def __init__(self):
         CACHE_DESCRIPTORS[hash(self.model)] = self
 
-    def __generate_key__(self, storage_key=False, parent='', **kwargs):
-        key = self.model.__name__ if not parent else parent
+    def __version_key__(self, namespace=''):
+        key = self.model.__name__ if not namespace else namespace
+        return f'{key}__version'
 
-        if storage_key:
-            return f'{key}__keys'
-
-        credentials = urllib.parse.urlencode(kwargs)
-        return f'{key}__{credentials}'
+    def version(self, namespace='') -> int:
+        """
+        Get the generation of the namespace, it is embedded in every key, so bump it discards all the keys
+        of the previous generation without touch them, they will expire by themselves.
+        """
 
-    def __add_key_to_storage__(self, key: str):
-        storage_key = self.__generate_key__(storage_key=True)
+        key = self.__version_key__(namespace)
+        version = cache.get(key)
 
-        json_data = cache.get(storage_key)
-        keys = json.loads(json_data) if json_data else []
+        if version is None:
+            # add is atomic, if other worker set it first we keep its value
+            cache.add(key, get_initial_version(), timeout=None)
+            version = cache.get(key)
 
-        keys.append(key)
+        return version
 
-        json_data = json.dumps(keys)
-        cache.set(storage_key, json_data)
+    def __generate_key__(self, version: Optional[int] = None, /, **kwargs):
+        key = self.model.__name__
+        if version is None:
+            version = self.version()
 
-    def keys(self):
-        # we get key from cache to support multiprocess
-        key = self.__generate_key__(storage_key=True)
-        json_data = cache.get(key)
-        return json.loads(json_data) if json_data else []
+        credentials = urllib.parse.urlencode(kwargs)
+        return f'{key}__v{version}__{credentials}'
 
-    def __clear_one__(self, parent=''):
-        # we get key from cache to support multiprocess
-        storage_key = self.__generate_key__(storage_key=True, parent=parent)
-        keys = self.keys()
+    def __clear_one__(self, namespace=''):
+        key = self.__version_key__(namespace)
 
-        for key in keys:
-            cache.set(key, None)
+        try:
+            # it is a INCR in redis, so it is safe between workers
+            cache.incr(key)
 
-        cache.set(storage_key, None)
+        except ValueError:
+            # the counter was evicted, start a new generation that was never used before
+            cache.add(key, get_initial_version(), timeout=None)
 
     def clear(self):
-        # we get key from cache to support multiprocess
         for parent in self.parents:
             self.__clear_one__(parent)
 
         self.__clear_one__()
 
-    def get(self, **kwargs) -> dict:
-        key = self.__generate_key__(**kwargs)
-        json_data = cache.get(key)
-        return json.loads(json_data) if json_data else None
+    def __tag_key__(self, tag: str) -> str:
+        return f'{self.model.__name__}__tag__{tag}'
 
-    def __fix_fields__(self, data):
-        for key in data.keys():
-            if isinstance(data[key], datetime):
-                data[key] = self.datetime_to_iso(data[key])
+    def __get_relations__(self) -> dict[str, list[str]]:
+        """
+        Get the fields of the model that point to each dependency, it is empty if the model does not have any.
+        """
 
-            if isinstance(data[key], dict):
-                data[key] = self.__fix_fields__(data[key])
+        fields = [x for x in self.model._meta.get_fields() if x.is_relation and x.concrete]
+        return {name: [x.name for x in fields if x.related_model.__name__ == name] for name in self.depends}
 
-            if isinstance(data[key], list):
-                if data[key] and isinstance(data[key][0], dict):
-                    data[key] = [self.__fix_fields__(item) for item in data[key]]
+    def __has_academy__(self) -> bool:
+        return any(x.name == 'academy' for x in self.model._meta.concrete_fields)
 
-                if data[key] and isinstance(data[key][0], datetime):
-                    data[key] = [self.datetime_to_iso(item) for item in data[key]]
+    def __get_tags__(self, data, params: dict) -> set[str]:
+        """
+        Get the rows that the document contains, as tags, the entry is outdated when any of them changes.
+        """
 
-        return data
+        tags = set()
+        rows = data['results'] if isinstance(data, dict) and 'results' in data else data
+        many = isinstance(rows, list)
 
-    def __fix_fields_in_array__(self, data):
-        check_data = data
-        if 'results' in data:
-            check_data = data['results']
+        if many:
+            # a new row could be included, the scoped lists just could include the rows of its academy
+            if 'academy_id' in params and self.__has_academy__():
+                tags.add(f'academy={params["academy_id"]}')
+
+            else:
+                tags.add(ANY)
 
-        if isinstance(check_data, dict):
-            check_data = self.__fix_fields__(check_data)
         else:
-            check_data = [self.__fix_fields__(x) for x in check_data]
+            rows = [rows]
+
+        rows = [x for x in rows if isinstance(x, dict)]
+
+        for row in rows:
+            tags.add(f'id={row["id"]}' if 'id' in row else ANY)
+
+        for name, fields in self.__get_relations__().items():
+            # the document could include it through a reverse relation
+            if not fields:
+                tags.add(f'{name}={ANY}')
+                continue
+
+            # the relations that are not serialized cannot outdate the document
+            values = [row[x] for row in rows for x in fields if x in row]
+            values = [y for x in values for y in (x if isinstance(x, list) else [x])]
+
+            for value in values:
+                if isinstance(value, dict):
+                    value = value.get('id', ANY)
+
+                if value is not None:
+                    tags.add(f'{name}={value}')
+
+        return tags
+
+    def __get_tag_versions__(self, tags: set[str]) -> dict[str, int]:
+        keys = [self.__tag_key__(x) for x in tags]
+        versions = cache.get_many(keys)
+        return {x: versions.get(x, 0) for x in keys}
+
+    def __is_outdated__(self, entry: CacheEntry) -> bool:
+        if not entry['tags']:
+            return False
+
+        versions = cache.get_many(list(entry['tags']))
+        return any(versions.get(k, 0) != v for k, v in entry['tags'].items())
+
+    def get_tags(self, instance) -> set[str]:
+        """
+        Get the tags to invalidate when a row of the model was saved or deleted.
+        """
 
-        if 'results' in data:
-            return {**data, 'results': check_data}
+        tags = {ANY, f'id={instance.pk}'}
 
-        return check_data
+        if (academy_id := getattr(instance, 'academy_id', None)) is not None:
+            tags.add(f'academy={academy_id}')
+
+        return tags
+
+    def get_dependency_tags(self, instance) -> set[str]:
+        """
+        Get the tags to invalidate when a row of one of the dependencies was saved or deleted.
+        """
+
+        name = instance.__class__.__name__
+        return {f'{name}={instance.pk}', f'{name}={ANY}'}
+
+    def __invalidations_key__(self) -> str:
+        return f'{self.model.__name__}__invalidations'
+
+    def invalidations(self) -> Optional[int]:
+        """
+        Get the counter of invalidations of the model, a document computed while it changed could be tagged
+        with the versions written by the invalidation.
+        """
+
+        return cache.get(self.__invalidations_key__())
+
+    def invalidate(self, *tags: str) -> None:
+        """
+        Outdate the entries tagged with any of the tags, the rest of the namespace is kept.
+        """
+
+        # it is bumped before the tags, so `set` sees it changed if it read any of the new versions
+        try:
+            cache.incr(self.__invalidations_key__())
+
+        except ValueError:
+            cache.add(self.__invalidations_key__(), get_initial_version(), timeout=None)
+
+        for tag in tags:
+            key = self.__tag_key__(tag)
+
+            try:
+                cache.incr(key)
+
+            except ValueError:
+                # the entries saw it as 0, the tag expires with the last entry that could see it
+                cache.add(key, get_initial_version(), timeout=self.max_age)
+
+    def __dump__(self, data, headers: dict, tags: set[str]) -> CacheEntry:
+        content = self.codec.encode(data)
+        headers = {k: str(v) for k, v in headers.items()}
+
+        return {
+            'content': content,
+            'compressed': False,
+            'etag': '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"',
+            'headers': headers,
+            'expires_at': time.time() + self.soft_max_age if self.soft_max_age is not None else None,
+            'tags': self.__get_tag_versions__(tags),
+        }
+
+    def __is_stale__(self, entry: CacheEntry) -> bool:
+        return entry['expires_at'] is not None and entry['expires_at'] < time.time()
+
+    def __compress__(self, entry: CacheEntry) -> CacheEntry:
+        if self.compress_threshold is None or len(entry['content']) < self.compress_threshold:
+            return entry
+
+        return {**entry, 'content': zlib.compress(entry['content'], self.compress_level), 'compressed': True}
+
+    def __decompress__(self, entry: CacheEntry) -> CacheEntry:
+        if not entry['compressed']:
+            return entry
+
+        return {**entry, 'content': zlib.decompress(entry['content']), 'compressed': False}
+
+    def entry(self, **kwargs) -> Optional[CacheEntry]:
+        """
+        Get the encoded document with its etag and headers, it can be written to the response as is, with
+        `codec.content_type`.
+        """
 
-    def set(self, data, **kwargs):
         key = self.__generate_key__(**kwargs)
-        data = self.__fix_fields_in_array__(data)
+        entry = cache.get(key)
+
+        if not entry or self.__is_outdated__(entry):
+            return None
+
+        return self.__decompress__(entry)
+
+    def lookup(self, **kwargs) -> tuple[Optional[CacheEntry], Optional[CacheContext]]:
+        """
+        Get the entry to be served. None means that the caller must compute it and save it with `set`, with
+        the context, it is read before the document is computed.
+
+        When the entry is soft-expired, missing or outdated, just one caller per key gets the lock. The rest
+        are served with the stale entry, the outdated entries are never served, so without one they wait a
+        moment for the entry of the caller with the lock.
+        """
+
+        context: CacheContext = {
+            'version': self.version(),
+            'invalidations': self.invalidations(),
+            'lock': None,
+            'token': None,
+        }
+
+        key = self.__generate_key__(context['version'], **kwargs)
+        entry = cache.get(key)
+
+        if entry and self.__is_outdated__(entry):
+            entry = None
+
+        if entry and not self.__is_stale__(entry):
+            return self.__decompress__(entry), None
+
+        if self.soft_max_age is None:
+            return None, context
+
+        # it is released by set, or it expires if the caller did not cache anything
+        token = uuid.uuid4().hex
+        if cache.add(f'{key}__lock', token, timeout=self.lock_timeout):
+            return None, {**context, 'lock': f'{key}__lock', 'token': token}
+
+        if entry:
+            return self.__decompress__(entry), None
+
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(self.lock_poll_interval)
+
+            if (entry := cache.get(key)) and not self.__is_outdated__(entry):
+                return self.__decompress__(entry), None
+
+        return None, context
+
+    def raw(self, **kwargs) -> Optional[bytes]:
+        entry = self.entry(**kwargs)
+        return entry['content'] if entry else None
+
+    def get(self, **kwargs) -> dict:
+        value = self.raw(**kwargs)
+        return self.codec.decode(value) if value is not None else None
+
+    def set(self,
+            data,
+            headers: Optional[dict] = None,
+            context: Optional[CacheContext] = None,
+            /,
+            **kwargs) -> CacheEntry:
+        """
+        Save the document, with the context got from `lookup` it is saved in the generation that was read,
+        it is not saved if the model was invalidated while it was computed, and the lock is released if it is
+        still held by the caller.
+        """
+
+        key = self.__generate_key__(context['version'] if context else None, **kwargs)
+        entry = self.__dump__(data, headers or {}, self.__get_tags__(data, kwargs))
+
+        # the versions of the tags are read first, a newer version implies a newer counter
+        if context is None or self.invalidations() == context['invalidations']:
+            cache.set(key, self.__compress__(entry), timeout=self.max_age)
 
-        json_data = json.dumps(data)
-        cache.set(key, json_data)
+        if context and context['lock'] and cache.get(context['lock']) == context['token']:
+            cache.delete(context['lock'])
 
-        self.__add_key_to_storage__(key)
+        return entry
@@ -0,0 +1,139 @@
+import csv, gzip, io
+from typing import Any, BinaryIO, Callable, Iterator, Optional, Union
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+
+__all__ = ['CSVColumn', 'get_csv_columns', 'iter_csv', 'write_csv']
+
+# rows fetched per round trip, they are read with a server-side cursor where the database supports it
+CSV_ITERATOR_SIZE = 2000
+
+# characters buffered before a chunk is yielded
+CSV_CHUNK_SIZE = 64 * 1024
+
+# a path like `user__email`, or its header and a path or a callable that gets the row
+CSVColumn = Union[str, tuple[str, Union[str, Callable[[Model], Any]]]]
+
+
+def get_csv_columns(model, columns: Optional[list[CSVColumn]] = None) -> list[tuple[str, Any]]:
+    """
+    Get the header and the getter of each column, the default columns are the fields of the model.
+    """
+
+    if columns is None:
+        columns = [x.name for x in model._meta.fields]
+
+    return [x if isinstance(x, tuple) else (x, x) for x in columns]
+
+
+def get_csv_relations(model, paths: list[str]) -> list[str]:
+    """
+    Get the relations that the paths go through, they are joined to avoid one query per row.
+    """
+
+    relations = set()
+
+    for path in paths:
+        current = model
+        names = []
+
+        for name in path.split('__'):
+            try:
+                field = current._meta.get_field(name)
+
+            # it is a property or a method
+            except FieldDoesNotExist:
+                break
+
+            if not field.is_relation or field.many_to_many or field.one_to_many:
+                break
+
+            names.append(name)
+            relations.add('__'.join(names))
+            current = field.related_model
+
+    return sorted(relations)
+
+
+def get_csv_value(obj, getter) -> Any:
+    if callable(getter):
+        return getter(obj)
+
+    for name in getter.split('__'):
+        if obj is None:
+            return None
+
+        obj = getattr(obj, name)
+
+    return obj
+
+
+def iter_csv(queryset: QuerySet,
+             columns: Optional[list[CSVColumn]] = None,
+             chunk_size: int = CSV_CHUNK_SIZE,
+             progress: Optional[Callable[[int], None]] = None) -> Iterator[str]:
+    """
+    Render a queryset as csv, in chunks, the rows are streamed from the database, so the memory used does not
+    depend on the number of rows. `progress` gets the number of rows rendered after each chunk.
+    """
+
+    columns = get_csv_columns(queryset.model, columns)
+
+    if relations := get_csv_relations(queryset.model, [x[1] for x in columns if isinstance(x[1], str)]):
+        queryset = queryset.select_related(*relations)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([x[0] for x in columns])
+
+    rows = 0
+    for obj in queryset.iterator(chunk_size=CSV_ITERATOR_SIZE):
+        writer.writerow([get_csv_value(obj, x[1]) for x in columns])
+        rows += 1
+
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+
+            buffer.seek(0)
+            buffer.truncate()
+
+            if progress:
+                progress(rows)
+
+    yield buffer.getvalue()
+
+    if progress:
+        progress(rows)
+
+
+def write_csv(queryset: QuerySet,
+              file: BinaryIO,
+              columns: Optional[list[CSVColumn]] = None,
+              compress: bool = False,
+              progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Write a queryset as csv to a binary file, like a writer of Google Cloud Storage, optionally compressed
+    with gzip, it returns the number of rows written.
+    """
+
+    rows = 0
+
+    def count(n: int) -> None:
+        nonlocal rows
+        rows = n
+
+        if progress:
+            progress(n)
+
+    # it writes the trailer of gzip when it is closed, the file is kept open
+    stream = gzip.GzipFile(fileobj=file, mode='wb') if compress else file
+
+    try:
+        for chunk in iter_csv(queryset, columns, progress=count):
+            stream.write(chunk.encode('utf-8'))
+
+    finally:
+        if compress:
+            stream.close()
+
+    return rows
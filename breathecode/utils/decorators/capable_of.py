@@ -45,9 +45,20 @@ def capable_of(capability=None):
     return decorator
 
 
-def get_academy_from_capability(kwargs, request, capability):
-    from breathecode.authenticate.models import ProfileAcademy
+def get_capabilities(request) -> dict[int, dict]:
+    """
+    Get the capabilities of the user by academy, it is memoized for the rest of the request.
+    """
+
+    from breathecode.authenticate.actions import get_user_capabilities
+
+    if getattr(request, '_capabilities', None) is None:
+        request._capabilities = get_user_capabilities(request.user.id)
 
+    return request._capabilities
+
+
+def get_academy_from_capability(kwargs, request, capability):
     academy_id = None
 
     if ('academy_id' not in kwargs and 'Academy' not in request.headers and 'academy' not in request.headers
@@ -74,19 +85,16 @@ def get_academy_from_capability(kwargs, request, capability):
     if isinstance(request.user, AnonymousUser):
         raise PermissionDenied('Invalid user')
 
-    capable = ProfileAcademy.objects.filter(user=request.user.id,
-                                            academy__id=academy_id,
-                                            role__capabilities__slug=capability)
+    academy = get_capabilities(request).get(int(academy_id))
 
-    if capable.count() == 0:
+    if academy is None or capability not in academy['capabilities']:
         raise PermissionDenied(
             f"You (user: {request.user.id}) don't have this capability: {capability} for academy {academy_id}"
         )
 
-    academy = capable.first().academy
-    if academy.status == 'DELETED':
+    if academy['status'] == 'DELETED':
         raise PermissionDenied(f'This academy is deleted')
-    if request.get_full_path() != '/v1/admissions/academy/activate' and academy.status == 'INACTIVE':
+    if request.get_full_path() != '/v1/admissions/academy/activate' and academy['status'] == 'INACTIVE':
         raise PermissionDenied(f'This academy is not active')
 
     return academy_id
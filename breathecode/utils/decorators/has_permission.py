@@ -3,12 +3,12 @@ from typing import Callable, Optional, TypedDict
 
 from django.contrib.auth.models import AnonymousUser
 from django.core.handlers.wsgi import WSGIRequest
-from django.db.models import Q, QuerySet
+from django.db.models import F, FloatField, OuterRef, Q, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework.views import APIView
-from django.db.models import Sum
 
-from breathecode.authenticate.models import Permission, User
+from breathecode.authenticate.models import User
 from breathecode.payments.signals import consume_service
 
 from ..exceptions import ProgramingError
@@ -33,14 +33,30 @@ HasPermissionCallback = Callable[[PermissionContextType, tuple, dict], tuple[Per
 
 
 def validate_permission(user: User, permission: str, consumer: bool | HasPermissionCallback = False) -> bool:
+    from breathecode.authenticate.actions import get_user_permissions
+
+    permissions = get_user_permissions(user.id)
+
     if consumer:
-        return User.objects.filter(id=user.id, groups__permissions__codename=permission).exists()
+        return permission in permissions['group']
+
+    return permission in permissions['user'] or permission in permissions['group']
+
 
-    found = Permission.objects.filter(codename=permission).first()
-    if not found:
-        return False
+def get_available_consumables(consumables: QuerySet) -> QuerySet:
+    """
+    Exclude the consumables that are fully reserved by its pending sessions.
+    """
 
-    return found.user_set.filter(id=user.id).exists() or found.group_set.filter(user__id=user.id).exists()
+    from breathecode.payments.models import ConsumptionSession
+
+    pending = ConsumptionSession.objects.filter(
+        consumable=OuterRef('pk'),
+        status='PENDING').values('consumable').annotate(total=Sum('how_many')).values('total')
+
+    return consumables.annotate(
+        pending_how_many=Coalesce(Subquery(pending), 0, output_field=FloatField())).exclude(
+            how_many__gt=0, how_many__lte=F('pending_how_many'))
 
 
 def has_permission(permission: str, consumer: bool | HasPermissionCallback = False) -> callable:
@@ -96,14 +112,7 @@ def has_permission(permission: str, consumer: bool | HasPermissionCallback = Fal
                     context, args, kwargs = consumer(context, args, kwargs)
 
                 if consumer and context['time_of_life']:
-                    consumables = context['consumables']
-                    for item in consumables.filter(consumptionsession__status='PENDING', how_many__gt=0):
-
-                        sum = item.consumptionsession_set.filter(status='PENDING').aggregate(
-                            Sum('consumptionsession__how_many'))
-
-                        if item.how_many - sum['how_many__sum'] == 0:
-                            context['consumables'] = context['consumables'].exclude(id=item.id)
+                    context['consumables'] = get_available_consumables(context['consumables'])
 
                 if consumer and context['will_consume'] and not context['consumables']:
                     #TODO: send a url to recharge this service
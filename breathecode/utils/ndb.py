@@ -1,30 +1,150 @@
+import base64
+import hashlib
+import itertools
+import json
+import threading
+from typing import Optional
+from django.core.cache import cache
 from breathecode.services.google_cloud.credentials import resolve_credentials
+from .validation_exception import ValidationException
 
 __all__ = ['NDB']
 
+# seconds
+COUNT_CACHE_TIMEOUT = 60
+
+lock = threading.Lock()
+client = None
+
+
+def get_client():
+    """
+    Get the client of the process, it opens the grpc channel, so it must not be built per query.
+    """
+
+    global client
+    from google.cloud import ndb
+
+    if client is None:
+        with lock:
+            if client is None:
+                resolve_credentials()
+                client = ndb.Client()
+
+    return client
+
+
+def split_query(query: list) -> list[list]:
+    """
+    Split the OR filters of a query in one query per alternative, `[a, OR(b, c)]` is split in
+    `[[a, b], [a, c]]`.
+    """
+
+    from google.cloud.ndb.query import DisjunctionNode
+
+    options = [list(x) if isinstance(x, DisjunctionNode) else [x] for x in query]
+    return [list(x) for x in itertools.product(*options)]
+
+
+def encode_cursor(cursors: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(cursors).encode('utf-8')).decode('utf-8')
+
+
+def is_cursor_state(state) -> bool:
+    return state is False or state is None or isinstance(state, str)
+
+
+def decode_cursor(token: str, size: int) -> list:
+    try:
+        cursors = json.loads(base64.urlsafe_b64decode(token.encode('utf-8')))
+
+    except ValueError:
+        cursors = None
+
+    if not isinstance(cursors, list) or len(cursors) != size or not all(is_cursor_state(x) for x in cursors):
+        raise ValidationException('Invalid cursor', slug='invalid-cursor')
+
+    return cursors
+
 
 class NDB:
 
     def __init__(self, Model):
-        from google.cloud import ndb
-        resolve_credentials()
-        self.client = ndb.Client()
+        self.client = get_client()
         self.Model = Model
 
     def fetch(self, query, **kwargs):
-        from google.cloud import ndb
-        client = ndb.Client()
-
-        with client.context():
+        with self.client.context():
             query = self.Model.query().filter(*query)
 
             elements = query.fetch(**kwargs)
             return [c.to_dict() for c in elements]
 
-    def count(self, query):
-        from google.cloud import ndb
-        client = ndb.Client()
+    def fetch_page(self,
+                   query,
+                   page_size: int,
+                   cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """
+        Get a page and the opaque cursor of the next one, None if it is the last page.
 
-        with client.context():
-            query = self.Model.query().filter(*query)
-            return query.count()
+        The OR filters are split in queries that are fetched one after another and chained, the next one is
+        read only when the previous ones are exhausted, each one keeps its own cursor, so the alternatives
+        must not match the same entities, like `OR(slug == a, slug == b)`.
+
+        The alternatives are not merged by `created_at`, the pages follow the order of Datastore within each
+        alternative, sorting them would need a composite index per filter.
+        """
+
+        from google.cloud.ndb import Cursor
+
+        queries = split_query(query)
+
+        # per query, the urlsafe cursor, None if it was not read yet, or False if it was exhausted
+        cursors = decode_cursor(cursor, len(queries)) if cursor else [None for _ in queries]
+
+        with self.client.context():
+            elements = []
+            for i, (filters, state) in enumerate(zip(queries, cursors)):
+                if state is False:
+                    continue
+
+                if len(elements) == page_size:
+                    break
+
+                # just the entities that are missing are read, so the cursor points right after the page
+                start_cursor = Cursor(urlsafe=state) if state else None
+                page, next_cursor, more = self.Model.query().filter(*filters).fetch_page(
+                    page_size - len(elements), start_cursor=start_cursor)
+
+                elements += page
+                cursors[i] = next_cursor.urlsafe().decode('utf-8') if more and next_cursor else False
+
+            results = [x.to_dict() for x in elements]
+
+        if all(x is False for x in cursors):
+            return results, None
+
+        return results, encode_cursor(cursors)
+
+    def count(self, query, limit: Optional[int] = None) -> int:
+        """
+        Count the entities, it is cached for a minute, provide a limit to stop counting there.
+        """
+
+        # the repr of the filters is stable, like FilterNode('cohort', '=', 'x')
+        digest = hashlib.sha1(repr([query, limit]).encode('utf-8')).hexdigest()
+        key = f'ndb__{self.Model._get_kind()}__count__{digest}'
+
+        if (count := cache.get(key)) is not None:
+            return count
+
+        with self.client.context():
+            # the alternatives are counted concurrently, Datastore cannot count an OR by itself
+            futures = [self.Model.query().filter(*x).count_async(limit=limit) for x in split_query(query)]
+            count = sum([x.result() for x in futures])
+
+        if limit is not None:
+            count = min(count, limit)
+
+        cache.set(key, count, timeout=COUNT_CACHE_TIMEOUT)
+        return count
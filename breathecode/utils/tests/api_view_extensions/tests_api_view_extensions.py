@@ -16,6 +16,14 @@ from breathecode.utils.api_view_extensions.api_view_extension_handlers import AP
 cohort_cache = CohortCache()
 
 
+def render(response):
+    # the responses built from the cache are rendered already
+    if hasattr(response, 'render'):
+        response.render()
+
+    return response
+
+
 class GetCohortSerializer(serpy.Serializer):
     id = serpy.Field()
     slug = serpy.Field()
@@ -42,11 +50,6 @@ class GetCohortSerializer(serpy.Serializer):
         return obj.academy.id if obj.academy else None
 
 
-def serialize_cache_value(data):
-    return str(data).replace('\'', '"').replace('None', 'null').replace('True',
-                                                                        'true').replace('False', 'false')
-
-
 class TestView(APIView):
     permission_classes = [AllowAny]
     extensions = APIViewExtensions(cache=CohortCache, sort='name', paginate=True)
@@ -56,7 +59,7 @@ class TestView(APIView):
 
         cache = handler.cache.get()
         if cache is not None:
-            return Response(cache, status=status.HTTP_200_OK)
+            return cache
 
         if id:
             item = Cohort.objects.filter(id=id).first()
@@ -114,7 +117,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
         request = request.get(f'/the-beans-should-not-have-sugar/1')
 
         view = TestView.as_view()
-        view(request).render()
+        render(view(request))
 
         self.assertEqual(APIViewExtensionHandlers._spy_extensions.call_args_list, [
             call(['CacheExtension', 'LanguageExtension', 'PaginationExtension', 'SortExtension']),
@@ -137,7 +140,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
         request = request.get(f'/the-beans-should-not-have-sugar/1')
 
         view = TestView.as_view()
-        view(request).render()
+        render(view(request))
 
         self.assertEqual(APIViewExtensionHandlers._spy_extension_arguments.call_args_list, [
             call(cache=CohortCache, sort='name', paginate=True),
@@ -156,7 +159,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
         request = request.get(f'/the-beans-should-not-have-sugar/1')
 
         view = CachePerUserTestView.as_view()
-        view(request).render()
+        render(view(request))
 
         self.assertEqual(APIViewExtensionHandlers._spy_extension_arguments.call_args_list, [
             call(cache=CohortCache, cache_per_user=True, sort='name', paginate=False),
@@ -175,7 +178,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
         request = request.get(f'/the-beans-should-not-have-sugar/1')
 
         view = CachePrefixTestView.as_view()
-        view(request).render()
+        render(view(request))
 
         self.assertEqual(APIViewExtensionHandlers._spy_extension_arguments.call_args_list, [
             call(cache=CohortCache,
@@ -196,13 +199,13 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = []
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(cohort_cache.keys(), ['Cohort__'])
+        self.assertEqual(cohort_cache.get(), expected)
 
     def test_cache__get__without_cache__one_cohort(self):
         cache.clear()
@@ -214,13 +217,13 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer([model.cohort], many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(cohort_cache.keys(), ['Cohort__'])
+        self.assertEqual(cohort_cache.get(), expected)
 
     def test_cache__get__without_cache__ten_cohorts(self):
         cache.clear()
@@ -232,13 +235,13 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer(sorted(model.cohort, key=lambda x: x.name), many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(cohort_cache.keys(), ['Cohort__'])
+        self.assertEqual(cohort_cache.get(), expected)
 
     def test_cache__get__without_cache__ten_cohorts__passing_arguments(self):
         cache.clear()
@@ -252,32 +255,31 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer(model.cohort[4:], many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(cohort_cache.keys(), ['Cohort__sort=slug&slug=100%2C101%2C110%2C111'])
+        self.assertEqual(cohort_cache.get(), None)
+        self.assertEqual(cohort_cache.get(sort='slug', slug=','.join(params)), expected)
 
     def test_cache__get__with_cache(self):
         cache.clear()
 
         cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
         for expected in cases:
-            json_data = json.dumps(expected)
-            cache.set('Cohort__keys', '["Cohort__"]')
-            cache.set('Cohort__', json_data)
+            cohort_cache.set(expected)
 
             request = APIRequestFactory()
             request = request.get('/the-beans-should-not-have-sugar')
 
             view = TestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), ['Cohort__'])
+            self.assertEqual(cohort_cache.get(), expected)
 
     def test_cache__get__with_cache__passing_arguments(self):
         cache.clear()
@@ -285,21 +287,18 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
         cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
         params = [bin(x).replace('0b', '') for x in range(4, 8)]
         for expected in cases:
-            json_data = json.dumps(expected)
-            cache.set('Cohort__keys', '["Cohort__sort=slug&slug=100%2C101%2C110%2C111"]')
-            cache.set('Cohort__sort=slug&slug=100%2C101%2C110%2C111', json_data)
+            cohort_cache.set(expected, sort='slug', slug=','.join(params))
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={",".join(params)}')
 
             view = TestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), ['Cohort__sort=slug&slug=100%2C101%2C110%2C111'])
-            self.assertEqual(cache.get('Cohort__sort=slug&slug=100%2C101%2C110%2C111'),
-                             str(expected).replace('\'', '"'))
+            self.assertEqual(cohort_cache.get(), None)
+            self.assertEqual(cohort_cache.get(sort='slug', slug=','.join(params)), expected)
 
     def test_cache__get__with_cache_but_other_case__passing_arguments(self):
         cache.clear()
@@ -310,22 +309,19 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
             slug = self.bc.fake.slug()
             model = self.bc.database.create(cohort={'slug': slug})
 
-            json_data = json.dumps(case)
-            cache.set('Cohort__', json_data)
-            cache.set('Cohort__keys', '["Cohort__"]')
+            cohort_cache.set(case)
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={slug}')
 
             view = TestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
             expected = GetCohortSerializer([model.cohort], many=True).data
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), ['Cohort__', f'Cohort__sort=slug&slug={slug}'])
-            self.assertEqual(cache.get('Cohort__'), serialize_cache_value(case))
-            self.assertEqual(cache.get(f'Cohort__sort=slug&slug={slug}'), serialize_cache_value(expected))
+            self.assertEqual(cohort_cache.get(), case)
+            self.assertEqual(cohort_cache.get(sort='slug', slug=slug), expected)
 
     def test_cache__get__with_cache_case_of_root_and_current__passing_arguments(self):
         cache.clear()
@@ -337,24 +333,136 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
             self.bc.database.delete('admissions.Cohort')
             model = self.bc.database.create(cohort={'slug': slug})
 
-            json_data_root = json.dumps(case)
-            json_data_query = json.dumps(case + case)
-            cache.set('Cohort__', json_data_root)
-            cache.set(f'Cohort__sort=slug&slug={slug}', json_data_query)
-            cache.set('Cohort__keys', f'["Cohort__", "Cohort__sort=slug&slug={slug}"]')
+            cohort_cache.set(case)
+            cohort_cache.set(case + case, sort='slug', slug=slug)
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={slug}')
 
             view = TestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
             expected = case + case
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), ['Cohort__', f'Cohort__sort=slug&slug={slug}'])
-            self.assertEqual(cache.get('Cohort__'), json_data_root)
-            self.assertEqual(cache.get(f'Cohort__sort=slug&slug={slug}'), json_data_query)
+            self.assertEqual(cohort_cache.get(), case)
+            self.assertEqual(cohort_cache.get(sort='slug', slug=slug), case + case)
+
+    def test_cache__get__with_cache__after_clear(self):
+        cache.clear()
+
+        cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
+        for case in cases:
+            cohort_cache.set(case)
+            version = cohort_cache.version()
+            parent_version = cohort_cache.version('CohortUser')
+
+            cohort_cache.clear()
+
+            request = APIRequestFactory()
+            request = request.get('/the-beans-should-not-have-sugar')
+
+            view = TestView.as_view()
+            response = render(view(request))
+            expected = []
+
+            self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(cohort_cache.version(), version + 1)
+            self.assertEqual(cohort_cache.version('CohortUser'), parent_version + 1)
+            self.assertEqual(cohort_cache.get(), expected)
+
+    def test_cache__get__with_cache__etag(self):
+        cache.clear()
+
+        cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
+        for expected in cases:
+            entry = cohort_cache.set(expected, {'x-total-count': len(expected)})
+
+            request = APIRequestFactory()
+            request = request.get('/the-beans-should-not-have-sugar')
+
+            view = TestView.as_view()
+            response = render(view(request))
+
+            self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['ETag'], entry['etag'])
+            self.assertEqual(response['x-total-count'], str(len(expected)))
+            self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_cache__get__with_cache__if_none_match(self):
+        cache.clear()
+
+        cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
+        for expected in cases:
+            entry = cohort_cache.set(expected)
+
+            request = APIRequestFactory()
+            request = request.get('/the-beans-should-not-have-sugar', HTTP_IF_NONE_MATCH=entry['etag'])
+
+            view = TestView.as_view()
+            response = render(view(request))
+
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response['ETag'], entry['etag'])
+
+    def test_cache__get__with_cache__if_none_match__outdated(self):
+        cache.clear()
+
+        cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
+        for expected in cases:
+            entry = cohort_cache.set(expected)
+
+            request = APIRequestFactory()
+            request = request.get('/the-beans-should-not-have-sugar', HTTP_IF_NONE_MATCH='"outdated"')
+
+            view = TestView.as_view()
+            response = render(view(request))
+
+            self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['ETag'], entry['etag'])
+
+    def test_cache__get__with_cache__other_format(self):
+        cache.clear()
+
+        model = self.bc.database.create(cohort=1)
+        cohort_cache.set([{'x': 1}], format='csv')
+
+        request = APIRequestFactory()
+        request = request.get('/the-beans-should-not-have-sugar?format=csv')
+
+        view = TestView.as_view()
+        response = render(view(request))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn(model.cohort.slug, response.content.decode('utf-8'))
+        self.assertFalse(response.has_header('ETag'))
+        self.assertEqual(cohort_cache.get(format='csv'), [{'x': 1}])
+
+    def test_cache__get__without_cache__etag(self):
+        cache.clear()
+
+        model = self.bc.database.create(cohort=10)
+
+        request = APIRequestFactory()
+        request = request.get('/the-beans-should-not-have-sugar?limit=5')
+
+        view = TestView.as_view()
+        response = render(view(request))
+
+        entry = cohort_cache.entry(limit=5)
+        expected = GetCohortSerializer(sorted(model.cohort, key=lambda x: x.name)[:5], many=True).data
+
+        self.assertEqual(json.loads(response.content.decode('utf-8'))['results'], expected)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], entry['etag'])
+        self.assertEqual(response['x-total-count'], '10')
+        self.assertEqual(entry['headers']['x-total-count'], '10')
+        self.assertEqual(response.content, entry['content'])
 
     """
     🔽🔽🔽 Cache per user without auth
@@ -366,22 +474,22 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
         cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
         params = [bin(x).replace('0b', '') for x in range(4, 8)]
         for expected in cases:
-            json_data = json.dumps(expected)
-            cache.set('Cohort__keys', '["Cohort__sort=slug&slug=100%2C101%2C110%2C111&request.user.id=None"]')
-            cache.set('Cohort__sort=slug&slug=100%2C101%2C110%2C111&request.user.id=None', json_data)
+            cohort_cache.set(expected, **{'sort': 'slug', 'slug': ','.join(params), 'request.user.id': None})
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={",".join(params)}')
 
             view = CachePerUserTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(),
-                             ['Cohort__sort=slug&slug=100%2C101%2C110%2C111&request.user.id=None'])
-            self.assertEqual(cache.get('Cohort__sort=slug&slug=100%2C101%2C110%2C111&request.user.id=None'),
-                             str(expected).replace('\'', '"'))
+            self.assertEqual(
+                cohort_cache.get(**{
+                    'sort': 'slug',
+                    'slug': ','.join(params),
+                    'request.user.id': None
+                }), expected)
 
     def test_cache_per_user__get__with_cache_but_other_case__passing_arguments(self):
         cache.clear()
@@ -392,24 +500,23 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
             slug = self.bc.fake.slug()
             model = self.bc.database.create(cohort={'slug': slug})
 
-            json_data = json.dumps(case)
-            cache.set('Cohort__', json_data)
-            cache.set('Cohort__keys', '["Cohort__"]')
+            cohort_cache.set(case)
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={slug}')
 
             view = CachePerUserTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
             expected = GetCohortSerializer([model.cohort], many=True).data
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(),
-                             ['Cohort__', f'Cohort__sort=slug&slug={slug}&request.user.id=None'])
-            self.assertEqual(cache.get('Cohort__'), serialize_cache_value(case))
-            self.assertEqual(cache.get(f'Cohort__sort=slug&slug={slug}&request.user.id=None'),
-                             serialize_cache_value(expected))
+            self.assertEqual(cohort_cache.get(), case)
+            self.assertEqual(cohort_cache.get(**{
+                'sort': 'slug',
+                'slug': slug,
+                'request.user.id': None
+            }), expected)
 
     def test_cache_per_user__get__with_cache_case_of_root_and_current__passing_arguments(self):
         cache.clear()
@@ -421,26 +528,24 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
             self.bc.database.delete('admissions.Cohort')
             model = self.bc.database.create(cohort={'slug': slug})
 
-            json_data_root = json.dumps(case)
-            json_data_query = json.dumps(case + case)
-            cache.set('Cohort__', json_data_root)
-            cache.set(f'Cohort__sort=slug&slug={slug}&request.user.id=None', json_data_query)
-            cache.set('Cohort__keys', f'["Cohort__", "Cohort__sort=slug&slug={slug}&request.user.id=None"]')
+            cohort_cache.set(case)
+            cohort_cache.set(case + case, **{'sort': 'slug', 'slug': slug, 'request.user.id': None})
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={slug}')
 
             view = CachePerUserTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
             expected = case + case
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(),
-                             ['Cohort__', f'Cohort__sort=slug&slug={slug}&request.user.id=None'])
-            self.assertEqual(cache.get('Cohort__'), json_data_root)
-            self.assertEqual(cache.get(f'Cohort__sort=slug&slug={slug}&request.user.id=None'),
-                             json_data_query)
+            self.assertEqual(cohort_cache.get(), case)
+            self.assertEqual(cohort_cache.get(**{
+                'sort': 'slug',
+                'slug': slug,
+                'request.user.id': None
+            }), case + case)
 
     """
     🔽🔽🔽 Cache per user with auth
@@ -453,27 +558,27 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
         params = [bin(x).replace('0b', '') for x in range(4, 8)]
         for expected in cases:
             model = self.bc.database.create(user=1)
-            json_data = json.dumps(expected)
-            cache.set('Cohort__keys',
-                      f'["Cohort__sort=slug&slug=100%2C101%2C110%2C111&request.user.id={model.user.id}"]')
-            cache.set(f'Cohort__sort=slug&slug=100%2C101%2C110%2C111&request.user.id={model.user.id}',
-                      json_data)
+            cohort_cache.set(expected, **{
+                'sort': 'slug',
+                'slug': ','.join(params),
+                'request.user.id': model.user.id
+            })
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={",".join(params)}')
 
             force_authenticate(request, user=model.user)
             view = CachePerUserTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(
-                cohort_cache.keys(),
-                [f'Cohort__sort=slug&slug=100%2C101%2C110%2C111&request.user.id={model.user.id}'])
-            self.assertEqual(
-                cache.get(f'Cohort__sort=slug&slug=100%2C101%2C110%2C111&request.user.id={model.user.id}'),
-                str(expected).replace('\'', '"'))
+                cohort_cache.get(**{
+                    'sort': 'slug',
+                    'slug': ','.join(params),
+                    'request.user.id': model.user.id
+                }), expected)
 
     def test_cache_per_user__get__auth__with_cache_but_other_case__passing_arguments(self):
         cache.clear()
@@ -484,25 +589,25 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
             slug = self.bc.fake.slug()
             model = self.bc.database.create(cohort={'slug': slug}, user=1)
 
-            json_data = json.dumps(case)
-            cache.set('Cohort__', json_data)
-            cache.set('Cohort__keys', '["Cohort__"]')
+            cohort_cache.set(case)
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={slug}')
 
             force_authenticate(request, user=model.user)
             view = CachePerUserTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
             expected = GetCohortSerializer([model.cohort], many=True).data
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(),
-                             ['Cohort__', f'Cohort__sort=slug&slug={slug}&request.user.id={model.user.id}'])
-            self.assertEqual(cache.get('Cohort__'), serialize_cache_value(case))
-            self.assertEqual(cache.get(f'Cohort__sort=slug&slug={slug}&request.user.id={model.user.id}'),
-                             serialize_cache_value(expected))
+            self.assertEqual(cohort_cache.get(), case)
+            self.assertEqual(
+                cohort_cache.get(**{
+                    'sort': 'slug',
+                    'slug': slug,
+                    'request.user.id': model.user.id
+                }), expected)
 
     def test_cache_per_user__get__auth__with_cache_case_of_root_and_current__passing_arguments(self):
         cache.clear()
@@ -514,28 +619,26 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
             self.bc.database.delete('admissions.Cohort')
             model = self.bc.database.create(cohort={'slug': slug}, user=1)
 
-            json_data_root = json.dumps(case)
-            json_data_query = json.dumps(case + case)
-            cache.set('Cohort__', json_data_root)
-            cache.set(f'Cohort__sort=slug&slug={slug}&request.user.id={model.user.id}', json_data_query)
-            cache.set('Cohort__keys',
-                      f'["Cohort__", "Cohort__sort=slug&slug={slug}&request.user.id={model.user.id}"]')
+            cohort_cache.set(case)
+            cohort_cache.set(case + case, **{'sort': 'slug', 'slug': slug, 'request.user.id': model.user.id})
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={slug}')
 
             force_authenticate(request, user=model.user)
             view = CachePerUserTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
             expected = case + case
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(),
-                             ['Cohort__', f'Cohort__sort=slug&slug={slug}&request.user.id={model.user.id}'])
-            self.assertEqual(cache.get('Cohort__'), json_data_root)
-            self.assertEqual(cache.get(f'Cohort__sort=slug&slug={slug}&request.user.id={model.user.id}'),
-                             json_data_query)
+            self.assertEqual(cohort_cache.get(), case)
+            self.assertEqual(
+                cohort_cache.get(**{
+                    'sort': 'slug',
+                    'slug': slug,
+                    'request.user.id': model.user.id
+                }), case + case)
 
     """
     🔽🔽🔽 Cache with prefix
@@ -547,31 +650,28 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
         cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
         params = [bin(x).replace('0b', '') for x in range(4, 8)]
         for expected in cases:
-            json_data = json.dumps(expected)
-            cache.set(
-                'Cohort__keys',
-                '["Cohort__sort=slug&slug=100%2C101%2C110%2C111&breathecode.view.get=the-beans-should-not-have-sugar"]'
-            )
-            cache.set(
-                'Cohort__sort=slug&slug=100%2C101%2C110%2C111&breathecode.view.get=the-beans-should-not-have-sugar',
-                json_data)
+            cohort_cache.set(
+                expected, **{
+                    'sort': 'slug',
+                    'slug': ','.join(params),
+                    'breathecode.view.get': 'the-beans-should-not-have-sugar'
+                })
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={",".join(params)}')
 
             view = CachePrefixTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), [
-                'Cohort__sort=slug&slug=100%2C101%2C110%2C111&breathecode.view.get=the-beans-should-not-have-sugar'
-            ])
             self.assertEqual(
-                cache.get(
-                    'Cohort__sort=slug&slug=100%2C101%2C110%2C111&breathecode.view.get=the-beans-should-not-have-sugar'
-                ),
-                str(expected).replace('\'', '"'))
+                cohort_cache.get(
+                    **{
+                        'sort': 'slug',
+                        'slug': ','.join(params),
+                        'breathecode.view.get': 'the-beans-should-not-have-sugar'
+                    }), expected)
 
     def test_cache_with_prefix__get__with_cache_but_other_case__passing_arguments(self):
         cache.clear()
@@ -582,28 +682,24 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
             slug = self.bc.fake.slug()
             model = self.bc.database.create(cohort={'slug': slug})
 
-            json_data = json.dumps(case)
-            cache.set('Cohort__', json_data)
-            cache.set('Cohort__keys', '["Cohort__"]')
+            cohort_cache.set(case)
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={slug}')
 
             view = CachePrefixTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
             expected = GetCohortSerializer([model.cohort], many=True).data
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), [
-                'Cohort__',
-                f'Cohort__sort=slug&slug={slug}&breathecode.view.get=the-beans-should-not-have-sugar'
-            ])
-            self.assertEqual(cache.get('Cohort__'), serialize_cache_value(case))
+            self.assertEqual(cohort_cache.get(), case)
             self.assertEqual(
-                cache.get(
-                    f'Cohort__sort=slug&slug={slug}&breathecode.view.get=the-beans-should-not-have-sugar'),
-                serialize_cache_value(expected))
+                cohort_cache.get(**{
+                    'sort': 'slug',
+                    'slug': slug,
+                    'breathecode.view.get': 'the-beans-should-not-have-sugar'
+                }), expected)
 
     def test_cache_with_prefix__get__with_cache_case_of_root_and_current__passing_arguments(self):
         cache.clear()
@@ -615,34 +711,30 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
             self.bc.database.delete('admissions.Cohort')
             model = self.bc.database.create(cohort={'slug': slug})
 
-            json_data_root = json.dumps(case)
-            json_data_query = json.dumps(case + case)
-            cache.set('Cohort__', json_data_root)
-            cache.set(f'Cohort__sort=slug&slug={slug}&breathecode.view.get=the-beans-should-not-have-sugar',
-                      json_data_query)
-            cache.set(
-                'Cohort__keys',
-                f'["Cohort__", "Cohort__sort=slug&slug={slug}&breathecode.view.get=the-beans-should-not-have-sugar"]'
-            )
+            cohort_cache.set(case)
+            cohort_cache.set(
+                case + case, **{
+                    'sort': 'slug',
+                    'slug': slug,
+                    'breathecode.view.get': 'the-beans-should-not-have-sugar'
+                })
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar?sort=slug&slug={slug}')
 
             view = CachePrefixTestView.as_view()
-            response = view(request).render()
+            response = render(view(request))
             expected = case + case
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), [
-                'Cohort__',
-                f'Cohort__sort=slug&slug={slug}&breathecode.view.get=the-beans-should-not-have-sugar'
-            ])
-            self.assertEqual(cache.get('Cohort__'), json_data_root)
+            self.assertEqual(cohort_cache.get(), case)
             self.assertEqual(
-                cache.get(
-                    f'Cohort__sort=slug&slug={slug}&breathecode.view.get=the-beans-should-not-have-sugar'),
-                json_data_query)
+                cohort_cache.get(**{
+                    'sort': 'slug',
+                    'slug': slug,
+                    'breathecode.view.get': 'the-beans-should-not-have-sugar'
+                }), case + case)
 
     """
     🔽🔽🔽 Sort
@@ -658,7 +750,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer(sorted(model.cohort, key=lambda x: x.name), many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
@@ -678,7 +770,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer(sorted(model.cohort, key=lambda x: x.name)[:100], many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
@@ -694,7 +786,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = {
             'count': 10,
             'first': None,
@@ -717,7 +809,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = {
             'count': 10,
             'first': 'http://testserver/the-beans-should-not-have-sugar?limit=5',
@@ -740,7 +832,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = {
             'count': 10,
             'first': 'http://testserver/the-beans-should-not-have-sugar?limit=5',
@@ -767,7 +859,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = PaginateFalseTestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer(sorted(model.cohort, key=lambda x: x.name), many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
@@ -783,7 +875,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = PaginateFalseTestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer(sorted(model.cohort, key=lambda x: x.name), many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
@@ -799,7 +891,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = PaginateFalseTestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer(sorted(model.cohort, key=lambda x: x.name), many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
@@ -815,7 +907,7 @@ class ApiViewExtensionsGetTestSuite(UtilsTestCase):
 
         view = PaginateFalseTestView.as_view()
 
-        response = view(request).render()
+        response = render(view(request))
         expected = GetCohortSerializer(sorted(model.cohort, key=lambda x: x.name), many=True).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
@@ -840,7 +932,7 @@ class ApiViewExtensionsGetIdTestSuite(UtilsTestCase):
         request = request.get(f'/the-beans-should-not-have-sugar/1')
 
         view = TestView.as_view()
-        view(request, id=1).render()
+        render(view(request, id=1))
 
         self.assertEqual(APIViewExtensionHandlers._spy_extensions.call_args_list, [
             call(['CacheExtension', 'LanguageExtension', 'PaginationExtension', 'SortExtension']),
@@ -858,13 +950,13 @@ class ApiViewExtensionsGetIdTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request, id=1).render()
+        response = render(view(request, id=1))
         expected = {'detail': 'Not found', 'status_code': 404}
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
-        self.assertEqual(cohort_cache.keys(), [])
+        self.assertEqual(cohort_cache.get(id=1), None)
 
     def test_cache__get__without_cache__one_cohort(self):
         cache.clear()
@@ -876,34 +968,30 @@ class ApiViewExtensionsGetIdTestSuite(UtilsTestCase):
 
         view = TestView.as_view()
 
-        response = view(request, id=1).render()
+        response = render(view(request, id=1))
         expected = GetCohortSerializer(model.cohort, many=False).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(cohort_cache.keys(), ['Cohort__id=1'])
-        self.assertEqual(cache.get('Cohort__id=1'), serialize_cache_value(expected))
+        self.assertEqual(cohort_cache.get(id=1), expected)
 
     def test_cache__get__with_cache(self):
         cache.clear()
 
         cases = [[], [{'x': 1}], [{'x': 1}, {'x': 2}]]
         for expected in cases:
-            json_data = json.dumps(expected)
-            cache.set('Cohort__keys', '["Cohort__id=1"]')
-            cache.set('Cohort__id=1', json_data)
+            cohort_cache.set(expected, id=1)
 
             request = APIRequestFactory()
             request = request.get('/the-beans-should-not-have-sugar/1')
 
             view = TestView.as_view()
-            response = view(request, id=1).render()
+            response = render(view(request, id=1))
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), ['Cohort__id=1'])
-            self.assertEqual(cache.get('Cohort__id=1'), serialize_cache_value(expected))
+            self.assertEqual(cohort_cache.get(id=1), expected)
 
     def test_cache__get__with_cache_but_other_case(self):
         cache.clear()
@@ -913,24 +1001,21 @@ class ApiViewExtensionsGetIdTestSuite(UtilsTestCase):
         slug = self.bc.fake.slug()
         model = self.bc.database.create(cohort={'slug': slug})
 
-        json_data = json.dumps(case)
-        cache.set('Cohort__', json_data)
-        cache.set('Cohort__id=2', json_data)
-        cache.set('Cohort__keys', '["Cohort__", "Cohort__id=2"]')
+        cohort_cache.set(case)
+        cohort_cache.set(case, id=2)
 
         request = APIRequestFactory()
         request = request.get(f'/the-beans-should-not-have-sugar/1')
 
         view = TestView.as_view()
-        response = view(request, id=1).render()
+        response = render(view(request, id=1))
         expected = GetCohortSerializer(model.cohort, many=False).data
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(cohort_cache.keys(), ['Cohort__', 'Cohort__id=2', 'Cohort__id=1'])
-        self.assertEqual(cache.get('Cohort__'), serialize_cache_value(case))
-        self.assertEqual(cache.get('Cohort__id=1'), serialize_cache_value(expected))
-        self.assertEqual(cache.get('Cohort__id=2'), serialize_cache_value(case))
+        self.assertEqual(cohort_cache.get(), case)
+        self.assertEqual(cohort_cache.get(id=1), expected)
+        self.assertEqual(cohort_cache.get(id=2), case)
 
     def test_cache__get__with_cache_case_of_root_and_current(self):
         cache.clear()
@@ -942,22 +1027,17 @@ class ApiViewExtensionsGetIdTestSuite(UtilsTestCase):
             self.bc.database.delete('admissions.Cohort')
             model = self.bc.database.create(cohort={'slug': slug})
 
-            json_data_root = json.dumps(case[0])
-            json_data_query = json.dumps(case[1])
-            cache.set('Cohort__', json_data_root)
-            cache.set('Cohort__id=1', json_data_query)
-            cache.set('Cohort__keys', '["Cohort__", "Cohort__id=1"]')
+            cohort_cache.set(case[0])
+            cohort_cache.set(case[1], id=1)
 
             request = APIRequestFactory()
             request = request.get(f'/the-beans-should-not-have-sugar/1')
 
             view = TestView.as_view()
-            response = view(request, id=1).render()
-            self.assertEqual(cohort_cache.keys(), ['Cohort__', 'Cohort__id=1'])
+            response = render(view(request, id=1))
             expected = case[1]
 
             self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(cohort_cache.keys(), ['Cohort__', 'Cohort__id=1'])
-            self.assertEqual(cache.get('Cohort__'), json_data_root)
-            self.assertEqual(cache.get('Cohort__id=1'), json_data_query)
+            self.assertEqual(cohort_cache.get(), case[0])
+            self.assertEqual(cohort_cache.get(id=1), case[1])
@@ -0,0 +1,434 @@
+import zlib
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+from decimal import Decimal
+from django.core.cache import cache
+from django.utils import timezone
+from breathecode.admissions.caches import CohortCache
+from breathecode.utils.cache import CACHE_DESCRIPTORS, JSONCodec
+from ..mixins import UtilsTestCase
+
+UTC_NOW = timezone.now()
+NOW = 1_700_000_000.0
+
+
+class JSONCohortCache(CohortCache):
+    codec = JSONCodec()
+
+
+class UncompressedCohortCache(CohortCache):
+    compress_threshold = None
+
+
+class FreshCohortCache(CohortCache):
+    soft_max_age = None
+
+
+cohort_cache = CohortCache()
+
+
+def get_data(n=1):
+    return [{
+        'id': x,
+        'name': f'cohort-{x}',
+        'kickoff_date': UTC_NOW,
+        'ending_date': None,
+        'price': Decimal('1.5'),
+    } for x in range(n)]
+
+
+def get_serialized_data(n=1):
+    return [{
+        'id': x,
+        'name': f'cohort-{x}',
+        'kickoff_date': UTC_NOW.isoformat().replace('+00:00', 'Z'),
+        'ending_date': None,
+        'price': 1.5,
+    } for x in range(n)]
+
+
+def get_tags(n=1):
+    return {'Cohort__tag__*': 0, **{f'Cohort__tag__id={x}': 0 for x in range(n)}}
+
+
+# the subclasses are registered as the descriptor of Cohort when they are instantiated, it is restored after
+# each test, so the signals of the other tests do not use them
+@patch.dict(CACHE_DESCRIPTORS)
+class CacheTestSuite(UtilsTestCase):
+    """
+    🔽🔽🔽 Codecs
+    """
+
+    def test_get__without_data(self):
+        cache.clear()
+
+        for instance in [cohort_cache, JSONCohortCache()]:
+            self.assertEqual(instance.get(), None)
+            self.assertEqual(instance.raw(), None)
+
+    def test_get__serialize_fields__orjson(self):
+        cache.clear()
+
+        cohort_cache.set(get_data())
+
+        self.assertEqual(cohort_cache.get(), get_serialized_data())
+
+    def test_get__serialize_fields__json(self):
+        cache.clear()
+
+        instance = JSONCohortCache()
+        instance.set(get_data())
+
+        self.assertEqual(instance.get(), get_serialized_data())
+
+    def test_raw__both_codecs_write_the_same_document(self):
+        cache.clear()
+
+        cohort_cache.set(get_data(), id=1)
+        orjson_value = cohort_cache.raw(id=1)
+
+        JSONCohortCache().set(get_data(), id=1)
+        json_value = JSONCohortCache().raw(id=1)
+
+        self.assertEqual(orjson_value, json_value)
+
+    """
+    🔽🔽🔽 Compression
+    """
+
+    @patch('time.time', MagicMock(return_value=NOW))
+    def test_set__below_threshold__uncompressed(self):
+        cache.clear()
+
+        cohort_cache.set(get_data())
+        key = cohort_cache.__generate_key__()
+        content = cohort_cache.codec.encode(get_data())
+
+        self.assertEqual(
+            cache.get(key), {
+                'content': content,
+                'compressed': False,
+                'etag': '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"',
+                'headers': {},
+                'expires_at': NOW + 60 * 5,
+                'tags': get_tags(1),
+            })
+
+    def test_set__above_threshold__compressed(self):
+        cache.clear()
+
+        cohort_cache.set(get_data(100))
+        key = cohort_cache.__generate_key__()
+        entry = cache.get(key)
+        content = cohort_cache.codec.encode(get_data(100))
+
+        self.assertEqual(entry['compressed'], True)
+        self.assertEqual(zlib.decompress(entry['content']), content)
+        self.assertEqual(entry['etag'], '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"')
+        self.assertEqual(cohort_cache.raw(), content)
+        self.assertEqual(cohort_cache.get(), get_serialized_data(100))
+
+    def test_set__above_threshold__compression_disabled(self):
+        cache.clear()
+
+        instance = UncompressedCohortCache()
+        instance.set(get_data(100))
+        key = instance.__generate_key__()
+        entry = cache.get(key)
+
+        self.assertEqual(entry['compressed'], False)
+        self.assertEqual(entry['content'], instance.codec.encode(get_data(100)))
+        self.assertEqual(instance.get(), get_serialized_data(100))
+
+    """
+    🔽🔽🔽 Entry
+    """
+
+    @patch('time.time', MagicMock(return_value=NOW))
+    def test_entry__with_headers(self):
+        cache.clear()
+
+        returned = cohort_cache.set(get_data(100), {'x-total-count': 100, 'Link': '<x>; rel="next"'}, id=1)
+        content = cohort_cache.codec.encode(get_data(100))
+        expected = {
+            'content': content,
+            'compressed': False,
+            'etag': '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"',
+            'headers': {
+                'x-total-count': '100',
+                'Link': '<x>; rel="next"'
+            },
+            'expires_at': NOW + 60 * 5,
+            'tags': get_tags(100),
+        }
+
+        self.assertEqual(returned, expected)
+        self.assertEqual(cohort_cache.entry(id=1), expected)
+
+    def test_set__headers_in_querystring(self):
+        cache.clear()
+
+        cohort_cache.set(get_data(), headers='x')
+
+        self.assertEqual(cohort_cache.get(), None)
+        self.assertEqual(cohort_cache.get(headers='x'), get_serialized_data())
+
+    """
+    🔽🔽🔽 Stale while revalidate
+    """
+
+    def test_lookup__fresh(self):
+        cache.clear()
+
+        entry = cohort_cache.set(get_data())
+
+        self.assertEqual(cohort_cache.lookup(), (entry, None))
+        self.assertEqual(cohort_cache.lookup(), (entry, None))
+
+    def test_lookup__without_entry(self):
+        cache.clear()
+
+        entry, context = cohort_cache.lookup()
+
+        self.assertEqual(entry, None)
+        self.assertEqual(
+            context, {
+                'version': cohort_cache.version(),
+                'invalidations': None,
+                'lock': cohort_cache.__generate_key__() + '__lock',
+                'token': cache.get(cohort_cache.__generate_key__() + '__lock'),
+            })
+
+    def test_lookup__without_entry__lock_held(self):
+        cache.clear()
+
+        _, context = cohort_cache.lookup()
+
+        # the caller with the lock did not save anything in time
+        with patch.object(cohort_cache, 'lock_wait', 0.1):
+            entry, other_context = cohort_cache.lookup()
+
+        self.assertEqual(entry, None)
+        self.assertEqual(other_context, {**context, 'lock': None, 'token': None})
+
+    def test_lookup__after_clear__concurrent(self):
+        cache.clear()
+
+        cohort_cache.set(get_data())
+        cohort_cache.clear()
+
+        computed = []
+        barrier = threading.Barrier(8)
+
+        def request():
+            barrier.wait()
+            entry, context = cohort_cache.lookup()
+
+            if entry is None:
+                computed.append(1)
+                time.sleep(0.2)
+                entry = cohort_cache.set(get_data(2), None, context)
+
+            return entry['content']
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            contents = list(executor.map(lambda _: request(), range(8)))
+
+        # one recompute, the rest wait for it
+        self.assertEqual(len(computed), 1)
+        self.assertEqual(contents, [cohort_cache.codec.encode(get_data(2))] * 8)
+
+    def test_lookup__soft_expired(self):
+        cache.clear()
+
+        with patch('time.time', MagicMock(return_value=NOW)):
+            stale = cohort_cache.set(get_data())
+
+        with patch('time.time', MagicMock(return_value=NOW + 60 * 5 + 1)):
+            # the first one recomputes it
+            entry, context = cohort_cache.lookup()
+
+            self.assertEqual(entry, None)
+            self.assertEqual(context['lock'], cohort_cache.__generate_key__() + '__lock')
+
+            # the rest get the stale entry
+            self.assertEqual(cohort_cache.lookup(), (stale, None))
+            self.assertEqual(cohort_cache.lookup(), (stale, None))
+
+            entry = cohort_cache.set(get_data(2), None, context)
+
+            self.assertEqual(cohort_cache.lookup(), (entry, None))
+            self.assertEqual(cache.get(context['lock']), None)
+
+    def test_lookup__soft_expired__lock_expired(self):
+        cache.clear()
+
+        with patch('time.time', MagicMock(return_value=NOW)):
+            stale = cohort_cache.set(get_data())
+
+        with patch('time.time', MagicMock(return_value=NOW + 60 * 5 + 1)):
+            _, context = cohort_cache.lookup()
+            self.assertEqual(cohort_cache.lookup(), (stale, None))
+
+            # the worker that got the lock did not save anything
+            cache.delete(context['lock'])
+
+            _, other_context = cohort_cache.lookup()
+            self.assertEqual(cohort_cache.lookup(), (stale, None))
+
+            # the late worker does not release the lock of the other one
+            cohort_cache.set(get_data(), None, context)
+            self.assertEqual(cache.get(other_context['lock']), other_context['token'])
+
+    def test_lookup__soft_expired__cleared_meanwhile(self):
+        cache.clear()
+
+        with patch('time.time', MagicMock(return_value=NOW)):
+            cohort_cache.set(get_data())
+
+        with patch('time.time', MagicMock(return_value=NOW + 60 * 5 + 1)):
+            _, context = cohort_cache.lookup()
+
+            cohort_cache.clear()
+            cohort_cache.set(get_data(), None, context)
+
+        # the document computed before the clear is saved in the previous generation
+        self.assertEqual(cohort_cache.lookup()[0], None)
+        self.assertEqual(cache.get(context['lock']), None)
+
+    def test_lookup__after_clear(self):
+        cache.clear()
+
+        cohort_cache.set(get_data())
+        cohort_cache.clear()
+
+        # the entries of the previous generation are not served
+        self.assertEqual(cohort_cache.get(), None)
+        self.assertEqual(cohort_cache.lookup()[0], None)
+
+        entry = cohort_cache.set(get_data(2))
+
+        self.assertEqual(cohort_cache.lookup(), (entry, None))
+
+    def test_lookup__after_clear__without_stale_while_revalidate(self):
+        cache.clear()
+
+        instance = FreshCohortCache()
+        instance.set(get_data())
+        instance.clear()
+
+        self.assertEqual(instance.lookup()[0], None)
+        self.assertEqual(instance.lookup()[0], None)
+
+    def test_lookup__after_invalidate(self):
+        cache.clear()
+
+        with patch('time.time', MagicMock(return_value=NOW)):
+            cohort_cache.set(get_data())
+
+        cohort_cache.invalidate('id=0')
+
+        # the row changed, the outdated entry is not served even if it is soft-expired
+        self.assertEqual(cohort_cache.get(), None)
+        self.assertEqual(cohort_cache.lookup()[0], None)
+
+        entry = cohort_cache.set(get_data(2))
+
+        self.assertEqual(cohort_cache.lookup(), (entry, None))
+
+    def test_set__invalidated_while_computed(self):
+        cache.clear()
+
+        _, context = cohort_cache.lookup()
+
+        # the row changed after the query
+        cohort_cache.invalidate('id=0')
+        entry = cohort_cache.set(get_data(), None, context)
+
+        # the document is served to its caller, but it is not saved
+        self.assertEqual(entry['content'], cohort_cache.codec.encode(get_data()))
+        self.assertEqual(cohort_cache.get(), None)
+
+        _, context = cohort_cache.lookup()
+        entry = cohort_cache.set(get_data(), None, context)
+
+        self.assertEqual(cohort_cache.lookup(), (entry, None))
+
+    """
+    🔽🔽🔽 Tags
+    """
+
+    def test_set__tags__scoped_list(self):
+        cache.clear()
+
+        data = {
+            'count':
+            2,
+            'results': [
+                {
+                    'id': 1,
+                    'academy': {
+                        'id': 1,
+                        'slug': 'x'
+                    },
+                    'syllabus_version': 3,
+                    'schedule': None,
+                },
+                {
+                    'id': 2,
+                    'academy': {
+                        'slug': 'x'
+                    },
+                    'syllabus_version': {
+                        'id': 4
+                    },
+                },
+            ],
+        }
+
+        entry = cohort_cache.set(data, academy_id=1)
+
+        self.assertEqual(
+            entry['tags'], {
+                'Cohort__tag__academy=1': 0,
+                'Cohort__tag__id=1': 0,
+                'Cohort__tag__id=2': 0,
+                'Cohort__tag__Academy=1': 0,
+                'Cohort__tag__Academy=*': 0,
+                'Cohort__tag__SyllabusVersion=3': 0,
+                'Cohort__tag__SyllabusVersion=4': 0,
+            })
+
+    def test_set__tags__detail(self):
+        cache.clear()
+
+        cohort_cache.invalidate('id=1')
+        entry = cohort_cache.set({'id': 1, 'name': 'x'}, id=1)
+
+        self.assertEqual(entry['tags'], {'Cohort__tag__id=1': cache.get('Cohort__tag__id=1')})
+
+    def test_invalidate__other_tags(self):
+        cache.clear()
+
+        cohort_cache.set(get_data())
+        cohort_cache.set(get_data(), academy_id=1)
+        cohort_cache.invalidate('id=1', 'academy=2', 'Academy=1')
+
+        self.assertEqual(cohort_cache.get(), get_serialized_data())
+        self.assertEqual(cohort_cache.get(academy_id=1), get_serialized_data())
+
+    def test_invalidate__academy(self):
+        cache.clear()
+
+        cohort_cache.set(get_data())
+        cohort_cache.set(get_data(), academy_id=1)
+        cohort_cache.set(get_data(), academy_id=2)
+        cohort_cache.invalidate('academy=1')
+
+        self.assertEqual(cohort_cache.get(), get_serialized_data())
+        self.assertEqual(cohort_cache.get(academy_id=1), None)
+        self.assertEqual(cohort_cache.get(academy_id=2), get_serialized_data())
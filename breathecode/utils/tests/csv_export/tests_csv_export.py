@@ -0,0 +1,92 @@
+import gzip
+import io
+from unittest.mock import MagicMock, call
+from breathecode.admissions.models import CohortUser
+from breathecode.utils.csv_export import iter_csv, write_csv
+from ..mixins import UtilsTestCase
+
+
+def get_columns():
+    return [
+        'id',
+        'user__email',
+        ('Cohort', 'cohort__name'),
+        ('Role', lambda x: x.role.lower()),
+    ]
+
+
+def get_rows(model):
+    return [['id', 'user__email', 'Cohort', 'Role']
+            ] + [[str(x.id), model.user.email, model.cohort.name,
+                  x.role.lower()] for x in model.cohort_user]
+
+
+def to_csv(rows):
+    return ''.join([','.join(x) + '\r\n' for x in rows])
+
+
+class CSVExportTestSuite(UtilsTestCase):
+    """
+    🔽🔽🔽 iter_csv
+    """
+
+    def test_iter_csv__default_columns(self):
+        model = self.bc.database.create(cohort_user=1)
+
+        with self.assertNumQueries(1):
+            content = ''.join(iter_csv(CohortUser.objects.all()))
+
+        fields = [x.name for x in CohortUser._meta.fields]
+        self.assertEqual(content.split('\r\n')[0], ','.join(fields))
+        self.assertIn(f',{model.user},{model.cohort},', content.split('\r\n')[1])
+
+    def test_iter_csv__with_columns(self):
+        model = self.bc.database.create(cohort_user=2)
+
+        # the relations are joined, the rows are not fetched one by one
+        with self.assertNumQueries(1):
+            content = ''.join(iter_csv(CohortUser.objects.order_by('id'), get_columns()))
+
+        self.assertEqual(content, to_csv(get_rows(model)))
+
+    def test_iter_csv__in_chunks(self):
+        model = self.bc.database.create(cohort_user=2)
+        progress = MagicMock()
+
+        chunks = list(
+            iter_csv(CohortUser.objects.order_by('id'), get_columns(), chunk_size=1, progress=progress))
+        rows = get_rows(model)
+
+        self.assertEqual(chunks, [to_csv(rows[:2]), to_csv(rows[2:]), ''])
+        self.assertEqual(progress.call_args_list, [call(1), call(2), call(2)])
+
+    """
+    🔽🔽🔽 write_csv
+    """
+
+    def test_write_csv(self):
+        model = self.bc.database.create(cohort_user=2)
+        file = io.BytesIO()
+
+        rows = write_csv(CohortUser.objects.order_by('id'), file, get_columns())
+
+        self.assertEqual(rows, 2)
+        self.assertEqual(file.getvalue().decode('utf-8'), to_csv(get_rows(model)))
+
+    def test_write_csv__compressed(self):
+        model = self.bc.database.create(cohort_user=2)
+        file = io.BytesIO()
+        progress = MagicMock()
+
+        rows = write_csv(CohortUser.objects.order_by('id'),
+                         file,
+                         get_columns(),
+                         compress=True,
+                         progress=progress)
+
+        self.assertEqual(rows, 2)
+        self.assertEqual(gzip.decompress(file.getvalue()).decode('utf-8'), to_csv(get_rows(model)))
+        self.assertEqual(progress.call_args_list, [call(2)])
+
+        # the file is kept open to be closed by the caller
+        self.assertFalse(file.closed)
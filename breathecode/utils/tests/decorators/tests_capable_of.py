@@ -314,3 +314,109 @@ class ViewTestSuite(UtilsTestCase):
 
         self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    """
+    🔽🔽🔽 Capabilities snapshot
+    """
+
+    def test_capable_of__view__get_id__cached_capabilities(self):
+        model = self.bc.database.create(user=1,
+                                        academy=1,
+                                        profile_academy=1,
+                                        role=1,
+                                        capability='can_kill_kenny')
+
+        factory = APIRequestFactory()
+        view = TestView.as_view()
+
+        for n in range(2):
+            request = factory.get('/they-killed-kenny', HTTP_ACADEMY=1)
+            force_authenticate(request, user=model.user)
+
+            with self.assertNumQueries(1 - n):
+                response = view(request, id=1).render()
+
+            expected = {'academy_id': 1, 'id': 1}
+
+            self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_capable_of__view__get_id__profile_academy_deleted(self):
+        model = self.bc.database.create(user=1,
+                                        academy=1,
+                                        profile_academy=1,
+                                        role=1,
+                                        capability='can_kill_kenny')
+
+        factory = APIRequestFactory()
+        view = TestView.as_view()
+
+        request = factory.get('/they-killed-kenny', HTTP_ACADEMY=1)
+        force_authenticate(request, user=model.user)
+        response = view(request, id=1).render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        model.profile_academy.delete()
+
+        request = factory.get('/they-killed-kenny', HTTP_ACADEMY=1)
+        force_authenticate(request, user=model.user)
+        response = view(request, id=1).render()
+        expected = {
+            'detail': "You (user: 1) don't have this capability: can_kill_kenny for academy 1",
+            'status_code': 403
+        }
+
+        self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_capable_of__view__get_id__capability_removed_from_the_role(self):
+        model = self.bc.database.create(user=1,
+                                        academy=1,
+                                        profile_academy=1,
+                                        role=1,
+                                        capability='can_kill_kenny')
+
+        factory = APIRequestFactory()
+        view = TestView.as_view()
+
+        request = factory.get('/they-killed-kenny', HTTP_ACADEMY=1)
+        force_authenticate(request, user=model.user)
+        response = view(request, id=1).render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        model.role.capabilities.remove(model.capability)
+
+        request = factory.get('/they-killed-kenny', HTTP_ACADEMY=1)
+        force_authenticate(request, user=model.user)
+        response = view(request, id=1).render()
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_capable_of__view__get_id__academy_deactivated(self):
+        model = self.bc.database.create(user=1,
+                                        academy=1,
+                                        profile_academy=1,
+                                        role=1,
+                                        capability='can_kill_kenny')
+
+        factory = APIRequestFactory()
+        view = TestView.as_view()
+
+        request = factory.get('/they-killed-kenny', HTTP_ACADEMY=1)
+        force_authenticate(request, user=model.user)
+        response = view(request, id=1).render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        model.academy.status = 'INACTIVE'
+        model.academy.save()
+
+        request = factory.get('/they-killed-kenny', HTTP_ACADEMY=1)
+        force_authenticate(request, user=model.user)
+        response = view(request, id=1).render()
+        expected = {'detail': 'This academy is not active', 'status_code': 403}
+
+        self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -16,6 +16,7 @@ from breathecode.payments import models
 import breathecode.utils.decorators as decorators
 from breathecode.payments import signals as payments_signals
 from breathecode.utils.decorators import PermissionContextType
+from breathecode.utils.decorators.has_permission import get_available_consumables
 
 from ..mixins import UtilsTestCase
 
@@ -8522,3 +8523,111 @@ class ConsumerCallbackViewTestSuite(UtilsTestCase):
 
         self.assertEqual(models.ConsumptionSession.build_session.call_args_list, [])
         self.assertEqual(payments_signals.consume_service.send.call_args_list, [])
+
+
+class PermissionSnapshotTestSuite(UtilsTestCase):
+    """
+    🔽🔽🔽 Permissions snapshot
+    """
+
+    def test__function__get__permission_removed_from_the_group(self):
+        user = {'user_permissions': []}
+        permissions = [{}, {'codename': PERMISSION}]
+        group = {'permission_id': 2}
+        model = self.bc.database.create(user=user, permission=permissions, group=group)
+
+        factory = APIRequestFactory()
+        view = get
+
+        request = factory.get('/they-killed-kenny')
+        force_authenticate(request, user=model.user)
+        response = view(request).render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        model.group.permissions.remove(model.permission[1])
+
+        request = factory.get('/they-killed-kenny')
+        force_authenticate(request, user=model.user)
+        response = view(request).render()
+        expected = {'detail': 'without-permission', 'status_code': 403}
+
+        self.assertEqual(json.loads(response.content.decode('utf-8')), expected)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test__function__get__permission_of_the_user_renamed(self):
+        model = self.bc.database.create(user=1, permission=1)
+
+        factory = APIRequestFactory()
+        view = get
+
+        request = factory.get('/they-killed-kenny')
+        force_authenticate(request, user=model.user)
+        response = view(request).render()
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        model.permission.codename = PERMISSION
+        model.permission.save()
+
+        request = factory.get('/they-killed-kenny')
+        force_authenticate(request, user=model.user)
+        response = view(request).render()
+
+        self.assertEqual(json.loads(response.content.decode('utf-8')), GET_RESPONSE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test__function__get__user_removed_from_the_group(self):
+        user = {'user_permissions': []}
+        permissions = [{}, {'codename': PERMISSION}]
+        group = {'permission_id': 2}
+        model = self.bc.database.create(user=user, permission=permissions, group=group)
+
+        factory = APIRequestFactory()
+        view = get
+
+        request = factory.get('/they-killed-kenny')
+        force_authenticate(request, user=model.user)
+        response = view(request).render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        model.group.user_set.remove(model.user)
+
+        request = factory.get('/they-killed-kenny')
+        force_authenticate(request, user=model.user)
+        response = view(request).render()
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    """
+    🔽🔽🔽 Available consumables
+    """
+
+    def test_get_available_consumables(self):
+        consumables = [{'how_many': 2}, {'how_many': 2}, {'how_many': -1}]
+        consumption_sessions = [{
+            'consumable_id': 1,
+            'how_many': 2,
+            'status': 'PENDING',
+        }, {
+            'consumable_id': 2,
+            'how_many': 1,
+            'status': 'PENDING',
+        }, {
+            'consumable_id': 2,
+            'how_many': 1,
+            'status': 'DONE',
+        }, {
+            'consumable_id': 3,
+            'how_many': 5,
+            'status': 'PENDING',
+        }]
+        model = self.bc.database.create(user=1,
+                                        consumable=consumables,
+                                        consumption_session=consumption_sessions)
+
+        with self.assertNumQueries(1):
+            available = list(get_available_consumables(models.Consumable.objects.order_by('id')))
+
+        self.assertEqual(available, model.consumable[1:])
@@ -0,0 +1,161 @@
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from google.cloud.ndb import Cursor
+from google.cloud.ndb.query import OR
+from breathecode.activity.models import Activity
+from breathecode.utils import NDB, ValidationException
+from breathecode.utils.ndb import encode_cursor, split_query
+from ..mixins import UtilsTestCase
+
+
+class Entity:
+
+    def __init__(self, data):
+        self.data = data
+
+    def to_dict(self):
+        return self.data
+
+
+class Future:
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+
+def get_model(rows: dict):
+    """
+    Fake ndb model, the rows are grouped by the slug filter, the cursors are the offsets.
+    """
+
+    class Query:
+
+        def __init__(self):
+            self.filters = []
+
+        def filter(self, *filters):
+            self.filters = filters
+            return self
+
+        def get_slug(self):
+            return next(x._value for x in self.filters if x._name == 'slug')
+
+        def get_rows(self):
+            return rows.get(self.get_slug(), [])
+
+        def fetch_page(self, page_size, start_cursor=None):
+            start = int(start_cursor.cursor.decode('utf-8')) if start_cursor else 0
+            page = self.get_rows()[start:start + page_size]
+            end = start + len(page)
+            more = end < len(self.get_rows())
+            Model.reads.append((self.get_slug(), len(page)))
+            return [Entity(x) for x in page], Cursor(cursor=str(end).encode('utf-8')), more
+
+        def count_async(self, limit=None):
+            return Future(len(self.get_rows()[:limit]))
+
+    Model = MagicMock()
+    Model.query.side_effect = Query
+    Model.reads = []
+    Model._get_kind.return_value = 'student_activity'
+    return Model
+
+
+def get_rows(slug, n):
+    return [{'slug': slug, 'id': x} for x in range(n)]
+
+
+@patch('breathecode.utils.ndb.get_client', MagicMock())
+class NDBTestSuite(UtilsTestCase):
+    """
+    🔽🔽🔽 split_query
+    """
+
+    def test_split_query(self):
+        query = [Activity.cohort == 'x', OR(Activity.slug == 'a', Activity.slug == 'b')]
+
+        self.assertEqual(split_query(query), [
+            [Activity.cohort == 'x', Activity.slug == 'a'],
+            [Activity.cohort == 'x', Activity.slug == 'b'],
+        ])
+
+    """
+    🔽🔽🔽 fetch_page
+    """
+
+    def test_fetch_page__one_query(self):
+        client = NDB(get_model({'a': get_rows('a', 5)}))
+        query = [Activity.slug == 'a']
+
+        page, cursor = client.fetch_page(query, 3)
+        self.assertEqual(page, get_rows('a', 3))
+
+        page, cursor = client.fetch_page(query, 3, cursor)
+        self.assertEqual(page, get_rows('a', 5)[3:])
+        self.assertEqual(cursor, None)
+
+    def test_fetch_page__or_query(self):
+        client = NDB(get_model({'a': get_rows('a', 2), 'b': get_rows('b', 4)}))
+        query = [OR(Activity.slug == 'a', Activity.slug == 'b')]
+
+        pages = []
+        cursor = None
+        while True:
+            page, cursor = client.fetch_page(query, 3, cursor)
+            pages.append(page)
+
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, [
+            get_rows('a', 2) + get_rows('b', 1),
+            get_rows('b', 4)[1:],
+        ])
+
+    def test_fetch_page__or_query__just_the_page_is_read(self):
+        Model = get_model({'a': get_rows('a', 5), 'b': get_rows('b', 5)})
+        client = NDB(Model)
+        query = [OR(Activity.slug == 'a', Activity.slug == 'b')]
+
+        cursor = None
+        for _ in range(3):
+            _, cursor = client.fetch_page(query, 3, cursor)
+
+        # the next alternative is read when the previous one is exhausted, the served entities are not read again
+        self.assertEqual(Model.reads, [('a', 3), ('a', 2), ('b', 1), ('b', 3)])
+
+    def test_fetch_page__invalid_cursor(self):
+        client = NDB(get_model({}))
+        query = [OR(Activity.slug == 'a', Activity.slug == 'b')]
+
+        for cursor in ['x', encode_cursor([[None, 0]]), encode_cursor([1, 2])]:
+            with self.assertRaisesMessage(ValidationException, 'invalid-cursor'):
+                client.fetch_page(query, 3, cursor)
+
+    """
+    🔽🔽🔽 count
+    """
+
+    def test_count__cached(self):
+        rows = {'a': get_rows('a', 2), 'b': get_rows('b', 4)}
+        client = NDB(get_model(rows))
+        query = [OR(Activity.slug == 'a', Activity.slug == 'b')]
+
+        self.assertEqual(client.count(query), 6)
+
+        rows['a'] = []
+
+        self.assertEqual(client.count(query), 6)
+
+        cache.clear()
+
+        self.assertEqual(client.count(query), 4)
+
+    def test_count__with_limit(self):
+        client = NDB(get_model({'a': get_rows('a', 2), 'b': get_rows('b', 4)}))
+        query = [OR(Activity.slug == 'a', Activity.slug == 'b')]
+
+        self.assertEqual(client.count(query, limit=3), 3)
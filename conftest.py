@@ -28,6 +28,14 @@ def clean_environment(monkeypatch):
     test_environment()
 
 
+@pytest.fixture(autouse=True)
+def clean_cache():
+    from django.core.cache import cache
+
+    # the ids are reused between tests, so the entries of the previous one would be wrong
+    cache.clear()
+
+
 @pytest.fixture()
 def random_image(fake):
 